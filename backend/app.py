@@ -1,23 +1,28 @@
+import hmac
 import os
+import threading
 from datetime import datetime
 
 import click
 from dotenv import load_dotenv
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask.cli import with_appcontext
 from flask_cors import CORS
 from flask_migrate import Migrate
 
 from logging_config import configure_logging
-from models import CertificationType, Lesson, TrainingModule, db
+from models import Assessment, CertificationType, Lesson, TrainingModule, db
+from platform_counters import get_platform_stats, reconcile_platform_counters
 from schema_readiness import (
     SchemaReadinessError,
     should_enforce_schema_readiness,
     validate_signup_schema_or_raise,
 )
+from seeders.assessment_questions import seed_assessment_questions as seed_assessment_questions_fixture
 from seeders.certifications import seed_certification_types as seed_certification_types_fixture
 from seeders.course_content import seed_course_content as seed_course_content_fixture
 from seeders.training import seed_training_modules as seed_training_modules_fixture
+from settings import get_settings, reload_settings
 
 
 load_dotenv()
@@ -25,6 +30,8 @@ configure_logging()
 
 migrate = Migrate()
 
+_BACKGROUND_SERVICES_LOCK = threading.Lock()
+
 
 def _normalize_setting(value):
     if value is None:
@@ -149,6 +156,102 @@ def _register_cli(app: Flask):
     def seed_course_content_command(force: bool, silent: bool):
         seed_course_content_fixture(force=force, silent=silent)
 
+    @app.cli.command('seed-assessment-questions')
+    @click.option('--force', is_flag=True, help='Update existing assessment questions with fixture data')
+    @click.option('--silent', is_flag=True, help='Suppress console output')
+    @with_appcontext
+    def seed_assessment_questions_command(force: bool, silent: bool):
+        seed_assessment_questions_fixture(force=force, silent=silent)
+
+    @app.cli.command('purge-question-sets')
+    @with_appcontext
+    def purge_question_sets_command():
+        from routes.assessment import purge_expired_question_sets
+
+        purged = purge_expired_question_sets()
+        if purged is None:
+            click.echo('QUESTION_SET_STORE is not configured; nothing to purge.')
+            return
+        click.echo(f'Purged {purged} expired question sets.')
+
+    @app.cli.command('grade-answer-sheets')
+    @click.argument('sheets_path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--organization', default=None, help='Only grade learners in this organization')
+    @click.option('--chunk-size', type=int, default=None, help='Results inserted per transaction')
+    @click.option('--output', type=click.Path(dir_okay=False, writable=True), default=None,
+                  help='Write per-sheet results as JSON to this path')
+    @with_appcontext
+    def grade_answer_sheets_command(sheets_path: str, organization, chunk_size, output):
+        """Grade a JSON list (or JSON Lines file) of answer sheets."""
+        import json
+
+        from routes.assessment import grade_answer_sheets
+
+        with open(sheets_path, encoding='utf-8') as handle:
+            if sheets_path.endswith('.jsonl'):
+                sheets = [json.loads(line) for line in handle if line.strip()]
+            else:
+                sheets = json.load(handle)
+        if isinstance(sheets, dict):
+            sheets = sheets.get('sheets') or []
+
+        summary = grade_answer_sheets(sheets, organization=organization, chunk_size=chunk_size)
+        if output:
+            with open(output, 'w', encoding='utf-8') as handle:
+                json.dump(summary, handle, indent=2)
+        click.echo(f"Graded {summary['submitted']} sheets: {summary['saved']} saved, {summary['failed']} failed.")
+        for result in summary['results']:
+            if result['status'] == 'error':
+                click.echo(f"  sheet {result['index']}: {result['error']}")
+
+    @app.cli.command('reconcile-platform-counters')
+    @with_appcontext
+    def reconcile_platform_counters_command():
+        """Recount users, assessment results and certifications behind /api/stats."""
+        drift = reconcile_platform_counters()
+        if not drift:
+            click.echo('Platform counters are in sync.')
+            return
+        for name, (stored, actual) in drift.items():
+            click.echo(f'{name}: {stored} -> {actual}')
+
+    @app.cli.command('backfill-domain-scores')
+    @click.option('--batch-size', type=int, default=None, help='Results copied per transaction')
+    @with_appcontext
+    def backfill_domain_scores_command(batch_size):
+        """Copy per-domain scores of existing results into assessment_domain_score."""
+        from assessment_analytics import backfill_domain_scores
+
+        backfilled = backfill_domain_scores(batch_size=batch_size)
+        click.echo(f'Backfilled domain scores for {backfilled} assessment results.')
+
+    @app.cli.command('rebuild-progress-counters')
+    @click.option('--batch-size', type=int, default=None, help='User progress rows checked per transaction')
+    @with_appcontext
+    def rebuild_progress_counters_command(batch_size):
+        """Recompute the lesson counters on user_progress from lesson_progress."""
+        from progress_counters import rebuild_progress_counters
+
+        repaired = rebuild_progress_counters(batch_size=batch_size)
+        click.echo(f'Rebuilt lesson counters on {repaired} user progress rows.')
+
+    @app.cli.command('refresh-recommendations')
+    @click.argument('output_path', type=click.Path(dir_okay=False, writable=True))
+    @click.option('--chunk-size', type=int, default=None, help='Users scored per array pass')
+    @with_appcontext
+    def refresh_recommendations_command(output_path: str, chunk_size):
+        """Write every user's top course recommendations as JSON Lines."""
+        import json
+
+        from recommendation_batch import iter_recommendations_for_all_users
+
+        users = 0
+        with open(output_path, 'w', encoding='utf-8') as handle:
+            for user_id, payload in iter_recommendations_for_all_users(chunk_size=chunk_size):
+                handle.write(json.dumps({'user_id': user_id, **payload}) + '\n')
+                users += 1
+        click.echo(f'Wrote recommendations for {users} users to {output_path}.')
+
 
 def _register_routes(app: Flask):
     @app.route('/api/health')
@@ -158,19 +261,39 @@ def _register_routes(app: Flask):
     @app.route('/api/stats')
     def platform_stats():
         try:
-            from models import AssessmentResult, Certification, User
-
-            return jsonify({
-                'total_users': User.query.count(),
-                'total_assessments': AssessmentResult.query.count(),
-                'total_certifications': Certification.query.count(),
-                'completion_rate': 85,
-                'average_transformation_weeks': 3,
-                'satisfaction_rating': 4.8,
-            })
+            return jsonify(get_platform_stats())
         except Exception as exc:
             return jsonify({'error': str(exc)}), 500
 
+    @app.route('/api/metrics')
+    def runtime_metrics():
+        # Internal cache and pool state is for operators only.
+        token = get_settings().platform.metrics_token
+        if not token:
+            return jsonify({'error': 'Not found'}), 404
+        if not hmac.compare_digest(request.headers.get('X-Metrics-Token', ''), token):
+            return jsonify({'error': 'Invalid metrics token'}), 401
+
+        from routes import get_verified_token_cache_stats
+        from routes.assessment import (
+            get_generated_question_bank_stats,
+            get_openrouter_circuit_stats,
+            get_question_set_pool_stats,
+        )
+        from http_caching import get_response_cache_stats
+        from lesson_touch_buffer import get_lesson_touch_buffer_stats
+        from recommendation_cache import get_recommendation_cache_stats
+
+        return jsonify({
+            'auth_token_cache': get_verified_token_cache_stats(),
+            'question_set_pool': get_question_set_pool_stats(),
+            'openrouter_circuit': get_openrouter_circuit_stats(),
+            'generated_question_bank': get_generated_question_bank_stats(),
+            'recommendation_cache': get_recommendation_cache_stats(),
+            'response_cache': get_response_cache_stats(),
+            'lesson_touch_buffer': get_lesson_touch_buffer_stats(),
+        })
+
 
 def _register_before_request_hooks(app: Flask):
     @app.before_request
@@ -183,6 +306,9 @@ def _register_before_request_hooks(app: Flask):
                 return jsonify({'error': 'Application schema is not ready.'}), 503
             app.config['_schema_readiness_checked'] = True
 
+        if not app.config.get('TESTING') and app.config.get('_background_services_pid') != os.getpid():
+            _start_background_services_once(app)
+
         if app.config.get('_content_seed_ensured'):
             return
 
@@ -196,6 +322,8 @@ def _register_before_request_hooks(app: Flask):
                 seed_training_modules_fixture(force=False, silent=True)
             if CertificationType.query.count() == 0:
                 seed_certification_types_fixture(force=False, silent=True)
+            if Assessment.query.count() == 0:
+                seed_assessment_questions_fixture(force=False, silent=True)
             seed_course_content_fixture(force=False, silent=True)
         except Exception:
             app.logger.exception('dev_content_seed_failed')
@@ -203,6 +331,44 @@ def _register_before_request_hooks(app: Flask):
         app.config['_content_seed_ensured'] = True
 
 
+def _start_background_services_once(app: Flask):
+    # Started from the first request of each serving process, never at import time,
+    # so `flask db upgrade` and other CLI commands do not spin up pools or flushers.
+    with _BACKGROUND_SERVICES_LOCK:
+        if app.config.get('_background_services_pid') == os.getpid():
+            return
+        app.config['_background_services_pid'] = os.getpid()
+        _start_background_services(app)
+
+
+def _start_background_services(app: Flask):
+    from lesson_touch_buffer import start_lesson_touch_buffer
+    from platform_counters import start_platform_counter_buffer
+    from routes import start_supabase_jwks_refresh
+    from routes.assessment import start_question_set_pool
+
+    with app.app_context():
+        try:
+            start_supabase_jwks_refresh()
+        except Exception:
+            app.logger.exception('supabase_jwks_prefetch_failed')
+
+        try:
+            start_question_set_pool()
+        except Exception:
+            app.logger.exception('question_set_pool_start_failed')
+
+        try:
+            start_lesson_touch_buffer()
+        except Exception:
+            app.logger.exception('lesson_touch_buffer_start_failed')
+
+        try:
+            start_platform_counter_buffer()
+        except Exception:
+            app.logger.exception('platform_counter_buffer_start_failed')
+
+
 def _enforce_startup_schema_readiness(app: Flask) -> None:
     if app.config.get('TESTING'):
         app.logger.info('startup_schema_readiness_check_skipped_for_testing')
@@ -218,9 +384,17 @@ def _enforce_startup_schema_readiness(app: Flask) -> None:
     app.logger.info('startup_schema_readiness_check_passed')
 
 
+def _configure_auth(settings):
+    from routes import configure_verified_token_cache
+
+    configure_verified_token_cache(settings.auth.token_cache_max_entries)
+
+
 def create_app(test_config=None):
     app = Flask(__name__)
     _configure_app(app, test_config=test_config)
+    settings = reload_settings(app)
+    _configure_auth(settings)
     _register_extensions(app)
     _register_blueprints(app)
     _register_cli(app)
@@ -242,6 +416,8 @@ if __name__ == '__main__':
                 seed_training_modules_fixture(force=False, silent=True)
             if CertificationType.query.count() == 0:
                 seed_certification_types_fixture(force=False, silent=True)
+            if Assessment.query.count() == 0:
+                seed_assessment_questions_fixture(force=False, silent=True)
             if Lesson.query.count() == 0:
                 seed_course_content_fixture(force=False, silent=True)
 
@@ -0,0 +1,96 @@
+from sqlalchemy import func, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from logging_config import get_logger
+from models import AssessmentDomainScore, AssessmentResult, User, db
+from routes.assessment import _result_domain_scores
+
+
+logger = get_logger(__name__)
+
+DEFAULT_BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_domain_scores(batch_size=DEFAULT_BACKFILL_BATCH_SIZE):
+    """Copy per-domain scores of results that have no ``assessment_domain_score`` rows yet.
+
+    Results are read in primary-key order, ``batch_size`` at a time, and each
+    batch is committed on its own, so an interrupted run resumes where it left
+    off. Returns the number of results backfilled.
+    """
+    batch_size = max(1, int(batch_size or DEFAULT_BACKFILL_BATCH_SIZE))
+    has_rows = (
+        db.session.query(AssessmentDomainScore.result_id)
+        .filter(AssessmentDomainScore.result_id == AssessmentResult.id)
+        .exists()
+    )
+    backfilled = 0
+    last_result_id = None
+
+    while True:
+        query = AssessmentResult.query.filter(~has_rows).order_by(AssessmentResult.id)
+        if last_result_id is not None:
+            query = query.filter(AssessmentResult.id > last_result_id)
+        results = query.limit(batch_size).all()
+        if not results:
+            break
+
+        rows = [
+            {
+                'result_id': result.id,
+                'user_id': result.user_id,
+                'domain': domain,
+                'score': entry['score'] or 0,
+                'total': entry['total'] or 0,
+                'completed_at': result.completed_at,
+            }
+            for result in results
+            for domain, entry in _result_domain_scores(result).items()
+        ]
+        try:
+            db.session.execute(insert(AssessmentDomainScore), rows)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            logger.exception('assessment_domain_score_backfill_failed', after_result_id=last_result_id)
+            raise
+
+        backfilled += len(results)
+        last_result_id = results[-1].id
+        logger.info('assessment_domain_score_backfill_batch', results=len(results), total=backfilled)
+
+    return backfilled
+
+
+def domain_score_summary(*, organization=None, domain=None, since=None, until=None):
+    """Average score per domain, computed with one ``GROUP BY`` over ``assessment_domain_score``.
+
+    ``since`` is inclusive and ``until`` exclusive, both compared with the
+    result's ``completed_at``.
+    """
+    query = db.session.query(
+        AssessmentDomainScore.domain,
+        func.count(AssessmentDomainScore.result_id),
+        func.avg(AssessmentDomainScore.score),
+        func.sum(AssessmentDomainScore.score),
+        func.sum(AssessmentDomainScore.total),
+    )
+    if organization is not None:
+        query = query.join(User, User.id == AssessmentDomainScore.user_id).filter(User.organization == organization)
+    if domain is not None:
+        query = query.filter(AssessmentDomainScore.domain == domain)
+    if since is not None:
+        query = query.filter(AssessmentDomainScore.completed_at >= since)
+    if until is not None:
+        query = query.filter(AssessmentDomainScore.completed_at < until)
+
+    summary = {}
+    for domain_name, results, average_score, score_sum, total_sum in (
+        query.group_by(AssessmentDomainScore.domain).order_by(AssessmentDomainScore.domain)
+    ):
+        summary[domain_name] = {
+            'results': results,
+            'average_score': round(float(average_score or 0), 2),
+            'percentage': round(score_sum / total_sum * 100, 1) if total_sum else 0,
+        }
+    return summary
@@ -1,11 +1,17 @@
 import uuid
 
 from models import User, db
+from recommendation_cache import invalidate_recommendations
 
 
 SUPABASE_PROVIDER = 'supabase'
 DEMO_PROVIDER = 'demo'
 SUPABASE_MANAGED_PASSWORD_MARKER = 'supabase_managed'
+IDENTITY_USER_ID_CACHE_LIMIT = 10000
+
+# Per-process (provider, subject) -> user id map so repeat logins resolve by
+# primary key instead of re-running the provider/subject lookup.
+_IDENTITY_USER_IDS = {}
 
 
 class AuthIdentityConflictError(ValueError):
@@ -131,17 +137,24 @@ def _link_user_to_identity(user, identity):
     user.auth_subject = identity['subject']
 
 
+def _profile_changes(user, profile):
+    changes = {}
+    for field in ('email', 'first_name', 'last_name'):
+        value = profile.get(field)
+        if value and getattr(user, field) != value:
+            changes[field] = value
+    for field in ('role', 'organization'):
+        value = profile.get(field)
+        if value is not None and getattr(user, field) != value:
+            changes[field] = value
+    return changes
+
+
 def _update_user_from_profile(user, profile):
-    if profile.get('email') and user.email != profile['email']:
-        user.email = profile['email']
-    if profile.get('first_name'):
-        user.first_name = profile['first_name']
-    if profile.get('last_name'):
-        user.last_name = profile['last_name']
-    if profile.get('role') is not None:
-        user.role = profile.get('role')
-    if profile.get('organization') is not None:
-        user.organization = profile.get('organization')
+    changes = _profile_changes(user, profile)
+    for field, value in changes.items():
+        setattr(user, field, value)
+    return bool(changes)
 
 
 def _user_matches_identity(user, identity):
@@ -160,14 +173,39 @@ def _can_relink_user_to_identity(user, identity):
     return user.auth_provider == DEMO_PROVIDER and identity['provider'] == SUPABASE_PROVIDER
 
 
+def _identity_key(identity):
+    return identity['provider'], identity['subject']
+
+
+def _remember_identity_user(identity, user):
+    if identity is None or user is None or not user.id:
+        return
+    if len(_IDENTITY_USER_IDS) >= IDENTITY_USER_ID_CACHE_LIMIT:
+        _IDENTITY_USER_IDS.clear()
+    _IDENTITY_USER_IDS[_identity_key(identity)] = user.id
+
+
+def clear_identity_user_cache():
+    _IDENTITY_USER_IDS.clear()
+
+
 def _find_user_by_identity(identity):
     if identity is None:
         return None
 
-    return User.query.filter_by(
+    cached_user_id = _IDENTITY_USER_IDS.get(_identity_key(identity))
+    if cached_user_id:
+        user = User.query.get(cached_user_id)
+        if _user_matches_identity(user, identity):
+            return user
+        _IDENTITY_USER_IDS.pop(_identity_key(identity), None)
+
+    user = User.query.filter_by(
         auth_provider=identity['provider'],
         auth_subject=identity['subject'],
     ).first()
+    _remember_identity_user(identity, user)
+    return user
 
 
 def _find_user_by_subject_id(identity):
@@ -192,8 +230,9 @@ def resolve_user_from_claims(claims, create_if_missing=False):
 
     user = _find_user_by_identity(identity)
     if user is not None:
-        _update_user_from_profile(user, profile)
-        db.session.commit()
+        if _update_user_from_profile(user, profile):
+            db.session.commit()
+            invalidate_recommendations(user.id)
         return user
 
     if not create_if_missing:
@@ -213,6 +252,7 @@ def resolve_user_from_claims(claims, create_if_missing=False):
         if not existing_user.password_hash:
             existing_user.password_hash = SUPABASE_MANAGED_PASSWORD_MARKER
         db.session.commit()
+        _remember_identity_user(identity, existing_user)
         return existing_user
 
     new_user_kwargs = {}
@@ -233,6 +273,7 @@ def resolve_user_from_claims(claims, create_if_missing=False):
     )
     db.session.add(user)
     db.session.commit()
+    _remember_identity_user(identity, user)
     return user
 
 
@@ -282,8 +323,11 @@ def sync_managed_user(claims, email, first_name, last_name, role=None, organizat
         db.session.add(user)
 
     _link_user_to_identity(user, identity)
-    _update_user_from_profile(user, profile)
+    profile_changed = _update_user_from_profile(user, profile)
     if not user.password_hash:
         user.password_hash = SUPABASE_MANAGED_PASSWORD_MARKER
     db.session.commit()
+    if profile_changed:
+        invalidate_recommendations(user.id)
+    _remember_identity_user(identity, user)
     return user
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def token_cache_key(token):
+    return hashlib.sha256(str(token).encode('utf-8')).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified bearer tokens.
+
+    Entries are keyed by a SHA-256 digest of the raw token so bearer secrets are
+    never held in memory, and each entry expires at the token's own ``exp``.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.max_entries = max(0, int(max_entries or 0))
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, token):
+        if not self.enabled:
+            return None
+
+        key = token_cache_key(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry['expires_at'] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, token, *, provider, subject, user_id, claims):
+        if not self.enabled or not user_id or not isinstance(claims, dict):
+            return None
+
+        expires_at = claims.get('exp')
+        if not isinstance(expires_at, (int, float)) or expires_at <= self._clock():
+            return None
+
+        entry = {
+            'provider': provider,
+            'subject': subject,
+            'user_id': user_id,
+            'claims': claims,
+            'expires_at': expires_at,
+        }
+        key = token_cache_key(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def resize(self, max_entries):
+        """Change the capacity, evicting the least recently used entries that no longer fit."""
+        with self._lock:
+            self.max_entries = max(0, int(max_entries or 0))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
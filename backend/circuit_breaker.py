@@ -0,0 +1,157 @@
+import threading
+import time
+
+from logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RECOVERY_SECONDS = 30
+DEFAULT_HALF_OPEN_MAX_CALLS = 1
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Classic closed/open/half-open breaker around a flaky upstream.
+
+    ``failure_threshold`` consecutive failures open the circuit. After
+    ``recovery_seconds`` up to ``half_open_max_calls`` probe calls are let
+    through; one success closes the circuit again and a failure re-opens it.
+    Calls that return but overrun their latency budget still hand back their
+    result, but count as failures.
+    """
+
+    def __init__(
+        self,
+        name,
+        *,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        recovery_seconds=DEFAULT_RECOVERY_SECONDS,
+        half_open_max_calls=DEFAULT_HALF_OPEN_MAX_CALLS,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_seconds = max(0.0, float(recovery_seconds))
+        self.half_open_max_calls = max(1, int(half_open_max_calls))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._half_open_in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejections = 0
+        self.latency_budget_exceeded = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _transition(self, new_state, reason):
+        previous_state = self._state
+        if previous_state == new_state:
+            return
+        self._state = new_state
+        logger.warning(
+            'circuit_state_changed',
+            circuit=self.name,
+            from_state=previous_state,
+            to_state=new_state,
+            reason=reason,
+            consecutive_failures=self._consecutive_failures,
+        )
+
+    def _maybe_half_open(self):
+        if self._state == STATE_OPEN and self._clock() - self._opened_at >= self.recovery_seconds:
+            self._half_open_in_flight = 0
+            self._transition(STATE_HALF_OPEN, 'recovery_timeout_elapsed')
+
+    def allow_request(self):
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+            self.rejections += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if self._state == STATE_HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._transition(STATE_CLOSED, 'probe_succeeded')
+
+    def record_failure(self, reason='error'):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            if self._state == STATE_HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._opened_at = self._clock()
+                self._transition(STATE_OPEN, f'probe_failed:{reason}')
+            elif self._state == STATE_CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self._transition(STATE_OPEN, f'failure_threshold_reached:{reason}')
+
+    def call(self, fn, *args, latency_budget_seconds=None, **kwargs):
+        """Run ``fn`` through the breaker, charging slow calls as failures."""
+        if not self.allow_request():
+            raise CircuitOpenError(f'{self.name} circuit is open')
+
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:
+            self.record_failure(type(exc).__name__)
+            raise
+
+        self.record_completion(time.monotonic() - started, latency_budget_seconds)
+        return result
+
+    def record_completion(self, elapsed_seconds, latency_budget_seconds=None):
+        """Record an admitted call that returned, charging it as a failure if it overran its budget."""
+        if latency_budget_seconds is not None and elapsed_seconds > latency_budget_seconds:
+            self.record_latency_budget_exceeded()
+        else:
+            self.record_success()
+
+    def record_latency_budget_exceeded(self):
+        with self._lock:
+            self.latency_budget_exceeded += 1
+        self.record_failure('latency_budget_exceeded')
+
+    def reset(self):
+        with self._lock:
+            self._consecutive_failures = 0
+            self._half_open_in_flight = 0
+            self._transition(STATE_CLOSED, 'reset')
+
+    def stats(self):
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_seconds': self.recovery_seconds,
+                'successes': self.successes,
+                'failures': self.failures,
+                'rejections': self.rejections,
+                'latency_budget_exceeded': self.latency_budget_exceeded,
+            }
@@ -0,0 +1,250 @@
+import hashlib
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from logging_config import get_logger
+from models import GeneratedQuestion, db
+
+
+logger = get_logger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+DEFAULT_REFRESH_SECONDS = 300
+# Other workers' rows can commit after newer ones, so refreshes re-read this far behind the watermark.
+LOAD_OVERLAP_SECONDS = 60
+OPTION_FIELDS = ('option_a', 'option_b', 'option_c', 'option_d')
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'should', 'that', 'the', 'this', 'to', 'what', 'when',
+    'which', 'who', 'why', 'with', 'you', 'your',
+))
+
+
+def _words(value):
+    return _WORD_PATTERN.findall(str(value or '').lower())
+
+
+def question_content_hash(question):
+    """Hash of the question text and its (unordered) options, ignoring case and punctuation."""
+    parts = [' '.join(_words(question.get('question_text')))]
+    parts.extend(sorted(' '.join(_words(question.get(field))) for field in OPTION_FIELDS))
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _similarity_tokens(question):
+    return frozenset(word for word in _words(question.get('question_text')) if word not in _STOPWORDS)
+
+
+def _jaccard(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _question_from_record(record):
+    return {
+        'id': record.id,
+        'domain': record.domain,
+        'question_text': record.question_text,
+        'option_a': record.option_a,
+        'option_b': record.option_b,
+        'option_c': record.option_c,
+        'option_d': record.option_d,
+        'correct_answer': record.correct_answer,
+        'explanation': record.explanation or '',
+    }
+
+
+class GeneratedQuestionBank:
+    """Deduplicated, persisted pool of model-generated questions.
+
+    Questions are keyed by a content hash (exact duplicates) and compared by
+    word-set Jaccard similarity against questions already banked for the same
+    level and domain (near duplicates). The bank is mirrored in memory per
+    (level, domain) so drawing a set never touches the database. The first load
+    reads the whole table; after that, every ``refresh_seconds`` only rows
+    created since the newest one already mirrored are read, to pick up other
+    workers' inserts.
+    """
+
+    def __init__(
+        self,
+        *,
+        domains,
+        similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+        refresh_seconds=DEFAULT_REFRESH_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.domains = tuple(domains)
+        self.similarity_threshold = similarity_threshold
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = defaultdict(list)
+        self._hashes = set()
+        self._loaded_at = None
+        self._loaded_through = None
+        self.inserted = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.draws = 0
+        self.draw_misses = 0
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and self._clock() - self._loaded_at < self.refresh_seconds:
+            return
+
+        query = GeneratedQuestion.query
+        if self._loaded_through is not None:
+            query = query.filter(
+                GeneratedQuestion.created_at >= self._loaded_through - timedelta(seconds=LOAD_OVERLAP_SECONDS)
+            )
+        records = query.all()
+
+        with self._lock:
+            for record in records:
+                if record.created_at is not None and (
+                    self._loaded_through is None or record.created_at > self._loaded_through
+                ):
+                    self._loaded_through = record.created_at
+                if record.content_hash in self._hashes:
+                    continue
+                question = _question_from_record(record)
+                self._entries[(record.assessment_level, record.domain)].append(
+                    (question, _similarity_tokens(question))
+                )
+                self._hashes.add(record.content_hash)
+            self._loaded_at = self._clock()
+
+    def _is_near_duplicate(self, tokens, existing_entries):
+        return any(
+            _jaccard(tokens, existing_tokens) >= self.similarity_threshold
+            for _, existing_tokens in existing_entries
+        )
+
+    def add(self, questions, *, assessment_level, model):
+        """Persist new, non-duplicate questions; returns how many were inserted."""
+        try:
+            self._ensure_loaded()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.warning('generated_question_bank_load_failed', error=str(exc))
+            return 0
+
+        new_entries = []
+        with self._lock:
+            batch_hashes = set()
+            for question in questions:
+                content_hash = question_content_hash(question)
+                if content_hash in self._hashes or content_hash in batch_hashes:
+                    self.exact_duplicates += 1
+                    continue
+
+                key = (assessment_level, question['domain'])
+                tokens = _similarity_tokens(question)
+                pending_for_key = [entry for entry_key, entry, _, _ in new_entries if entry_key == key]
+                if self._is_near_duplicate(tokens, self._entries[key]) or self._is_near_duplicate(
+                    tokens,
+                    pending_for_key,
+                ):
+                    self.near_duplicates += 1
+                    continue
+
+                batch_hashes.add(content_hash)
+                banked = {
+                    'id': str(uuid.uuid4()),
+                    'domain': question['domain'],
+                    'question_text': question['question_text'],
+                    'option_a': question['option_a'],
+                    'option_b': question['option_b'],
+                    'option_c': question['option_c'],
+                    'option_d': question['option_d'],
+                    'correct_answer': str(question['correct_answer']).upper(),
+                    'explanation': question.get('explanation') or '',
+                }
+                new_entries.append((key, (None, tokens), banked, content_hash))
+
+        if not new_entries:
+            return 0
+
+        inserted = []
+        raced_hashes = []
+        try:
+            for key, entry, banked, content_hash in new_entries:
+                record = GeneratedQuestion(
+                    content_hash=content_hash,
+                    assessment_level=assessment_level,
+                    model=model,
+                    **banked,
+                )
+                try:
+                    with db.session.begin_nested():
+                        db.session.add(record)
+                except IntegrityError:
+                    # Another worker banked the same question since our last load.
+                    raced_hashes.append(content_hash)
+                    continue
+                inserted.append((key, entry, banked, content_hash))
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.warning('generated_question_bank_insert_failed', error=str(exc))
+            return 0
+
+        with self._lock:
+            for key, (_, tokens), banked, content_hash in inserted:
+                self._entries[key].append((banked, tokens))
+                self._hashes.add(content_hash)
+            self._hashes.update(raced_hashes)
+            self.exact_duplicates += len(raced_hashes)
+            self.inserted += len(inserted)
+        return len(inserted)
+
+    def available(self, assessment_level):
+        with self._lock:
+            return {domain: len(self._entries.get((assessment_level, domain), ())) for domain in self.domains}
+
+    def draw(self, assessment_level, questions_per_domain, min_per_domain):
+        """Sample ``questions_per_domain`` banked questions for every domain, or ``None``."""
+        try:
+            self._ensure_loaded()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.warning('generated_question_bank_load_failed', error=str(exc))
+            return None
+
+        required = max(questions_per_domain, min_per_domain)
+        with self._lock:
+            pools = [self._entries.get((assessment_level, domain), ()) for domain in self.domains]
+            if any(len(pool) < required for pool in pools):
+                self.draw_misses += 1
+                return None
+
+            self.draws += 1
+            selected = [
+                dict(question)
+                for pool in pools
+                for question, _ in random.sample(pool, questions_per_domain)
+            ]
+
+        random.shuffle(selected)
+        return selected
+
+    def stats(self):
+        with self._lock:
+            return {
+                'questions': sum(len(entries) for entries in self._entries.values()),
+                'inserted': self.inserted,
+                'exact_duplicates': self.exact_duplicates,
+                'near_duplicates': self.near_duplicates,
+                'draws': self.draws,
+                'draw_misses': self.draw_misses,
+            }
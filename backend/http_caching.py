@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import current_app, request
+
+from settings import get_settings
+
+
+RESPONSE_CACHE_EXTENSION_KEY = 'litmusai_response_cache'
+DEFAULT_MAX_ENTRIES = 256
+
+
+def version_tag(*parts):
+    """Stable ETag value for the given version parts."""
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+
+class ResponseBodyCache:
+    """Serialized JSON bodies of anonymous responses, keyed by route variant and version.
+
+    Keys embed the version the body was built from, so a new version simply
+    misses and the old body ages out of the LRU.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = build()
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+def get_response_cache():
+    cache = current_app.extensions.get(RESPONSE_CACHE_EXTENSION_KEY)
+    if cache is None:
+        cache = ResponseBodyCache()
+        current_app.extensions[RESPONSE_CACHE_EXTENSION_KEY] = cache
+    return cache
+
+
+def get_response_cache_stats():
+    cache = current_app.extensions.get(RESPONSE_CACHE_EXTENSION_KEY)
+    return cache.stats() if cache is not None else {'entries': 0, 'hits': 0, 'misses': 0}
+
+
+def _serialize(payload):
+    return f'{current_app.json.dumps(payload)}\n'.encode('utf-8')
+
+
+def _apply_cache_headers(response, *, etag, weak, private, surrogate_keys, vary_authorization):
+    response.set_etag(etag, weak=weak)
+    if private:
+        # Per-user bodies: browsers revalidate with If-None-Match, shared caches never store them.
+        response.headers['Cache-Control'] = 'private, no-cache'
+    else:
+        max_age = get_settings().platform.catalog_cache_max_age_seconds
+        response.headers['Cache-Control'] = f'public, max-age={max_age}'
+        # Fastly-style and Netlify edge tags, so a deploy or catalog change can purge by key.
+        response.headers['Surrogate-Key'] = ' '.join(surrogate_keys)
+        response.headers['Netlify-Cache-Tag'] = ','.join(surrogate_keys)
+    if vary_authorization:
+        response.vary.add('Authorization')
+    return response
+
+
+def conditional_json_response(
+    etag,
+    build_payload,
+    *,
+    surrogate_keys=(),
+    private=False,
+    cache_key=None,
+    vary_authorization=False,
+):
+    """JSON response validated by ``etag``; a matching ``If-None-Match`` gets a bodyless 304.
+
+    ``build_payload`` runs only when a body is needed. Public responses with a
+    ``cache_key`` reuse the serialized bytes from the in-process cache; private
+    (per-user) responses get a weak ETag because they are rebuilt every time.
+    """
+    headers = {
+        'etag': etag,
+        'weak': private,
+        'private': private,
+        'surrogate_keys': surrogate_keys,
+        'vary_authorization': vary_authorization,
+    }
+    if request.if_none_match.contains_weak(etag):
+        return _apply_cache_headers(current_app.response_class(status=304), **headers)
+
+    if cache_key is not None and not private:
+        body = get_response_cache().get_or_build(cache_key, lambda: _serialize(build_payload()))
+    else:
+        body = _serialize(build_payload())
+    response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    return _apply_cache_headers(response, **headers)
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+
+import jwt
+from jwt import PyJWKClientError, PyJWKSet
+
+from logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 600
+DEFAULT_TIMEOUT_SECONDS = 10
+MIN_FORCED_REFRESH_SECONDS = 30
+REFRESH_AHEAD_RATIO = 0.8
+
+
+def default_jwks_cache_path(jwks_url, cache_dir=None):
+    digest = hashlib.sha256(jwks_url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir or tempfile.gettempdir(), f'litmusai-jwks-{digest}.json')
+
+
+class JwksKeyManager:
+    """Serves JWKS signing keys from memory and refreshes them off the request path.
+
+    Keys are prefetched on start, refreshed on a daemon thread before the
+    configured lifespan runs out, and persisted to a JSON file that every worker
+    on the host reads before going to the network. Failed refreshes keep the
+    last-known keys. The only synchronous fetches are the very first one when no
+    key is available at all, and a rate-limited retry when a token names an
+    unknown ``kid`` (key rotation).
+    """
+
+    def __init__(
+        self,
+        jwks_url,
+        *,
+        refresh_seconds=DEFAULT_REFRESH_SECONDS,
+        timeout=DEFAULT_TIMEOUT_SECONDS,
+        cache_path=None,
+        clock=time.time,
+    ):
+        self.jwks_url = jwks_url
+        self.refresh_seconds = max(1, int(refresh_seconds))
+        self.timeout = timeout
+        self.cache_path = cache_path
+        self._clock = clock
+        self._keys = {}
+        self._fetched_at = 0.0
+        self._last_forced_refresh = 0.0
+        self._last_refresh_failed = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.fetch_count = 0
+        self.fetch_failures = 0
+
+    @property
+    def fetched_at(self):
+        return self._fetched_at
+
+    def key_ids(self):
+        with self._lock:
+            return sorted(self._keys)
+
+    def start(self):
+        """Load any on-disk keys and start the refresh thread, which fetches immediately if needed."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return self
+
+        self._pid = os.getpid()
+        self._stop_event = threading.Event()
+        if not self._keys:
+            self._load_from_disk(require_fresh=False)
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name='jwks-refresh',
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def _refresh_delay(self):
+        if not self._fetched_at and not self._last_refresh_failed:
+            return 0
+        if self._last_refresh_failed:
+            return min(self.refresh_seconds, MIN_FORCED_REFRESH_SECONDS)
+        age = self._clock() - self._fetched_at if self._fetched_at else self.refresh_seconds
+        return max(1.0, self.refresh_seconds * REFRESH_AHEAD_RATIO - age)
+
+    def _run(self):
+        while not self._stop_event.wait(self._refresh_delay()):
+            self.refresh()
+
+    def refresh(self, force=False):
+        """Refresh keys, preferring a fresh on-disk copy written by another worker."""
+        with self._refresh_lock:
+            if not force and self._load_from_disk(require_fresh=True):
+                self._last_refresh_failed = False
+                return True
+
+            try:
+                jwks = self._fetch()
+                self._install(jwks, self._clock())
+            except Exception as exc:
+                self.fetch_failures += 1
+                self._last_refresh_failed = True
+                if not self._keys:
+                    self._load_from_disk(require_fresh=False)
+                logger.warning(
+                    'jwks_refresh_failed',
+                    jwks_url=self.jwks_url,
+                    error=str(exc),
+                    serving_stale_keys=bool(self._keys),
+                )
+                return False
+
+            self._last_refresh_failed = False
+            self._write_to_disk(jwks)
+            return True
+
+    def _fetch(self):
+        self.fetch_count += 1
+        http_request = urllib.request.Request(self.jwks_url, headers={'Accept': 'application/json'})
+        with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def _install(self, jwks, fetched_at):
+        key_set = PyJWKSet.from_dict(jwks)
+        keys = {key.key_id: key for key in key_set.keys}
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = fetched_at
+
+    def _load_from_disk(self, require_fresh):
+        if not self.cache_path:
+            return False
+
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as handle:
+                cached = json.load(handle)
+            fetched_at = float(cached['fetched_at'])
+            jwks = cached['jwks']
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if fetched_at <= self._fetched_at:
+            return False
+        if require_fresh and self._clock() - fetched_at >= self.refresh_seconds * REFRESH_AHEAD_RATIO:
+            return False
+
+        try:
+            self._install(jwks, fetched_at)
+        except Exception:
+            return False
+        return True
+
+    def _write_to_disk(self, jwks):
+        if not self.cache_path:
+            return
+
+        directory = os.path.dirname(self.cache_path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix='.jwks-', suffix='.json')
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as handle:
+                json.dump({'fetched_at': self._fetched_at, 'jwks': jwks}, handle)
+            os.replace(temp_path, self.cache_path)
+        except OSError as exc:
+            logger.warning('jwks_cache_write_failed', cache_path=self.cache_path, error=str(exc))
+
+    def _key_for(self, key_id):
+        with self._lock:
+            if key_id is None and len(self._keys) == 1:
+                return next(iter(self._keys.values()))
+            return self._keys.get(key_id)
+
+    def get_signing_key(self, key_id):
+        if self._pid != os.getpid():
+            self.start()
+
+        signing_key = self._key_for(key_id)
+        if signing_key is not None:
+            return signing_key
+
+        now = self._clock()
+        if now - self._last_forced_refresh >= MIN_FORCED_REFRESH_SECONDS:
+            self._last_forced_refresh = now
+            self.refresh(force=True)
+            signing_key = self._key_for(key_id)
+
+        if signing_key is None:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{key_id}"')
+        return signing_key
+
+    def get_signing_key_from_jwt(self, token):
+        header = jwt.get_unverified_header(token)
+        return self.get_signing_key(header.get('kid'))
@@ -0,0 +1,254 @@
+import atexit
+import os
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import bindparam, or_, update
+
+from logging_config import get_logger
+from models import LessonProgress, UserProgress, db
+from settings import get_settings
+
+
+logger = get_logger(__name__)
+
+LESSON_TOUCH_BUFFER_EXTENSION_KEY = 'litmusai_lesson_touch_buffer'
+SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 5
+
+_LESSON_TABLE = LessonProgress.__table__
+_MODULE_TABLE = UserProgress.__table__
+
+# Touches can land out of order across workers, so never move last_accessed backwards.
+_LESSON_TOUCH = (
+    update(_LESSON_TABLE)
+    .where(
+        _LESSON_TABLE.c.user_id == bindparam('touch_user_id'),
+        _LESSON_TABLE.c.lesson_id == bindparam('touch_lesson_id'),
+        or_(_LESSON_TABLE.c.last_accessed.is_(None), _LESSON_TABLE.c.last_accessed < bindparam('touch_at')),
+    )
+    .values(last_accessed=bindparam('touch_at'))
+)
+_MODULE_TOUCH = (
+    update(_MODULE_TABLE)
+    .where(
+        _MODULE_TABLE.c.user_id == bindparam('touch_user_id'),
+        _MODULE_TABLE.c.module_id == bindparam('touch_module_id'),
+        or_(_MODULE_TABLE.c.last_accessed.is_(None), _MODULE_TABLE.c.last_accessed < bindparam('touch_at')),
+    )
+    .values(last_accessed=bindparam('touch_at'), current_lesson_id=bindparam('touch_lesson_id'))
+)
+
+
+class LessonTouchBuffer:
+    """Write-behind buffer for the ``last_accessed`` bumps made by lesson views.
+
+    :meth:`record` keeps only the newest view per ``(user, lesson)``; a daemon
+    thread writes whatever is pending every ``flush_interval_seconds`` with two
+    executemany UPDATEs, and once more when the worker exits. A failed flush
+    merges its batch back (newest view per key wins) for the next attempt.
+    Once ``max_pending`` distinct lessons are waiting, further touches are
+    dropped and counted rather than blocking the request.
+    """
+
+    def __init__(self, *, flush_interval_seconds=5, max_pending=10000):
+        self.flush_interval_seconds = max(0, flush_interval_seconds)
+        self.max_pending = max(1, int(max_pending))
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self._atexit_registered = False
+        self.recorded = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.requeued = 0
+        self.touches_flushed = 0
+        self._flush_seconds_total = 0.0
+        self.last_flush_ms = None
+        self.max_flush_ms = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def start(self, app):
+        if self.flush_interval_seconds <= 0:
+            return self
+        if self.running:
+            return self
+
+        if self._pid is not None and self._pid != os.getpid():
+            # Touches inherited from the parent process are the parent's to flush.
+            with self._lock:
+                self._pending = {}
+        self._app = app
+        self._pid = os.getpid()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='lesson-touch-buffer', daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self._shutdown)
+            self._atexit_registered = True
+        logger.info(
+            'lesson_touch_buffer_started',
+            flush_interval_seconds=self.flush_interval_seconds,
+            max_pending=self.max_pending,
+        )
+        return self
+
+    def stop(self):
+        """Stop the flusher thread; it writes whatever is still pending on its way out."""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+        self._thread = None
+
+    def _shutdown(self):
+        if self._pid == os.getpid():
+            self.stop()
+
+    def record(self, user_id, lesson_id, module_id, accessed_at):
+        """Queue a lesson view; returns False when the buffer is not running and the caller must write it."""
+        if self._app is not None and self._pid != os.getpid():
+            self.start(self._app)
+        if not self.running:
+            return False
+
+        key = (user_id, lesson_id)
+        with self._lock:
+            self.recorded += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.coalesced += 1
+                if accessed_at > pending[1]:
+                    self._pending[key] = (module_id, accessed_at)
+            elif len(self._pending) >= self.max_pending:
+                self.dropped += 1
+            else:
+                self._pending[key] = (module_id, accessed_at)
+        return True
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write every pending touch in one transaction; returns the number of touches written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            lesson_rows = []
+            latest_by_module = {}
+            for (user_id, lesson_id), (module_id, accessed_at) in pending.items():
+                lesson_rows.append({'touch_user_id': user_id, 'touch_lesson_id': lesson_id, 'touch_at': accessed_at})
+                latest = latest_by_module.get((user_id, module_id))
+                if latest is None or accessed_at > latest[1]:
+                    latest_by_module[(user_id, module_id)] = (lesson_id, accessed_at)
+            module_rows = [
+                {
+                    'touch_user_id': user_id,
+                    'touch_module_id': module_id,
+                    'touch_lesson_id': lesson_id,
+                    'touch_at': accessed_at,
+                }
+                for (user_id, module_id), (lesson_id, accessed_at) in latest_by_module.items()
+            ]
+
+            started = time.perf_counter()
+            try:
+                db.session.execute(_LESSON_TOUCH, lesson_rows)
+                db.session.execute(_MODULE_TOUCH, module_rows)
+                db.session.commit()
+            except Exception as exc:
+                db.session.rollback()
+                self._requeue(pending)
+                with self._lock:
+                    self.flush_failures += 1
+                    self.requeued += len(pending)
+                logger.warning('lesson_touch_flush_failed', touches=len(pending), error=str(exc))
+                return 0
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self.flushes += 1
+                self.touches_flushed += len(pending)
+                self._flush_seconds_total += elapsed
+                self.last_flush_ms = round(elapsed * 1000, 2)
+                self.max_flush_ms = max(self.max_flush_ms or 0.0, self.last_flush_ms)
+            return len(pending)
+
+    def _requeue(self, batch):
+        # Merged back even past max_pending: these touches were already accepted.
+        with self._lock:
+            for key, (module_id, accessed_at) in batch.items():
+                pending = self._pending.get(key)
+                if pending is None or accessed_at > pending[1]:
+                    self._pending[key] = (module_id, accessed_at)
+
+    def _flush_in_app(self):
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception as exc:
+            logger.warning('lesson_touch_flush_error', error=str(exc))
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval_seconds):
+            self._flush_in_app()
+        self._flush_in_app()
+        with self._lock:
+            lost, self._pending = len(self._pending), {}
+            self.dropped += lost
+        if lost:
+            logger.warning('lesson_touch_shutdown_flush_incomplete', dropped=lost)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'running': self.running,
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'flush_interval_seconds': self.flush_interval_seconds,
+                'recorded': self.recorded,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped,
+                'flushes': self.flushes,
+                'flush_failures': self.flush_failures,
+                'requeued': self.requeued,
+                'touches_flushed': self.touches_flushed,
+                'last_flush_ms': self.last_flush_ms,
+                'max_flush_ms': self.max_flush_ms,
+                'avg_flush_ms': (
+                    round(self._flush_seconds_total / self.flushes * 1000, 2) if self.flushes else None
+                ),
+            }
+
+
+def get_lesson_touch_buffer():
+    buffer = current_app.extensions.get(LESSON_TOUCH_BUFFER_EXTENSION_KEY)
+    if buffer is None:
+        settings = get_settings().training
+        buffer = LessonTouchBuffer(
+            flush_interval_seconds=settings.lesson_touch_flush_seconds,
+            max_pending=settings.lesson_touch_max_pending,
+        )
+        current_app.extensions[LESSON_TOUCH_BUFFER_EXTENSION_KEY] = buffer
+    return buffer
+
+
+def start_lesson_touch_buffer():
+    return get_lesson_touch_buffer().start(current_app._get_current_object())
+
+
+def get_lesson_touch_buffer_stats():
+    return get_lesson_touch_buffer().stats()
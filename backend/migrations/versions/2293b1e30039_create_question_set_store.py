@@ -0,0 +1,47 @@
+"""Create server-side store for generated assessment question sets."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30039'
+down_revision = '2293b1e30038'
+branch_labels = None
+depends_on = None
+
+
+QUESTION_SET_TABLE = 'question_set'
+EXPIRES_AT_INDEX = 'ix_question_set_expires_at'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table(QUESTION_SET_TABLE):
+        op.create_table(
+            QUESTION_SET_TABLE,
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('assessment_level', sa.String(length=20), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        inspector = inspect(bind)
+
+    existing_indexes = {index['name'] for index in inspector.get_indexes(QUESTION_SET_TABLE)}
+    if EXPIRES_AT_INDEX not in existing_indexes:
+        op.create_index(EXPIRES_AT_INDEX, QUESTION_SET_TABLE, ['expires_at'])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if inspector.has_table(QUESTION_SET_TABLE):
+        existing_indexes = {index['name'] for index in inspector.get_indexes(QUESTION_SET_TABLE)}
+        if EXPIRES_AT_INDEX in existing_indexes:
+            op.drop_index(EXPIRES_AT_INDEX, table_name=QUESTION_SET_TABLE)
+        op.drop_table(QUESTION_SET_TABLE)
@@ -0,0 +1,56 @@
+"""Create deduplicated bank of OpenRouter-generated assessment questions."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30040'
+down_revision = '2293b1e30039'
+branch_labels = None
+depends_on = None
+
+
+GENERATED_QUESTION_TABLE = 'generated_question'
+LEVEL_DOMAIN_INDEX = 'ix_generated_question_level_domain'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table(GENERATED_QUESTION_TABLE):
+        op.create_table(
+            GENERATED_QUESTION_TABLE,
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.Column('assessment_level', sa.String(length=20), nullable=False),
+            sa.Column('domain', sa.String(length=50), nullable=False),
+            sa.Column('model', sa.String(length=120), nullable=True),
+            sa.Column('question_text', sa.Text(), nullable=False),
+            sa.Column('option_a', sa.String(length=500), nullable=False),
+            sa.Column('option_b', sa.String(length=500), nullable=False),
+            sa.Column('option_c', sa.String(length=500), nullable=False),
+            sa.Column('option_d', sa.String(length=500), nullable=False),
+            sa.Column('correct_answer', sa.String(length=1), nullable=False),
+            sa.Column('explanation', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('content_hash'),
+        )
+        inspector = inspect(bind)
+
+    existing_indexes = {index['name'] for index in inspector.get_indexes(GENERATED_QUESTION_TABLE)}
+    if LEVEL_DOMAIN_INDEX not in existing_indexes:
+        op.create_index(LEVEL_DOMAIN_INDEX, GENERATED_QUESTION_TABLE, ['assessment_level', 'domain'])
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if inspector.has_table(GENERATED_QUESTION_TABLE):
+        existing_indexes = {index['name'] for index in inspector.get_indexes(GENERATED_QUESTION_TABLE)}
+        if LEVEL_DOMAIN_INDEX in existing_indexes:
+            op.drop_index(LEVEL_DOMAIN_INDEX, table_name=GENERATED_QUESTION_TABLE)
+        op.drop_table(GENERATED_QUESTION_TABLE)
@@ -0,0 +1,105 @@
+"""Add per-user lookup indexes and the latest assessment pointer on user."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30041'
+down_revision = '2293b1e30040'
+branch_labels = None
+depends_on = None
+
+
+ASSESSMENT_RESULT_INDEX = ('ix_assessment_result_user_completed', 'assessment_result', ['user_id', 'completed_at'])
+USER_PROGRESS_STATUS_INDEX = ('ix_user_progress_user_status', 'user_progress', ['user_id', 'status'])
+USER_PROGRESS_UNIQUE_INDEX = 'uq_user_progress_user_module'
+LATEST_ASSESSMENT_COLUMN = 'latest_assessment_result_id'
+
+
+def _index_names(inspector, table_name):
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def _delete_duplicate_user_progress(bind):
+    """Keep the most advanced row for each (user_id, module_id) before enforcing uniqueness."""
+    progress = sa.table(
+        'user_progress',
+        sa.column('id', sa.String),
+        sa.column('user_id', sa.String),
+        sa.column('module_id', sa.String),
+        sa.column('status', sa.String),
+        sa.column('progress_percentage', sa.Integer),
+        sa.column('last_accessed', sa.DateTime),
+    )
+    duplicate_keys = bind.execute(
+        sa.select(progress.c.user_id, progress.c.module_id)
+        .group_by(progress.c.user_id, progress.c.module_id)
+        .having(sa.func.count() > 1)
+    ).all()
+
+    for user_id, module_id in duplicate_keys:
+        rows = bind.execute(
+            sa.select(progress).where(progress.c.user_id == user_id, progress.c.module_id == module_id)
+        ).all()
+        rows.sort(
+            key=lambda row: (
+                row.status == 'completed',
+                row.progress_percentage or 0,
+                str(row.last_accessed or ''),
+            ),
+            reverse=True,
+        )
+        stale_ids = [row.id for row in rows[1:]]
+        bind.execute(sa.delete(progress).where(progress.c.id.in_(stale_ids)))
+
+
+def _backfill_latest_assessment(bind):
+    user = sa.table('user', sa.column('id', sa.String), sa.column(LATEST_ASSESSMENT_COLUMN, sa.String))
+    result = sa.table(
+        'assessment_result',
+        sa.column('id', sa.String),
+        sa.column('user_id', sa.String),
+        sa.column('completed_at', sa.DateTime),
+    )
+    latest_result_id = (
+        sa.select(result.c.id)
+        .where(result.c.user_id == user.c.id)
+        .order_by(result.c.completed_at.desc(), result.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    bind.execute(sa.update(user).values({LATEST_ASSESSMENT_COLUMN: latest_result_id}))
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    for name, table_name, columns in (ASSESSMENT_RESULT_INDEX, USER_PROGRESS_STATUS_INDEX):
+        if name not in _index_names(inspector, table_name):
+            op.create_index(name, table_name, columns)
+
+    if USER_PROGRESS_UNIQUE_INDEX not in _index_names(inspector, 'user_progress'):
+        _delete_duplicate_user_progress(bind)
+        op.create_index(USER_PROGRESS_UNIQUE_INDEX, 'user_progress', ['user_id', 'module_id'], unique=True)
+
+    user_columns = {column['name'] for column in inspector.get_columns('user')}
+    if LATEST_ASSESSMENT_COLUMN not in user_columns:
+        op.add_column('user', sa.Column(LATEST_ASSESSMENT_COLUMN, sa.String(length=36), nullable=True))
+    _backfill_latest_assessment(bind)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    user_columns = {column['name'] for column in inspector.get_columns('user')}
+    if LATEST_ASSESSMENT_COLUMN in user_columns:
+        op.drop_column('user', LATEST_ASSESSMENT_COLUMN)
+
+    if USER_PROGRESS_UNIQUE_INDEX in _index_names(inspector, 'user_progress'):
+        op.drop_index(USER_PROGRESS_UNIQUE_INDEX, table_name='user_progress')
+    for name, table_name, _ in (USER_PROGRESS_STATUS_INDEX, ASSESSMENT_RESULT_INDEX):
+        if name in _index_names(inspector, table_name):
+            op.drop_index(name, table_name=table_name)
@@ -0,0 +1,36 @@
+"""Create catalog version counters used to invalidate in-memory catalog snapshots."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30042'
+down_revision = '2293b1e30041'
+branch_labels = None
+depends_on = None
+
+
+CATALOG_VERSION_TABLE = 'catalog_version'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table(CATALOG_VERSION_TABLE):
+        op.create_table(
+            CATALOG_VERSION_TABLE,
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+            sa.PrimaryKeyConstraint('name'),
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if inspector.has_table(CATALOG_VERSION_TABLE):
+        op.drop_table(CATALOG_VERSION_TABLE)
@@ -0,0 +1,55 @@
+"""Create the normalized per-domain assessment score table.
+
+Existing results are copied in by ``flask backfill-domain-scores``, which runs
+in batches and skips results that already have rows.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30043'
+down_revision = '2293b1e30042'
+branch_labels = None
+depends_on = None
+
+
+DOMAIN_SCORE_TABLE = 'assessment_domain_score'
+DOMAIN_SCORE_INDEXES = (
+    ('ix_assessment_domain_score_domain_completed', ['domain', 'completed_at']),
+    ('ix_assessment_domain_score_user_completed', ['user_id', 'completed_at']),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table(DOMAIN_SCORE_TABLE):
+        op.create_table(
+            DOMAIN_SCORE_TABLE,
+            sa.Column('result_id', sa.String(length=36), nullable=False),
+            sa.Column('domain', sa.String(length=100), nullable=False),
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('score', sa.Integer(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('completed_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['result_id'], ['assessment_result.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('result_id', 'domain'),
+        )
+        inspector = inspect(bind)
+
+    existing_indexes = {index['name'] for index in inspector.get_indexes(DOMAIN_SCORE_TABLE)}
+    for name, columns in DOMAIN_SCORE_INDEXES:
+        if name not in existing_indexes:
+            op.create_index(name, DOMAIN_SCORE_TABLE, columns)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if inspector.has_table(DOMAIN_SCORE_TABLE):
+        op.drop_table(DOMAIN_SCORE_TABLE)
@@ -0,0 +1,53 @@
+"""Create platform counters behind /api/stats, seeded from the current row counts."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30044'
+down_revision = '2293b1e30043'
+branch_labels = None
+depends_on = None
+
+
+PLATFORM_COUNTER_TABLE = 'platform_counter'
+COUNTED_TABLES = (
+    ('total_users', 'user'),
+    ('total_assessments', 'assessment_result'),
+    ('total_certifications', 'certification'),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if not inspector.has_table(PLATFORM_COUNTER_TABLE):
+        op.create_table(
+            PLATFORM_COUNTER_TABLE,
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('value', sa.BigInteger(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+            sa.PrimaryKeyConstraint('name'),
+        )
+
+    counters = sa.table(
+        PLATFORM_COUNTER_TABLE,
+        sa.column('name', sa.String),
+        sa.column('value', sa.BigInteger),
+    )
+    existing = {row.name for row in bind.execute(sa.select(counters.c.name))}
+    for name, table_name in COUNTED_TABLES:
+        if name in existing or not inspector.has_table(table_name):
+            continue
+        count = bind.execute(sa.select(sa.func.count()).select_from(sa.table(table_name))).scalar()
+        bind.execute(sa.insert(counters).values(name=name, value=count or 0))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    if inspector.has_table(PLATFORM_COUNTER_TABLE):
+        op.drop_table(PLATFORM_COUNTER_TABLE)
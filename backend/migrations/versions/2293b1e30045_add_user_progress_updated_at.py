@@ -0,0 +1,45 @@
+"""Track when each user_progress row last changed, for per-user progress versions."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30045'
+down_revision = '2293b1e30044'
+branch_labels = None
+depends_on = None
+
+
+UPDATED_AT_COLUMN = 'updated_at'
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    progress_columns = {column['name'] for column in inspector.get_columns('user_progress')}
+    if UPDATED_AT_COLUMN not in progress_columns:
+        op.add_column('user_progress', sa.Column(UPDATED_AT_COLUMN, sa.DateTime(), nullable=True))
+        user_progress = sa.table(
+            'user_progress',
+            sa.column('updated_at', sa.DateTime),
+            sa.column('last_accessed', sa.DateTime),
+            sa.column('started_at', sa.DateTime),
+        )
+        bind.execute(sa.update(user_progress).values(
+            updated_at=sa.func.coalesce(
+                user_progress.c.last_accessed,
+                user_progress.c.started_at,
+                sa.func.current_timestamp(),
+            ),
+        ))
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    progress_columns = {column['name'] for column in inspector.get_columns('user_progress')}
+    if UPDATED_AT_COLUMN in progress_columns:
+        op.drop_column('user_progress', UPDATED_AT_COLUMN)
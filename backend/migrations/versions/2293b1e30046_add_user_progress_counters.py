@@ -0,0 +1,73 @@
+"""Add incremental lesson counters to user_progress, backfilled from lesson_progress."""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+revision = '2293b1e30046'
+down_revision = '2293b1e30045'
+branch_labels = None
+depends_on = None
+
+
+COUNTER_COLUMNS = ('completed_required_lessons', 'lesson_time_spent_minutes')
+
+
+def _backfill_counters(bind):
+    user_progress = sa.table(
+        'user_progress',
+        sa.column('user_id', sa.String),
+        sa.column('module_id', sa.String),
+        sa.column('completed_required_lessons', sa.Integer),
+        sa.column('lesson_time_spent_minutes', sa.Integer),
+    )
+    lesson_progress = sa.table(
+        'lesson_progress',
+        sa.column('user_id', sa.String),
+        sa.column('module_id', sa.String),
+        sa.column('lesson_id', sa.String),
+        sa.column('status', sa.String),
+        sa.column('time_spent_minutes', sa.Integer),
+    )
+    lesson = sa.table('lesson', sa.column('id', sa.String), sa.column('is_required', sa.Boolean))
+    same_module = sa.and_(
+        lesson_progress.c.user_id == user_progress.c.user_id,
+        lesson_progress.c.module_id == user_progress.c.module_id,
+    )
+    completed_required = (
+        sa.select(sa.func.count())
+        .select_from(lesson_progress.join(lesson, lesson.c.id == lesson_progress.c.lesson_id))
+        .where(same_module, lesson_progress.c.status == 'completed', lesson.c.is_required.isnot(False))
+        .scalar_subquery()
+    )
+    time_spent = (
+        sa.select(sa.func.coalesce(sa.func.sum(lesson_progress.c.time_spent_minutes), 0))
+        .where(same_module)
+        .scalar_subquery()
+    )
+    bind.execute(sa.update(user_progress).values(
+        completed_required_lessons=completed_required,
+        lesson_time_spent_minutes=time_spent,
+    ))
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    progress_columns = {column['name'] for column in inspector.get_columns('user_progress')}
+    for name in COUNTER_COLUMNS:
+        if name not in progress_columns:
+            op.add_column('user_progress', sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+    _backfill_counters(bind)
+
+
+def downgrade():
+    bind = op.get_bind()
+    inspector = inspect(bind)
+
+    progress_columns = {column['name'] for column in inspector.get_columns('user_progress')}
+    for name in reversed(COUNTER_COLUMNS):
+        if name in progress_columns:
+            op.drop_column('user_progress', name)
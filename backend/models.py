@@ -23,6 +23,9 @@ class User(db.Model):
     stripe_subscription_id = db.Column(db.String(100), nullable=True)
     subscription_status = db.Column(db.String(20), nullable=True)  # active, canceled, past_due, etc.
 
+    # Denormalized pointer to the newest AssessmentResult, kept current by the submit paths.
+    latest_assessment_result_id = db.Column(db.String(36), nullable=True)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -67,6 +70,62 @@ class AssessmentResult(db.Model):
     recommendations = db.Column(db.Text, nullable=True)
     completed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_assessment_result_user_completed', 'user_id', 'completed_at'),
+    )
+
+class AssessmentDomainScore(db.Model):
+    """One row per domain of an AssessmentResult, for SQL-side aggregation."""
+    result_id = db.Column(db.String(36), db.ForeignKey('assessment_result.id'), primary_key=True)
+    domain = db.Column(db.String(100), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_assessment_domain_score_domain_completed', 'domain', 'completed_at'),
+        db.Index('ix_assessment_domain_score_user_completed', 'user_id', 'completed_at'),
+    )
+
+class QuestionSet(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    assessment_level = db.Column(db.String(20), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class GeneratedQuestion(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)
+    assessment_level = db.Column(db.String(20), nullable=False)
+    domain = db.Column(db.String(50), nullable=False)
+    model = db.Column(db.String(120), nullable=True)
+    question_text = db.Column(db.Text, nullable=False)
+    option_a = db.Column(db.String(500), nullable=False)
+    option_b = db.Column(db.String(500), nullable=False)
+    option_c = db.Column(db.String(500), nullable=False)
+    option_d = db.Column(db.String(500), nullable=False)
+    correct_answer = db.Column(db.String(1), nullable=False)
+    explanation = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_generated_question_level_domain', 'assessment_level', 'domain'),
+    )
+
+class CatalogVersion(db.Model):
+    """Monotonic version counters that tell every worker when a cached catalog is stale."""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PlatformCounter(db.Model):
+    """Running row counts behind the public platform stats."""
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class TrainingModule(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
@@ -131,6 +190,18 @@ class UserProgress(db.Model):
     started_at = db.Column(db.DateTime, nullable=True)
     completed_at = db.Column(db.DateTime, nullable=True)
     last_accessed = db.Column(db.DateTime, default=datetime.utcnow)
+    # Advanced by every write; read_progress_version derives per-user ETags from it.
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Running totals over the module's LessonProgress rows, moved by atomic deltas
+    # on every lesson change; `flask rebuild-progress-counters` recomputes them.
+    completed_required_lessons = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    lesson_time_spent_minutes = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        db.Index('uq_user_progress_user_module', 'user_id', 'module_id', unique=True),
+        db.Index('ix_user_progress_user_status', 'user_id', 'status'),
+    )
 
 class Certification(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -0,0 +1,285 @@
+import dataclasses
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from flask import current_app
+from sqlalchemy import case, event, func, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from logging_config import get_logger
+from models import CatalogVersion, Lesson, TrainingModule, db
+from settings import get_settings
+from training_metadata import build_module_metadata, parse_json_array
+
+
+logger = get_logger(__name__)
+
+MODULE_CATALOG_EXTENSION_KEY = 'litmusai_module_catalog'
+MODULE_CATALOG_VERSION_NAME = 'training_modules'
+
+_CATALOG_GENERATION = 0
+_GENERATION_LOCK = threading.Lock()
+
+
+def bump_module_catalog_generation():
+    """Force every in-process module catalog to reload on its next lookup."""
+    global _CATALOG_GENERATION
+    with _GENERATION_LOCK:
+        _CATALOG_GENERATION += 1
+        return _CATALOG_GENERATION
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_catalog_changes(session, flush_context):
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, (TrainingModule, Lesson)) for instance in changed):
+        session.info['module_catalog_dirty'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_generation_on_commit(session):
+    if session.info.pop('module_catalog_dirty', False):
+        bump_module_catalog_generation()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_changes(session):
+    session.info.pop('module_catalog_dirty', None)
+
+
+def read_module_catalog_version():
+    version = db.session.query(CatalogVersion.version).filter_by(name=MODULE_CATALOG_VERSION_NAME).scalar()
+    return version or 0
+
+
+def bump_module_catalog_version():
+    """Advance the shared catalog version so every worker rebuilds its snapshot.
+
+    Seeders call this after writing modules or lessons; bulk ``Query.delete``
+    and other writes that bypass the ORM unit of work are covered too.
+    """
+    bump_module_catalog_generation()
+    try:
+        bumped = db.session.execute(
+            update(CatalogVersion)
+            .where(CatalogVersion.name == MODULE_CATALOG_VERSION_NAME)
+            .values(version=CatalogVersion.version + 1, updated_at=datetime.utcnow())
+        ).rowcount
+        if not bumped:
+            db.session.add(CatalogVersion(name=MODULE_CATALOG_VERSION_NAME, version=1))
+        db.session.commit()
+    except SQLAlchemyError as exc:
+        db.session.rollback()
+        logger.warning('module_catalog_version_bump_failed', error=str(exc))
+        return None
+    return read_module_catalog_version()
+
+
+@dataclasses.dataclass(frozen=True)
+class CatalogModule:
+    """Detached, read-only copy of a ``TrainingModule`` with its JSON fields parsed once."""
+
+    id: str
+    title: str
+    description: Optional[str]
+    role_specific: Optional[str]
+    difficulty_level: Optional[int]
+    estimated_duration_minutes: int
+    content_type: str
+    content_url: Optional[str]
+    prerequisites: Optional[str]
+    learning_objectives: Optional[str]
+    is_premium: bool
+    is_active: bool
+    created_at: Optional[datetime]
+    target_domains: Optional[str]
+    lesson_count: int
+    required_lesson_count: int = 0
+    prerequisite_payload: Any = None
+    learning_objective_list: tuple = ()
+    target_domain_list: tuple = ()
+    module_metadata: Optional[dict] = None
+
+
+_MODULE_COLUMNS = (
+    'id',
+    'title',
+    'description',
+    'role_specific',
+    'difficulty_level',
+    'estimated_duration_minutes',
+    'content_type',
+    'content_url',
+    'prerequisites',
+    'learning_objectives',
+    'is_premium',
+    'is_active',
+    'created_at',
+    'target_domains',
+)
+
+
+def _parse_prerequisite_payload(value):
+    if value is None:
+        return {}
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return {}
+
+
+def catalog_module_from_record(record, lesson_count, required_lesson_count=None):
+    module = CatalogModule(
+        **{column: getattr(record, column) for column in _MODULE_COLUMNS},
+        lesson_count=lesson_count,
+        required_lesson_count=lesson_count if required_lesson_count is None else required_lesson_count,
+    )
+    module = dataclasses.replace(
+        module,
+        prerequisite_payload=_parse_prerequisite_payload(module.prerequisites),
+        learning_objective_list=tuple(parse_json_array(module.learning_objectives)),
+        target_domain_list=tuple(parse_json_array(module.target_domains)),
+    )
+    # Built from the parsed fields above, so each JSON column is decoded once per snapshot.
+    return dataclasses.replace(module, module_metadata=build_module_metadata(module))
+
+
+def _catalog_fingerprint(modules):
+    digest = hashlib.sha256()
+    for module in sorted(modules, key=lambda module: module.id):
+        values = [getattr(module, column) for column in _MODULE_COLUMNS]
+        values.append(module.lesson_count)
+        digest.update(json.dumps(values, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ModuleCatalogSnapshot:
+    """Immutable view of the module catalog at one version, ordered by title.
+
+    ``fingerprint`` hashes the content of the active modules, so caches derived
+    from the catalog can tell when it has really changed.
+    """
+
+    def __init__(self, modules, version):
+        self.version = version
+        self.modules = tuple(sorted(modules, key=lambda module: module.title or ''))
+        self.active_modules = tuple(module for module in self.modules if module.is_active)
+        self.by_id = {module.id: module for module in self.modules}
+        self.fingerprint = _catalog_fingerprint(self.active_modules)
+
+    def __len__(self):
+        return len(self.modules)
+
+    def get(self, module_id):
+        return self.by_id.get(module_id)
+
+
+class ModuleCatalog:
+    """Holds the current catalog snapshot for one app.
+
+    In-process commits that touch ``TrainingModule`` or ``Lesson`` rows force a
+    rebuild on the next lookup. Other workers' changes are seen through the
+    ``catalog_version`` row, read at most every ``refresh_seconds``; between
+    checks a lookup runs no queries at all.
+    """
+
+    def __init__(self, *, refresh_seconds=30, clock=time.monotonic):
+        self.refresh_seconds = max(0, int(refresh_seconds))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._generation = None
+        self._next_check_at = 0.0
+        self.reload_count = 0
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and self._generation == _CATALOG_GENERATION
+            and self._clock() < self._next_check_at
+        ):
+            return snapshot
+
+        with self._lock:
+            now = self._clock()
+            if self._snapshot is None or self._generation != _CATALOG_GENERATION:
+                return self._reload(now)
+            if now < self._next_check_at:
+                return self._snapshot
+
+            try:
+                version = read_module_catalog_version()
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                logger.warning('module_catalog_version_check_failed', error=str(exc))
+                self._next_check_at = now + self.refresh_seconds
+                return self._snapshot
+
+            if version != self._snapshot.version:
+                return self._reload(now)
+            self._next_check_at = now + self.refresh_seconds
+            return self._snapshot
+
+    def reload(self):
+        with self._lock:
+            return self._reload(self._clock())
+
+    def _reload(self, now):
+        started = time.perf_counter()
+        generation = _CATALOG_GENERATION
+        try:
+            version = read_module_catalog_version()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.warning('module_catalog_version_check_failed', error=str(exc))
+            version = None
+        lesson_counts = (
+            db.session.query(
+                Lesson.module_id,
+                func.count(Lesson.id).label('lesson_count'),
+                func.sum(case((Lesson.is_required.is_(False), 0), else_=1)).label('required_lesson_count'),
+            )
+            .group_by(Lesson.module_id)
+            .subquery()
+        )
+        rows = (
+            db.session.query(
+                TrainingModule,
+                func.coalesce(lesson_counts.c.lesson_count, 0),
+                func.coalesce(lesson_counts.c.required_lesson_count, 0),
+            )
+            .outerjoin(lesson_counts, lesson_counts.c.module_id == TrainingModule.id)
+            .all()
+        )
+        modules = [
+            catalog_module_from_record(record, lesson_count, required_lesson_count)
+            for record, lesson_count, required_lesson_count in rows
+        ]
+        snapshot = ModuleCatalogSnapshot(modules, version)
+
+        self._snapshot = snapshot
+        self._generation = generation
+        self._next_check_at = now + self.refresh_seconds
+        self.reload_count += 1
+        logger.info(
+            'module_catalog_loaded',
+            version=version,
+            module_count=len(snapshot),
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        return snapshot
+
+
+def get_module_catalog():
+    """Return the current module catalog snapshot for this app."""
+    catalog = current_app.extensions.get(MODULE_CATALOG_EXTENSION_KEY)
+    if catalog is None:
+        catalog = ModuleCatalog(refresh_seconds=get_settings().training.module_catalog_refresh_seconds)
+        current_app.extensions[MODULE_CATALOG_EXTENSION_KEY] = catalog
+    return catalog.snapshot()
@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+MAX_PAGE_LIMIT = 200
+
+
+class InvalidPageRequest(ValueError):
+    """Raised for a malformed ``limit`` or ``cursor`` query parameter."""
+
+
+def encode_cursor(sort_value, row_id):
+    raw = json.dumps([sort_value.isoformat() if sort_value else None, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(row_id, str):
+            raise TypeError('cursor id must be a string')
+        return (datetime.fromisoformat(sort_value) if sort_value else None), row_id
+    except (TypeError, ValueError) as exc:
+        raise InvalidPageRequest('Invalid cursor') from exc
+
+
+def parse_page_args(args, max_limit=MAX_PAGE_LIMIT):
+    """Read ``limit``, ``cursor`` and ``summary`` from request args.
+
+    ``limit`` is ``None`` when the client did not ask for paging, so existing
+    callers keep receiving the full list.
+    """
+    raw_limit = args.get('limit')
+    if raw_limit in (None, ''):
+        limit = None
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError as exc:
+            raise InvalidPageRequest('limit must be an integer') from exc
+        if limit < 1:
+            raise InvalidPageRequest('limit must be positive')
+        limit = min(limit, max_limit)
+
+    raw_cursor = args.get('cursor')
+    cursor = decode_cursor(raw_cursor) if raw_cursor else None
+    summary = str(args.get('summary', '')).strip().lower() in ('1', 'true', 'yes')
+    return limit, cursor, summary
+
+
+def keyset_page(query, sort_column, id_column, limit, cursor, row_key):
+    """Return up to ``limit`` rows newest-first and the cursor for the next page.
+
+    Rows are ordered by ``sort_column`` descending (NULLs last) with
+    ``id_column`` as the tiebreaker, so every page is one range scan no matter
+    how deep the client has paged. ``row_key(row)`` returns the
+    ``(sort_value, id)`` pair of a result row. A ``limit`` of ``None`` returns
+    every remaining row and no cursor.
+    """
+    if cursor is not None:
+        sort_value, row_id = cursor
+        if sort_value is None:
+            query = query.filter(sort_column.is_(None), id_column < row_id)
+        else:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+                sort_column.is_(None),
+            ))
+
+    query = query.order_by(sort_column.desc().nulls_last(), id_column.desc())
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(*row_key(rows[-1]))
@@ -0,0 +1,296 @@
+import atexit
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from logging_config import get_logger
+from models import AssessmentResult, Certification, PlatformCounter, User, db
+from settings import get_settings
+
+
+logger = get_logger(__name__)
+
+PLATFORM_STATS_EXTENSION_KEY = 'litmusai_platform_stats'
+PLATFORM_COUNTER_BUFFER_EXTENSION_KEY = 'litmusai_platform_counter_buffer'
+COUNTED_MODELS = (
+    ('total_users', User),
+    ('total_assessments', AssessmentResult),
+    ('total_certifications', Certification),
+)
+STATIC_PLATFORM_STATS = {
+    'completion_rate': 85,
+    'average_transformation_weeks': 3,
+    'satisfaction_rating': 4.8,
+}
+SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 5
+
+_COUNTER_TABLE = PlatformCounter.__table__
+
+
+def _counter_increment(name, delta):
+    return (
+        update(_COUNTER_TABLE)
+        .where(_COUNTER_TABLE.c.name == name)
+        .values(value=_COUNTER_TABLE.c.value + delta, updated_at=datetime.utcnow())
+    )
+
+
+class PlatformCounterBuffer:
+    """Collects committed row-count deltas in memory and folds them into ``platform_counter`` in batches.
+
+    In serving workers, write paths never lock the shared counter rows:
+    committed deltas are added here and a daemon thread applies them every
+    ``flush_interval_seconds``, once more at worker exit, and before this
+    worker reads the counters. Processes without a running flusher (CLI
+    commands, scripts, tests) write each commit's deltas straight through.
+    Anything lost to a crash is corrected by ``reconcile_platform_counters``.
+    """
+
+    def __init__(self, *, flush_interval_seconds=10):
+        self.flush_interval_seconds = max(0, flush_interval_seconds)
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self._atexit_registered = False
+        self.flushes = 0
+        self.flush_failures = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def start(self, app):
+        if self.flush_interval_seconds <= 0 or self.running:
+            return self
+
+        if self._pid is not None and self._pid != os.getpid():
+            # Deltas inherited from the parent process are the parent's to flush.
+            with self._lock:
+                self._pending.clear()
+        self._app = app
+        self._pid = os.getpid()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='platform-counter-buffer', daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self._shutdown)
+            self._atexit_registered = True
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+        self._thread = None
+
+    def _shutdown(self):
+        if self._pid == os.getpid():
+            self.stop()
+
+    def add(self, deltas):
+        with self._lock:
+            self._pending.update(deltas)
+
+    def write_through(self, deltas):
+        """Apply ``deltas`` now on a separate connection, for processes with no flusher (CLI, scripts)."""
+        try:
+            with db.engine.begin() as connection:
+                for name, delta in sorted(deltas.items()):
+                    if delta:
+                        connection.execute(_counter_increment(name, delta))
+        except SQLAlchemyError as exc:
+            self.add(deltas)
+            logger.warning('platform_counter_write_through_failed', deltas=dict(deltas), error=str(exc))
+
+    def pending(self):
+        with self._lock:
+            return {name: delta for name, delta in self._pending.items() if delta}
+
+    def flush(self):
+        """Apply every pending delta in one short transaction; failed deltas are kept for the next flush."""
+        with self._flush_lock:
+            with self._lock:
+                pending = {name: delta for name, delta in self._pending.items() if delta}
+                self._pending.clear()
+            if not pending:
+                return {}
+
+            try:
+                for name, delta in sorted(pending.items()):
+                    db.session.execute(_counter_increment(name, delta))
+                db.session.commit()
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                self.add(pending)
+                with self._lock:
+                    self.flush_failures += 1
+                logger.warning('platform_counter_flush_failed', deltas=pending, error=str(exc))
+                return {}
+
+            with self._lock:
+                self.flushes += 1
+            return pending
+
+    def _flush_in_app(self):
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception as exc:
+            logger.warning('platform_counter_flush_error', error=str(exc))
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval_seconds):
+            self._flush_in_app()
+        self._flush_in_app()
+
+
+def get_platform_counter_buffer():
+    buffer = current_app.extensions.get(PLATFORM_COUNTER_BUFFER_EXTENSION_KEY)
+    if buffer is None:
+        buffer = PlatformCounterBuffer(flush_interval_seconds=get_settings().platform.counter_flush_seconds)
+        current_app.extensions[PLATFORM_COUNTER_BUFFER_EXTENSION_KEY] = buffer
+    return buffer
+
+
+def start_platform_counter_buffer():
+    return get_platform_counter_buffer().start(current_app._get_current_object())
+
+
+def _session_deltas(session):
+    return session.info.setdefault('platform_counter_deltas', Counter())
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_flushed_rows(session, flush_context):
+    deltas = None
+    for name, model in COUNTED_MODELS:
+        delta = (
+            sum(1 for instance in session.new if isinstance(instance, model))
+            - sum(1 for instance in session.deleted if isinstance(instance, model))
+        )
+        if delta:
+            deltas = deltas if deltas is not None else _session_deltas(session)
+            deltas[name] += delta
+
+
+@event.listens_for(Session, 'after_commit')
+def _buffer_committed_counts(session):
+    deltas = session.info.pop('platform_counter_deltas', None)
+    if not deltas or not has_app_context():
+        return
+    buffer = get_platform_counter_buffer()
+    if buffer.running:
+        buffer.add(deltas)
+    else:
+        # Nothing would ever flush this process's buffer; the session cannot emit SQL here.
+        buffer.write_through(deltas)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_uncommitted_counts(session):
+    session.info.pop('platform_counter_deltas', None)
+
+
+def increment_platform_counter(name, delta):
+    """Count rows written outside the ORM unit of work (bulk inserts); applied once the session commits."""
+    if delta:
+        _session_deltas(db.session)[name] += delta
+
+
+def _count_rows(model):
+    return db.session.query(func.count(model.id)).scalar() or 0
+
+
+def read_platform_counters():
+    """Current counter values; counters that have no row yet are seeded from ``COUNT(*)``."""
+    get_platform_counter_buffer().flush()
+    values = dict(db.session.query(PlatformCounter.name, PlatformCounter.value).all())
+    missing = [(name, model) for name, model in COUNTED_MODELS if name not in values]
+    if missing:
+        seeded = {name: _count_rows(model) for name, model in missing}
+        try:
+            db.session.add_all(PlatformCounter(name=name, value=value) for name, value in seeded.items())
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            # Another worker seeded them first; its rows win.
+            db.session.rollback()
+            logger.warning('platform_counter_seed_failed', error=str(exc))
+        values.update(seeded)
+    return {name: int(values[name]) for name, _ in COUNTED_MODELS}
+
+
+def reconcile_platform_counters():
+    """Recount every counter from its table and correct drift.
+
+    Returns ``{name: (stored, actual)}`` for each counter that was wrong or missing.
+    """
+    get_platform_counter_buffer().flush()
+    stored = dict(db.session.query(PlatformCounter.name, PlatformCounter.value).all())
+    drift = {}
+    for name, model in COUNTED_MODELS:
+        actual = _count_rows(model)
+        if name not in stored:
+            db.session.add(PlatformCounter(name=name, value=actual))
+        elif stored[name] != actual:
+            db.session.execute(
+                update(_COUNTER_TABLE)
+                .where(_COUNTER_TABLE.c.name == name)
+                .values(value=actual, updated_at=datetime.utcnow())
+            )
+        else:
+            continue
+        drift[name] = (stored.get(name), actual)
+    db.session.commit()
+
+    cache = current_app.extensions.get(PLATFORM_STATS_EXTENSION_KEY)
+    if cache is not None:
+        cache.clear()
+    if drift:
+        logger.info('platform_counters_reconciled', drift={name: list(values) for name, values in drift.items()})
+    return drift
+
+
+class PlatformStatsCache:
+    """Serves the platform stats payload from memory for ``ttl_seconds`` between reads."""
+
+    def __init__(self, ttl_seconds, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._payload = None
+        self._expires_at = 0.0
+
+    def get(self, loader):
+        payload = self._payload
+        if payload is not None and self._clock() < self._expires_at:
+            return payload
+
+        payload = loader()
+        with self._lock:
+            self._payload = payload
+            self._expires_at = self._clock() + self.ttl_seconds
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._payload = None
+
+
+def get_platform_stats():
+    cache = current_app.extensions.get(PLATFORM_STATS_EXTENSION_KEY)
+    if cache is None:
+        cache = PlatformStatsCache(get_settings().platform.stats_cache_seconds)
+        current_app.extensions[PLATFORM_STATS_EXTENSION_KEY] = cache
+    return cache.get(lambda: {**read_platform_counters(), **STATIC_PLATFORM_STATS})
@@ -0,0 +1,181 @@
+from datetime import datetime
+
+from sqlalchemy import and_, case, func, update
+from sqlalchemy.exc import IntegrityError
+
+from logging_config import get_logger
+from models import Lesson, LessonProgress, UserProgress, db
+from module_catalog import get_module_catalog
+
+
+logger = get_logger(__name__)
+
+DEFAULT_REBUILD_BATCH_SIZE = 1000
+
+# Lessons count as required unless explicitly marked optional (NULL rows predate the column default).
+REQUIRED_LESSON = Lesson.is_required.isnot(False)
+
+
+def required_lesson_count(module_id):
+    module = get_module_catalog().get(module_id)
+    if module is not None:
+        return module.required_lesson_count
+    return db.session.query(func.count(Lesson.id)).filter(Lesson.module_id == module_id, REQUIRED_LESSON).scalar() or 0
+
+
+def lesson_progress_contribution(progress, lesson):
+    """``(completed required lessons, minutes)`` one ``LessonProgress`` row adds to its module's counters."""
+    if progress is None:
+        return 0, 0
+    completed = int(progress.status == 'completed' and lesson.is_required is not False)
+    return completed, progress.time_spent_minutes or 0
+
+
+def first_incomplete_lesson_id(user_id, module_id):
+    completed = (
+        db.session.query(LessonProgress.id)
+        .filter(
+            LessonProgress.lesson_id == Lesson.id,
+            LessonProgress.user_id == user_id,
+            LessonProgress.status == 'completed',
+        )
+        .exists()
+    )
+    lesson_id = (
+        db.session.query(Lesson.id)
+        .filter(Lesson.module_id == module_id, ~completed)
+        .order_by(Lesson.order_index)
+        .limit(1)
+        .scalar()
+    )
+    if lesson_id is None:
+        lesson_id = (
+            db.session.query(Lesson.id)
+            .filter(Lesson.module_id == module_id)
+            .order_by(Lesson.order_index.desc())
+            .limit(1)
+            .scalar()
+        )
+    return lesson_id
+
+
+def _refresh_derived_fields(progress, required_lessons, now, has_lesson_activity=True):
+    completed = progress.completed_required_lessons or 0
+    progress.progress_percentage = min(100, completed * 100 // required_lessons) if required_lessons else 0
+    progress.time_spent_minutes = progress.lesson_time_spent_minutes or 0
+    if required_lessons and completed >= required_lessons:
+        progress.status = 'completed'
+        progress.completed_at = progress.completed_at or now
+    elif has_lesson_activity or progress.time_spent_minutes > 0:
+        progress.status = 'in_progress'
+        progress.completed_at = None
+    else:
+        progress.status = 'not_started'
+
+
+def apply_module_progress_delta(user_id, module_id, *, completed_delta=0, time_delta=0, now=None):
+    """Fold one lesson change into the module's ``UserProgress`` inside the caller's transaction.
+
+    The counters move with a single ``UPDATE ... SET col = col + delta``, so
+    concurrent lesson changes never overwrite each other, and the row stays
+    locked until the caller commits. Costs the same few queries whatever the
+    module size. Returns ``(progress, completion_changed)``.
+    """
+    now = now or datetime.utcnow()
+    progress = db.session.execute(
+        update(UserProgress)
+        .where(UserProgress.user_id == user_id, UserProgress.module_id == module_id)
+        .values(
+            completed_required_lessons=UserProgress.completed_required_lessons + completed_delta,
+            lesson_time_spent_minutes=UserProgress.lesson_time_spent_minutes + time_delta,
+            last_accessed=now,
+            started_at=func.coalesce(UserProgress.started_at, now),
+        )
+        .returning(UserProgress)
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+
+    if progress is None:
+        progress = UserProgress(
+            user_id=user_id,
+            module_id=module_id,
+            status='in_progress',
+            progress_percentage=0,
+            completed_required_lessons=max(0, completed_delta),
+            lesson_time_spent_minutes=max(0, time_delta),
+            started_at=now,
+            last_accessed=now,
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(progress)
+        except IntegrityError:
+            # Another request created the row first; apply the delta to it instead.
+            return apply_module_progress_delta(
+                user_id,
+                module_id,
+                completed_delta=completed_delta,
+                time_delta=time_delta,
+                now=now,
+            )
+
+    was_completed = progress.status == 'completed'
+    _refresh_derived_fields(progress, required_lesson_count(module_id), now)
+    if completed_delta or progress.current_lesson_id is None:
+        progress.current_lesson_id = first_incomplete_lesson_id(user_id, module_id)
+    return progress, was_completed != (progress.status == 'completed')
+
+
+def rebuild_progress_counters(batch_size=DEFAULT_REBUILD_BATCH_SIZE):
+    """Recompute every ``UserProgress`` counter from the raw ``LessonProgress`` rows.
+
+    Rows are read in primary-key order, ``batch_size`` at a time, with one
+    aggregate query per batch; each batch is committed on its own. Returns the
+    number of rows whose counters had drifted.
+    """
+    batch_size = max(1, int(batch_size or DEFAULT_REBUILD_BATCH_SIZE))
+    now = datetime.utcnow()
+    repaired = 0
+    last_progress_id = None
+
+    while True:
+        query = UserProgress.query.order_by(UserProgress.id)
+        if last_progress_id is not None:
+            query = query.filter(UserProgress.id > last_progress_id)
+        rows = query.limit(batch_size).all()
+        if not rows:
+            break
+
+        totals = {
+            (user_id, module_id): (int(completed or 0), int(minutes or 0))
+            for user_id, module_id, completed, minutes in (
+                db.session.query(
+                    LessonProgress.user_id,
+                    LessonProgress.module_id,
+                    func.sum(case((and_(LessonProgress.status == 'completed', REQUIRED_LESSON), 1), else_=0)),
+                    func.sum(LessonProgress.time_spent_minutes),
+                )
+                .join(Lesson, Lesson.id == LessonProgress.lesson_id)
+                .filter(
+                    LessonProgress.user_id.in_({row.user_id for row in rows}),
+                    LessonProgress.module_id.in_({row.module_id for row in rows}),
+                )
+                .group_by(LessonProgress.user_id, LessonProgress.module_id)
+            )
+        }
+
+        for progress in rows:
+            key = (progress.user_id, progress.module_id)
+            completed, minutes = totals.get(key, (0, 0))
+            if (progress.completed_required_lessons, progress.lesson_time_spent_minutes) == (completed, minutes):
+                continue
+            progress.completed_required_lessons = completed
+            progress.lesson_time_spent_minutes = minutes
+            _refresh_derived_fields(progress, required_lesson_count(progress.module_id), now, key in totals)
+            repaired += 1
+
+        db.session.commit()
+        last_progress_id = rows[-1].id
+        logger.info('progress_counter_rebuild_batch', rows=len(rows), repaired=repaired)
+
+    return repaired
@@ -0,0 +1,18 @@
+from sqlalchemy import func
+
+from models import UserProgress, db
+
+
+def read_progress_version(user_id):
+    """Validator for everything derived from a user's ``UserProgress`` rows.
+
+    Derived from the rows themselves (row count plus the newest ``updated_at``,
+    which every ORM and Core UPDATE advances), so progress writes never touch a
+    shared per-user counter row.
+    """
+    count, latest_update = (
+        db.session.query(func.count(UserProgress.id), func.max(UserProgress.updated_at))
+        .filter(UserProgress.user_id == user_id)
+        .one()
+    )
+    return f'{count}:{latest_update.isoformat() if latest_update else ""}'
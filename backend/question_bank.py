@@ -0,0 +1,325 @@
+import hashlib
+import json
+import random
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from logging_config import get_logger
+from models import Assessment, CatalogVersion, db
+
+
+logger = get_logger(__name__)
+
+QUESTION_BANK_EXTENSION_KEY = 'litmusai_question_bank'
+QUESTION_BANK_VERSION_NAME = 'assessment_questions'
+QUESTION_FIELDS = (
+    'id',
+    'domain',
+    'question_text',
+    'option_a',
+    'option_b',
+    'option_c',
+    'option_d',
+    'correct_answer',
+    'explanation',
+    'difficulty_level',
+)
+
+_BANK_GENERATION = 0
+_GENERATION_LOCK = threading.Lock()
+
+
+def bump_question_bank_generation():
+    """Force every in-process question bank to reload on its next lookup."""
+    global _BANK_GENERATION
+    with _GENERATION_LOCK:
+        _BANK_GENERATION += 1
+        return _BANK_GENERATION
+
+
+def _bump_version_row(connection):
+    bumped = connection.execute(
+        update(CatalogVersion.__table__)
+        .where(CatalogVersion.__table__.c.name == QUESTION_BANK_VERSION_NAME)
+        .values(version=CatalogVersion.__table__.c.version + 1)
+    ).rowcount
+    if not bumped:
+        connection.execute(insert(CatalogVersion.__table__).values(name=QUESTION_BANK_VERSION_NAME, version=1))
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_assessment_changes(session, flush_context):
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, Assessment) for instance in changed):
+        session.info['question_bank_dirty'] = True
+        if not session.info.get('question_bank_version_bumped'):
+            # Question edits are rare, so the shared row is bumped in the writer's transaction.
+            _bump_version_row(session.connection())
+            session.info['question_bank_version_bumped'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_generation_on_commit(session):
+    session.info.pop('question_bank_version_bumped', None)
+    if session.info.pop('question_bank_dirty', False):
+        bump_question_bank_generation()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_changes(session):
+    session.info.pop('question_bank_dirty', None)
+    session.info.pop('question_bank_version_bumped', None)
+
+
+def bump_question_bank_version():
+    """Advance the shared question bank version for writes that bypass the ORM (bulk updates, raw SQL)."""
+    bump_question_bank_generation()
+    try:
+        _bump_version_row(db.session.connection())
+        db.session.commit()
+    except SQLAlchemyError as exc:
+        db.session.rollback()
+        logger.warning('question_bank_version_bump_failed', error=str(exc))
+
+
+def question_from_record(record):
+    return {
+        'id': str(record.id),
+        'domain': record.domain,
+        'question_text': record.question_text,
+        'option_a': record.option_a,
+        'option_b': record.option_b,
+        'option_c': record.option_c,
+        'option_d': record.option_d,
+        'correct_answer': str(record.correct_answer or '').strip().upper(),
+        'explanation': record.explanation,
+        'difficulty_level': record.difficulty_level or 1,
+    }
+
+
+def _question_sort_key(question):
+    suffix = str(question['id']).rsplit('-', 1)[-1]
+    numeric_suffix = int(suffix) if suffix.isdigit() else None
+    return (
+        question.get('difficulty_level') or 1,
+        0 if numeric_suffix is not None else 1,
+        numeric_suffix or 0,
+        str(question['id']),
+    )
+
+
+def _level_candidates(ordered_questions, assessment_level, questions_per_domain):
+    if len(ordered_questions) < questions_per_domain:
+        return list(ordered_questions)
+
+    if assessment_level == 'beginner':
+        candidates = list(ordered_questions[:questions_per_domain])
+    elif assessment_level == 'intermediate':
+        candidates = list(ordered_questions[1:1 + questions_per_domain])
+    else:
+        candidates = list(ordered_questions[-questions_per_domain:])
+
+    if len(candidates) < questions_per_domain:
+        existing_ids = {question['id'] for question in candidates}
+        candidates.extend(question for question in ordered_questions if question['id'] not in existing_ids)
+
+    return candidates[:questions_per_domain]
+
+
+class QuestionBankSnapshot:
+    """Immutable, pre-indexed view of the active question bank.
+
+    Questions are indexed by id and grouped per domain in selection order, and
+    the candidate set for every assessment level is computed up front, so
+    selecting and grading a question set are dictionary and tuple lookups.
+    """
+
+    def __init__(self, questions, *, domains, levels, questions_per_domain, source):
+        domain_set = set(domains)
+        normalized = [
+            {field: question.get(field) for field in QUESTION_FIELDS}
+            for question in questions
+            if question.get('domain') in domain_set
+        ]
+        for question in normalized:
+            question['id'] = str(question['id'])
+            question['correct_answer'] = str(question['correct_answer'] or '').strip().upper()
+            question['difficulty_level'] = question['difficulty_level'] or 1
+
+        ordered_by_domain = {
+            domain: tuple(sorted(
+                (question for question in normalized if question['domain'] == domain),
+                key=_question_sort_key,
+            ))
+            for domain in domains
+        }
+
+        self.source = source
+        self.domains = tuple(domains)
+        self.questions = tuple(question for domain in domains for question in ordered_by_domain[domain])
+        self.by_id = {question['id']: question for question in self.questions}
+        self.by_domain = ordered_by_domain
+        self.domain_totals = {domain: len(ordered_by_domain[domain]) for domain in domains}
+        self.level_candidates = {
+            level: tuple(
+                question
+                for domain in domains
+                for question in _level_candidates(ordered_by_domain[domain], level, questions_per_domain)
+            )
+            for level in levels
+        }
+        self.version = hashlib.sha256(
+            json.dumps(self.questions, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.questions)
+
+    def get(self, question_id):
+        return self.by_id.get(question_id)
+
+    def questions_for_ids(self, question_ids):
+        by_id = self.by_id
+        return [by_id[question_id] for question_id in question_ids if question_id in by_id]
+
+    def select(self, assessment_level):
+        selected = list(self.level_candidates.get(assessment_level, ()))
+        random.shuffle(selected)
+        return selected
+
+
+class QuestionBank:
+    """Holds the current snapshot for one app and reloads it when the bank changes.
+
+    Commits that touch ``Assessment`` rows in this process trigger a reload on
+    the next lookup. Every ORM write to ``Assessment`` also bumps the shared
+    ``assessment_questions`` row in ``catalog_version``, so other processes
+    pick up edits through a cheap version/count/max(created_at) signature
+    query, run at most every ``refresh_seconds``. When the table has no usable rows, the built-in
+    ``fallback_questions`` are served instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        domains,
+        levels,
+        questions_per_domain,
+        fallback_questions=(),
+        refresh_seconds=30,
+        clock=time.monotonic,
+    ):
+        self.domains = tuple(domains)
+        self.levels = tuple(levels)
+        self.questions_per_domain = questions_per_domain
+        self.fallback_questions = tuple(fallback_questions)
+        self.refresh_seconds = max(0, int(refresh_seconds))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._signature = None
+        self._generation = None
+        self._next_check_at = 0.0
+        self.reload_count = 0
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and self._generation == _BANK_GENERATION
+            and self._clock() < self._next_check_at
+        ):
+            return snapshot
+
+        with self._lock:
+            now = self._clock()
+            if self._snapshot is None or self._generation != _BANK_GENERATION:
+                return self._reload(now)
+            if now < self._next_check_at:
+                return self._snapshot
+
+            try:
+                signature = self._current_signature()
+            except SQLAlchemyError as exc:
+                db.session.rollback()
+                logger.warning('question_bank_signature_check_failed', error=str(exc))
+                self._next_check_at = now + self.refresh_seconds
+                return self._snapshot
+
+            if signature != self._signature:
+                return self._reload(now)
+            self._next_check_at = now + self.refresh_seconds
+            return self._snapshot
+
+    def reload(self):
+        with self._lock:
+            return self._reload(self._clock())
+
+    def _active_filter(self):
+        return Assessment.is_active.isnot(False)
+
+    def _current_signature(self):
+        version = (
+            select(CatalogVersion.version)
+            .where(CatalogVersion.name == QUESTION_BANK_VERSION_NAME)
+            .scalar_subquery()
+        )
+        count, latest_created_at, shared_version = (
+            db.session.query(func.count(Assessment.id), func.max(Assessment.created_at), version)
+            .filter(self._active_filter())
+            .one()
+        )
+        return (shared_version or 0, count, str(latest_created_at))
+
+    def _build_snapshot(self, questions, source):
+        return QuestionBankSnapshot(
+            questions,
+            domains=self.domains,
+            levels=self.levels,
+            questions_per_domain=self.questions_per_domain,
+            source=source,
+        )
+
+    def _reload(self, now):
+        started = time.perf_counter()
+        generation = _BANK_GENERATION
+        try:
+            signature = self._current_signature()
+            records = Assessment.query.filter(self._active_filter()).all()
+            snapshot = self._build_snapshot([question_from_record(record) for record in records], 'database')
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.warning('question_bank_load_failed', error=str(exc))
+            signature = None
+            snapshot = self._snapshot
+
+        if snapshot is None or not len(snapshot):
+            snapshot = self._build_snapshot(self.fallback_questions, 'builtin')
+
+        self._snapshot = snapshot
+        self._signature = signature
+        self._generation = generation
+        self._next_check_at = now + self.refresh_seconds
+        self.reload_count += 1
+        logger.info(
+            'question_bank_loaded',
+            version=snapshot.version,
+            source=snapshot.source,
+            question_count=len(snapshot),
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        return snapshot
+
+
+def get_question_bank(**bank_options):
+    """Return the question bank for the current app, creating it on first use."""
+    bank = current_app.extensions.get(QUESTION_BANK_EXTENSION_KEY)
+    if bank is None:
+        bank = QuestionBank(**bank_options)
+        current_app.extensions[QUESTION_BANK_EXTENSION_KEY] = bank
+    return bank
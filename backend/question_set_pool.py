@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+from collections import deque
+
+from logging_config import get_logger
+
+
+logger = get_logger(__name__)
+
+DEFAULT_TARGET_DEPTH = 3
+DEFAULT_MAX_AGE_SECONDS = 30 * 60
+IDLE_POLL_SECONDS = 5
+MAX_RETRY_BACKOFF_SECONDS = 60
+
+
+class _LevelMetrics:
+    __slots__ = ('pops', 'empty_pops', 'expired', 'refills', 'refill_failures', 'refill_seconds_total', 'last_refill_ms')
+
+    def __init__(self):
+        self.pops = 0
+        self.empty_pops = 0
+        self.expired = 0
+        self.refills = 0
+        self.refill_failures = 0
+        self.refill_seconds_total = 0.0
+        self.last_refill_ms = None
+
+
+class QuestionSetPool:
+    """Keeps a few pre-generated, signed question sets per assessment level.
+
+    Requests take a set with :meth:`pop` (a deque pop under a lock) and a
+    daemon producer thread refills each level up to ``target_depth`` by calling
+    ``generate(level)`` inside the owning app's context. Sets older than
+    ``max_age_seconds`` are discarded so the signed token still has most of
+    its lifetime left when it is handed out.
+    """
+
+    def __init__(
+        self,
+        *,
+        levels,
+        generate,
+        target_depth=DEFAULT_TARGET_DEPTH,
+        max_age_seconds=DEFAULT_MAX_AGE_SECONDS,
+        clock=time.time,
+    ):
+        self.levels = tuple(levels)
+        self.target_depth = max(0, int(target_depth))
+        self.max_age_seconds = max_age_seconds
+        self._generate = generate
+        self._clock = clock
+        self._sets = {level: deque() for level in self.levels}
+        self._metrics = {level: _LevelMetrics() for level in self.levels}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self._consecutive_failures = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def start(self, app):
+        if self.target_depth <= 0:
+            return self
+        if self.running:
+            return self
+
+        self._app = app
+        self._pid = os.getpid()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='question-set-pool', daemon=True)
+        self._thread.start()
+        logger.info('question_set_pool_started', levels=list(self.levels), target_depth=self.target_depth)
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def pop(self, level):
+        """Return a pooled question set for ``level``, or ``None`` when the pool is empty."""
+        if self._app is not None and self._pid != os.getpid():
+            self.start(self._app)
+
+        now = self._clock()
+        question_set = None
+        with self._lock:
+            queue = self._sets.get(level)
+            metrics = self._metrics.get(level)
+            if queue is None:
+                return None
+
+            metrics.pops += 1
+            while queue:
+                created_at, candidate = queue.popleft()
+                if now - created_at <= self.max_age_seconds:
+                    question_set = candidate
+                    break
+                metrics.expired += 1
+
+            if question_set is None:
+                metrics.empty_pops += 1
+
+        self._wake_event.set()
+        return question_set
+
+    def push(self, level, question_set):
+        with self._lock:
+            self._sets[level].append((self._clock(), question_set))
+
+    def depth(self, level):
+        with self._lock:
+            return len(self._sets.get(level, ()))
+
+    def clear(self):
+        with self._lock:
+            for queue in self._sets.values():
+                queue.clear()
+
+    def _next_level_to_fill(self):
+        with self._lock:
+            shallowest = min(self.levels, key=lambda level: len(self._sets[level]), default=None)
+            if shallowest is None or len(self._sets[shallowest]) >= self.target_depth:
+                return None
+            return shallowest
+
+    def _retry_delay(self):
+        return min(MAX_RETRY_BACKOFF_SECONDS, 2 ** self._consecutive_failures)
+
+    def refill_once(self):
+        """Generate one set for the shallowest level; returns False when nothing needed filling."""
+        level = self._next_level_to_fill()
+        if level is None:
+            return False
+
+        started = time.perf_counter()
+        try:
+            if self._app is not None:
+                with self._app.app_context():
+                    question_set = self._generate(level)
+            else:
+                question_set = self._generate(level)
+        except Exception as exc:
+            logger.warning('question_set_pool_refill_error', assessment_level=level, error=str(exc))
+            question_set = None
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            metrics = self._metrics[level]
+            if question_set:
+                self._sets[level].append((self._clock(), question_set))
+                metrics.refills += 1
+                metrics.refill_seconds_total += elapsed
+                metrics.last_refill_ms = round(elapsed * 1000, 2)
+            else:
+                metrics.refill_failures += 1
+
+        if question_set:
+            self._consecutive_failures = 0
+        else:
+            self._consecutive_failures += 1
+        return bool(question_set)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self._next_level_to_fill() is None:
+                self._wake_event.wait(IDLE_POLL_SECONDS)
+                self._wake_event.clear()
+                continue
+
+            if not self.refill_once():
+                self._stop_event.wait(self._retry_delay())
+
+    def stats(self):
+        with self._lock:
+            levels = {}
+            for level in self.levels:
+                metrics = self._metrics[level]
+                levels[level] = {
+                    'depth': len(self._sets[level]),
+                    'pops': metrics.pops,
+                    'empty_pops': metrics.empty_pops,
+                    'empty_rate': round(metrics.empty_pops / metrics.pops, 4) if metrics.pops else 0.0,
+                    'expired': metrics.expired,
+                    'refills': metrics.refills,
+                    'refill_failures': metrics.refill_failures,
+                    'last_refill_ms': metrics.last_refill_ms,
+                    'avg_refill_ms': (
+                        round(metrics.refill_seconds_total / metrics.refills * 1000, 2) if metrics.refills else None
+                    ),
+                }
+            return {
+                'running': self.running,
+                'target_depth': self.target_depth,
+                'max_age_seconds': self.max_age_seconds,
+                'levels': levels,
+            }
@@ -0,0 +1,136 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import QuestionSet, db
+
+
+DEFAULT_PURGE_INTERVAL_SECONDS = 300
+DEFAULT_MEMORY_MAX_ENTRIES = 5000
+
+
+class QuestionSetStoreUnavailable(RuntimeError):
+    """Raised when the backing store cannot save or load a question set."""
+
+
+class DatabaseQuestionSetStore:
+    """Keeps generated question sets in the ``question_set`` table.
+
+    Rows expire ``ttl_seconds`` after they are written; expired rows are never
+    returned and are deleted in bulk at most every ``purge_interval_seconds``
+    as part of a write (or by the ``purge-question-sets`` CLI command).
+    """
+
+    backend = 'database'
+
+    def __init__(self, ttl_seconds, purge_interval_seconds=DEFAULT_PURGE_INTERVAL_SECONDS, clock=time.time):
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._clock = clock
+        self._last_purge_at = 0.0
+
+    def _utcnow(self):
+        return datetime.utcfromtimestamp(self._clock())
+
+    def put(self, assessment_level, payload):
+        now = self._clock()
+        record = QuestionSet(
+            id=str(uuid.uuid4()),
+            assessment_level=assessment_level,
+            payload=payload,
+            created_at=self._utcnow(),
+            expires_at=self._utcnow() + timedelta(seconds=self.ttl_seconds),
+        )
+        try:
+            db.session.add(record)
+            if now - self._last_purge_at >= self.purge_interval_seconds:
+                self._last_purge_at = now
+                self._delete_expired()
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            raise QuestionSetStoreUnavailable(str(exc)) from exc
+        return record.id
+
+    def get(self, set_id):
+        try:
+            record = QuestionSet.query.filter(
+                QuestionSet.id == set_id,
+                QuestionSet.expires_at > self._utcnow(),
+            ).first()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            raise QuestionSetStoreUnavailable(str(exc)) from exc
+        return dict(record.payload) if record is not None else None
+
+    def _delete_expired(self):
+        return QuestionSet.query.filter(QuestionSet.expires_at <= self._utcnow()).delete(synchronize_session=False)
+
+    def purge_expired(self):
+        try:
+            deleted = self._delete_expired()
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            raise QuestionSetStoreUnavailable(str(exc)) from exc
+        return deleted
+
+
+class MemoryQuestionSetStore:
+    """Per-process store for single-worker deployments and local development."""
+
+    backend = 'memory'
+
+    def __init__(self, ttl_seconds, max_entries=DEFAULT_MEMORY_MAX_ENTRIES, clock=time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, assessment_level, payload):
+        set_id = str(uuid.uuid4())
+        with self._lock:
+            self._purge_locked(self._clock())
+            self._entries[set_id] = (self._clock() + self.ttl_seconds, payload)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return set_id
+
+    def get(self, set_id):
+        with self._lock:
+            entry = self._entries.get(set_id)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= self._clock():
+                del self._entries[set_id]
+                return None
+            return dict(payload)
+
+    def _purge_locked(self, now):
+        # Entries share one TTL, so insertion order is expiry order.
+        purged = 0
+        while self._entries:
+            set_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[set_id]
+            purged += 1
+        return purged
+
+    def purge_expired(self):
+        with self._lock:
+            return self._purge_locked(self._clock())
+
+
+def build_question_set_store(backend, ttl_seconds):
+    if backend == 'database':
+        return DatabaseQuestionSetStore(ttl_seconds)
+    if backend == 'memory':
+        return MemoryQuestionSetStore(ttl_seconds)
+    return None
@@ -0,0 +1,275 @@
+import time
+
+import numpy as np
+
+from logging_config import get_logger
+from models import AssessmentResult, User, UserProgress, db
+from module_catalog import get_module_catalog
+from routes.assessment import (
+    COMPLETED_MODULE_PENALTY,
+    DOMAINS,
+    RECOMMENDATION_LIMIT,
+    TRACK_DOMAIN_HINTS,
+    WORKPLACE_TRACKS,
+    _normalize_workplace_track,
+    _recommendation_context,
+    _recommendations_payload,
+    _score_context_module,
+    _serialize_scored_recommendation,
+)
+from training_metadata import build_module_metadata
+
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class ModuleScoringMatrix:
+    """Per-module scoring terms for one catalog, laid out for broadcasting against users.
+
+    A module's target domains are kept as a (modules x slots) array of domain
+    column indexes, padded with a sentinel column that never matches. Scoring
+    walks the slots in the module's own target order, so the weak-domain gap
+    sums are accumulated exactly as ``_score_module_recommendation`` adds them
+    and the float scores come out bit-for-bit equal.
+    """
+
+    def __init__(self, modules):
+        self.modules = tuple(modules)
+        self.metadata = [build_module_metadata(module) for module in self.modules]
+        targets = [list(metadata.get('target_domains') or []) for metadata in self.metadata]
+
+        extra_domains = sorted({domain for domain_list in targets for domain in domain_list} - set(DOMAINS))
+        self.domains = list(DOMAINS) + extra_domains
+        self.domain_index = {domain: index for index, domain in enumerate(self.domains)}
+        self.sentinel = len(self.domains)
+
+        width = max((len(domain_list) for domain_list in targets), default=0)
+        self.target_slots = np.full((len(self.modules), width), self.sentinel, dtype=np.intp)
+        for row, domain_list in enumerate(targets):
+            self.target_slots[row, :len(domain_list)] = [self.domain_index[domain] for domain in domain_list]
+        self.has_targets = np.array([bool(domain_list) for domain_list in targets], dtype=bool)
+
+        tracks = [_normalize_workplace_track(module.role_specific) for module in self.modules]
+        self.track_index = np.array([WORKPLACE_TRACKS.index(track) for track in tracks], dtype=np.intp)
+        self.is_general = self.track_index == WORKPLACE_TRACKS.index('General')
+        self.track_hint_overlap = np.array([
+            [bool(set(domain_list) & TRACK_DOMAIN_HINTS.get(track, set())) for domain_list in targets]
+            for track in WORKPLACE_TRACKS
+        ], dtype=bool).reshape(len(WORKPLACE_TRACKS), len(self.modules))
+
+        self.difficulty = np.array([module.difficulty_level or 1 for module in self.modules], dtype=np.int64)
+        self.has_internal_lessons = np.array(
+            [bool(metadata.get('has_internal_lessons')) for metadata in self.metadata],
+            dtype=bool,
+        )
+        self.content_bonus = np.array([
+            12 if metadata.get('has_internal_lessons') else 4 if metadata.get('external_url') else 0
+            for metadata in self.metadata
+        ], dtype=np.int64)
+
+        title_order = sorted(range(len(self.modules)), key=lambda index: self.modules[index].title)
+        self.title_rank = np.empty(len(self.modules), dtype=np.intp)
+        self.title_rank[title_order] = np.arange(len(self.modules))
+        self.module_index = {module.id: index for index, module in enumerate(self.modules)}
+
+    def __len__(self):
+        return len(self.modules)
+
+    def _domain_rows(self, contexts):
+        """(users x domains+1) gap, weak, fallback and certification arrays; the last column is the sentinel."""
+        shape = (len(contexts), self.sentinel + 1)
+        gaps = np.zeros(shape, dtype=np.float64)
+        weak = np.zeros(shape, dtype=bool)
+        fallback = np.zeros(shape, dtype=bool)
+        certification = np.zeros(shape, dtype=bool)
+
+        for row, context in enumerate(contexts):
+            for entry in context['weak_domains']:
+                column = self.domain_index.get(entry['domain'])
+                if column is not None:
+                    weak[row, column] = True
+                    gaps[row, column] = entry['gap_percentage']
+            for target, domains in ((fallback, context['fallback_domains']),
+                                    (certification, context['certification_domains'])):
+                for domain in domains:
+                    column = self.domain_index.get(domain)
+                    if column is not None:
+                        target[row, column] = True
+        return gaps, weak, fallback, certification
+
+    def score(self, contexts, completed_module_ids):
+        """Return the (users x modules) score matrix, mirroring ``_score_module_recommendation``."""
+        user_count, module_count = len(contexts), len(self.modules)
+        gaps, weak, fallback, certification = self._domain_rows(contexts)
+
+        weak_sum = np.zeros((user_count, module_count), dtype=np.float64)
+        weak_count = np.zeros((user_count, module_count), dtype=np.int64)
+        fallback_any = np.zeros((user_count, module_count), dtype=bool)
+        certification_any = np.zeros((user_count, module_count), dtype=bool)
+        for slot in range(self.target_slots.shape[1]):
+            columns = self.target_slots[:, slot]
+            weak_sum += gaps[:, columns]
+            weak_count += weak[:, columns]
+            fallback_any |= fallback[:, columns]
+            certification_any |= certification[:, columns]
+
+        has_weak = weak_count > 0
+        weak_term = np.divide(weak_sum, weak_count, out=np.zeros_like(weak_sum), where=has_weak) * 0.45
+        domain_term = np.where(
+            has_weak,
+            weak_term,
+            np.where(fallback_any, 12, np.where(self.has_targets, 0, 6)),
+        )
+
+        profile_index = np.array(
+            [WORKPLACE_TRACKS.index(context['profile_track']) for context in contexts],
+            dtype=np.intp,
+        )
+        same_track = self.track_index[np.newaxis, :] == profile_index[:, np.newaxis]
+        track_term = np.where(
+            same_track & ~self.is_general,
+            24,
+            np.where(self.is_general, 14, np.where(self.track_hint_overlap[profile_index], 10, 0)),
+        )
+
+        ideal_difficulty = np.array([context['ideal_difficulty'] for context in contexts], dtype=np.int64)
+        difficulty_delta = np.abs(self.difficulty[np.newaxis, :] - ideal_difficulty[:, np.newaxis])
+        difficulty_term = np.maximum(0, 16 - difficulty_delta * 6)
+
+        # Same addition order as the per-request scorer so float results match exactly.
+        scores = np.full((user_count, module_count), 8.0)
+        scores = scores + domain_term
+        scores = scores + track_term
+        scores = scores + difficulty_term
+        scores = scores + self.content_bonus
+        scores = scores + np.where(certification_any, 10, 0)
+
+        completed = np.zeros((user_count, module_count), dtype=bool)
+        for row, module_ids in enumerate(completed_module_ids):
+            indexes = [self.module_index[module_id] for module_id in module_ids if module_id in self.module_index]
+            completed[row, indexes] = True
+        scores = scores - np.where(completed, COMPLETED_MODULE_PENALTY, 0)
+        return scores, profile_index
+
+    def top_modules(self, scores, profile_index, limit=RECOMMENDATION_LIMIT):
+        """Indexes of the best ``limit`` modules per user, ordered like the per-request sort."""
+        shape = scores.shape
+        track_mismatch = self.track_index[np.newaxis, :] != profile_index[:, np.newaxis]
+        order = np.lexsort((
+            np.broadcast_to(self.title_rank, shape),
+            np.broadcast_to(~self.has_internal_lessons, shape),
+            track_mismatch,
+            -scores,
+        ), axis=-1)
+        return order[:, :limit]
+
+    def recommend(self, contexts, completed_module_ids):
+        """Recommendation payloads for a chunk of users, identical to the request path's."""
+        if not contexts:
+            return []
+        if not self.modules:
+            return [_recommendations_payload(context, []) for context in contexts]
+
+        scores, profile_index = self.score(contexts, completed_module_ids)
+        top = self.top_modules(scores, profile_index)
+
+        payloads = []
+        for row, context in enumerate(contexts):
+            recommendations = []
+            for index in top[row]:
+                module, module_metadata = self.modules[index], self.metadata[index]
+                # Only the selected modules need source domains and labels.
+                score_data = _score_context_module(module, module_metadata, context)
+                recommendations.append(_serialize_scored_recommendation(
+                    module,
+                    module_metadata,
+                    float(scores[row, index]),
+                    score_data,
+                    context,
+                ))
+            payloads.append(_recommendations_payload(context, recommendations))
+        return payloads
+
+
+def _user_chunks(chunk_size):
+    last_user_id = None
+    while True:
+        query = db.session.query(User.id, User.role, User.latest_assessment_result_id).order_by(User.id)
+        if last_user_id is not None:
+            query = query.filter(User.id > last_user_id)
+        rows = query.limit(chunk_size).all()
+        if not rows:
+            return
+        yield rows
+        last_user_id = rows[-1].id
+
+
+def _latest_results(rows):
+    pointers = {row.latest_assessment_result_id: row.id for row in rows if row.latest_assessment_result_id}
+    latest = {}
+    if pointers:
+        for result in AssessmentResult.query.filter(AssessmentResult.id.in_(pointers)).all():
+            if pointers.get(result.id) == result.user_id:
+                latest[result.user_id] = result
+
+    # Mirror get_latest_assessment_result for users whose pointer is unset or stale.
+    missing = [row.id for row in rows if row.id not in latest]
+    if missing:
+        fallback = (AssessmentResult.query
+                    .filter(AssessmentResult.user_id.in_(missing))
+                    .order_by(
+                        AssessmentResult.user_id,
+                        AssessmentResult.completed_at.desc(),
+                        AssessmentResult.id.desc(),
+                    )
+                    .all())
+        for result in fallback:
+            latest.setdefault(result.user_id, result)
+    return latest
+
+
+def _completed_modules(user_ids):
+    completed = {user_id: set() for user_id in user_ids}
+    for user_id, module_id in db.session.query(UserProgress.user_id, UserProgress.module_id).filter(
+        UserProgress.user_id.in_(user_ids),
+        UserProgress.status == 'completed',
+    ):
+        completed[user_id].add(module_id)
+    return completed
+
+
+def iter_recommendations_for_all_users(chunk_size=DEFAULT_CHUNK_SIZE, modules=None):
+    """Yield ``(user_id, payload)`` for every user, scoring ``chunk_size`` users per array pass.
+
+    Memory is bounded by one chunk of (users x modules) arrays; rows are read
+    with keyset pagination on ``user.id``.
+    """
+    chunk_size = max(1, int(chunk_size or DEFAULT_CHUNK_SIZE))
+    matrix = ModuleScoringMatrix(get_module_catalog().active_modules if modules is None else modules)
+    started = time.perf_counter()
+    scored = 0
+
+    for rows in _user_chunks(chunk_size):
+        user_ids = [row.id for row in rows]
+        latest = _latest_results(rows)
+        completed = _completed_modules(user_ids)
+        contexts = [
+            _recommendation_context(
+                latest.get(row.id),
+                _normalize_workplace_track(row.role),
+                completed[row.id],
+            )
+            for row in rows
+        ]
+        payloads = matrix.recommend(contexts, [completed[user_id] for user_id in user_ids])
+        scored += len(rows)
+        yield from zip(user_ids, payloads)
+
+    logger.info(
+        'recommendations_refreshed',
+        users=scored,
+        modules=len(matrix),
+        duration_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
@@ -0,0 +1,101 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from settings import get_settings
+
+
+RECOMMENDATION_CACHE_EXTENSION_KEY = 'litmusai_recommendation_cache'
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def completed_modules_digest(module_ids):
+    return hashlib.sha256('\n'.join(sorted(module_ids)).encode('utf-8')).hexdigest()
+
+
+class RecommendationCache:
+    """Per-user recommendation responses, stored as serialized JSON bodies.
+
+    Each entry remembers the key it was built for (latest assessment, completed
+    modules, profile track and catalog fingerprint); a lookup with a different
+    key is a miss, so changes made by other workers are never served stale.
+    Writers in this process also call ``invalidate`` so the entry is dropped
+    straight away. Least recently used entries are evicted past ``max_entries``.
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id, key):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != key or entry[2] <= self._clock():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, key, body):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (key, body, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                if self._entries.pop(user_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+
+def get_recommendation_cache():
+    cache = current_app.extensions.get(RECOMMENDATION_CACHE_EXTENSION_KEY)
+    if cache is None:
+        settings = get_settings().assessment
+        cache = RecommendationCache(
+            ttl_seconds=settings.recommendation_cache_ttl_seconds,
+            max_entries=settings.recommendation_cache_max_entries,
+        )
+        current_app.extensions[RECOMMENDATION_CACHE_EXTENSION_KEY] = cache
+    return cache
+
+
+def get_recommendation_cache_stats():
+    return get_recommendation_cache().stats()
+
+
+def invalidate_recommendations(*user_ids):
+    """Drop cached recommendations for users whose assessment, progress or profile changed."""
+    if not has_app_context():
+        return
+    cache = current_app.extensions.get(RECOMMENDATION_CACHE_EXTENSION_KEY)
+    if cache is not None:
+        cache.invalidate(user_id for user_id in user_ids if user_id)
@@ -1,12 +1,11 @@
 from functools import wraps
 import base64
 import json
-import os
+import time
 import uuid
 
 import jwt
-from jwt import PyJWKClient
-from flask import current_app, g, jsonify, request
+from flask import g, jsonify, request
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from auth_identity import (
@@ -14,6 +13,9 @@ from auth_identity import (
     MissingIdentityEmailError,
     resolve_user_from_claims,
 )
+from auth_token_cache import VerifiedTokenCache
+from jwks_manager import JwksKeyManager, default_jwks_cache_path
+from settings import get_settings
 
 
 DEMO_USER_ID = 'demo-user'
@@ -21,24 +23,13 @@ DEMO_TOKEN_PREFIX = 'demo.'
 SUPABASE_PROVIDER = 'supabase'
 DEMO_PROVIDER = 'demo'
 _SUPABASE_JWKS_CLIENTS = {}
-TRUTHY_VALUES = {'1', 'true', 'yes', 'on'}
+_DEMO_USER_IDS = {}
+DEMO_USER_CACHE_LIMIT = 1000
+DEMO_USER_CACHE_TTL_SECONDS = 300
 ASYMMETRIC_ALGORITHMS = ('RS256', 'RS384', 'RS512', 'ES256', 'ES384', 'ES512', 'EdDSA')
 
 
-def _config_value(key):
-    value = current_app.config.get(key)
-    if value is not None:
-        normalized = str(value).strip()
-        if normalized:
-            return normalized
-
-    env_value = os.getenv(key)
-    if env_value is not None:
-        normalized = str(env_value).strip()
-        if normalized:
-            return normalized
-
-    return ''
+_VERIFIED_TOKEN_CACHE = VerifiedTokenCache()
 
 
 def _normalize_url(value):
@@ -48,44 +39,30 @@ def _normalize_url(value):
     return normalized
 
 
-def _normalize_supabase_url():
-    return _normalize_url(_config_value('SUPABASE_URL') or _config_value('VITE_SUPABASE_URL'))
+def _auth_settings():
+    return get_settings().auth
 
 
 def _normalize_issuer(raw_value=None):
-    value = _normalize_url(raw_value) if raw_value is not None else _normalize_url(_config_value('SUPABASE_JWT_ISSUER'))
-    if value:
-        return value
-
-    supabase_url = _normalize_supabase_url()
-    if supabase_url:
-        return f'{supabase_url}/auth/v1'
-
-    return ''
+    value = _normalize_url(raw_value) if raw_value is not None else ''
+    return value or _auth_settings().jwt_issuer
 
 
 def _normalize_jwks_url(raw_value=None):
-    value = _normalize_url(raw_value) if raw_value is not None else _normalize_url(_config_value('SUPABASE_JWKS_URL'))
-    if value:
-        return value
-
-    issuer = _normalize_issuer()
-    if issuer:
-        return f'{issuer}/.well-known/jwks.json'
-
-    return ''
+    value = _normalize_url(raw_value) if raw_value is not None else ''
+    return value or _auth_settings().jwks_url
 
 
 def _normalize_audience():
-    return _config_value('SUPABASE_JWT_AUDIENCE') or 'authenticated'
+    return _auth_settings().jwt_audience
 
 
 def _supabase_jwt_secret():
-    return _config_value('SUPABASE_JWT_SECRET')
+    return _auth_settings().jwt_secret
 
 
 def _supabase_is_configured():
-    return bool(_normalize_issuer() and (_normalize_jwks_url() or _supabase_jwt_secret()))
+    return _auth_settings().supabase_configured
 
 
 def _get_supabase_jwks_client(jwks_url):
@@ -96,29 +73,28 @@ def _get_supabase_jwks_client(jwks_url):
     if normalized in _SUPABASE_JWKS_CLIENTS:
         return _SUPABASE_JWKS_CLIENTS[normalized]
 
-    try:
-        cache_keys = str(_config_value('SUPABASE_JWKS_CACHE_KEYS')).lower() in TRUTHY_VALUES
-        max_cached_keys = int(_config_value('SUPABASE_JWKS_MAX_KEYS') or 16)
-        cache_lifespan = int(_config_value('SUPABASE_JWKS_CACHE_LIFESPAN') or 600)
-        timeout = int(_config_value('SUPABASE_JWKS_TIMEOUT_SECONDS') or 30)
-    except ValueError:
-        cache_keys = False
-        max_cached_keys = 16
-        cache_lifespan = 600
-        timeout = 30
+    auth_settings = _auth_settings()
+    cache_dir = auth_settings.jwks_cache_dir
+    client = JwksKeyManager(
+        normalized,
+        refresh_seconds=auth_settings.jwks_cache_lifespan,
+        timeout=auth_settings.jwks_timeout_seconds,
+        cache_path=default_jwks_cache_path(normalized, cache_dir or None),
+    )
 
-    try:
-        client = PyJWKClient(
-            normalized,
-            cache_keys=cache_keys,
-            max_cached_keys=max_cached_keys,
-            lifespan=cache_lifespan,
-            timeout=timeout,
-        )
-    except Exception:
+    _SUPABASE_JWKS_CLIENTS[normalized] = client
+    return client
+
+
+def start_supabase_jwks_refresh():
+    """Prefetch Supabase signing keys and keep them fresh off the request path."""
+    jwks_url = _normalize_jwks_url()
+    if not jwks_url:
         return None
 
-    _SUPABASE_JWKS_CLIENTS[normalized] = client
+    client = _get_supabase_jwks_client(jwks_url)
+    if client is not None and hasattr(client, 'start'):
+        client.start()
     return client
 
 
@@ -128,19 +104,8 @@ def _normalize_identity_value(value):
     return value.strip()
 
 
-def _truthy_config(key):
-    return _config_value(key).lower() in TRUTHY_VALUES
-
-
 def _demo_auth_enabled():
-    if current_app.config.get('TESTING'):
-        return True
-
-    environment = (_config_value('FLASK_ENV') or _config_value('ENV')).lower()
-    if environment in ('production', 'prod'):
-        return False
-
-    return _truthy_config('ENABLE_DEMO_AUTH') or environment == 'demo'
+    return _auth_settings().demo_auth_enabled
 
 
 def _truncate(value, max_length, fallback=''):
@@ -206,61 +171,88 @@ def _decode_demo_payload_token(token):
     }
 
 
+def _demo_profile_from_claims(claims=None):
+    demo_claims = claims if isinstance(claims, dict) else _default_demo_claims()
+    metadata = demo_claims.get('user_metadata') if isinstance(demo_claims.get('user_metadata'), dict) else {}
+    return {
+        'id': _truncate(demo_claims.get('sub'), 36, DEMO_USER_ID),
+        'email': _truncate(demo_claims.get('email'), 120, 'demo@example.com').lower(),
+        'first_name': _truncate(metadata.get('first_name'), 50, 'Demo'),
+        'last_name': _truncate(metadata.get('last_name'), 50, 'User'),
+        'role': _truncate(demo_claims.get('role'), 50, 'learner'),
+        'organization': _truncate(demo_claims.get('organization'), 100, '') or None,
+    }
+
+
+def _apply_demo_profile(user, profile, fields):
+    changed = False
+    for field in fields:
+        if getattr(user, field) != profile[field]:
+            setattr(user, field, profile[field])
+            changed = True
+    return changed
+
+
 def _get_or_create_demo_user(claims=None):
     from models import User, db
 
-    demo_claims = claims if isinstance(claims, dict) else _default_demo_claims()
-    subject = _truncate(demo_claims.get('sub'), 36, DEMO_USER_ID)
-    email = _truncate(demo_claims.get('email'), 120, 'demo@example.com').lower()
-    metadata = demo_claims.get('user_metadata') if isinstance(demo_claims.get('user_metadata'), dict) else {}
-    first_name = _truncate(metadata.get('first_name'), 50, 'Demo')
-    last_name = _truncate(metadata.get('last_name'), 50, 'User')
-    role = _truncate(demo_claims.get('role'), 50, 'learner')
-    organization = _truncate(demo_claims.get('organization'), 100, '')
+    profile = _demo_profile_from_claims(claims)
+    subject = profile['id']
 
     user = User.query.get(subject)
     if user is not None:
-        user.email = email
-        user.first_name = first_name
-        user.last_name = last_name
-        user.role = role
-        user.organization = organization or None
-        db.session.commit()
+        if _apply_demo_profile(user, profile, ('email', 'first_name', 'last_name', 'role', 'organization')):
+            db.session.commit()
         return user
 
-    user = User.query.filter_by(email=email).first()
+    user = User.query.filter_by(email=profile['email']).first()
     if user is not None:
-        user.auth_provider = DEMO_PROVIDER
-        user.auth_subject = subject
-        user.first_name = first_name
-        user.last_name = last_name
-        user.role = role
-        user.organization = organization or None
-        db.session.commit()
+        linked_profile = {**profile, 'auth_provider': DEMO_PROVIDER, 'auth_subject': subject}
+        if _apply_demo_profile(
+            user,
+            linked_profile,
+            ('auth_provider', 'auth_subject', 'first_name', 'last_name', 'role', 'organization'),
+        ):
+            db.session.commit()
         return user
 
     user = User(
-        id=subject,
-        email=email,
+        **profile,
         password_hash='demo',
         auth_provider=DEMO_PROVIDER,
         auth_subject=subject,
-        first_name=first_name,
-        last_name=last_name,
-        role=role,
-        organization=organization or None,
     )
     db.session.add(user)
     try:
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
-        user = User.query.get(subject) or User.query.filter_by(email=email).first()
+        user = User.query.get(subject) or User.query.filter_by(email=profile['email']).first()
         if user is None:
             raise
     return user
 
 
+def _resolve_demo_user_id(claims):
+    profile = _demo_profile_from_claims(claims)
+    fingerprint = tuple(sorted(profile.items()))
+    now = time.time()
+
+    cached = _DEMO_USER_IDS.get(profile['id'])
+    if cached is not None and cached[0] == fingerprint and cached[2] > now:
+        return cached[1]
+
+    user = _get_or_create_demo_user(claims)
+    if len(_DEMO_USER_IDS) >= DEMO_USER_CACHE_LIMIT:
+        _DEMO_USER_IDS.clear()
+    _DEMO_USER_IDS[profile['id']] = (fingerprint, user.id, now + DEMO_USER_CACHE_TTL_SECONDS)
+    return user.id
+
+
+def clear_demo_user_cache():
+    _DEMO_USER_IDS.clear()
+
+
 def _build_identity(provider, claims):
     subject = _normalize_identity_value(claims.get('sub'))
     user = resolve_user_from_claims(claims, create_if_missing=bool(subject))
@@ -374,6 +366,31 @@ def _default_allowed_providers():
     return tuple(providers)
 
 
+def _cached_token_identity(token, providers):
+    entry = _VERIFIED_TOKEN_CACHE.get(token)
+    if entry is None or entry['provider'] not in providers:
+        return None
+
+    return {
+        'provider': entry['provider'],
+        'subject': entry['subject'],
+        'user_id': entry['user_id'],
+        'claims': entry['claims'],
+    }
+
+
+def get_verified_token_cache_stats():
+    return _VERIFIED_TOKEN_CACHE.stats()
+
+
+def configure_verified_token_cache(max_entries):
+    _VERIFIED_TOKEN_CACHE.resize(max_entries)
+
+
+def clear_verified_token_cache():
+    _VERIFIED_TOKEN_CACHE.clear()
+
+
 def _decode_token_identity(optional=False, token=None, allowed_providers=None):
     token = _extract_token_value(optional=optional, token=token)
     if token is None:
@@ -381,15 +398,18 @@ def _decode_token_identity(optional=False, token=None, allowed_providers=None):
 
     demo_claims = _decode_demo_payload_token(token)
     if demo_claims and _demo_auth_enabled():
-        demo_user = _get_or_create_demo_user(demo_claims)
         return {
             'provider': DEMO_PROVIDER,
             'subject': demo_claims['sub'],
-            'user_id': demo_user.id,
+            'user_id': _resolve_demo_user_id(demo_claims),
             'claims': demo_claims,
         }
 
     providers = tuple(allowed_providers or _default_allowed_providers())
+    cached_identity = _cached_token_identity(token, providers)
+    if cached_identity is not None:
+        return cached_identity
+
     decoders = {
         SUPABASE_PROVIDER: _decode_supabase_jwt,
     }
@@ -401,7 +421,15 @@ def _decode_token_identity(optional=False, token=None, allowed_providers=None):
 
         claims = decoder(token)
         if claims is not None:
-            return _build_identity(provider, claims)
+            identity = _build_identity(provider, claims)
+            _VERIFIED_TOKEN_CACHE.set(
+                token,
+                provider=provider,
+                subject=identity['subject'],
+                user_id=identity['user_id'],
+                claims=claims,
+            )
+            return identity
 
     if optional:
         return None
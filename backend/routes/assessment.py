@@ -1,6 +1,11 @@
-from flask import Blueprint, request, jsonify, g
-from models import db, AssessmentResult, User, TrainingModule, UserProgress
+from flask import Blueprint, current_app, request, jsonify, g
+from models import db, AssessmentDomainScore, AssessmentResult, User, UserProgress
+from sqlalchemy import bindparam, insert
+from sqlalchemy.exc import SQLAlchemyError
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from functools import lru_cache
 import base64
 import hashlib
 import hmac
@@ -8,11 +13,24 @@ import json
 import os
 import random
 import re
+import threading
 import time
-import urllib.error
 import urllib.request
 import uuid
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from generated_question_bank import GeneratedQuestionBank
+from question_bank import get_question_bank
+from question_set_pool import QuestionSetPool
+from module_catalog import get_module_catalog
+from pagination import InvalidPageRequest, keyset_page, parse_page_args
+from platform_counters import increment_platform_counter
+from question_set_store import QuestionSetStoreUnavailable, build_question_set_store
+from recommendation_cache import completed_modules_digest, get_recommendation_cache, invalidate_recommendations
 from routes import get_supabase_identity, supabase_jwt_required
+from seeders.assessment_questions import SAMPLE_QUESTIONS
+from settings import get_settings
 from training_metadata import build_module_metadata
 from logging_config import get_logger
 
@@ -21,7 +39,6 @@ logger = get_logger(__name__)
 
 assessment_bp = Blueprint('assessment', __name__)
 
-# Sample assessment questions - in production, these would be in the database
 DOMAINS = [
     'AI Fundamentals',
     'Practical Usage',
@@ -43,286 +60,15 @@ LEVEL_PROMPT_GUIDANCE = {
     'intermediate': 'Use applied workplace scenarios that require tradeoff reasoning and responsible-use judgment.',
     'advanced': 'Use strategic, governance, evaluation, and implementation scenarios with nuanced distractors.',
 }
-OPENROUTER_DEFAULT_BASE_URL = 'https://openrouter.ai/api/v1'
 QUESTION_SET_TOKEN_TTL_SECONDS = 60 * 60 * 2
+QUESTION_SET_TOKEN_VERSION = 2
+QUESTION_SET_POOL_EXTENSION_KEY = 'litmusai_question_set_pool'
+OPENROUTER_CIRCUIT_EXTENSION_KEY = 'litmusai_openrouter_circuit'
+QUESTION_SET_STORE_EXTENSION_KEY = 'litmusai_question_set_store'
+GENERATED_QUESTION_BANK_EXTENSION_KEY = 'litmusai_generated_question_bank'
 
-SAMPLE_QUESTIONS = [
-    {
-        "id": "1",
-        "domain": "AI Fundamentals",
-        "question_text": "What is the primary difference between AI and traditional software?",
-        "option_a": "AI can learn and adapt from data",
-        "option_b": "AI is faster than traditional software",
-        "option_c": "AI uses more memory",
-        "option_d": "AI is more expensive",
-        "correct_answer": "A",
-        "explanation": "Unlike traditional software, AI systems can learn from data and improve performance without explicit programming for every scenario."
-    },
-    {
-        "id": "2",
-        "domain": "AI Fundamentals",
-        "question_text": "What does “machine learning” mean?",
-        "option_a": "Teaching humans about machines",
-        "option_b": "A type of AI that learns patterns from data",
-        "option_c": "Programming robots to move",
-        "option_d": "Computer maintenance procedures",
-        "correct_answer": "B",
-        "explanation": "Machine learning is a subset of AI focused on algorithms that learn patterns from data to make predictions or decisions."
-    },
-    {
-        "id": "3",
-        "domain": "AI Fundamentals",
-        "question_text": "What causes AI “hallucinations”?",
-        "option_a": "Hardware malfunctions",
-        "option_b": "User input errors",
-        "option_c": "The AI generating plausible but false information",
-        "option_d": "Internet connectivity issues",
-        "correct_answer": "C",
-        "explanation": "Hallucinations happen when AI fills gaps with confident but incorrect information based on patterns it has learned."
-    },
-    {
-        "id": "4",
-        "domain": "Practical Usage",
-        "question_text": "When writing a prompt for an AI tool, you should:",
-        "option_a": "Be vague to let AI be creative",
-        "option_b": "Be specific and clear about what you want",
-        "option_c": "Use only technical jargon",
-        "option_d": "Keep it to one word",
-        "correct_answer": "B",
-        "explanation": "Clear, specific prompts give AI models the context they need to produce accurate, useful outputs."
-    },
-    {
-        "id": "5",
-        "domain": "Practical Usage",
-        "question_text": "What’s the best practice when using AI for research or work?",
-        "option_a": "Accept all AI results without checking",
-        "option_b": "Verify important information with reliable sources",
-        "option_c": "Only use AI-generated sources",
-        "option_d": "Never use AI for professional work",
-        "correct_answer": "B",
-        "explanation": "AI outputs should be validated, especially for critical work—treat them as a starting point, not the final answer."
-    },
-    {
-        "id": "6",
-        "domain": "Practical Usage",
-        "question_text": "An AI tool gives you conflicting information on the same topic. You should:",
-        "option_a": "Use the first response",
-        "option_b": "Research the topic independently to verify",
-        "option_c": "Choose the longer response",
-        "option_d": "Ask the same question again",
-        "correct_answer": "B",
-        "explanation": "When AI responses conflict, cross-checking with trustworthy human-vetted sources ensures accuracy."
-    },
-    {
-        "id": "7",
-        "domain": "Ethics & Critical Thinking",
-        "question_text": "What is “algorithmic bias”?",
-        "option_a": "AI systems running slowly",
-        "option_b": "AI systems making unfair decisions based on training data",
-        "option_c": "Programming syntax errors",
-        "option_d": "Hardware processing limitations",
-        "correct_answer": "B",
-        "explanation": "Algorithmic bias occurs when AI models inherit or amplify unfair patterns found in their training data."
-    },
-    {
-        "id": "8",
-        "domain": "Ethics & Critical Thinking",
-        "question_text": "You notice an AI hiring tool consistently rejects qualified candidates from certain groups. This indicates:",
-        "option_a": "The system is working efficiently",
-        "option_b": "Potential discriminatory bias that needs investigation",
-        "option_c": "Normal performance variation",
-        "option_d": "Cost-saving optimization",
-        "correct_answer": "B",
-        "explanation": "Consistent rejection of specific groups is a warning sign of bias that requires immediate review and mitigation."
-    },
-    {
-        "id": "9",
-        "domain": "Ethics & Critical Thinking",
-        "question_text": "Before trusting AI-generated content, you should:",
-        "option_a": "Always trust it completely",
-        "option_b": "Consider the source, context, and verify key facts",
-        "option_c": "Only check if it looks suspicious",
-        "option_d": "Never trust AI content",
-        "correct_answer": "B",
-        "explanation": "Evaluating source credibility and validating important details prevents misinformation from spreading."
-    },
-    {
-        "id": "10",
-        "domain": "AI Impact & Applications",
-        "question_text": "Which task is current AI BEST suited for?",
-        "option_a": "Providing emotional counseling",
-        "option_b": "Recognizing patterns in large amounts of data",
-        "option_c": "Making complex ethical decisions",
-        "option_d": "Replacing all human judgment",
-        "correct_answer": "B",
-        "explanation": "AI excels at analyzing large datasets to surface patterns, trends, and insights quickly."
-    },
-    {
-        "id": "11",
-        "domain": "AI Impact & Applications",
-        "question_text": "How is AI most likely to affect jobs in the next 5 years?",
-        "option_a": "Eliminate all human jobs",
-        "option_b": "Automate some tasks while creating new types of work",
-        "option_c": "Only affect technology jobs",
-        "option_d": "Have no impact on employment",
-        "correct_answer": "B",
-        "explanation": "AI will automate repetitive tasks but also create new opportunities that require human oversight and strategic thinking."
-    },
-    {
-        "id": "12",
-        "domain": "AI Impact & Applications",
-        "question_text": "What’s a realistic expectation for AI tools today?",
-        "option_a": "They can solve any business problem perfectly",
-        "option_b": "They can assist with analysis and draft generation",
-        "option_c": "They always provide 100% accurate information",
-        "option_d": "They can replace human creativity entirely",
-        "correct_answer": "B",
-        "explanation": "Modern AI is a powerful assistant for analysis and content creation, but still requires human oversight."
-    },
-    {
-        "id": "13",
-        "domain": "Strategic Understanding",
-        "question_text": "When should you choose NOT to use AI for a task?",
-        "option_a": "When it costs money",
-        "option_b": "When human empathy, ethics, or critical judgment are essential",
-        "option_c": "When the technology is new",
-        "option_d": "Never - AI should be used for everything",
-        "correct_answer": "B",
-        "explanation": "Tasks that depend on empathy, ethical nuance, or high-stakes judgment should remain human-led."
-    },
-    {
-        "id": "14",
-        "domain": "Strategic Understanding",
-        "question_text": "What does successful human-AI collaboration look like?",
-        "option_a": "Humans competing against AI",
-        "option_b": "AI and humans complementing each other’s strengths",
-        "option_c": "AI doing all the work",
-        "option_d": "Humans avoiding AI entirely",
-        "correct_answer": "B",
-        "explanation": "The strongest outcomes happen when humans and AI combine strengths—strategy and creativity with speed and scale."
-    },
-    {
-        "id": "15",
-        "domain": "Strategic Understanding",
-        "question_text": "You’re implementing AI in your organization. What’s most important?",
-        "option_a": "Choosing the most expensive AI solution",
-        "option_b": "Training employees and establishing ethical guidelines",
-        "option_c": "Replacing as many human workers as possible",
-        "option_d": "Focusing only on cost savings",
-        "correct_answer": "B",
-        "explanation": "Successful AI adoption depends on skilled people and clear ethical guardrails, not just technology investments."
-    },
-    {
-        "id": "16",
-        "domain": "AI Fundamentals",
-        "question_text": "Which phrase best describes “training data” for AI models?",
-        "option_a": "Data used to operate software without user input",
-        "option_b": "Examples that teach the model patterns and relationships",
-        "option_c": "The final output produced by the model",
-        "option_d": "A list of software bugs to fix",
-        "correct_answer": "B",
-        "explanation": "Training data consists of examples that let the model learn patterns over many iterations."
-    },
-    {
-        "id": "17",
-        "domain": "AI Fundamentals",
-        "question_text": "Why is data quality important for AI systems?",
-        "option_a": "Better data always makes models run faster",
-        "option_b": "High-quality data improves reliability and reduces harmful outputs",
-        "option_c": "Poor data is only a user interface issue",
-        "option_d": "Data quality does not matter once a model is deployed",
-        "correct_answer": "B",
-        "explanation": "Model quality is tied closely to the quality of the data used to train it, especially for fairness and accuracy."
-    },
-    {
-        "id": "18",
-        "domain": "Practical Usage",
-        "question_text": "If an AI-generated response includes wrong details, what should you do first?",
-        "option_a": "Ignore it and move on",
-        "option_b": "Verify with trusted references",
-        "option_c": "Ask the AI to confirm its confidence",
-        "option_d": "Post it immediately to stakeholders",
-        "correct_answer": "B",
-        "explanation": "Verification with trusted sources is the fastest way to correct possible inaccuracies."
-    },
-    {
-        "id": "19",
-        "domain": "Practical Usage",
-        "question_text": "Which prompt style is most useful for brainstorming ideas?",
-        "option_a": "A strict, single-word instruction",
-        "option_b": "A broad open prompt with role, context, constraints, and format",
-        "option_c": "A request without context",
-        "option_d": "No prompt is needed; AI auto-generates ideas by default",
-        "correct_answer": "B",
-        "explanation": "Rich context and constraints help AI give outputs that are easier to use and evaluate."
-    },
-    {
-        "id": "20",
-        "domain": "Ethics & Critical Thinking",
-        "question_text": "What should you do if AI output reveals sensitive personal data?",
-        "option_a": "Share it with your team immediately",
-        "option_b": "Redact or report it through your privacy process",
-        "option_c": "Store it and forget about it",
-        "option_d": "Use it in your marketing campaign",
-        "correct_answer": "B",
-        "explanation": "Sensitive outputs should be handled under privacy and data-protection practices, not treated as ordinary output."
-    },
-    {
-        "id": "21",
-        "domain": "Ethics & Critical Thinking",
-        "question_text": "Which practice helps reduce model bias risks in production?",
-        "option_a": "Testing with diverse user groups and auditing outputs",
-        "option_b": "Restricting model updates forever",
-        "option_c": "Only using one dataset source",
-        "option_d": "Avoiding any feedback process",
-        "correct_answer": "A",
-        "explanation": "Ongoing evaluation with diverse scenarios is key to catching fairness gaps before harm occurs."
-    },
-    {
-        "id": "22",
-        "domain": "AI Impact & Applications",
-        "question_text": "Where is AI most commonly adopted for short-cycle operational gain?",
-        "option_a": "Only for legal sentencing decisions",
-        "option_b": "Customer support triage and document automation",
-        "option_c": "Replacing board-level leadership roles",
-        "option_d": "Replacing all manual tasks instantly",
-        "correct_answer": "B",
-        "explanation": "AI often delivers fast ROI in repetitive support, routing, and document-heavy workflows."
-    },
-    {
-        "id": "23",
-        "domain": "AI Impact & Applications",
-        "question_text": "What is a practical first application for teams new to AI?",
-        "option_a": "Full autonomous company operations",
-        "option_b": "Automated meeting minute drafts with human review",
-        "option_c": "Replacing all strategic decisions with AI",
-        "option_d": "Hiring no human reviewers",
-        "correct_answer": "B",
-        "explanation": "Pilot projects with human review build confidence before scaling AI use."
-    },
-    {
-        "id": "24",
-        "domain": "Strategic Understanding",
-        "question_text": "How should leadership frame AI adoption goals?",
-        "option_a": "As a shortcut for governance and compliance",
-        "option_b": "As measurable business outcomes with responsible guardrails",
-        "option_c": "As a way to reduce all employee ownership",
-        "option_d": "As a trend to satisfy investors only",
-        "correct_answer": "B",
-        "explanation": "AI strategy works best when outcomes, risk controls, and ownership are clearly defined."
-    },
-    {
-        "id": "25",
-        "domain": "Strategic Understanding",
-        "question_text": "What is a strong indicator of AI strategy maturity?",
-        "option_a": "Adopting the newest model every quarter",
-        "option_b": "Measuring outcomes, iterating, and balancing ethics with speed",
-        "option_c": "Avoiding AI whenever uncertainty exists",
-        "option_d": "Deploying without cross-team communication",
-        "correct_answer": "B",
-        "explanation": "Mature strategy couples experimentation with accountability, governance, and measurable value."
-    }
-]
+_GENERATION_EXECUTOR = None
+_GENERATION_EXECUTOR_LOCK = threading.Lock()
 
 
 def _normalize_assessment_level(value, default=DEFAULT_ASSESSMENT_LEVEL):
@@ -377,7 +123,7 @@ def _prepare_question_for_delivery(question):
 
 
 def _get_question_set_secret():
-    return str(os.getenv('ASSESSMENT_QUESTION_SET_SECRET') or '').strip()
+    return get_settings().assessment.question_set_secret
 
 
 def _b64url_encode(raw):
@@ -445,23 +191,61 @@ def _answer_hash(question, answer_letter, assessment_level, secret):
     return hmac.new(secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).hexdigest()
 
 
-def _create_question_set_token(grading_questions, assessment_level, model):
+@lru_cache(maxsize=8)
+def _answer_key_cipher(secret):
+    derived_key = hmac.new(
+        secret.encode('utf-8'),
+        b'assessment-question-set-v2-answer-key',
+        hashlib.sha256,
+    ).digest()
+    return AESGCM(derived_key)
+
+
+def _answer_key_associated_data(assessment_level, question_ids):
+    return '|'.join([str(assessment_level), *question_ids]).encode('utf-8')
+
+
+def _encrypt_answer_key(answer_letters, assessment_level, question_ids, secret):
+    nonce = os.urandom(12)
+    ciphertext = _answer_key_cipher(secret).encrypt(
+        nonce,
+        ''.join(answer_letters).encode('ascii'),
+        _answer_key_associated_data(assessment_level, question_ids),
+    )
+    return _b64url_encode(nonce + ciphertext)
+
+
+def _decrypt_answer_key(answer_key, assessment_level, question_ids, secret):
+    try:
+        raw = _b64url_decode(answer_key)
+        plaintext = _answer_key_cipher(secret).decrypt(
+            raw[:12],
+            raw[12:],
+            _answer_key_associated_data(assessment_level, question_ids),
+        )
+        return plaintext.decode('ascii')
+    except (InvalidTag, ValueError, TypeError):
+        return None
+
+
+def _create_question_set_token(grading_questions, assessment_level, model, version=QUESTION_SET_TOKEN_VERSION):
     secret = _get_question_set_secret()
     if not secret:
         return None
 
     now = int(time.time())
     payload_questions = []
+    answer_letters = []
     for question in grading_questions:
         correct_answer = str(question['correct_answer']).upper()
         public_question = _question_public_payload(question)
-        payload_questions.append({
-            **public_question,
-            'answer_hash': _answer_hash(question, correct_answer, assessment_level, secret),
-        })
+        if version == 1:
+            public_question['answer_hash'] = _answer_hash(question, correct_answer, assessment_level, secret)
+        payload_questions.append(public_question)
+        answer_letters.append(correct_answer)
 
-    return _sign_payload({
-        'v': 1,
+    payload = {
+        'v': version,
         'kind': 'assessment_question_set',
         'assessment_level': assessment_level,
         'generation_source': 'openrouter',
@@ -469,12 +253,146 @@ def _create_question_set_token(grading_questions, assessment_level, model):
         'iat': now,
         'exp': now + QUESTION_SET_TOKEN_TTL_SECONDS,
         'questions': payload_questions,
+    }
+    if version != 1:
+        payload['answer_key'] = _encrypt_answer_key(
+            answer_letters,
+            assessment_level,
+            [question['id'] for question in payload_questions],
+            secret,
+        )
+    return _sign_payload(payload, secret)
+
+
+def _question_set_store():
+    extensions = current_app.extensions
+    if QUESTION_SET_STORE_EXTENSION_KEY not in extensions:
+        extensions[QUESTION_SET_STORE_EXTENSION_KEY] = build_question_set_store(
+            get_settings().assessment.question_set_store,
+            QUESTION_SET_TOKEN_TTL_SECONDS,
+        )
+    return extensions[QUESTION_SET_STORE_EXTENSION_KEY]
+
+
+def purge_expired_question_sets():
+    store = _question_set_store()
+    if store is None:
+        return None
+    return store.purge_expired()
+
+
+def _stored_question_payload(question):
+    return {
+        **_question_public_payload(question),
+        'correct_answer': str(question['correct_answer']).upper(),
+        'explanation': str(question.get('explanation') or ''),
+    }
+
+
+def _issue_question_set_token(grading_questions, assessment_level, model):
+    """Store the set server-side and return a short reference token, or a self-contained token."""
+    store = _question_set_store()
+    secret = _get_question_set_secret()
+    if store is None or not secret:
+        return _create_question_set_token(grading_questions, assessment_level, model)
+
+    stored_questions = [_stored_question_payload(question) for question in grading_questions]
+    try:
+        set_id = store.put(assessment_level, {
+            'assessment_level': assessment_level,
+            'generation_source': 'openrouter',
+            'model': model,
+            'selected_question_ids': [question['id'] for question in stored_questions],
+            'questions': stored_questions,
+        })
+    except QuestionSetStoreUnavailable as exc:
+        logger.warning('question_set_store_put_failed', backend=store.backend, error=str(exc))
+        return _create_question_set_token(grading_questions, assessment_level, model)
+
+    now = int(time.time())
+    return _sign_payload({
+        'v': 1,
+        'kind': 'assessment_question_set_ref',
+        'sid': set_id,
+        'iat': now,
+        'exp': now + QUESTION_SET_TOKEN_TTL_SECONDS,
     }, secret)
 
 
+def _resolve_question_set_reference(payload):
+    set_id = payload.get('sid')
+    store = _question_set_store()
+    if store is None or not isinstance(set_id, str):
+        return None
+
+    try:
+        stored = store.get(set_id)
+    except QuestionSetStoreUnavailable as exc:
+        logger.warning('question_set_store_get_failed', backend=store.backend, error=str(exc))
+        return None
+
+    if not stored or not isinstance(stored.get('questions'), list):
+        return None
+
+    return {
+        'assessment_level': _normalize_assessment_level(stored.get('assessment_level')),
+        'generation_source': stored.get('generation_source') or 'openrouter',
+        'selected_question_ids': list(stored.get('selected_question_ids') or []),
+        'questions': [dict(question) for question in stored['questions']],
+    }
+
+
+def _grading_question_from_payload(question):
+    if not isinstance(question, dict):
+        return None
+
+    question_id = _normalize_question_id(question.get('id'))
+    domain = str(question.get('domain') or '').strip()
+    question_text = str(question.get('question_text') or '').strip()
+    option_values = {
+        'A': str(question.get('option_a') or '').strip(),
+        'B': str(question.get('option_b') or '').strip(),
+        'C': str(question.get('option_c') or '').strip(),
+        'D': str(question.get('option_d') or '').strip(),
+    }
+
+    if not question_id or domain not in DOMAINS or not question_text:
+        return None
+    if any(not option_text for option_text in option_values.values()):
+        return None
+
+    return {
+        'id': question_id,
+        'domain': domain,
+        'question_text': question_text,
+        'option_a': option_values['A'],
+        'option_b': option_values['B'],
+        'option_c': option_values['C'],
+        'option_d': option_values['D'],
+        'correct_answer': '',
+        'explanation': '',
+    }
+
+
+def _v1_correct_answer(question, grading_question, assessment_level, secret):
+    answer_hash = str(question.get('answer_hash') or '').strip()
+    if not answer_hash:
+        return ''
+
+    for answer_letter in ('A', 'B', 'C', 'D'):
+        if hmac.compare_digest(
+            _answer_hash(grading_question, answer_letter, assessment_level, secret),
+            answer_hash,
+        ):
+            return answer_letter
+    return ''
+
+
 def _resolve_question_set_token(token):
     payload = _decode_signed_payload(token)
-    if not payload or payload.get('kind') != 'assessment_question_set' or payload.get('v') != 1:
+    if payload and payload.get('kind') == 'assessment_question_set_ref':
+        return _resolve_question_set_reference(payload)
+    if not payload or payload.get('kind') != 'assessment_question_set' or payload.get('v') not in (1, 2):
         return None
 
     assessment_level = _normalize_assessment_level(payload.get('assessment_level'), default=None)
@@ -488,55 +406,39 @@ def _resolve_question_set_token(token):
     selected_question_ids = []
 
     for question in questions:
-        if not isinstance(question, dict):
+        grading_question = _grading_question_from_payload(question)
+        if grading_question is None:
             return None
 
-        question_id = _normalize_question_id(question.get('id'))
-        domain = str(question.get('domain') or '').strip()
-        question_text = str(question.get('question_text') or '').strip()
-        answer_hash = str(question.get('answer_hash') or '').strip()
-        option_values = {
-            'A': str(question.get('option_a') or '').strip(),
-            'B': str(question.get('option_b') or '').strip(),
-            'C': str(question.get('option_c') or '').strip(),
-            'D': str(question.get('option_d') or '').strip(),
-        }
-
-        if not question_id or domain not in DOMAINS or not question_text or not answer_hash:
-            return None
-        if any(not option_text for option_text in option_values.values()):
-            return None
-
-        grading_question = {
-            'id': question_id,
-            'domain': domain,
-            'question_text': question_text,
-            'option_a': option_values['A'],
-            'option_b': option_values['B'],
-            'option_c': option_values['C'],
-            'option_d': option_values['D'],
-            'correct_answer': '',
-            'explanation': '',
-        }
-
-        for answer_letter in ('A', 'B', 'C', 'D'):
-            if hmac.compare_digest(
-                _answer_hash(grading_question, answer_letter, assessment_level, secret),
-                answer_hash,
-            ):
-                grading_question['correct_answer'] = answer_letter
-                break
-
-        if not grading_question['correct_answer']:
-            return None
-
-        domain_counts[domain] += 1
+        domain_counts[grading_question['domain']] += 1
         grading_questions.append(grading_question)
-        selected_question_ids.append(question_id)
+        selected_question_ids.append(grading_question['id'])
 
     if domain_counts != Counter({domain: QUESTIONS_PER_DOMAIN for domain in DOMAINS}):
         return None
 
+    if payload['v'] == 1:
+        answer_letters = [
+            _v1_correct_answer(question, grading_question, assessment_level, secret)
+            for question, grading_question in zip(questions, grading_questions)
+        ]
+    else:
+        answer_key = _decrypt_answer_key(
+            str(payload.get('answer_key') or ''),
+            assessment_level,
+            selected_question_ids,
+            secret,
+        )
+        answer_letters = list(answer_key or '')
+
+    if len(answer_letters) != len(grading_questions) or any(
+        letter not in ('A', 'B', 'C', 'D') for letter in answer_letters
+    ):
+        return None
+
+    for grading_question, answer_letter in zip(grading_questions, answer_letters):
+        grading_question['correct_answer'] = answer_letter
+
     return {
         'assessment_level': assessment_level,
         'generation_source': payload.get('generation_source') or 'openrouter',
@@ -546,21 +448,38 @@ def _resolve_question_set_token(token):
 
 
 def _openrouter_settings():
-    api_key = str(os.getenv('OPENROUTER_API_KEY') or '').strip()
-    model = str(os.getenv('OPENROUTER_MODEL') or '').strip()
-    base_url = str(os.getenv('OPENROUTER_BASE_URL') or OPENROUTER_DEFAULT_BASE_URL).strip().rstrip('/')
-    question_set_secret = _get_question_set_secret()
-
-    if not api_key or not model or not question_set_secret:
+    settings = get_settings().assessment
+    if not settings.openrouter_configured:
         return None
 
     return {
-        'api_key': api_key,
-        'model': model,
-        'base_url': base_url or OPENROUTER_DEFAULT_BASE_URL,
+        'api_key': settings.openrouter_api_key,
+        'model': settings.openrouter_model,
+        'base_url': settings.openrouter_base_url,
+        'latency_budget_seconds': settings.openrouter_latency_budget_seconds,
+        'generation_mode': settings.openrouter_generation_mode,
+        'domain_retries': settings.openrouter_domain_retries,
     }
 
 
+def _openrouter_circuit():
+    breaker = current_app.extensions.get(OPENROUTER_CIRCUIT_EXTENSION_KEY)
+    if breaker is None:
+        settings = get_settings().assessment
+        breaker = CircuitBreaker(
+            'openrouter',
+            failure_threshold=settings.openrouter_circuit_failure_threshold,
+            recovery_seconds=settings.openrouter_circuit_recovery_seconds,
+            half_open_max_calls=settings.openrouter_circuit_half_open_max_calls,
+        )
+        current_app.extensions[OPENROUTER_CIRCUIT_EXTENSION_KEY] = breaker
+    return breaker
+
+
+def get_openrouter_circuit_stats():
+    return _openrouter_circuit().stats()
+
+
 def _assessment_generation_prompt(assessment_level):
     domain_list = '\n'.join(f'- {domain}: exactly {QUESTIONS_PER_DOMAIN} questions' for domain in DOMAINS)
     return (
@@ -578,7 +497,22 @@ def _assessment_generation_prompt(assessment_level):
     )
 
 
-def _post_openrouter_chat_completion(*, api_key, model, base_url, messages):
+def _domain_generation_prompt(assessment_level, domain):
+    return (
+        'Generate AI literacy assessment questions for a single domain. '
+        f'The learner level is "{assessment_level}" and the domain is "{domain}". '
+        f'{LEVEL_PROMPT_GUIDANCE.get(assessment_level, LEVEL_PROMPT_GUIDANCE[DEFAULT_ASSESSMENT_LEVEL])} '
+        'Return JSON only, with this exact shape: '
+        f'{{"questions":[{{"domain":"{domain}","question_text":"...","option_a":"...",'
+        '"option_b":"...","option_c":"...","option_d":"...","correct_answer":"A",'
+        '"explanation":"..."}]}. '
+        f'Rules: return exactly {QUESTIONS_PER_DOMAIN} questions, all in the "{domain}" domain. '
+        'Each question must have four plausible answer choices, one correct answer letter A-D, '
+        'workplace-relevant wording, and no markdown.'
+    )
+
+
+def _post_openrouter_chat_completion(*, api_key, model, base_url, messages, timeout=20):
     request_body = json.dumps({
         'model': model,
         'messages': messages,
@@ -597,7 +531,7 @@ def _post_openrouter_chat_completion(*, api_key, model, base_url, messages):
         method='POST',
     )
 
-    with urllib.request.urlopen(http_request, timeout=20) as response:
+    with urllib.request.urlopen(http_request, timeout=timeout) as response:
         return json.loads(response.read().decode('utf-8'))
 
 
@@ -661,55 +595,76 @@ def _coerce_option_values(raw_question):
     ]
 
 
-def _normalize_generated_questions(parsed_payload, assessment_level):
+def _raw_generated_questions(parsed_payload):
     if isinstance(parsed_payload, dict):
-        raw_questions = parsed_payload.get('questions')
-    else:
-        raw_questions = parsed_payload
+        return parsed_payload.get('questions')
+    return parsed_payload
+
+
+def _normalize_generated_question(raw_question, default_domain=None):
+    if not isinstance(raw_question, dict):
+        return None
+
+    domain = str(raw_question.get('domain') or default_domain or '').strip()
+    question_text = str(
+        raw_question.get('question_text') or raw_question.get('question') or ''
+    ).strip()
+    correct_answer_raw = str(raw_question.get('correct_answer') or raw_question.get('answer') or '').strip()
+    option_values = _coerce_option_values(raw_question)
+    correct_answer = correct_answer_raw.upper()
+    if correct_answer not in ('A', 'B', 'C', 'D'):
+        normalized_correct_text = correct_answer_raw.lower()
+        for option_index, option_value in enumerate(option_values):
+            if option_value.lower() == normalized_correct_text:
+                correct_answer = chr(ord('A') + option_index)
+                break
+
+    if (
+        domain not in DOMAINS
+        or not question_text
+        or len(option_values) != 4
+        or any(not option for option in option_values)
+        or correct_answer not in ('A', 'B', 'C', 'D')
+    ):
+        return None
+
+    return {
+        'domain': domain,
+        'question_text': question_text,
+        'option_a': option_values[0],
+        'option_b': option_values[1],
+        'option_c': option_values[2],
+        'option_d': option_values[3],
+        'correct_answer': correct_answer,
+        'explanation': str(raw_question.get('explanation') or '').strip(),
+    }
+
+
+def _assign_generated_question_id(question, assessment_level, question_number):
+    return {
+        'id': (
+            f'generated-{assessment_level}-{_domain_slug(question["domain"])}-'
+            f'{question_number}-{uuid.uuid4().hex[:8]}'
+        ),
+        **question,
+    }
+
 
+def _normalize_generated_questions(parsed_payload, assessment_level):
+    raw_questions = _raw_generated_questions(parsed_payload)
     if not isinstance(raw_questions, list) or len(raw_questions) != len(DOMAINS) * QUESTIONS_PER_DOMAIN:
         return None
 
     questions_by_domain = {domain: [] for domain in DOMAINS}
     for raw_question in raw_questions:
-        if not isinstance(raw_question, dict):
-            return None
-
-        domain = str(raw_question.get('domain') or '').strip()
-        question_text = str(
-            raw_question.get('question_text') or raw_question.get('question') or ''
-        ).strip()
-        correct_answer_raw = str(raw_question.get('correct_answer') or raw_question.get('answer') or '').strip()
-        option_values = _coerce_option_values(raw_question)
-        correct_answer = correct_answer_raw.upper()
-        if correct_answer not in ('A', 'B', 'C', 'D'):
-            normalized_correct_text = correct_answer_raw.lower()
-            for option_index, option_value in enumerate(option_values):
-                if option_value.lower() == normalized_correct_text:
-                    correct_answer = chr(ord('A') + option_index)
-                    break
-
-        if (
-            domain not in questions_by_domain
-            or not question_text
-            or len(option_values) != 4
-            or any(not option for option in option_values)
-            or correct_answer not in ('A', 'B', 'C', 'D')
-        ):
+        question = _normalize_generated_question(raw_question)
+        if question is None:
             return None
 
-        question_number = len(questions_by_domain[domain]) + 1
-        questions_by_domain[domain].append({
-            'id': f'generated-{assessment_level}-{_domain_slug(domain)}-{question_number}-{uuid.uuid4().hex[:8]}',
-            'domain': domain,
-            'question_text': question_text,
-            'option_a': option_values[0],
-            'option_b': option_values[1],
-            'option_c': option_values[2],
-            'option_d': option_values[3],
-            'correct_answer': correct_answer,
-            'explanation': str(raw_question.get('explanation') or '').strip(),
-        })
+        domain_questions = questions_by_domain[question['domain']]
+        domain_questions.append(
+            _assign_generated_question_id(question, assessment_level, len(domain_questions) + 1)
+        )
 
     if any(len(questions_by_domain[domain]) != QUESTIONS_PER_DOMAIN for domain in DOMAINS):
         return None
@@ -721,56 +676,241 @@ def _normalize_generated_questions(parsed_payload, assessment_level):
     return normalized_questions
 
 
+def _normalize_domain_questions(parsed_payload, assessment_level, domain):
+    raw_questions = _raw_generated_questions(parsed_payload)
+    if not isinstance(raw_questions, list) or len(raw_questions) != QUESTIONS_PER_DOMAIN:
+        return None
+
+    domain_questions = []
+    for raw_question in raw_questions:
+        question = _normalize_generated_question(raw_question, default_domain=domain)
+        if question is None or question['domain'] != domain:
+            return None
+        domain_questions.append(
+            _assign_generated_question_id(question, assessment_level, len(domain_questions) + 1)
+        )
+    return domain_questions
+
+
+def _request_openrouter_questions(breaker, settings, prompt, timeout=None):
+    """Ask OpenRouter for questions; with ``breaker=None`` the caller records the breaker outcome itself."""
+    request_options = {
+        'api_key': settings['api_key'],
+        'model': settings['model'],
+        'base_url': settings['base_url'],
+        'timeout': timeout or settings['latency_budget_seconds'],
+        'messages': [
+            {
+                'role': 'system',
+                'content': 'You create valid JSON assessment content for AI literacy learning products.',
+            },
+            {
+                'role': 'user',
+                'content': prompt,
+            },
+        ],
+    }
+    if breaker is None:
+        openrouter_response = _post_openrouter_chat_completion(**request_options)
+    else:
+        openrouter_response = breaker.call(
+            _post_openrouter_chat_completion,
+            latency_budget_seconds=settings['latency_budget_seconds'],
+            **request_options,
+        )
+    return _parse_json_from_text(_extract_openrouter_message_text(openrouter_response))
+
+
+def _generation_executor():
+    global _GENERATION_EXECUTOR
+    with _GENERATION_EXECUTOR_LOCK:
+        if _GENERATION_EXECUTOR is None:
+            _GENERATION_EXECUTOR = ThreadPoolExecutor(
+                max_workers=len(DOMAINS) * 2,
+                thread_name_prefix='openrouter-domain',
+            )
+        return _GENERATION_EXECUTOR
+
+
+def _generate_domain_questions(settings, assessment_level, domain, timeout):
+    """Returns ``(questions, upstream_error)``; malformed output is ``(None, None)``."""
+    try:
+        parsed_payload = _request_openrouter_questions(
+            None,
+            settings,
+            _domain_generation_prompt(assessment_level, domain),
+            timeout=timeout,
+        )
+    except (OSError, ValueError, TypeError, KeyError) as exc:
+        logger.warning(
+            'openrouter_domain_questions_failed',
+            assessment_level=assessment_level,
+            domain=domain,
+            error=str(exc),
+        )
+        return None, type(exc).__name__
+
+    domain_questions = _normalize_domain_questions(parsed_payload, assessment_level, domain)
+    if domain_questions is None:
+        logger.warning('openrouter_domain_questions_invalid', assessment_level=assessment_level, domain=domain)
+    return domain_questions, None
+
+
+def _generate_questions_per_domain(breaker, settings, assessment_level):
+    # The whole question set is one call as far as the breaker is concerned: a
+    # single failed set must not count once per domain against the threshold.
+    if not breaker.allow_request():
+        raise CircuitOpenError(f'{breaker.name} circuit is open')
+
+    budget_seconds = settings['latency_budget_seconds']
+    started = time.monotonic()
+    deadline = started + budget_seconds
+    executor = _generation_executor()
+    questions_by_domain = {}
+    pending_domains = list(DOMAINS)
+    upstream_error = None
+    timed_out = False
+
+    try:
+        for attempt in range(settings['domain_retries'] + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            futures = {
+                domain: executor.submit(_generate_domain_questions, settings, assessment_level, domain, remaining)
+                for domain in pending_domains
+            }
+            for domain, future in futures.items():
+                try:
+                    domain_questions, error = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    # The HTTP call is bounded by the same budget, so the worker thread frees itself.
+                    future.cancel()
+                    timed_out = True
+                    continue
+                if error:
+                    upstream_error = error
+                if domain_questions:
+                    questions_by_domain[domain] = domain_questions
+
+            pending_domains = [domain for domain in pending_domains if domain not in questions_by_domain]
+            if not pending_domains:
+                break
+            if attempt < settings['domain_retries']:
+                logger.info(
+                    'openrouter_domain_questions_retrying',
+                    assessment_level=assessment_level,
+                    domains=pending_domains,
+                )
+    except Exception as exc:
+        breaker.record_failure(type(exc).__name__)
+        raise
+
+    if timed_out:
+        breaker.record_latency_budget_exceeded()
+    elif pending_domains and upstream_error:
+        breaker.record_failure(upstream_error)
+    else:
+        breaker.record_completion(time.monotonic() - started, budget_seconds)
+
+    if pending_domains:
+        return None
+
+    generated_questions = [question for domain in DOMAINS for question in questions_by_domain[domain]]
+    random.shuffle(generated_questions)
+    return generated_questions
+
+
+def _deliver_generated_questions(generated_questions, assessment_level, model):
+    public_questions = []
+    grading_questions = []
+    for question in generated_questions:
+        public_question, grading_question = _prepare_question_for_delivery(question)
+        public_questions.append(public_question)
+        grading_questions.append(grading_question)
+
+    question_set_token = _issue_question_set_token(
+        grading_questions,
+        assessment_level,
+        model,
+    )
+    if not question_set_token:
+        logger.warning('openrouter_assessment_questions_unsigned', assessment_level=assessment_level)
+        return None
+
+    return {
+        'questions': public_questions,
+        'selected_question_ids': [question['id'] for question in public_questions],
+        'question_set_token': question_set_token,
+        'generation_source': 'openrouter',
+    }
+
+
+def _generated_question_bank():
+    bank = current_app.extensions.get(GENERATED_QUESTION_BANK_EXTENSION_KEY)
+    if bank is None:
+        bank = GeneratedQuestionBank(
+            domains=DOMAINS,
+            similarity_threshold=get_settings().assessment.generated_question_similarity_threshold,
+        )
+        current_app.extensions[GENERATED_QUESTION_BANK_EXTENSION_KEY] = bank
+    return bank
+
+
+def get_generated_question_bank_stats():
+    return _generated_question_bank().stats()
+
+
+def _remember_generated_questions(generated_questions, assessment_level, model):
+    inserted = _generated_question_bank().add(generated_questions, assessment_level=assessment_level, model=model)
+    if inserted:
+        logger.info('generated_questions_banked', assessment_level=assessment_level, inserted=inserted)
+
+
+def _banked_question_set(assessment_level):
+    """Assemble a set from previously generated questions, skipping the model call."""
+    settings = _openrouter_settings()
+    assessment_settings = get_settings().assessment
+    if not settings or random.random() >= assessment_settings.generated_question_reuse_ratio:
+        return None
+
+    banked_questions = _generated_question_bank().draw(
+        assessment_level,
+        QUESTIONS_PER_DOMAIN,
+        assessment_settings.generated_question_min_per_domain,
+    )
+    if not banked_questions:
+        return None
+    return _deliver_generated_questions(banked_questions, assessment_level, settings['model'])
+
+
 def _generate_openrouter_question_set(assessment_level):
     settings = _openrouter_settings()
     if not settings:
         return None
 
+    breaker = _openrouter_circuit()
     try:
-        openrouter_response = _post_openrouter_chat_completion(
-            api_key=settings['api_key'],
-            model=settings['model'],
-            base_url=settings['base_url'],
-            messages=[
-                {
-                    'role': 'system',
-                    'content': 'You create valid JSON assessment content for AI literacy learning products.',
-                },
-                {
-                    'role': 'user',
-                    'content': _assessment_generation_prompt(assessment_level),
-                },
-            ],
-        )
-        parsed_payload = _parse_json_from_text(_extract_openrouter_message_text(openrouter_response))
-        generated_questions = _normalize_generated_questions(parsed_payload, assessment_level)
+        if settings['generation_mode'] == 'per_domain':
+            generated_questions = _generate_questions_per_domain(breaker, settings, assessment_level)
+        else:
+            parsed_payload = _request_openrouter_questions(
+                breaker,
+                settings,
+                _assessment_generation_prompt(assessment_level),
+            )
+            generated_questions = _normalize_generated_questions(parsed_payload, assessment_level)
         if not generated_questions:
             logger.warning('openrouter_assessment_questions_invalid', assessment_level=assessment_level)
             return None
 
-        public_questions = []
-        grading_questions = []
-        for question in generated_questions:
-            public_question, grading_question = _prepare_question_for_delivery(question)
-            public_questions.append(public_question)
-            grading_questions.append(grading_question)
-
-        question_set_token = _create_question_set_token(
-            grading_questions,
-            assessment_level,
-            settings['model'],
-        )
-        if not question_set_token:
-            logger.warning('openrouter_assessment_questions_unsigned', assessment_level=assessment_level)
-            return None
-
-        return {
-            'questions': public_questions,
-            'selected_question_ids': [question['id'] for question in public_questions],
-            'question_set_token': question_set_token,
-            'generation_source': 'openrouter',
-        }
-    except (urllib.error.URLError, TimeoutError, ValueError, TypeError, KeyError) as exc:
+        _remember_generated_questions(generated_questions, assessment_level, settings['model'])
+        return _deliver_generated_questions(generated_questions, assessment_level, settings['model'])
+    except CircuitOpenError:
+        logger.info('openrouter_assessment_questions_skipped_circuit_open', assessment_level=assessment_level)
+        return None
+    except (OSError, ValueError, TypeError, KeyError) as exc:
         logger.warning(
             'openrouter_assessment_questions_failed',
             assessment_level=assessment_level,
@@ -779,46 +919,50 @@ def _generate_openrouter_question_set(assessment_level):
         return None
 
 
-def _group_questions_by_domain():
-    questions_by_domain = {domain: [] for domain in DOMAINS}
-    for question in SAMPLE_QUESTIONS:
-        domain = question['domain']
-        if domain in questions_by_domain:
-            questions_by_domain[domain].append(question)
-    return questions_by_domain
+def _question_set_pool():
+    pool = current_app.extensions.get(QUESTION_SET_POOL_EXTENSION_KEY)
+    if pool is None:
+        settings = get_settings().assessment
+        pool = QuestionSetPool(
+            levels=ASSESSMENT_LEVELS,
+            generate=lambda assessment_level: _generate_openrouter_question_set(assessment_level),
+            target_depth=settings.question_set_pool_depth,
+            max_age_seconds=min(settings.question_set_pool_max_age_seconds, QUESTION_SET_TOKEN_TTL_SECONDS // 2),
+        )
+        current_app.extensions[QUESTION_SET_POOL_EXTENSION_KEY] = pool
+    return pool
 
 
-def _select_random_questions(questions_by_domain, assessment_level=DEFAULT_ASSESSMENT_LEVEL):
-    selected_questions = []
-    assessment_level = _normalize_assessment_level(assessment_level)
-    for domain in DOMAINS:
-        domain_questions = questions_by_domain.get(domain, [])
-        ordered_questions = sorted(
-            domain_questions,
-            key=lambda question: int(str(question.get('id', '0')).split('-')[-1] or 0),
-        )
-        if len(domain_questions) >= QUESTIONS_PER_DOMAIN:
-            if assessment_level == 'beginner':
-                candidate_questions = ordered_questions[:QUESTIONS_PER_DOMAIN]
-            elif assessment_level == 'intermediate':
-                candidate_questions = ordered_questions[1:1 + QUESTIONS_PER_DOMAIN]
-            else:
-                candidate_questions = ordered_questions[-QUESTIONS_PER_DOMAIN:]
-
-            if len(candidate_questions) < QUESTIONS_PER_DOMAIN:
-                existing_ids = {question['id'] for question in candidate_questions}
-                candidate_questions.extend(
-                    question for question in ordered_questions if question['id'] not in existing_ids
-                )
+def start_question_set_pool():
+    """Start pre-generating OpenRouter question sets for every assessment level."""
+    if not _openrouter_settings():
+        return None
+    return _question_set_pool().start(current_app._get_current_object())
 
-            selected_questions.extend(
-                random.sample(candidate_questions[:QUESTIONS_PER_DOMAIN], QUESTIONS_PER_DOMAIN)
-            )
-        else:
-            selected_questions.extend(domain_questions)
 
-    random.shuffle(selected_questions)
-    return selected_questions
+def get_question_set_pool_stats():
+    return _question_set_pool().stats()
+
+
+def _next_generated_question_set(assessment_level):
+    pool = _question_set_pool()
+    if pool.running:
+        return pool.pop(assessment_level)
+    return _generate_openrouter_question_set(assessment_level)
+
+
+def _question_bank():
+    return get_question_bank(
+        domains=DOMAINS,
+        levels=ASSESSMENT_LEVELS,
+        questions_per_domain=QUESTIONS_PER_DOMAIN,
+        fallback_questions=SAMPLE_QUESTIONS,
+        refresh_seconds=get_settings().assessment.question_bank_refresh_seconds,
+    ).snapshot()
+
+
+def _select_random_questions(assessment_level=DEFAULT_ASSESSMENT_LEVEL):
+    return _question_bank().select(_normalize_assessment_level(assessment_level))
 
 
 def _normalize_question_id(raw_question_id):
@@ -844,12 +988,7 @@ def _normalize_question_id_list(raw_question_ids):
 
 
 def _get_questions_by_ids(selected_question_ids):
-    question_by_id = {str(question['id']): question for question in SAMPLE_QUESTIONS}
-    return [
-        question_by_id[question_id]
-        for question_id in _normalize_question_id_list(selected_question_ids)
-        if question_id in question_by_id
-    ]
+    return _question_bank().questions_for_ids(_normalize_question_id_list(selected_question_ids))
 
 
 def _resolve_grading_questions(answers, selected_question_ids):
@@ -859,13 +998,155 @@ def _resolve_grading_questions(answers, selected_question_ids):
 
     answer_ids = _normalize_question_id_list(list(answers.keys()))
     fallback_questions = _get_questions_by_ids(answer_ids)
-    return fallback_questions if fallback_questions else SAMPLE_QUESTIONS
+    return fallback_questions if fallback_questions else list(_question_bank().questions)
 
 
 def _format_question(question):
     public_question, _ = _prepare_question_for_delivery(question)
     return public_question
 
+
+def _grading_plan(selected_questions):
+    """Precompute what grading needs per question so many sheets can share one set."""
+    plan = []
+    for question in selected_questions:
+        correct = question['correct_answer']
+        plan.append((
+            question['id'],
+            question['domain'],
+            correct.upper(),
+            question[f"option_{correct.lower()}"].strip().lower(),
+        ))
+    return plan
+
+
+def _score_answer_sheet(grading_plan, answers, option_map):
+    total_score = 0
+    domain_scores = {domain: 0 for domain in DOMAINS}
+    domain_totals = {domain: 0 for domain in DOMAINS}
+    correctness = []
+
+    for q_id, domain, correct, correct_answer_text in grading_plan:
+        user_answer = answers.get(q_id, '')
+        if user_answer is None:
+            user_answer = ''
+        user_answer = str(user_answer).strip()
+        answer_options = option_map.get(q_id) or {}
+        user_answer_text = answer_options.get(user_answer.upper(), '') if isinstance(answer_options, dict) else ''
+
+        domain_totals[domain] += 1
+
+        if user_answer_text:
+            is_correct = user_answer_text.strip().lower() == correct_answer_text
+        else:
+            is_correct = user_answer.upper() == correct
+        if is_correct:
+            total_score += 1
+            domain_scores[domain] += 1
+        correctness.append((user_answer, user_answer_text, is_correct))
+
+    return total_score, domain_scores, domain_totals, correctness
+
+
+def _domain_scores_payload(domain_scores, domain_totals):
+    return {
+        domain: {
+            'score': domain_scores.get(domain, 0),
+            'total': domain_totals.get(domain, 0)
+        }
+        for domain in DOMAINS
+    }
+
+
+LEGACY_DOMAIN_SCORE_FIELDS = (
+    ('functional_score', 'AI Fundamentals'),
+    ('ethical_score', 'Practical Usage'),
+    ('rhetorical_score', 'Ethics & Critical Thinking'),
+    ('pedagogical_score', 'AI Impact & Applications'),
+)
+
+
+def _assessment_result_values(
+    *,
+    user_id,
+    total_score,
+    max_score,
+    assessment_level,
+    domain_scores_payload,
+    time_taken,
+    recommendations,
+    grading_source,
+):
+    values = {
+        'id': str(uuid.uuid4()),
+        'user_id': user_id,
+        'total_score': total_score,
+        'max_score': max_score,
+        'percentage': (total_score / max_score) * 100 if max_score > 0 else 0,
+        'assessment_level': assessment_level,
+        'domain_scores': domain_scores_payload,
+        'time_taken_minutes': time_taken,
+        'completed_at': datetime.utcnow(),
+        'recommendations': json.dumps({
+            'insights': recommendations,
+            'strategic_score': domain_scores_payload.get('Strategic Understanding', {}).get('score', 0),
+            'assessment_level': assessment_level,
+            'generation_source': grading_source,
+        }),
+    }
+    for attr, domain in LEGACY_DOMAIN_SCORE_FIELDS:
+        values[attr] = domain_scores_payload.get(domain, {}).get('score', 0)
+    return values
+
+
+def _domain_score_rows(result_values):
+    """``assessment_domain_score`` rows for a result, written in the same transaction."""
+    return [
+        {
+            'result_id': result_values['id'],
+            'user_id': result_values['user_id'],
+            'domain': domain,
+            'score': entry.get('score', 0) or 0,
+            'total': entry.get('total', 0) or 0,
+            'completed_at': result_values['completed_at'],
+        }
+        for domain, entry in result_values['domain_scores'].items()
+    ]
+
+
+def _point_users_at_latest_assessments(latest_result_ids):
+    """Update ``User.latest_assessment_result_id`` in the caller's transaction.
+
+    ``latest_result_ids`` maps user id to the id of their newest result.
+    """
+    if not latest_result_ids:
+        return
+    user_table = User.__table__
+    db.session.execute(
+        user_table.update()
+        .where(user_table.c.id == bindparam('pointer_user_id'))
+        .values(latest_assessment_result_id=bindparam('pointer_result_id')),
+        [
+            {'pointer_user_id': user_id, 'pointer_result_id': result_id}
+            for user_id, result_id in latest_result_ids.items()
+        ],
+    )
+
+
+def get_latest_assessment_result(user_id, user=None):
+    """Newest AssessmentResult for a user, via the maintained pointer when it is set."""
+    if user is None:
+        user = db.session.get(User, user_id)
+    pointer = user.latest_assessment_result_id if user is not None else None
+    if pointer:
+        result = db.session.get(AssessmentResult, pointer)
+        if result is not None and result.user_id == user_id:
+            return result
+    return (AssessmentResult.query
+            .filter_by(user_id=user_id)
+            .order_by(AssessmentResult.completed_at.desc(), AssessmentResult.id.desc())
+            .first())
+
 DOMAIN_TOTALS = {
     domain: sum(1 for question in SAMPLE_QUESTIONS if question['domain'] == domain)
     for domain in DOMAINS
@@ -972,8 +1253,7 @@ def _assessment_level_from_result(assessment):
 
 
 def _fallback_question_set(assessment_level):
-    questions_by_domain = _group_questions_by_domain()
-    selected_questions = _select_random_questions(questions_by_domain, assessment_level)
+    selected_questions = _select_random_questions(assessment_level)
     questions = [
         _format_question(question) for question in selected_questions
     ]
@@ -1097,7 +1377,9 @@ def get_assessment_questions():
             }), 400
 
         assessment_level = _normalize_assessment_level(request.args.get('level'))
-        generated_question_set = _generate_openrouter_question_set(assessment_level)
+        generated_question_set = _banked_question_set(assessment_level) or _next_generated_question_set(
+            assessment_level
+        )
         if generated_question_set:
             return jsonify({
                 'questions': generated_question_set['questions'],
@@ -1157,42 +1439,24 @@ def submit_assessment():
             selected_questions = _resolve_grading_questions(answers, selected_question_ids)
         
         # Calculate scores
-        total_score = 0
+        grading_plan = _grading_plan(selected_questions)
+        total_score, domain_scores, domain_totals, correctness = _score_answer_sheet(
+            grading_plan,
+            answers,
+            option_map_payload,
+        )
         max_score = len(selected_questions)
-        domain_scores = {domain: 0 for domain in DOMAINS}
-        domain_totals = {domain: 0 for domain in DOMAINS}
-        
+
         detailed_results = []
-        
-        for question in selected_questions:
-            q_id = question['id']
-            domain = question['domain']
+        for question, (user_answer, user_answer_text, is_correct) in zip(selected_questions, correctness):
             correct = question['correct_answer']
-            user_answer = answers.get(q_id, '')
-            if user_answer is None:
-                user_answer = ''
-            user_answer = str(user_answer).strip()
-            answer_options = option_map_payload.get(q_id, {})
-            user_answer_text = answer_options.get(user_answer.upper(), '')
-            correct_answer_text = question[f"option_{correct.lower()}"]
-
-            domain_totals[domain] += 1
-            
-            if user_answer_text:
-                is_correct = user_answer_text.strip().lower() == correct_answer_text.strip().lower()
-            else:
-                is_correct = user_answer.upper() == correct.upper()
-            if is_correct:
-                total_score += 1
-                domain_scores[domain] += 1
-            
             detailed_results.append({
-                'question_id': q_id,
-                'domain': domain,
+                'question_id': question['id'],
+                'domain': question['domain'],
                 'user_answer': user_answer,
                 'user_answer_text': user_answer_text,
                 'correct_answer': correct,
-                'correct_answer_text': correct_answer_text,
+                'correct_answer_text': question[f"option_{correct.lower()}"],
                 'is_correct': is_correct,
                 'explanation': question['explanation']
             })
@@ -1203,13 +1467,7 @@ def submit_assessment():
         score_band = classify_score(total_score)
         recommendations = generate_recommendations(domain_scores, domain_totals, total_score, score_band)
 
-        domain_scores_payload = {
-            domain: {
-                'score': domain_scores.get(domain, 0),
-                'total': domain_totals.get(domain, 0)
-            }
-            for domain in DOMAINS
-        }
+        domain_scores_payload = _domain_scores_payload(domain_scores, domain_totals)
         
         # Save results if user is authenticated
         user_id = g.get('current_user_id')
@@ -1217,34 +1475,23 @@ def submit_assessment():
             user_id = get_supabase_identity(optional=True)
         
         if user_id:
-            legacy_field_map = [
-                ('functional_score', 'AI Fundamentals'),
-                ('ethical_score', 'Practical Usage'),
-                ('rhetorical_score', 'Ethics & Critical Thinking'),
-                ('pedagogical_score', 'AI Impact & Applications')
-            ]
-
-            result = AssessmentResult(
+            result_values = _assessment_result_values(
                 user_id=user_id,
                 total_score=total_score,
                 max_score=max_score,
-                percentage=percentage,
                 assessment_level=assessment_level,
-                domain_scores=domain_scores_payload,
-                time_taken_minutes=time_taken,
-                recommendations=json.dumps({
-                    'insights': recommendations,
-                    'strategic_score': domain_scores.get('Strategic Understanding', 0),
-                    'assessment_level': assessment_level,
-                    'generation_source': grading_source,
-                })
+                domain_scores_payload=domain_scores_payload,
+                time_taken=time_taken,
+                recommendations=recommendations,
+                grading_source=grading_source,
             )
-
-            for attr, domain in legacy_field_map:
-                setattr(result, attr, domain_scores_payload.get(domain, {}).get('score', 0))
+            result = AssessmentResult(**result_values)
 
             db.session.add(result)
+            db.session.add_all(AssessmentDomainScore(**row) for row in _domain_score_rows(result_values))
+            _point_users_at_latest_assessments({user_id: result.id})
             db.session.commit()
+            invalidate_recommendations(user_id)
 
             logger.info(
                 'assessment_submitted',
@@ -1287,6 +1534,219 @@ def submit_assessment():
         logger.exception('assessment_submit_failed', error=str(e))
         return jsonify({'error': 'Failed to submit assessment', 'details': str(e)}), 500
 
+
+class AnswerSheetError(ValueError):
+    """A single answer sheet in a batch could not be graded."""
+
+
+USER_LOOKUP_CHUNK_SIZE = 500
+
+
+def _lookup_learners(sheets, organization=None):
+    user_ids = {str(sheet['user_id']) for sheet in sheets if sheet.get('user_id')}
+    emails = {str(sheet['email']).strip().lower() for sheet in sheets if sheet.get('email') and not sheet.get('user_id')}
+
+    learner_ids = set()
+    by_email = {}
+    for column, values in ((User.id, sorted(user_ids)), (User.email, sorted(emails))):
+        for start in range(0, len(values), USER_LOOKUP_CHUNK_SIZE):
+            query = db.session.query(User.id, User.email).filter(column.in_(values[start:start + USER_LOOKUP_CHUNK_SIZE]))
+            if organization is not None:
+                query = query.filter(User.organization == organization)
+            for user_id, email in query:
+                learner_ids.add(user_id)
+                by_email[(email or '').lower()] = user_id
+    return learner_ids, by_email
+
+
+class _BatchQuestionSets:
+    """Resolves and caches each distinct question set (and its grading plan) once per batch."""
+
+    def __init__(self):
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._cache)
+
+    def resolve(self, sheet, answers):
+        raw_token = sheet.get('question_set_token')
+        selected_question_ids = _normalize_question_id_list(
+            sheet.get('selected_question_ids') or sheet.get('question_ids')
+        )
+        if raw_token:
+            cache_key = ('token', raw_token)
+        elif selected_question_ids:
+            cache_key = ('ids', tuple(selected_question_ids))
+        else:
+            cache_key = ('answers', tuple(sorted(_normalize_question_id_list(list(answers.keys())))))
+
+        if cache_key not in self._cache:
+            self._cache[cache_key] = self._load(raw_token, answers, selected_question_ids)
+        resolved = self._cache[cache_key]
+        if resolved is None:
+            raise AnswerSheetError('Question set token is invalid or expired')
+        return resolved
+
+    @staticmethod
+    def _load(raw_token, answers, selected_question_ids):
+        if raw_token:
+            question_set_data = _resolve_question_set_token(raw_token)
+            if not question_set_data:
+                return None
+            questions = question_set_data['questions']
+            return {
+                'questions': questions,
+                'plan': _grading_plan(questions),
+                'assessment_level': question_set_data['assessment_level'],
+                'generation_source': question_set_data['generation_source'],
+            }
+
+        questions = _resolve_grading_questions(answers, selected_question_ids)
+        return {
+            'questions': questions,
+            'plan': _grading_plan(questions),
+            'assessment_level': None,
+            'generation_source': 'curated_fallback',
+        }
+
+
+def _grade_batch_sheet(sheet, learner_ids, learners_by_email, question_sets):
+    if not isinstance(sheet, dict):
+        raise AnswerSheetError('Answer sheet must be an object')
+    answers = sheet.get('answers')
+    if not answers or not isinstance(answers, dict):
+        raise AnswerSheetError('Answers must be an object keyed by question id')
+    if not _is_valid_assessment_level(sheet.get('assessment_level')):
+        raise AnswerSheetError('Invalid assessment level')
+
+    if sheet.get('user_id'):
+        user_id = str(sheet['user_id']) if str(sheet['user_id']) in learner_ids else None
+    else:
+        user_id = learners_by_email.get(str(sheet.get('email') or '').strip().lower())
+    if not user_id:
+        raise AnswerSheetError('Learner not found')
+
+    question_set = question_sets.resolve(sheet, answers)
+    option_map = sheet.get('option_map')
+    total_score, domain_scores, domain_totals, _ = _score_answer_sheet(
+        question_set['plan'],
+        answers,
+        option_map if isinstance(option_map, dict) else {},
+    )
+    assessment_level = question_set['assessment_level'] or _normalize_assessment_level(sheet.get('assessment_level'))
+    score_band = classify_score(total_score)
+    values = _assessment_result_values(
+        user_id=user_id,
+        total_score=total_score,
+        max_score=len(question_set['plan']),
+        assessment_level=assessment_level,
+        domain_scores_payload=_domain_scores_payload(domain_scores, domain_totals),
+        time_taken=sheet.get('time_taken_minutes', 0),
+        recommendations=generate_recommendations(domain_scores, domain_totals, total_score, score_band),
+        grading_source=question_set['generation_source'],
+    )
+    return values, score_band
+
+
+def grade_answer_sheets(sheets, *, organization=None, chunk_size=None):
+    """Grade many answer sheets in one pass and bulk-insert their results.
+
+    Learners are looked up in bulk (optionally restricted to ``organization``),
+    each distinct question set is resolved once, and results are inserted in
+    transactions of ``chunk_size`` rows. A bad sheet, or a chunk that fails to
+    commit, is reported in ``results`` without aborting the rest of the batch.
+    """
+    chunk_size = max(1, chunk_size or get_settings().assessment.batch_grading_chunk_size)
+    valid_sheets = [sheet for sheet in sheets if isinstance(sheet, dict)]
+    learner_ids, learners_by_email = _lookup_learners(valid_sheets, organization)
+    question_sets = _BatchQuestionSets()
+
+    results = [None] * len(sheets)
+    pending = []
+    for index, sheet in enumerate(sheets):
+        try:
+            values, score_band = _grade_batch_sheet(sheet, learner_ids, learners_by_email, question_sets)
+        except AnswerSheetError as exc:
+            results[index] = {'index': index, 'status': 'error', 'error': str(exc)}
+            continue
+        results[index] = {
+            'index': index,
+            'status': 'saved',
+            'result_id': values['id'],
+            'user_id': values['user_id'],
+            'total_score': values['total_score'],
+            'max_score': values['max_score'],
+            'percentage': round(values['percentage'], 1),
+            'assessment_level': values['assessment_level'],
+            'score_band': score_band,
+        }
+        if isinstance(sheet, dict) and sheet.get('sheet_id') is not None:
+            results[index]['sheet_id'] = sheet['sheet_id']
+        pending.append((index, values))
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            db.session.execute(insert(AssessmentResult), [values for _, values in chunk])
+            db.session.execute(
+                insert(AssessmentDomainScore),
+                [row for _, values in chunk for row in _domain_score_rows(values)],
+            )
+            increment_platform_counter('total_assessments', len(chunk))
+            latest_result_ids = {values['user_id']: values['id'] for _, values in chunk}
+            _point_users_at_latest_assessments(latest_result_ids)
+            db.session.commit()
+            invalidate_recommendations(*latest_result_ids)
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            logger.warning('assessment_batch_chunk_failed', chunk_start=start, rows=len(chunk), error=str(exc))
+            for index, _ in chunk:
+                results[index] = {'index': index, 'status': 'error', 'error': 'Failed to save result'}
+
+    saved = sum(1 for result in results if result['status'] == 'saved')
+    logger.info(
+        'assessment_batch_graded',
+        submitted=len(sheets),
+        saved=saved,
+        failed=len(sheets) - saved,
+        question_sets=len(question_sets),
+        organization=organization,
+    )
+    return {
+        'submitted': len(sheets),
+        'saved': saved,
+        'failed': len(sheets) - saved,
+        'results': results,
+    }
+
+
+@assessment_bp.route('/submit/batch', methods=['POST'])
+@supabase_jwt_required()
+def submit_assessment_batch():
+    """Grade and save answer sheets for many learners in the caller's organization"""
+    try:
+        user_id = g.get('current_user_id') or get_supabase_identity()
+        user = User.query.get(user_id)
+        if not user or user.subscription_tier != 'enterprise':
+            return jsonify({'error': 'Bulk grading requires an enterprise subscription'}), 403
+        if not user.organization:
+            return jsonify({'error': 'Bulk grading requires an organization on your profile'}), 403
+
+        data = request.get_json() or {}
+        sheets = data.get('sheets')
+        if not isinstance(sheets, list) or not sheets:
+            return jsonify({'error': 'sheets must be a non-empty list'}), 400
+        max_sheets = get_settings().assessment.batch_grading_max_sheets
+        if len(sheets) > max_sheets:
+            return jsonify({'error': f'A batch may contain at most {max_sheets} sheets'}), 413
+
+        return jsonify(grade_answer_sheets(sheets, organization=user.organization)), 200
+    except Exception as e:
+        db.session.rollback()
+        logger.exception('assessment_batch_submit_failed', error=str(e))
+        return jsonify({'error': 'Failed to grade answer sheets', 'details': str(e)}), 500
+
+
 def classify_score(total_correct):
     if total_correct <= 6:
         return 'Beginner'
@@ -1401,6 +1861,101 @@ def serialize_course_recommendation(
         **extra_fields,
     }
 
+def _stored_recommendations(result):
+    """Return the stored insights and the legacy strategic score from ``result.recommendations``."""
+    recommendation_payload = []
+    legacy_strategic_score = 0
+    stored_recommendations = result.recommendations
+    if stored_recommendations:
+        try:
+            parsed = json.loads(stored_recommendations)
+            if isinstance(parsed, dict):
+                recommendation_payload = parsed.get('insights', [])
+                legacy_strategic_score = parsed.get('strategic_score', 0) or 0
+            elif isinstance(parsed, list):
+                recommendation_payload = parsed
+        except Exception:
+            recommendation_payload = []
+    return recommendation_payload, legacy_strategic_score
+
+
+def _result_domain_scores(result, legacy_strategic_score=None):
+    """Per-domain ``{'score', 'total'}`` for a stored result, falling back to the legacy columns."""
+    if legacy_strategic_score is None:
+        _, legacy_strategic_score = _stored_recommendations(result)
+
+    domain_scores_payload = {}
+    stored_domain_scores = result.domain_scores
+    if isinstance(stored_domain_scores, str):
+        try:
+            stored_domain_scores = json.loads(stored_domain_scores)
+        except ValueError:
+            stored_domain_scores = {}
+
+    if not isinstance(stored_domain_scores, dict):
+        stored_domain_scores = {}
+
+    legacy_fallback = {
+        'AI Fundamentals': result.functional_score or 0,
+        'Practical Usage': result.ethical_score or 0,
+        'Ethics & Critical Thinking': result.rhetorical_score or 0,
+        'AI Impact & Applications': result.pedagogical_score or 0,
+        'Strategic Understanding': legacy_strategic_score
+    }
+
+    for domain in DOMAINS:
+        stored_entry = stored_domain_scores.get(domain, {}) if stored_domain_scores else {}
+        score_value = stored_entry.get('score') if isinstance(stored_entry, dict) else None
+        total_value = stored_entry.get('total') if isinstance(stored_entry, dict) else None
+
+        domain_scores_payload[domain] = {
+            'score': score_value if score_value is not None else legacy_fallback.get(domain, 0),
+            'total': total_value if total_value else DOMAIN_TOTALS.get(domain, 0)
+        }
+    return domain_scores_payload
+
+
+def _serialize_history_entry(result):
+    recommendation_payload, legacy_strategic_score = _stored_recommendations(result)
+    domain_scores_payload = _result_domain_scores(result, legacy_strategic_score)
+
+    return {
+        'id': result.id,
+        'total_score': result.total_score,
+        'max_score': result.max_score,
+        'percentage': result.percentage,
+        'assessment_level': _assessment_level_from_result(result),
+        'score_band': classify_score(result.total_score),
+        'domain_scores': domain_scores_payload,
+        'time_taken_minutes': result.time_taken_minutes,
+        'completed_at': result.completed_at.isoformat(),
+        'recommendations': recommendation_payload
+    }
+
+
+HISTORY_SUMMARY_COLUMNS = (
+    AssessmentResult.id,
+    AssessmentResult.total_score,
+    AssessmentResult.max_score,
+    AssessmentResult.percentage,
+    AssessmentResult.assessment_level,
+    AssessmentResult.time_taken_minutes,
+    AssessmentResult.completed_at,
+)
+
+
+def _serialize_history_summary(row):
+    return {
+        'id': row.id,
+        'total_score': row.total_score,
+        'max_score': row.max_score,
+        'percentage': row.percentage,
+        'assessment_level': _normalize_assessment_level(row.assessment_level),
+        'score_band': classify_score(row.total_score),
+        'time_taken_minutes': row.time_taken_minutes,
+        'completed_at': row.completed_at.isoformat() if row.completed_at else None,
+    }
+
 @assessment_bp.route('/history', methods=['GET'])
 @supabase_jwt_required()
 def get_assessment_history():
@@ -1408,242 +1963,230 @@ def get_assessment_history():
     try:
         user_id = g.get('current_user_id') or get_supabase_identity()
         
-        results = AssessmentResult.query.filter_by(user_id=user_id)\
-                                      .order_by(AssessmentResult.completed_at.desc())\
-                                      .all()
-        
-        history = []
-        for result in results:
-            recommendation_payload = []
-            legacy_strategic_score = 0
-            stored_recommendations = result.recommendations
-            if stored_recommendations:
-                try:
-                    parsed = json.loads(stored_recommendations)
-                    if isinstance(parsed, dict):
-                        recommendation_payload = parsed.get('insights', [])
-                        legacy_strategic_score = parsed.get('strategic_score', 0) or 0
-                    elif isinstance(parsed, list):
-                        recommendation_payload = parsed
-                except Exception:
-                    recommendation_payload = []
-
-            domain_scores_payload = {}
-            stored_domain_scores = result.domain_scores
-            if isinstance(stored_domain_scores, str):
-                try:
-                    stored_domain_scores = json.loads(stored_domain_scores)
-                except ValueError:
-                    stored_domain_scores = {}
-
-            if not isinstance(stored_domain_scores, dict):
-                stored_domain_scores = {}
-
-            legacy_fallback = {
-                'AI Fundamentals': result.functional_score or 0,
-                'Practical Usage': result.ethical_score or 0,
-                'Ethics & Critical Thinking': result.rhetorical_score or 0,
-                'AI Impact & Applications': result.pedagogical_score or 0,
-                'Strategic Understanding': legacy_strategic_score
-            }
+        try:
+            limit, cursor, summary = parse_page_args(request.args)
+        except InvalidPageRequest as exc:
+            return jsonify({'error': str(exc)}), 400
 
-            for domain in DOMAINS:
-                stored_entry = stored_domain_scores.get(domain, {}) if stored_domain_scores else {}
-                score_value = stored_entry.get('score') if isinstance(stored_entry, dict) else None
-                total_value = stored_entry.get('total') if isinstance(stored_entry, dict) else None
-
-                domain_scores_payload[domain] = {
-                    'score': score_value if score_value is not None else legacy_fallback.get(domain, 0),
-                    'total': total_value if total_value else DOMAIN_TOTALS.get(domain, 0)
-                }
-
-            history.append({
-                'id': result.id,
-                'total_score': result.total_score,
-                'max_score': result.max_score,
-                'percentage': result.percentage,
-                'assessment_level': _assessment_level_from_result(result),
-                'score_band': classify_score(result.total_score),
-                'domain_scores': domain_scores_payload,
-                'time_taken_minutes': result.time_taken_minutes,
-                'completed_at': result.completed_at.isoformat(),
-                'recommendations': recommendation_payload
-            })
+        if summary:
+            query = db.session.query(*HISTORY_SUMMARY_COLUMNS).filter(AssessmentResult.user_id == user_id)
+        else:
+            query = AssessmentResult.query.filter_by(user_id=user_id)
+        results, next_cursor = keyset_page(
+            query,
+            AssessmentResult.completed_at,
+            AssessmentResult.id,
+            limit,
+            cursor,
+            row_key=lambda result: (result.completed_at, result.id),
+        )
+        serialize = _serialize_history_summary if summary else _serialize_history_entry
+        history = [serialize(result) for result in results]
 
-        logger.info('assessment_history_requested', user_id=user_id, results=len(history))
-        return jsonify({'history': history}), 200
+        logger.info(
+            'assessment_history_requested',
+            user_id=user_id,
+            results=len(history),
+            summary=summary,
+            paged=cursor is not None,
+        )
+        return jsonify({'history': history, 'next_cursor': next_cursor}), 200
 
     except Exception as e:
         logger.exception('assessment_history_failed', error=str(e))
         return jsonify({'error': 'Failed to get assessment history', 'details': str(e)}), 500
 
 
-@assessment_bp.route('/recommendations', methods=['GET'])
-@supabase_jwt_required()
-def get_course_recommendations():
-    """Get personalized course recommendations based on latest assessment results"""
-    try:
-        user_id = g.get('current_user_id') or get_supabase_identity()
-
-        # Get the latest assessment result
-        latest_result = AssessmentResult.query.filter_by(user_id=user_id)\
-                                             .order_by(AssessmentResult.completed_at.desc())\
-                                             .first()
+RECOMMENDATION_LIMIT = 6
+COMPLETED_MODULE_PENALTY = 18
 
-        user = User.query.get(user_id)
-        profile_track = _normalize_workplace_track(user.role if user else None)
-        completed_progress = UserProgress.query.filter_by(user_id=user_id, status='completed').all()
-        completed_module_ids = {progress.module_id for progress in completed_progress}
-        completed_modules_count = len(completed_progress)
-        all_modules = TrainingModule.query.filter_by(is_active=True).all()
-
-        if not latest_result:
-            certification_domains = _certification_source_domains(None, completed_module_ids, completed_modules_count)
-            scored_recommendations = []
-
-            for module in all_modules:
-                module_metadata = build_module_metadata(module)
-                score_data = _score_module_recommendation(
-                    module,
-                    module_metadata=module_metadata,
-                    profile_track=profile_track,
-                    weak_domains=[],
-                    fallback_domains=TRACK_DOMAIN_HINTS.get(profile_track, set()),
-                    certification_domains=certification_domains,
-                    ideal_difficulty=1,
-                )
-                score = score_data['score'] - (18 if module.id in completed_module_ids else 0)
-                scored_recommendations.append((
-                    score,
-                    serialize_course_recommendation(
-                        module,
-                        reason='Great starting point for workplace AI literacy',
-                        priority=_recommendation_priority(score),
-                        skill_gap_percentage=0,
-                        track=score_data['track'],
-                        source_domains=score_data['source_domains'],
-                        next_action_label=_next_action_label(
-                            module_metadata,
-                            certification_relevant=score_data['certification_relevant'],
-                        ),
-                        recommended_path=module_metadata.get('start_path'),
-                        confidence=_recommendation_confidence(score),
-                    ),
-                ))
-
-            scored_recommendations.sort(
-                key=lambda item: (
-                    -item[0],
-                    item[1]['track'] != profile_track,
-                    -int(item[1].get('has_internal_lessons', False)),
-                    item[1]['title'],
-                )
-            )
 
-            return jsonify({
-                'recommendations': [item[1] for item in scored_recommendations[:6]],
-                'message': 'Take an assessment to get personalized recommendations',
-                'assessment_level': None,
-            }), 200
+def _recommendation_context(latest_result, profile_track, completed_module_ids):
+    """Per-user scoring inputs shared by the request path and the batch scorer."""
+    if not latest_result:
+        return {
+            'assessment': None,
+            'assessment_level': None,
+            'profile_track': profile_track,
+            'weak_domains': [],
+            'fallback_domains': TRACK_DOMAIN_HINTS.get(profile_track, set()),
+            'certification_domains': _certification_source_domains(
+                None,
+                completed_module_ids,
+                len(completed_module_ids),
+            ),
+            'ideal_difficulty': 1,
+        }
 
-        domain_entries = _assessment_domain_entries(latest_result)
-        assessment_level = _assessment_level_from_result(latest_result)
-        weak_domains = [entry for entry in domain_entries if entry['percentage'] < 50]
-        weak_domains.sort(key=lambda x: x['percentage'])
-        fallback_domains = {
+    domain_entries = _assessment_domain_entries(latest_result)
+    weak_domains = [entry for entry in domain_entries if entry['percentage'] < 50]
+    weak_domains.sort(key=lambda x: x['percentage'])
+    return {
+        'assessment': latest_result,
+        'assessment_level': _assessment_level_from_result(latest_result),
+        'profile_track': profile_track,
+        'weak_domains': weak_domains,
+        'fallback_domains': {
             entry['domain']
             for entry in sorted(domain_entries, key=lambda x: x['percentage'])[:3]
-        }
-        certification_domains = _certification_source_domains(
+        },
+        'certification_domains': _certification_source_domains(
             latest_result,
             completed_module_ids,
-            completed_modules_count,
+            len(completed_module_ids),
+        ),
+        'ideal_difficulty': _recommended_difficulty(latest_result),
+    }
+
+
+def _recommendation_reason(context, score_data):
+    if context['assessment'] is None:
+        return 'Great starting point for workplace AI literacy', 0
+
+    profile_track = context['profile_track']
+    weak_domain_map = {entry['domain']: entry for entry in context['weak_domains']}
+    matched_weak_domains = [domain for domain in score_data['source_domains'] if domain in weak_domain_map]
+    if matched_weak_domains:
+        primary_domain = matched_weak_domains[0]
+        primary_gap = weak_domain_map[primary_domain]
+        reason = (
+            f'Strengthen your {primary_domain} skills '
+            f'(scored {primary_gap["score"]}/{primary_gap["total"]})'
         )
+        return reason, round(primary_gap['gap_percentage'], 1)
+    if score_data['certification_relevant']:
+        return 'Supports certification readiness requirements', 0
+    if score_data['track'] == profile_track and profile_track != 'General':
+        return f'Fits your {profile_track} workplace AI track', 0
+    if context['assessment_level'] == 'advanced':
+        return 'Matches your advanced self-rating with deeper applied practice', 0
+    if context['assessment_level'] == 'beginner':
+        return 'Keeps your next step approachable from your self-rating', 0
+    return 'Good next step from your latest assessment', 0
+
+
+def _serialize_scored_recommendation(module, module_metadata, score, score_data, context):
+    reason, skill_gap_percentage = _recommendation_reason(context, score_data)
+    return serialize_course_recommendation(
+        module,
+        reason=reason,
+        priority=_recommendation_priority(score),
+        skill_gap_percentage=skill_gap_percentage,
+        track=score_data['track'],
+        source_domains=score_data['source_domains'],
+        next_action_label=_next_action_label(
+            module_metadata,
+            certification_relevant=score_data['certification_relevant'],
+        ),
+        recommended_path=module_metadata.get('start_path'),
+        confidence=_recommendation_confidence(score),
+    )
 
-        scored_recommendations = []
-        weak_domain_map = {entry['domain']: entry for entry in weak_domains}
-        ideal_difficulty = _recommended_difficulty(latest_result)
-
-        for module in all_modules:
-            module_metadata = build_module_metadata(module)
-            score_data = _score_module_recommendation(
-                module,
-                module_metadata=module_metadata,
-                profile_track=profile_track,
-                weak_domains=weak_domains,
-                fallback_domains=fallback_domains,
-                certification_domains=certification_domains,
-                ideal_difficulty=ideal_difficulty,
-            )
-            source_domains = score_data['source_domains']
-            matched_weak_domains = [domain for domain in source_domains if domain in weak_domain_map]
-            if matched_weak_domains:
-                primary_domain = matched_weak_domains[0]
-                primary_gap = weak_domain_map[primary_domain]
-                reason = (
-                    f'Strengthen your {primary_domain} skills '
-                    f'(scored {primary_gap["score"]}/{primary_gap["total"]})'
-                )
-                skill_gap_percentage = round(primary_gap['gap_percentage'], 1)
-            elif score_data['certification_relevant']:
-                reason = 'Supports certification readiness requirements'
-                skill_gap_percentage = 0
-            elif score_data['track'] == profile_track and profile_track != 'General':
-                reason = f'Fits your {profile_track} workplace AI track'
-                skill_gap_percentage = 0
-            elif assessment_level == 'advanced':
-                reason = 'Matches your advanced self-rating with deeper applied practice'
-                skill_gap_percentage = 0
-            elif assessment_level == 'beginner':
-                reason = 'Keeps your next step approachable from your self-rating'
-                skill_gap_percentage = 0
-            else:
-                reason = 'Good next step from your latest assessment'
-                skill_gap_percentage = 0
-
-            score = score_data['score'] - (18 if module.id in completed_module_ids else 0)
-            scored_recommendations.append((
-                score,
-                serialize_course_recommendation(
-                    module,
-                    reason=reason,
-                    priority=_recommendation_priority(score),
-                    skill_gap_percentage=skill_gap_percentage,
-                    track=score_data['track'],
-                    source_domains=source_domains,
-                    next_action_label=_next_action_label(
-                        module_metadata,
-                        certification_relevant=score_data['certification_relevant'],
-                    ),
-                    recommended_path=module_metadata.get('start_path'),
-                    confidence=_recommendation_confidence(score),
-                ),
-            ))
-
-        scored_recommendations.sort(
-            key=lambda item: (
-                -item[0],
-                item[1]['track'] != profile_track,
-                -int(item[1].get('has_internal_lessons', False)),
-                item[1]['title'],
-            )
+
+def _score_context_module(module, module_metadata, context):
+    return _score_module_recommendation(
+        module,
+        module_metadata=module_metadata,
+        profile_track=context['profile_track'],
+        weak_domains=context['weak_domains'],
+        fallback_domains=context['fallback_domains'],
+        certification_domains=context['certification_domains'],
+        ideal_difficulty=context['ideal_difficulty'],
+    )
+
+
+def _recommendations_payload(context, recommendations):
+    if context['assessment'] is None:
+        return {
+            'recommendations': recommendations,
+            'message': 'Take an assessment to get personalized recommendations',
+            'assessment_level': None,
+        }
+
+    weak_domains = context['weak_domains']
+    return {
+        'recommendations': recommendations,
+        'assessment_score': context['assessment'].percentage,
+        'assessment_level': context['assessment_level'],
+        'weak_domains': [d['domain'] for d in weak_domains[:3]],
+        'weak_domain_details': weak_domains[:3]
+    }
+
+
+def _build_course_recommendations(user_id, latest_result, profile_track, completed_module_ids, all_modules):
+    context = _recommendation_context(latest_result, profile_track, completed_module_ids)
+
+    scored_recommendations = []
+    for module in all_modules:
+        module_metadata = build_module_metadata(module)
+        score_data = _score_context_module(module, module_metadata, context)
+        score = score_data['score'] - (COMPLETED_MODULE_PENALTY if module.id in completed_module_ids else 0)
+        scored_recommendations.append((
+            score,
+            _serialize_scored_recommendation(module, module_metadata, score, score_data, context),
+        ))
+
+    scored_recommendations.sort(
+        key=lambda item: (
+            -item[0],
+            item[1]['track'] != profile_track,
+            -int(item[1].get('has_internal_lessons', False)),
+            item[1]['title'],
         )
-        recommendations = [item[1] for item in scored_recommendations[:6]]
+    )
+    recommendations = [item[1] for item in scored_recommendations[:RECOMMENDATION_LIMIT]]
 
+    if latest_result:
         logger.info(
             'course_recommendations_generated',
             user_id=user_id,
-            weak_domains=len(weak_domains),
+            weak_domains=len(context['weak_domains']),
             recommendations=len(recommendations)
         )
 
-        return jsonify({
-            'recommendations': recommendations,
-            'assessment_score': latest_result.percentage,
-            'assessment_level': assessment_level,
-            'weak_domains': [d['domain'] for d in weak_domains[:3]],
-            'weak_domain_details': weak_domains[:3]
-        }), 200
+    return _recommendations_payload(context, recommendations)
+
+
+@assessment_bp.route('/recommendations', methods=['GET'])
+@supabase_jwt_required()
+def get_course_recommendations():
+    """Get personalized course recommendations based on latest assessment results"""
+    try:
+        user_id = g.get('current_user_id') or get_supabase_identity()
+
+        user = User.query.get(user_id)
+        latest_result = get_latest_assessment_result(user_id, user)
+        profile_track = _normalize_workplace_track(user.role if user else None)
+        completed_module_ids = {
+            module_id
+            for (module_id,) in db.session.query(UserProgress.module_id).filter_by(
+                user_id=user_id,
+                status='completed',
+            )
+        }
+        catalog = get_module_catalog()
+
+        # Hits return the stored body as-is, skipping scoring and serialization.
+        cache = get_recommendation_cache()
+        cache_key = (
+            latest_result.id if latest_result else None,
+            completed_modules_digest(completed_module_ids),
+            profile_track,
+            catalog.fingerprint,
+        )
+        body = cache.get(user_id, cache_key)
+        if body is None:
+            payload = _build_course_recommendations(
+                user_id,
+                latest_result,
+                profile_track,
+                completed_module_ids,
+                catalog.active_modules,
+            )
+            body = current_app.json.dumps(payload)
+            cache.put(user_id, cache_key, body)
+
+        return current_app.response_class(f'{body}\n', status=200, mimetype=current_app.json.mimetype)
 
     except Exception as e:
         logger.exception('course_recommendations_failed', error=str(e))
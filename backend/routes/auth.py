@@ -8,6 +8,7 @@ from auth_identity import (
 )
 from logging_config import get_logger
 from models import User, db
+from recommendation_cache import invalidate_recommendations
 from routes import (
     get_supabase_claims,
     get_supabase_identity,
@@ -134,6 +135,7 @@ def update_profile():
             )
 
         db.session.commit()
+        invalidate_recommendations(user.id)
         return jsonify({
             'message': 'Profile updated successfully',
             'user': _build_user_payload(user),
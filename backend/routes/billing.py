@@ -1,4 +1,3 @@
-import os
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -8,34 +7,23 @@ from stripe import Subscription as StripeSubscription
 from stripe.billing_portal import Session as StripeBillingPortalSession
 from stripe.checkout import Session as StripeCheckoutSession
 
+from http_caching import conditional_json_response, version_tag
 from logging_config import get_logger
 from models import User, db
 from routes import get_supabase_claims, get_supabase_identity, supabase_jwt_required
+from settings import get_settings
 
 
 billing_bp = Blueprint('billing', __name__)
 logger = get_logger(__name__)
 
 
-def _is_truthy(value):
-    if value is None:
-        return False
-    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+def _billing_settings():
+    return get_settings().billing
 
 
 def _mock_mode_enabled():
-    if _is_truthy(os.getenv('STRIPE_MOCK_MODE', '')):
-        return True
-
-    if _is_truthy(os.getenv('DISABLE_STRIPE_AUTO_MOCK', '')):
-        return False
-
-    secret_missing = not os.getenv('STRIPE_SECRET_KEY')
-    if not secret_missing:
-        return False
-
-    env_hint = (os.getenv('FLASK_ENV') or os.getenv('ENV') or '').lower()
-    return env_hint not in ('production', 'prod')
+    return _billing_settings().mock_mode
 
 
 PLAN_DEFINITIONS = {
@@ -110,7 +98,7 @@ def _create_stripe_billing_portal_session(**kwargs):
 
 
 def _get_frontend_url() -> str:
-    return os.getenv('FRONTEND_URL', 'http://localhost:5173')
+    return _billing_settings().frontend_url
 
 
 def _resolve_frontend_url(path: str) -> str:
@@ -153,9 +141,9 @@ def _plan_config(plan_id: str):
         return None, None
 
     price_env = plan.get('stripe_price_env')
-    price_id = os.getenv(price_env) if price_env else None
+    price_id = _billing_settings().stripe_price_ids.get(price_env) if price_env else None
 
-    stripe_secret = os.getenv('STRIPE_SECRET_KEY')
+    stripe_secret = _billing_settings().stripe_secret_key
     stripe_configured = bool(stripe_secret)
 
     amount_cents = plan.get('amount_cents')
@@ -199,7 +187,7 @@ def _serialize_plan(plan_id: str, mock_mode: bool):
     if price_env and not configured:
         if mock_mode:
             status_message = 'Stripe not configured. Using sandbox checkout flow.'
-        elif not os.getenv('STRIPE_SECRET_KEY'):
+        elif not _billing_settings().stripe_secret_key:
             status_message = 'Stripe secret key is missing. Set STRIPE_SECRET_KEY to enable checkout.'
         else:
             status_message = 'Using on-the-fly Stripe price data based on plan amount.'
@@ -469,8 +457,7 @@ def _handle_subscription_deleted(stripe_subscription):
     )
 
 
-@billing_bp.route('/config', methods=['GET'])
-def get_billing_config():
+def _billing_config_payload():
     plans = []
     mock_mode = _mock_mode_enabled()
     for plan_id in PLAN_DEFINITIONS.keys():
@@ -478,13 +465,30 @@ def get_billing_config():
         if serialized:
             plans.append(serialized)
 
-    payload = {
-        'publishable_key': os.getenv('STRIPE_PUBLISHABLE_KEY', ''),
+    return {
+        'publishable_key': _billing_settings().stripe_publishable_key,
         'plans': plans,
         'mock_mode': mock_mode,
     }
 
-    return jsonify(payload)
+
+@billing_bp.route('/config', methods=['GET'])
+def get_billing_config():
+    # The payload is a pure function of the billing settings snapshot.
+    settings = _billing_settings()
+    etag = version_tag(
+        'billing-config',
+        settings.stripe_publishable_key,
+        bool(settings.stripe_secret_key),
+        settings.mock_mode,
+        sorted(settings.stripe_price_ids.items()),
+    )
+    return conditional_json_response(
+        etag,
+        _billing_config_payload,
+        surrogate_keys=('billing-config',),
+        cache_key=('billing-config', etag),
+    )
 
 
 @billing_bp.route('/subscription', methods=['GET'])
@@ -502,7 +506,7 @@ def get_subscription():
         return jsonify({'error': str(exc)}), 400
 
     mock_mode = _mock_mode_enabled()
-    stripe_secret = os.getenv('STRIPE_SECRET_KEY')
+    stripe_secret = _billing_settings().stripe_secret_key
     if (
         not mock_mode and
         stripe_secret and
@@ -648,7 +652,7 @@ def complete_checkout_session():
     if error:
         return jsonify({'error': error[0]}), error[1]
 
-    stripe_secret = os.getenv('STRIPE_SECRET_KEY')
+    stripe_secret = _billing_settings().stripe_secret_key
     if not stripe_secret:
         return jsonify({'error': 'Stripe is not configured'}), 503
 
@@ -685,8 +689,8 @@ def complete_checkout_session():
 
 @billing_bp.route('/webhooks/stripe', methods=['POST'])
 def handle_stripe_webhook():
-    webhook_secret = os.getenv('STRIPE_WEBHOOK_SECRET')
-    stripe_secret = os.getenv('STRIPE_SECRET_KEY')
+    webhook_secret = _billing_settings().stripe_webhook_secret
+    stripe_secret = _billing_settings().stripe_secret_key
     signature = request.headers.get('Stripe-Signature', '')
 
     if not webhook_secret:
@@ -739,7 +743,7 @@ def create_customer_portal():
     if _mock_mode_enabled():
         return jsonify({'url': f'{return_url}?portal=mock'}), 200
 
-    stripe_secret = os.getenv('STRIPE_SECRET_KEY')
+    stripe_secret = _billing_settings().stripe_secret_key
     if not stripe_secret:
         return jsonify({'error': 'Stripe is not configured'}), 503
 
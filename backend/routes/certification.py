@@ -2,6 +2,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import func
+from http_caching import conditional_json_response, version_tag
 from routes import supabase_jwt_required, get_supabase_identity, get_supabase_claims
 from models import (
     db,
@@ -12,6 +14,9 @@ from models import (
     AssessmentResult,
 )
 from logging_config import get_logger
+from pagination import InvalidPageRequest, keyset_page, parse_page_args
+from progress_version import read_progress_version
+from routes.assessment import get_latest_assessment_result
 import json
 import random
 import string
@@ -188,6 +193,71 @@ def generate_verification_code():
     """Generate a unique verification code for certificates"""
     return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
 
+def certification_catalog_version():
+    """Cheap version of the certification catalog: row count plus the newest ``updated_at``."""
+    count, updated_at = db.session.query(
+        func.count(CertificationType.id),
+        func.max(CertificationType.updated_at),
+    ).one()
+    return count, str(updated_at) if updated_at else None
+
+
+def _available_certifications_payload(user):
+    latest_assessment = None
+    completed_modules = 0
+    completed_module_ids = set()
+    current_tier = _normalize_tier(user.subscription_tier) if user else 'free'
+    if user:
+        latest_assessment = get_latest_assessment_result(user.id, user)
+        completed_progress = (UserProgress.query
+                              .filter_by(user_id=user.id, status='completed')
+                              .all())
+        completed_modules = len(completed_progress)
+        completed_module_ids = {progress.module_id for progress in completed_progress}
+
+    records = CertificationType.query.order_by(CertificationType.title.asc()).all()
+    payload = []
+    for record in records:
+        serialized = _serialize_certification_type(record)
+        required_tier = record.access_tier or ('professional' if record.is_premium else 'free')
+        upgrade_required = not _has_tier_access(current_tier, required_tier)
+
+        if user:
+            readiness = _evaluate_certification_readiness(
+                record,
+                latest_assessment,
+                completed_modules,
+                completed_module_ids,
+            )
+        else:
+            readiness = {
+                'eligible': False,
+                'reasons': ['Sign in to evaluate your certification readiness.']
+            }
+
+        missing_requirements = list(readiness['reasons'])
+        if upgrade_required:
+            missing_requirements.append(
+                f'Upgrade to {required_tier} in billing to unlock this certification.'
+            )
+
+        serialized.update({
+            'required_tier': required_tier,
+            'current_tier': current_tier,
+            'upgrade_required': upgrade_required,
+            'eligible': readiness['eligible'] and not upgrade_required,
+            'missing_requirements': missing_requirements
+        })
+        payload.append(serialized)
+
+    response = {'certifications': payload}
+    if not payload:
+        response['message'] = 'No certification catalog configured. Run `flask seed-certifications` to load defaults.'
+
+    logger.info('certification_catalog_listed', count=len(payload))
+    return response
+
+
 @certification_bp.route('/available', methods=['GET'])
 @supabase_jwt_required(optional=True)
 def get_available_certifications():
@@ -213,96 +283,96 @@ def get_available_certifications():
                 db.session.add(user)
                 db.session.commit()
 
-        latest_assessment = None
-        completed_modules = 0
-        completed_module_ids = set()
-        current_tier = _normalize_tier(user.subscription_tier) if user else 'free'
-        if user:
-            latest_assessment = (AssessmentResult.query
-                                 .filter_by(user_id=user.id)
-                                 .order_by(AssessmentResult.completed_at.desc())
-                                 .first())
-            completed_progress = (UserProgress.query
-                                  .filter_by(user_id=user.id, status='completed')
-                                  .all())
-            completed_modules = len(completed_progress)
-            completed_module_ids = {progress.module_id for progress in completed_progress}
-
-        records = CertificationType.query.order_by(CertificationType.title.asc()).all()
-        payload = []
-        for record in records:
-            serialized = _serialize_certification_type(record)
-            required_tier = record.access_tier or ('professional' if record.is_premium else 'free')
-            upgrade_required = not _has_tier_access(current_tier, required_tier)
-
-            if user:
-                readiness = _evaluate_certification_readiness(
-                    record,
-                    latest_assessment,
-                    completed_modules,
-                    completed_module_ids,
-                )
-            else:
-                readiness = {
-                    'eligible': False,
-                    'reasons': ['Sign in to evaluate your certification readiness.']
-                }
-
-            missing_requirements = list(readiness['reasons'])
-            if upgrade_required:
-                missing_requirements.append(
-                    f'Upgrade to {required_tier} in billing to unlock this certification.'
-                )
-
-            serialized.update({
-                'required_tier': required_tier,
-                'current_tier': current_tier,
-                'upgrade_required': upgrade_required,
-                'eligible': readiness['eligible'] and not upgrade_required,
-                'missing_requirements': missing_requirements
-            })
-            payload.append(serialized)
-
-        response = {'certifications': payload}
-        if not payload:
-            response['message'] = 'No certification catalog configured. Run `flask seed-certifications` to load defaults.'
+        if user is None:
+            etag = version_tag('certification-catalog', *certification_catalog_version())
+        else:
+            etag = version_tag(
+                'certification-catalog',
+                *certification_catalog_version(),
+                user.id,
+                user.subscription_tier,
+                user.latest_assessment_result_id,
+                read_progress_version(user.id),
+            )
 
-        logger.info('certification_catalog_listed', count=len(payload))
-        return jsonify(response), 200
+        return conditional_json_response(
+            etag,
+            lambda: _available_certifications_payload(user),
+            surrogate_keys=('certification-catalog',),
+            private=user is not None,
+            cache_key=('certification-catalog', etag),
+            vary_authorization=True,
+        )
 
     except Exception as e:
         logger.exception('certification_catalog_failed', error=str(e))
         return jsonify({'error': 'Failed to get certifications', 'details': str(e)}), 500
 
+EARNED_SUMMARY_COLUMNS = (
+    Certification.id,
+    Certification.catalog_id,
+    Certification.certification_type,
+    Certification.verification_code,
+    Certification.issued_at,
+    Certification.expires_at,
+    Certification.is_valid,
+)
+
+
+def _serialize_earned_summary(row):
+    return {
+        'id': row.id,
+        'catalog_id': row.catalog_id,
+        'certification_type': row.certification_type,
+        'verification_code': row.verification_code,
+        'issued_at': row.issued_at.isoformat() if row.issued_at else None,
+        'expires_at': row.expires_at.isoformat() if row.expires_at else None,
+        'is_valid': row.is_valid,
+    }
+
+
+def _serialize_earned_certification(certification, catalog):
+    return {
+        'id': certification.id,
+        'catalog_id': certification.catalog_id,
+        'certification_type': certification.certification_type,
+        'verification_code': certification.verification_code,
+        'issued_at': certification.issued_at.isoformat() if certification.issued_at else None,
+        'expires_at': certification.expires_at.isoformat() if certification.expires_at else None,
+        'is_valid': certification.is_valid,
+        'badge_url': certification.badge_url,
+        'skills_validated': _parse_skill_payload(certification.skills_validated) or (catalog.skills_validated if catalog else []),
+        'access_tier': catalog.access_tier if catalog else None
+    }
+
 @certification_bp.route('/earned', methods=['GET'])
 @supabase_jwt_required()
 def get_earned_certifications():
     """Get user's earned certifications"""
     try:
         user_id = g.get('current_user_id') or get_supabase_identity()
-        records = (Certification.query.filter_by(user_id=user_id)
-                   .outerjoin(CertificationType, Certification.catalog_id == CertificationType.id)
-                   .add_entity(CertificationType)
-                   .order_by(Certification.issued_at.desc())
-                   .all())
-
-        payload = []
-        for certification, catalog in records:
-            payload.append({
-                'id': certification.id,
-                'catalog_id': certification.catalog_id,
-                'certification_type': certification.certification_type,
-                'verification_code': certification.verification_code,
-                'issued_at': certification.issued_at.isoformat() if certification.issued_at else None,
-                'expires_at': certification.expires_at.isoformat() if certification.expires_at else None,
-                'is_valid': certification.is_valid,
-                'badge_url': certification.badge_url,
-                'skills_validated': _parse_skill_payload(certification.skills_validated) or (catalog.skills_validated if catalog else []),
-                'access_tier': catalog.access_tier if catalog else None
-            })
-
-        logger.info('certifications_listed', user_id=user_id, count=len(payload))
-        return jsonify({'certifications': payload}), 200
+        try:
+            limit, cursor, summary = parse_page_args(request.args)
+        except InvalidPageRequest as exc:
+            return jsonify({'error': str(exc)}), 400
+
+        if summary:
+            query = db.session.query(*EARNED_SUMMARY_COLUMNS).filter(Certification.user_id == user_id)
+            row_key = lambda row: (row.issued_at, row.id)
+        else:
+            query = (Certification.query.filter_by(user_id=user_id)
+                     .outerjoin(CertificationType, Certification.catalog_id == CertificationType.id)
+                     .add_entity(CertificationType))
+            row_key = lambda row: (row[0].issued_at, row[0].id)
+        records, next_cursor = keyset_page(query, Certification.issued_at, Certification.id, limit, cursor, row_key)
+
+        if summary:
+            payload = [_serialize_earned_summary(row) for row in records]
+        else:
+            payload = [_serialize_earned_certification(certification, catalog) for certification, catalog in records]
+
+        logger.info('certifications_listed', user_id=user_id, count=len(payload), summary=summary)
+        return jsonify({'certifications': payload, 'next_cursor': next_cursor}), 200
 
     except Exception as e:
         logger.exception('certifications_list_failed', user_id=user_id, error=str(e))
@@ -337,7 +407,13 @@ def verify_certification(verification_code):
         }
 
         logger.info('certification_verified', verification_code=verification_code, catalog_id=certification.catalog_id)
-        return jsonify({'valid': True, 'certification': payload}), 200
+        # Revocation and renames must show up, so the row is always read; the ETag
+        # only saves the transfer when nothing changed.
+        return conditional_json_response(
+            version_tag('certification-verify', verification_code, json.dumps(payload, sort_keys=True)),
+            lambda: {'valid': True, 'certification': payload},
+            surrogate_keys=('certification-verify', f'certification-{verification_code}'),
+        )
 
     except Exception as e:
         logger.exception('certification_verify_failed', verification_code=verification_code, error=str(e))
@@ -395,10 +471,7 @@ def apply_for_certification(certification_id):
                 'certification': _serialize_awarded_certification(existing_certification, cert_type)
             }), 200
 
-        latest_assessment = (AssessmentResult.query
-                             .filter_by(user_id=user_id)
-                             .order_by(AssessmentResult.completed_at.desc())
-                             .first())
+        latest_assessment = get_latest_assessment_result(user_id, user)
         completed_progress = (UserProgress.query
                               .filter_by(user_id=user_id, status='completed')
                               .all())
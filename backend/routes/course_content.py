@@ -6,6 +6,11 @@ Handles lesson viewing, progress tracking, and quiz submissions
 from flask import Blueprint, jsonify, request, g
 from models import db, TrainingModule, Lesson, LessonProgress, UserProgress
 from routes.auth import supabase_jwt_required, get_supabase_identity
+from module_catalog import get_module_catalog
+from lesson_touch_buffer import get_lesson_touch_buffer
+from progress_counters import apply_module_progress_delta, lesson_progress_contribution, required_lesson_count
+from recommendation_cache import invalidate_recommendations
+from settings import get_settings
 from training_metadata import build_module_metadata, normalize_video_embed_url
 import structlog
 import json
@@ -104,6 +109,23 @@ def serialize_module_progress(module_progress, lessons, progress_map):
     }
 
 
+def serialize_module_progress_counters(module_progress, required_lessons):
+    """Module summary from the ``UserProgress`` counters, without loading the module's lessons."""
+    return {
+        'module_id': module_progress.module_id,
+        'status': module_progress.status,
+        'progress_percentage': module_progress.progress_percentage,
+        'completed_lessons': module_progress.completed_required_lessons,
+        'total_lessons': required_lessons,
+        'time_spent_minutes': module_progress.time_spent_minutes,
+        'current_lesson_id': module_progress.current_lesson_id,
+        'resume_lesson_id': module_progress.current_lesson_id,
+        'started_at': module_progress.started_at.isoformat() if module_progress.started_at else None,
+        'last_accessed': module_progress.last_accessed.isoformat() if module_progress.last_accessed else None,
+        'completed_at': module_progress.completed_at.isoformat() if module_progress.completed_at else None,
+    }
+
+
 @course_content_bp.route('/modules/<module_id>/lessons', methods=['GET'])
 @supabase_jwt_required()
 def get_module_lessons(module_id):
@@ -112,7 +134,7 @@ def get_module_lessons(module_id):
         user_id = g.get('current_user_id') or get_supabase_identity()
         
         # Get the module
-        module = TrainingModule.query.get(module_id)
+        module = get_module_catalog().get(module_id) or TrainingModule.query.get(module_id)
         if not module:
             return jsonify({'error': 'Module not found'}), 404
         
@@ -176,6 +198,61 @@ def get_module_lessons(module_id):
         return jsonify({'error': 'Failed to get lessons', 'details': str(e)}), 500
 
 
+def _is_revisit(progress, module_progress):
+    """A view that would only move ``last_accessed``/``current_lesson_id`` on rows that already exist."""
+    return (
+        progress is not None
+        and module_progress is not None
+        and progress.status != 'not_started'
+        and progress.started_at is not None
+        and module_progress.status != 'not_started'
+        and module_progress.started_at is not None
+    )
+
+
+def _write_lesson_view(user_id, lesson, progress, module_progress, now):
+    lesson_id = lesson.id
+    if not progress:
+        # Create new progress record
+        progress = LessonProgress(
+            user_id=user_id,
+            lesson_id=lesson_id,
+            module_id=lesson.module_id,
+            status='in_progress',
+            started_at=now,
+            last_accessed=now
+        )
+        db.session.add(progress)
+    else:
+        # Update last accessed
+        progress.last_accessed = now
+        if progress.status == 'not_started':
+            progress.status = 'in_progress'
+        if not progress.started_at:
+            progress.started_at = now
+
+    if not module_progress:
+        module_progress = UserProgress(
+            user_id=user_id,
+            module_id=lesson.module_id,
+            status='in_progress',
+            started_at=progress.started_at or now,
+            current_lesson_id=lesson_id,
+            last_accessed=now,
+        )
+        db.session.add(module_progress)
+    else:
+        module_progress.current_lesson_id = lesson_id
+        module_progress.last_accessed = now
+        if module_progress.status == 'not_started':
+            module_progress.status = 'in_progress'
+        if not module_progress.started_at:
+            module_progress.started_at = progress.started_at or now
+
+    db.session.commit()
+    return progress
+
+
 @course_content_bp.route('/lessons/<lesson_id>', methods=['GET'])
 @supabase_jwt_required()
 def get_lesson_content(lesson_id):
@@ -200,44 +277,10 @@ def get_lesson_content(lesson_id):
             module_id=lesson.module_id
         ).first()
 
-        if not progress:
-            # Create new progress record
-            progress = LessonProgress(
-                user_id=user_id,
-                lesson_id=lesson_id,
-                module_id=lesson.module_id,
-                status='in_progress',
-                started_at=now,
-                last_accessed=now
-            )
-            db.session.add(progress)
-        else:
-            # Update last accessed
-            progress.last_accessed = now
-            if progress.status == 'not_started':
-                progress.status = 'in_progress'
-            if not progress.started_at:
-                progress.started_at = now
-
-        if not module_progress:
-            module_progress = UserProgress(
-                user_id=user_id,
-                module_id=lesson.module_id,
-                status='in_progress',
-                started_at=progress.started_at or now,
-                current_lesson_id=lesson_id,
-                last_accessed=now,
-            )
-            db.session.add(module_progress)
-        else:
-            module_progress.current_lesson_id = lesson_id
-            module_progress.last_accessed = now
-            if module_progress.status == 'not_started':
-                module_progress.status = 'in_progress'
-            if not module_progress.started_at:
-                module_progress.started_at = progress.started_at or now
-
-        db.session.commit()
+        if not _is_revisit(progress, module_progress) or not get_lesson_touch_buffer().record(
+            user_id, lesson_id, lesson.module_id, now
+        ):
+            progress = _write_lesson_view(user_id, lesson, progress, module_progress, now)
         
         # Parse and normalize content JSON
         content_data = normalize_lesson_content(lesson)
@@ -281,11 +324,12 @@ def complete_lesson(lesson_id):
         if not lesson:
             return jsonify({'error': 'Lesson not found'}), 404
         
-        # Get or create progress record
+        # Get or create progress record, locked until the module counters move with it
         progress = LessonProgress.query.filter_by(
             user_id=user_id,
             lesson_id=lesson_id
-        ).first()
+        ).with_for_update().first()
+        before = lesson_progress_contribution(progress, lesson)
         
         if not progress:
             progress = LessonProgress(
@@ -304,12 +348,19 @@ def complete_lesson(lesson_id):
         # For quiz lessons, save score
         if lesson.content_type == 'quiz' and 'quiz_score' in data:
             progress.quiz_score = data['quiz_score']
-            progress.quiz_attempts += 1
-        
+            progress.quiz_attempts = (progress.quiz_attempts or 0) + 1
+        
+        # Update module progress in the same transaction
+        after = lesson_progress_contribution(progress, lesson)
+        _, completion_changed = apply_module_progress_delta(
+            user_id,
+            lesson.module_id,
+            completed_delta=after[0] - before[0],
+            time_delta=after[1] - before[1],
+        )
         db.session.commit()
-        
-        # Update module progress
-        update_module_progress(user_id, lesson.module_id)
+        if completion_changed:
+            invalidate_recommendations(user_id)
         
         logger.info('lesson_completed', 
                    user_id=user_id, 
@@ -326,6 +377,7 @@ def complete_lesson(lesson_id):
         }), 200
         
     except Exception as e:
+        db.session.rollback()
         logger.exception('complete_lesson_failed', error=str(e))
         return jsonify({'error': 'Failed to complete lesson', 'details': str(e)}), 500
 
@@ -342,11 +394,12 @@ def update_lesson_progress(lesson_id):
         if not lesson:
             return jsonify({'error': 'Lesson not found'}), 404
         
-        # Get or create progress record
+        # Get or create progress record, locked until the module counters move with it
         progress = LessonProgress.query.filter_by(
             user_id=user_id,
             lesson_id=lesson_id
-        ).first()
+        ).with_for_update().first()
+        before = lesson_progress_contribution(progress, lesson)
         
         if not progress:
             progress = LessonProgress(
@@ -364,98 +417,161 @@ def update_lesson_progress(lesson_id):
             progress.status = data['status']
         
         progress.last_accessed = datetime.utcnow()
+        after = lesson_progress_contribution(progress, lesson)
+        _, completion_changed = apply_module_progress_delta(
+            user_id,
+            lesson.module_id,
+            completed_delta=after[0] - before[0],
+            time_delta=after[1] - before[1],
+        )
         db.session.commit()
-        update_module_progress(user_id, lesson.module_id)
+        if completion_changed:
+            invalidate_recommendations(user_id)
         
         return jsonify({'message': 'Progress updated successfully'}), 200
         
     except Exception as e:
+        db.session.rollback()
         logger.exception('update_lesson_progress_failed', error=str(e))
         return jsonify({'error': 'Failed to update progress', 'details': str(e)}), 500
 
 
-def update_module_progress(user_id, module_id):
-    """Calculate and update overall module progress"""
+LESSON_STATUS_RANK = {'not_started': 0, 'in_progress': 1, 'completed': 2}
+
+
+class InvalidProgressBatch(ValueError):
+    pass
+
+
+def collapse_progress_events(events):
+    """Fold an ordered list of lesson progress events into one update per lesson.
+
+    Time spent and status only move forward: the largest time and the most
+    advanced status win, whatever order the heartbeats arrive in.
+    """
+    collapsed = {}
+    for index, event in enumerate(events):
+        if not isinstance(event, dict) or not isinstance(event.get('lesson_id'), str) or not event['lesson_id']:
+            raise InvalidProgressBatch(f'events[{index}] needs a lesson_id.')
+
+        status = event.get('status')
+        if status is not None and status not in LESSON_STATUS_RANK:
+            raise InvalidProgressBatch(f'events[{index}] has an unknown status {status!r}.')
+
+        time_spent = event.get('time_spent_minutes')
+        if time_spent is not None and (isinstance(time_spent, bool) or not isinstance(time_spent, int) or time_spent < 0):
+            raise InvalidProgressBatch(f'events[{index}] time_spent_minutes must be a non-negative integer.')
+
+        update = collapsed.setdefault(event['lesson_id'], {'time_spent_minutes': None, 'status': None})
+        if time_spent is not None:
+            update['time_spent_minutes'] = max(time_spent, update['time_spent_minutes'] or 0)
+        if status is not None and LESSON_STATUS_RANK[status] > LESSON_STATUS_RANK.get(update['status'], -1):
+            update['status'] = status
+    return collapsed
+
+
+def _apply_lesson_progress_update(progress, update, now):
+    if update['time_spent_minutes'] is not None:
+        progress.time_spent_minutes = max(update['time_spent_minutes'], progress.time_spent_minutes or 0)
+
+    # Any event means the lesson was opened, so it is at least in progress.
+    status = update['status'] or 'in_progress'
+    if LESSON_STATUS_RANK[status] > LESSON_STATUS_RANK.get(progress.status or 'not_started', 0):
+        progress.status = status
+        if status == 'completed' and not progress.completed_at:
+            progress.completed_at = now
+    progress.last_accessed = now
+
+
+@course_content_bp.route('/progress/batch', methods=['POST'])
+@supabase_jwt_required()
+def ingest_progress_batch():
+    """Apply an ordered batch of lesson progress events in one transaction"""
+    user_id = None
     try:
-        # Get all lessons for the module
-        lessons = Lesson.query.filter_by(module_id=module_id).order_by(Lesson.order_index).all()
-        total_lessons = len(lessons)
-        
-        if total_lessons == 0:
-            return
-        
-        lesson_progress_records = LessonProgress.query.filter_by(
-            user_id=user_id,
-            module_id=module_id
-        ).all()
-        progress_by_lesson = {progress.lesson_id: progress for progress in lesson_progress_records}
+        user_id = g.get('current_user_id') or get_supabase_identity()
+        data = request.get_json(silent=True) or {}
+        events = data.get('events')
+        if not isinstance(events, list) or not events:
+            return jsonify({'error': 'events must be a non-empty list.'}), 400
+
+        max_events = get_settings().training.progress_batch_max_events
+        if len(events) > max_events:
+            return jsonify({'error': f'A batch can hold at most {max_events} events.'}), 400
+
+        try:
+            collapsed = collapse_progress_events(events)
+        except InvalidProgressBatch as exc:
+            return jsonify({'error': str(exc)}), 400
+
+        lessons = {lesson.id: lesson for lesson in Lesson.query.filter(Lesson.id.in_(collapsed))}
+        unknown_lesson_ids = sorted(set(collapsed) - set(lessons))
+        progress_by_lesson = {
+            progress.lesson_id: progress
+            for progress in LessonProgress.query.filter(
+                LessonProgress.user_id == user_id,
+                LessonProgress.lesson_id.in_(lessons),
+            ).with_for_update()
+        }
 
-        completed_lessons = sum(
-            1 for lesson in lessons
-            if progress_by_lesson.get(lesson.id) and progress_by_lesson[lesson.id].status == 'completed'
-        )
-        
-        # Calculate progress percentage
-        progress_percentage = int((completed_lessons / total_lessons) * 100)
-        total_time_spent = sum((progress.time_spent_minutes or 0) for progress in lesson_progress_records)
-        next_incomplete_lesson = next(
-            (
-                lesson.id for lesson in lessons
-                if not progress_by_lesson.get(lesson.id)
-                or progress_by_lesson[lesson.id].status != 'completed'
-            ),
-            lessons[-1].id if lessons else None,
-        )
-        
-        # Get or create module progress
-        module_progress = UserProgress.query.filter_by(
-            user_id=user_id,
-            module_id=module_id
-        ).first()
-        
-        if not module_progress:
-            module_progress = UserProgress(
-                user_id=user_id,
-                module_id=module_id,
-                started_at=datetime.utcnow()
-            )
-            db.session.add(module_progress)
-        
-        # Update progress
-        module_progress.progress_percentage = progress_percentage
-        module_progress.time_spent_minutes = total_time_spent
-        module_progress.current_lesson_id = next_incomplete_lesson
-        module_progress.last_accessed = max(
-            (progress.last_accessed for progress in lesson_progress_records if progress.last_accessed),
-            default=datetime.utcnow(),
-        )
-        if lesson_progress_records and not module_progress.started_at:
-            module_progress.started_at = min(
-                (
-                    progress.started_at for progress in lesson_progress_records
-                    if progress.started_at
-                ),
-                default=datetime.utcnow(),
+        now = datetime.utcnow()
+        deltas = {}
+        for lesson_id, lesson in lessons.items():
+            progress = progress_by_lesson.get(lesson_id)
+            before = lesson_progress_contribution(progress, lesson)
+            if progress is None:
+                progress = LessonProgress(
+                    user_id=user_id,
+                    lesson_id=lesson_id,
+                    module_id=lesson.module_id,
+                    status='not_started',
+                    time_spent_minutes=0,
+                    quiz_attempts=0,
+                    started_at=now,
+                )
+                db.session.add(progress)
+                progress_by_lesson[lesson_id] = progress
+            _apply_lesson_progress_update(progress, collapsed[lesson_id], now)
+            after = lesson_progress_contribution(progress, lesson)
+            completed_delta, time_delta = deltas.get(lesson.module_id, (0, 0))
+            deltas[lesson.module_id] = (completed_delta + after[0] - before[0], time_delta + after[1] - before[1])
+
+        modules = {}
+        for module_id, (completed_delta, time_delta) in sorted(deltas.items()):
+            modules[module_id] = apply_module_progress_delta(
+                user_id,
+                module_id,
+                completed_delta=completed_delta,
+                time_delta=time_delta,
+                now=now,
             )
-        
-        # Update status
-        if progress_percentage == 100:
-            module_progress.status = 'completed'
-            if not module_progress.completed_at:
-                module_progress.completed_at = datetime.utcnow()
-        elif lesson_progress_records or total_time_spent > 0:
-            module_progress.status = 'in_progress'
-            module_progress.completed_at = None
-        else:
-            module_progress.status = 'not_started'
-        
+        db.session.flush()
+        # Serialized before the commit expires every row, which would reload them one by one.
+        response = {
+            'lessons': {
+                lesson_id: serialize_lesson_progress(progress_by_lesson[lesson_id])
+                for lesson_id in lessons
+            },
+            'modules': [
+                serialize_module_progress_counters(module_progress, required_lesson_count(module_id))
+                for module_id, (module_progress, _) in modules.items()
+            ],
+            'unknown_lesson_ids': unknown_lesson_ids,
+        }
         db.session.commit()
-        
-        logger.info('module_progress_updated',
+        if any(completion_changed for _, completion_changed in modules.values()):
+            invalidate_recommendations(user_id)
+
+        logger.info('lesson_progress_batch_applied',
                    user_id=user_id,
-                   module_id=module_id,
-                   progress_percentage=progress_percentage,
-                   status=module_progress.status)
-        
+                   events=len(events),
+                   lessons=len(lessons),
+                   modules=len(modules),
+                   unknown_lessons=len(unknown_lesson_ids))
+
+        return jsonify(response), 200
+
     except Exception as e:
-        logger.exception('update_module_progress_failed', error=str(e))
+        db.session.rollback()
+        logger.exception('lesson_progress_batch_failed', user_id=user_id, error=str(e))
+        return jsonify({'error': 'Failed to update progress', 'details': str(e)}), 500
@@ -1,7 +1,13 @@
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import case, func
 from routes import supabase_jwt_required, get_supabase_identity
 from models import db, TrainingModule, UserProgress
+from http_caching import conditional_json_response, version_tag
 from logging_config import get_logger
+from module_catalog import get_module_catalog
+from pagination import InvalidPageRequest, keyset_page, parse_page_args
+from progress_version import read_progress_version
+from recommendation_cache import invalidate_recommendations
 from datetime import datetime
 import json
 import uuid
@@ -21,7 +27,10 @@ def parse_json_field(value, default=None):
 
 
 def serialize_module(module, include_details: bool = False):
-    payload = parse_json_field(module.prerequisites, {})
+    # Catalog snapshot modules carry their JSON fields pre-parsed.
+    payload = getattr(module, 'prerequisite_payload', None)
+    if payload is None:
+        payload = parse_json_field(module.prerequisites, {})
 
     if isinstance(payload, dict):
         requirements = payload.get('requirements') or []
@@ -39,7 +48,10 @@ def serialize_module(module, include_details: bool = False):
         sections = []
         metadata = {}
 
-    learning_objectives = parse_json_field(module.learning_objectives, [])
+    if hasattr(module, 'learning_objective_list'):
+        learning_objectives = list(module.learning_objective_list)
+    else:
+        learning_objectives = parse_json_field(module.learning_objectives, [])
 
     access_tier = metadata.get('access_tier') if isinstance(metadata, dict) else None
 
@@ -103,6 +115,51 @@ def build_progress_summary(progress_payload):
     }
 
 
+PROGRESS_SUMMARY_COLUMNS = (
+    UserProgress.id,
+    UserProgress.module_id,
+    UserProgress.status,
+    UserProgress.progress_percentage,
+    UserProgress.last_accessed,
+)
+PROGRESS_COLUMNS = PROGRESS_SUMMARY_COLUMNS + (
+    UserProgress.time_spent_minutes,
+    UserProgress.current_lesson_id,
+    UserProgress.started_at,
+    UserProgress.completed_at,
+)
+
+
+def serialize_progress_summary(progress, module_title=None):
+    return {
+        'module_id': progress.module_id,
+        'module_title': module_title,
+        'status': progress.status,
+        'progress_percentage': progress.progress_percentage or 0,
+        'last_accessed': progress.last_accessed.isoformat() if progress.last_accessed else None,
+    }
+
+
+def build_user_progress_summary(user_id):
+    """Same shape as ``build_progress_summary`` but aggregated in SQL over every record."""
+    completed_modules, total_learning_time = (db.session.query(
+        func.coalesce(func.sum(case((UserProgress.status == 'completed', 1), else_=0)), 0),
+        func.coalesce(func.sum(UserProgress.time_spent_minutes), 0),
+    ).filter(UserProgress.user_id == user_id).one())
+
+    resume_row = (db.session.query(*PROGRESS_COLUMNS, TrainingModule.title.label('module_title'))
+                  .join(TrainingModule, TrainingModule.id == UserProgress.module_id)
+                  .filter(UserProgress.user_id == user_id, UserProgress.status == 'in_progress')
+                  .order_by(UserProgress.last_accessed.desc().nulls_last())
+                  .first())
+
+    return {
+        'completed_modules': int(completed_modules),
+        'total_learning_time': int(total_learning_time),
+        'resume_module': serialize_progress(resume_row, module_title=resume_row.module_title) if resume_row else None,
+    }
+
+
 def get_progress_lookup(user_id, module_ids):
     if not user_id or not module_ids:
         return {}
@@ -117,59 +174,73 @@ def get_progress_lookup(user_id, module_ids):
     return {progress.module_id: progress for progress in progress_records}
 
 
-@training_bp.route('/modules', methods=['GET'])
-@supabase_jwt_required(optional=True)
-def get_training_modules():
-    try:
-        user_id = g.get('current_user_id') or get_supabase_identity(optional=True)
-        role_filter = request.args.get('role')
-        access_tier = request.args.get('tier')
-
-        query = TrainingModule.query.filter_by(is_active=True)
+def _training_modules_payload(catalog, user_id, role_filter, access_tier):
+    records = catalog.active_modules
 
-        if role_filter and role_filter != 'All':
-            query = query.filter(
-                (TrainingModule.role_specific == role_filter) |
-                (TrainingModule.role_specific == 'General')
-            )
+    if role_filter and role_filter != 'All':
+        records = [module for module in records if module.role_specific in (role_filter, 'General')]
 
-        records = query.order_by(TrainingModule.title.asc()).all()
-        modules = [serialize_module(module) for module in records]
+    modules = [serialize_module(module) for module in records]
 
-        if access_tier:
-            modules = [m for m in modules if m.get('access_tier') == access_tier]
+    if access_tier:
+        modules = [m for m in modules if m.get('access_tier') == access_tier]
 
-        response_payload = {'modules': modules}
-        progress_payload = []
+    response_payload = {'modules': modules}
+    progress_payload = []
 
-        if user_id and modules:
-            progress_lookup = get_progress_lookup(user_id, [module['id'] for module in modules])
-            for module_payload in modules:
-                progress = serialize_progress(
-                    progress_lookup.get(module_payload['id']),
-                    module_title=module_payload.get('title'),
-                )
-                module_payload['user_progress'] = progress
-                if progress:
-                    progress_payload.append(progress)
+    if user_id and modules:
+        progress_lookup = get_progress_lookup(user_id, [module['id'] for module in modules])
+        for module_payload in modules:
+            progress = serialize_progress(
+                progress_lookup.get(module_payload['id']),
+                module_title=module_payload.get('title'),
+            )
+            module_payload['user_progress'] = progress
+            if progress:
+                progress_payload.append(progress)
+
+        response_payload['summary'] = build_progress_summary(progress_payload)
+        response_payload['resume_module'] = response_payload['summary']['resume_module']
+
+    if not records:
+        response_payload['message'] = 'No training modules configured yet. Use `flask seed-training-modules` to load defaults.'
+    elif access_tier and not modules:
+        response_payload['message'] = f'No modules available for tier {access_tier}.'
+
+    logger.info(
+        'training_modules_listed',
+        role_filter=role_filter,
+        access_tier=access_tier,
+        count=len(modules),
+    )
+    return response_payload
 
-            response_payload['summary'] = build_progress_summary(progress_payload)
-            response_payload['resume_module'] = response_payload['summary']['resume_module']
 
-        if not records:
-            response_payload['message'] = 'No training modules configured yet. Use `flask seed-training-modules` to load defaults.'
-        elif access_tier and not modules:
-            response_payload['message'] = f'No modules available for tier {access_tier}.'
+@training_bp.route('/modules', methods=['GET'])
+@supabase_jwt_required(optional=True)
+def get_training_modules():
+    try:
+        user_id = g.get('current_user_id') or get_supabase_identity(optional=True)
+        role_filter = request.args.get('role')
+        access_tier = request.args.get('tier')
 
-        logger.info(
-            'training_modules_listed',
-            role_filter=role_filter,
-            access_tier=access_tier,
-            count=len(modules),
+        catalog = get_module_catalog()
+        variant = ('training-modules', catalog.fingerprint, role_filter, access_tier)
+        if user_id:
+            # Per-user progress is merged in, so the validator also tracks the user's progress version.
+            etag = version_tag(*variant, user_id, read_progress_version(user_id))
+        else:
+            etag = version_tag(*variant)
+
+        return conditional_json_response(
+            etag,
+            lambda: _training_modules_payload(catalog, user_id, role_filter, access_tier),
+            surrogate_keys=('training-modules',),
+            private=bool(user_id),
+            cache_key=variant,
+            vary_authorization=True,
         )
 
-        return jsonify(response_payload), 200
-
     except Exception as e:
         logger.exception('training_modules_fetch_failed', error=str(e))
         return jsonify({'error': 'Failed to get training modules', 'details': str(e)}), 500
@@ -180,7 +251,7 @@ def get_training_modules():
 def get_training_module_detail(module_id):
     try:
       user_id = g.get('current_user_id') or get_supabase_identity(optional=True)
-      module = TrainingModule.query.get(module_id)
+      module = get_module_catalog().get(module_id) or TrainingModule.query.get(module_id)
       if not module or not module.is_active:
           return jsonify({'error': 'Module not found'}), 404
 
@@ -206,21 +277,37 @@ def get_user_progress():
     try:
         user_id = g.get('current_user_id') or get_supabase_identity()
 
-        records = (UserProgress.query
-                   .filter_by(user_id=user_id)
-                   .join(TrainingModule, TrainingModule.id == UserProgress.module_id)
-                   .add_entity(TrainingModule)
-                   .all())
+        try:
+            limit, cursor, summary_only = parse_page_args(request.args)
+        except InvalidPageRequest as exc:
+            return jsonify({'error': str(exc)}), 400
+
+        columns = PROGRESS_SUMMARY_COLUMNS if summary_only else PROGRESS_COLUMNS
+        query = (db.session.query(*columns, TrainingModule.title.label('module_title'))
+                 .join(TrainingModule, TrainingModule.id == UserProgress.module_id)
+                 .filter(UserProgress.user_id == user_id))
+        records, next_cursor = keyset_page(
+            query,
+            UserProgress.last_accessed,
+            UserProgress.id,
+            limit,
+            cursor,
+            row_key=lambda row: (row.last_accessed, row.id),
+        )
 
-        progress_payload = []
-        for progress, module in records:
-            progress_payload.append(serialize_progress(progress, module_title=module.title))
+        serialize = serialize_progress_summary if summary_only else serialize_progress
+        progress_payload = [serialize(row, module_title=row.module_title) for row in records]
+        response = {'progress': progress_payload, 'next_cursor': next_cursor}
+        if cursor is None:
+            response['summary'] = build_user_progress_summary(user_id)
 
-        logger.info('training_progress_listed', user_id=user_id, count=len(progress_payload))
-        return jsonify({
-            'progress': progress_payload,
-            'summary': build_progress_summary(progress_payload),
-        }), 200
+        logger.info(
+            'training_progress_listed',
+            user_id=user_id,
+            count=len(progress_payload),
+            summary=summary_only,
+        )
+        return jsonify(response), 200
 
     except Exception as e:
         logger.exception('training_progress_failed', user_id=user_id, error=str(e))
@@ -315,6 +402,8 @@ def update_progress(module_id):
             progress.completed_at = datetime.utcnow()
 
         db.session.commit()
+        if mark_complete:
+            invalidate_recommendations(user_id)
 
         logger.info(
             'training_progress_updated',
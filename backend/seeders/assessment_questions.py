@@ -0,0 +1,333 @@
+from models import Assessment, db
+
+SAMPLE_QUESTIONS = [
+    {
+        "id": "1",
+        "domain": "AI Fundamentals",
+        "question_text": "What is the primary difference between AI and traditional software?",
+        "option_a": "AI can learn and adapt from data",
+        "option_b": "AI is faster than traditional software",
+        "option_c": "AI uses more memory",
+        "option_d": "AI is more expensive",
+        "correct_answer": "A",
+        "explanation": "Unlike traditional software, AI systems can learn from data and improve performance without explicit programming for every scenario."
+    },
+    {
+        "id": "2",
+        "domain": "AI Fundamentals",
+        "question_text": "What does “machine learning” mean?",
+        "option_a": "Teaching humans about machines",
+        "option_b": "A type of AI that learns patterns from data",
+        "option_c": "Programming robots to move",
+        "option_d": "Computer maintenance procedures",
+        "correct_answer": "B",
+        "explanation": "Machine learning is a subset of AI focused on algorithms that learn patterns from data to make predictions or decisions."
+    },
+    {
+        "id": "3",
+        "domain": "AI Fundamentals",
+        "question_text": "What causes AI “hallucinations”?",
+        "option_a": "Hardware malfunctions",
+        "option_b": "User input errors",
+        "option_c": "The AI generating plausible but false information",
+        "option_d": "Internet connectivity issues",
+        "correct_answer": "C",
+        "explanation": "Hallucinations happen when AI fills gaps with confident but incorrect information based on patterns it has learned."
+    },
+    {
+        "id": "4",
+        "domain": "Practical Usage",
+        "question_text": "When writing a prompt for an AI tool, you should:",
+        "option_a": "Be vague to let AI be creative",
+        "option_b": "Be specific and clear about what you want",
+        "option_c": "Use only technical jargon",
+        "option_d": "Keep it to one word",
+        "correct_answer": "B",
+        "explanation": "Clear, specific prompts give AI models the context they need to produce accurate, useful outputs."
+    },
+    {
+        "id": "5",
+        "domain": "Practical Usage",
+        "question_text": "What’s the best practice when using AI for research or work?",
+        "option_a": "Accept all AI results without checking",
+        "option_b": "Verify important information with reliable sources",
+        "option_c": "Only use AI-generated sources",
+        "option_d": "Never use AI for professional work",
+        "correct_answer": "B",
+        "explanation": "AI outputs should be validated, especially for critical work—treat them as a starting point, not the final answer."
+    },
+    {
+        "id": "6",
+        "domain": "Practical Usage",
+        "question_text": "An AI tool gives you conflicting information on the same topic. You should:",
+        "option_a": "Use the first response",
+        "option_b": "Research the topic independently to verify",
+        "option_c": "Choose the longer response",
+        "option_d": "Ask the same question again",
+        "correct_answer": "B",
+        "explanation": "When AI responses conflict, cross-checking with trustworthy human-vetted sources ensures accuracy."
+    },
+    {
+        "id": "7",
+        "domain": "Ethics & Critical Thinking",
+        "question_text": "What is “algorithmic bias”?",
+        "option_a": "AI systems running slowly",
+        "option_b": "AI systems making unfair decisions based on training data",
+        "option_c": "Programming syntax errors",
+        "option_d": "Hardware processing limitations",
+        "correct_answer": "B",
+        "explanation": "Algorithmic bias occurs when AI models inherit or amplify unfair patterns found in their training data."
+    },
+    {
+        "id": "8",
+        "domain": "Ethics & Critical Thinking",
+        "question_text": "You notice an AI hiring tool consistently rejects qualified candidates from certain groups. This indicates:",
+        "option_a": "The system is working efficiently",
+        "option_b": "Potential discriminatory bias that needs investigation",
+        "option_c": "Normal performance variation",
+        "option_d": "Cost-saving optimization",
+        "correct_answer": "B",
+        "explanation": "Consistent rejection of specific groups is a warning sign of bias that requires immediate review and mitigation."
+    },
+    {
+        "id": "9",
+        "domain": "Ethics & Critical Thinking",
+        "question_text": "Before trusting AI-generated content, you should:",
+        "option_a": "Always trust it completely",
+        "option_b": "Consider the source, context, and verify key facts",
+        "option_c": "Only check if it looks suspicious",
+        "option_d": "Never trust AI content",
+        "correct_answer": "B",
+        "explanation": "Evaluating source credibility and validating important details prevents misinformation from spreading."
+    },
+    {
+        "id": "10",
+        "domain": "AI Impact & Applications",
+        "question_text": "Which task is current AI BEST suited for?",
+        "option_a": "Providing emotional counseling",
+        "option_b": "Recognizing patterns in large amounts of data",
+        "option_c": "Making complex ethical decisions",
+        "option_d": "Replacing all human judgment",
+        "correct_answer": "B",
+        "explanation": "AI excels at analyzing large datasets to surface patterns, trends, and insights quickly."
+    },
+    {
+        "id": "11",
+        "domain": "AI Impact & Applications",
+        "question_text": "How is AI most likely to affect jobs in the next 5 years?",
+        "option_a": "Eliminate all human jobs",
+        "option_b": "Automate some tasks while creating new types of work",
+        "option_c": "Only affect technology jobs",
+        "option_d": "Have no impact on employment",
+        "correct_answer": "B",
+        "explanation": "AI will automate repetitive tasks but also create new opportunities that require human oversight and strategic thinking."
+    },
+    {
+        "id": "12",
+        "domain": "AI Impact & Applications",
+        "question_text": "What’s a realistic expectation for AI tools today?",
+        "option_a": "They can solve any business problem perfectly",
+        "option_b": "They can assist with analysis and draft generation",
+        "option_c": "They always provide 100% accurate information",
+        "option_d": "They can replace human creativity entirely",
+        "correct_answer": "B",
+        "explanation": "Modern AI is a powerful assistant for analysis and content creation, but still requires human oversight."
+    },
+    {
+        "id": "13",
+        "domain": "Strategic Understanding",
+        "question_text": "When should you choose NOT to use AI for a task?",
+        "option_a": "When it costs money",
+        "option_b": "When human empathy, ethics, or critical judgment are essential",
+        "option_c": "When the technology is new",
+        "option_d": "Never - AI should be used for everything",
+        "correct_answer": "B",
+        "explanation": "Tasks that depend on empathy, ethical nuance, or high-stakes judgment should remain human-led."
+    },
+    {
+        "id": "14",
+        "domain": "Strategic Understanding",
+        "question_text": "What does successful human-AI collaboration look like?",
+        "option_a": "Humans competing against AI",
+        "option_b": "AI and humans complementing each other’s strengths",
+        "option_c": "AI doing all the work",
+        "option_d": "Humans avoiding AI entirely",
+        "correct_answer": "B",
+        "explanation": "The strongest outcomes happen when humans and AI combine strengths—strategy and creativity with speed and scale."
+    },
+    {
+        "id": "15",
+        "domain": "Strategic Understanding",
+        "question_text": "You’re implementing AI in your organization. What’s most important?",
+        "option_a": "Choosing the most expensive AI solution",
+        "option_b": "Training employees and establishing ethical guidelines",
+        "option_c": "Replacing as many human workers as possible",
+        "option_d": "Focusing only on cost savings",
+        "correct_answer": "B",
+        "explanation": "Successful AI adoption depends on skilled people and clear ethical guardrails, not just technology investments."
+    },
+    {
+        "id": "16",
+        "domain": "AI Fundamentals",
+        "question_text": "Which phrase best describes “training data” for AI models?",
+        "option_a": "Data used to operate software without user input",
+        "option_b": "Examples that teach the model patterns and relationships",
+        "option_c": "The final output produced by the model",
+        "option_d": "A list of software bugs to fix",
+        "correct_answer": "B",
+        "explanation": "Training data consists of examples that let the model learn patterns over many iterations."
+    },
+    {
+        "id": "17",
+        "domain": "AI Fundamentals",
+        "question_text": "Why is data quality important for AI systems?",
+        "option_a": "Better data always makes models run faster",
+        "option_b": "High-quality data improves reliability and reduces harmful outputs",
+        "option_c": "Poor data is only a user interface issue",
+        "option_d": "Data quality does not matter once a model is deployed",
+        "correct_answer": "B",
+        "explanation": "Model quality is tied closely to the quality of the data used to train it, especially for fairness and accuracy."
+    },
+    {
+        "id": "18",
+        "domain": "Practical Usage",
+        "question_text": "If an AI-generated response includes wrong details, what should you do first?",
+        "option_a": "Ignore it and move on",
+        "option_b": "Verify with trusted references",
+        "option_c": "Ask the AI to confirm its confidence",
+        "option_d": "Post it immediately to stakeholders",
+        "correct_answer": "B",
+        "explanation": "Verification with trusted sources is the fastest way to correct possible inaccuracies."
+    },
+    {
+        "id": "19",
+        "domain": "Practical Usage",
+        "question_text": "Which prompt style is most useful for brainstorming ideas?",
+        "option_a": "A strict, single-word instruction",
+        "option_b": "A broad open prompt with role, context, constraints, and format",
+        "option_c": "A request without context",
+        "option_d": "No prompt is needed; AI auto-generates ideas by default",
+        "correct_answer": "B",
+        "explanation": "Rich context and constraints help AI give outputs that are easier to use and evaluate."
+    },
+    {
+        "id": "20",
+        "domain": "Ethics & Critical Thinking",
+        "question_text": "What should you do if AI output reveals sensitive personal data?",
+        "option_a": "Share it with your team immediately",
+        "option_b": "Redact or report it through your privacy process",
+        "option_c": "Store it and forget about it",
+        "option_d": "Use it in your marketing campaign",
+        "correct_answer": "B",
+        "explanation": "Sensitive outputs should be handled under privacy and data-protection practices, not treated as ordinary output."
+    },
+    {
+        "id": "21",
+        "domain": "Ethics & Critical Thinking",
+        "question_text": "Which practice helps reduce model bias risks in production?",
+        "option_a": "Testing with diverse user groups and auditing outputs",
+        "option_b": "Restricting model updates forever",
+        "option_c": "Only using one dataset source",
+        "option_d": "Avoiding any feedback process",
+        "correct_answer": "A",
+        "explanation": "Ongoing evaluation with diverse scenarios is key to catching fairness gaps before harm occurs."
+    },
+    {
+        "id": "22",
+        "domain": "AI Impact & Applications",
+        "question_text": "Where is AI most commonly adopted for short-cycle operational gain?",
+        "option_a": "Only for legal sentencing decisions",
+        "option_b": "Customer support triage and document automation",
+        "option_c": "Replacing board-level leadership roles",
+        "option_d": "Replacing all manual tasks instantly",
+        "correct_answer": "B",
+        "explanation": "AI often delivers fast ROI in repetitive support, routing, and document-heavy workflows."
+    },
+    {
+        "id": "23",
+        "domain": "AI Impact & Applications",
+        "question_text": "What is a practical first application for teams new to AI?",
+        "option_a": "Full autonomous company operations",
+        "option_b": "Automated meeting minute drafts with human review",
+        "option_c": "Replacing all strategic decisions with AI",
+        "option_d": "Hiring no human reviewers",
+        "correct_answer": "B",
+        "explanation": "Pilot projects with human review build confidence before scaling AI use."
+    },
+    {
+        "id": "24",
+        "domain": "Strategic Understanding",
+        "question_text": "How should leadership frame AI adoption goals?",
+        "option_a": "As a shortcut for governance and compliance",
+        "option_b": "As measurable business outcomes with responsible guardrails",
+        "option_c": "As a way to reduce all employee ownership",
+        "option_d": "As a trend to satisfy investors only",
+        "correct_answer": "B",
+        "explanation": "AI strategy works best when outcomes, risk controls, and ownership are clearly defined."
+    },
+    {
+        "id": "25",
+        "domain": "Strategic Understanding",
+        "question_text": "What is a strong indicator of AI strategy maturity?",
+        "option_a": "Adopting the newest model every quarter",
+        "option_b": "Measuring outcomes, iterating, and balancing ethics with speed",
+        "option_c": "Avoiding AI whenever uncertainty exists",
+        "option_d": "Deploying without cross-team communication",
+        "correct_answer": "B",
+        "explanation": "Mature strategy couples experimentation with accountability, governance, and measurable value."
+    }
+]
+
+
+def _question_title(entry):
+    return f"{entry['domain']} question {entry['id']}"
+
+
+def seed_assessment_questions(force: bool = False, silent: bool = False):
+    inserted, updated = 0, 0
+
+    for entry in SAMPLE_QUESTIONS:
+        record = Assessment.query.get(entry['id'])
+
+        if record:
+            if not force:
+                continue
+
+            record.title = _question_title(entry)
+            record.domain = entry['domain']
+            record.question_text = entry['question_text']
+            record.option_a = entry['option_a']
+            record.option_b = entry['option_b']
+            record.option_c = entry['option_c']
+            record.option_d = entry['option_d']
+            record.correct_answer = entry['correct_answer']
+            record.explanation = entry.get('explanation')
+            record.difficulty_level = entry.get('difficulty_level', 1)
+            record.is_active = True
+            updated += 1
+        else:
+            record = Assessment(
+                id=entry['id'],
+                title=_question_title(entry),
+                domain=entry['domain'],
+                question_text=entry['question_text'],
+                option_a=entry['option_a'],
+                option_b=entry['option_b'],
+                option_c=entry['option_c'],
+                option_d=entry['option_d'],
+                correct_answer=entry['correct_answer'],
+                explanation=entry.get('explanation'),
+                difficulty_level=entry.get('difficulty_level', 1),
+                is_active=True,
+            )
+            db.session.add(record)
+            inserted += 1
+
+    if inserted or updated:
+        db.session.commit()
+
+    if not silent:
+        print(
+            f"Assessment questions seed completed. inserted={inserted}, updated={updated}, "
+            f"skipped={len(SAMPLE_QUESTIONS) - inserted - updated}"
+        )
@@ -12,6 +12,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models import db, TrainingModule, Lesson
+from module_catalog import bump_module_catalog_version
 from seeders.training import (
     DEFAULT_MODULES,
     HR_TRAINING_VIDEO_URL,
@@ -1640,6 +1641,9 @@ def seed_course_content(force=False, silent=False):
         if not silent:
             print(f"✅ Added {lessons_added} lessons to '{module.title}'")
 
+    if total_lessons_added or force:
+        bump_module_catalog_version()
+
     if not silent:
         print(f"\n📚 Course content seeding complete! Total lessons added: {total_lessons_added}")
 
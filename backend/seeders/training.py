@@ -1,6 +1,7 @@
 import json
 
 from models import TrainingModule, db
+from module_catalog import bump_module_catalog_version
 from seeders.curated_videos import get_curated_video, get_curated_video_url
 
 SALES_TRAINING_VIDEO_URL = get_curated_video_url('module-ai-sales')
@@ -595,6 +596,7 @@ def seed_training_modules(force: bool = False, silent: bool = False):
 
     if inserted or updated:
         db.session.commit()
+        bump_module_catalog_version()
 
     if not silent:
         print(
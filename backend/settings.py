@@ -0,0 +1,283 @@
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from flask import current_app
+
+
+SETTINGS_EXTENSION_KEY = 'litmusai_settings'
+TRUTHY_VALUES = ('1', 'true', 'yes', 'on')
+PRODUCTION_ENVIRONMENTS = ('production', 'prod')
+OPENROUTER_DEFAULT_BASE_URL = 'https://openrouter.ai/api/v1'
+STRIPE_PRICE_SETTING_KEYS = ('STRIPE_PRICE_PREMIUM', 'STRIPE_PRICE_ENTERPRISE')
+OPENROUTER_GENERATION_MODES = ('single', 'per_domain')
+
+
+@dataclass(frozen=True)
+class AuthSettings:
+    supabase_url: str
+    jwt_issuer: str
+    jwks_url: str
+    jwt_audience: str
+    jwt_secret: str
+    jwks_cache_lifespan: int
+    jwks_timeout_seconds: int
+    jwks_cache_dir: str
+    token_cache_max_entries: int
+    demo_auth_enabled: bool
+
+    @property
+    def supabase_configured(self) -> bool:
+        return bool(self.jwt_issuer and (self.jwks_url or self.jwt_secret))
+
+
+@dataclass(frozen=True)
+class BillingSettings:
+    stripe_secret_key: str
+    stripe_publishable_key: str
+    stripe_webhook_secret: str
+    stripe_price_ids: Mapping[str, str]
+    mock_mode: bool
+    frontend_url: str
+
+
+@dataclass(frozen=True)
+class AssessmentSettings:
+    openrouter_api_key: str
+    openrouter_model: str
+    openrouter_base_url: str
+    question_set_secret: str
+    question_bank_refresh_seconds: int
+    question_set_pool_depth: int
+    question_set_pool_max_age_seconds: int
+    openrouter_latency_budget_seconds: float
+    openrouter_circuit_failure_threshold: int
+    openrouter_circuit_recovery_seconds: float
+    openrouter_circuit_half_open_max_calls: int
+    openrouter_generation_mode: str
+    openrouter_domain_retries: int
+    question_set_store: str
+    generated_question_reuse_ratio: float
+    generated_question_min_per_domain: int
+    generated_question_similarity_threshold: float
+    batch_grading_max_sheets: int
+    batch_grading_chunk_size: int
+    recommendation_cache_ttl_seconds: int
+    recommendation_cache_max_entries: int
+
+    @property
+    def openrouter_configured(self) -> bool:
+        return bool(self.openrouter_api_key and self.openrouter_model and self.question_set_secret)
+
+
+@dataclass(frozen=True)
+class TrainingSettings:
+    module_catalog_refresh_seconds: int
+    progress_batch_max_events: int
+    lesson_touch_flush_seconds: int
+    lesson_touch_max_pending: int
+
+
+@dataclass(frozen=True)
+class PlatformSettings:
+    stats_cache_seconds: int
+    catalog_cache_max_age_seconds: int
+    metrics_token: str
+    counter_flush_seconds: int
+
+
+@dataclass(frozen=True)
+class Settings:
+    environment: str
+    testing: bool
+    auth: AuthSettings
+    billing: BillingSettings
+    assessment: AssessmentSettings
+    training: TrainingSettings
+    platform: PlatformSettings
+
+    @property
+    def is_production(self) -> bool:
+        return self.environment in PRODUCTION_ENVIRONMENTS
+
+
+def _normalize_url(value):
+    return str(value or '').strip().rstrip('/')
+
+
+def _int_setting(value, default):
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def _float_setting(value, default):
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+def _generation_mode(value):
+    normalized = str(value or '').strip().lower().replace('-', '_')
+    return normalized if normalized in OPENROUTER_GENERATION_MODES else OPENROUTER_GENERATION_MODES[0]
+
+
+class _SettingsSource:
+    def __init__(self, config):
+        self._config = config or {}
+
+    def value(self, key, default=''):
+        config_value = self._config.get(key)
+        if config_value is not None:
+            normalized = str(config_value).strip()
+            if normalized:
+                return normalized
+
+        env_value = os.getenv(key)
+        if env_value is not None:
+            normalized = env_value.strip()
+            if normalized:
+                return normalized
+
+        return default
+
+    def truthy(self, key):
+        return self.value(key).lower() in TRUTHY_VALUES
+
+
+def _load_auth_settings(source, environment, testing):
+    supabase_url = _normalize_url(source.value('SUPABASE_URL') or source.value('VITE_SUPABASE_URL'))
+    jwt_issuer = _normalize_url(source.value('SUPABASE_JWT_ISSUER'))
+    if not jwt_issuer and supabase_url:
+        jwt_issuer = f'{supabase_url}/auth/v1'
+
+    jwks_url = _normalize_url(source.value('SUPABASE_JWKS_URL'))
+    if not jwks_url and jwt_issuer:
+        jwks_url = f'{jwt_issuer}/.well-known/jwks.json'
+
+    if testing:
+        demo_auth_enabled = True
+    elif environment in PRODUCTION_ENVIRONMENTS:
+        demo_auth_enabled = False
+    else:
+        demo_auth_enabled = source.truthy('ENABLE_DEMO_AUTH') or environment == 'demo'
+
+    return AuthSettings(
+        supabase_url=supabase_url,
+        jwt_issuer=jwt_issuer,
+        jwks_url=jwks_url,
+        jwt_audience=source.value('SUPABASE_JWT_AUDIENCE', 'authenticated'),
+        jwt_secret=source.value('SUPABASE_JWT_SECRET'),
+        jwks_cache_lifespan=_int_setting(source.value('SUPABASE_JWKS_CACHE_LIFESPAN'), 600),
+        jwks_timeout_seconds=_int_setting(source.value('SUPABASE_JWKS_TIMEOUT_SECONDS'), 10),
+        jwks_cache_dir=source.value('SUPABASE_JWKS_CACHE_DIR'),
+        token_cache_max_entries=_int_setting(source.value('AUTH_TOKEN_CACHE_MAX_ENTRIES'), 4096),
+        demo_auth_enabled=demo_auth_enabled,
+    )
+
+
+def _load_billing_settings(source, environment):
+    stripe_secret_key = source.value('STRIPE_SECRET_KEY')
+    if source.truthy('STRIPE_MOCK_MODE'):
+        mock_mode = True
+    elif source.truthy('DISABLE_STRIPE_AUTO_MOCK') or stripe_secret_key:
+        mock_mode = False
+    else:
+        mock_mode = environment not in PRODUCTION_ENVIRONMENTS
+
+    return BillingSettings(
+        stripe_secret_key=stripe_secret_key,
+        stripe_publishable_key=source.value('STRIPE_PUBLISHABLE_KEY'),
+        stripe_webhook_secret=source.value('STRIPE_WEBHOOK_SECRET'),
+        stripe_price_ids=MappingProxyType({key: source.value(key) for key in STRIPE_PRICE_SETTING_KEYS}),
+        mock_mode=mock_mode,
+        frontend_url=source.value('FRONTEND_URL', 'http://localhost:5173'),
+    )
+
+
+def _load_assessment_settings(source):
+    return AssessmentSettings(
+        openrouter_api_key=source.value('OPENROUTER_API_KEY'),
+        openrouter_model=source.value('OPENROUTER_MODEL'),
+        openrouter_base_url=_normalize_url(source.value('OPENROUTER_BASE_URL')) or OPENROUTER_DEFAULT_BASE_URL,
+        question_set_secret=source.value('ASSESSMENT_QUESTION_SET_SECRET'),
+        question_bank_refresh_seconds=_int_setting(source.value('QUESTION_BANK_REFRESH_SECONDS'), 30),
+        question_set_pool_depth=_int_setting(source.value('QUESTION_SET_POOL_DEPTH'), 3),
+        question_set_pool_max_age_seconds=_int_setting(source.value('QUESTION_SET_POOL_MAX_AGE_SECONDS'), 1800),
+        openrouter_latency_budget_seconds=_float_setting(source.value('OPENROUTER_LATENCY_BUDGET_SECONDS'), 10.0),
+        openrouter_circuit_failure_threshold=_int_setting(source.value('OPENROUTER_CIRCUIT_FAILURE_THRESHOLD'), 3),
+        openrouter_circuit_recovery_seconds=_float_setting(source.value('OPENROUTER_CIRCUIT_RECOVERY_SECONDS'), 30.0),
+        openrouter_circuit_half_open_max_calls=_int_setting(
+            source.value('OPENROUTER_CIRCUIT_HALF_OPEN_MAX_CALLS'),
+            1,
+        ),
+        openrouter_generation_mode=_generation_mode(source.value('OPENROUTER_GENERATION_MODE')),
+        openrouter_domain_retries=max(0, _int_setting(source.value('OPENROUTER_DOMAIN_RETRIES'), 1)),
+        question_set_store=source.value('QUESTION_SET_STORE').lower(),
+        generated_question_reuse_ratio=min(
+            1.0,
+            max(0.0, _float_setting(source.value('GENERATED_QUESTION_REUSE_RATIO'), 0.8)),
+        ),
+        generated_question_min_per_domain=_int_setting(source.value('GENERATED_QUESTION_MIN_PER_DOMAIN'), 6),
+        generated_question_similarity_threshold=_float_setting(
+            source.value('GENERATED_QUESTION_SIMILARITY_THRESHOLD'),
+            0.85,
+        ),
+        batch_grading_max_sheets=_int_setting(source.value('ASSESSMENT_BATCH_MAX_SHEETS'), 10000),
+        batch_grading_chunk_size=_int_setting(source.value('ASSESSMENT_BATCH_CHUNK_SIZE'), 500),
+        recommendation_cache_ttl_seconds=_int_setting(source.value('RECOMMENDATION_CACHE_TTL_SECONDS'), 600),
+        recommendation_cache_max_entries=_int_setting(source.value('RECOMMENDATION_CACHE_MAX_ENTRIES'), 10000),
+    )
+
+
+def _load_training_settings(source):
+    return TrainingSettings(
+        module_catalog_refresh_seconds=_int_setting(source.value('MODULE_CATALOG_REFRESH_SECONDS'), 30),
+        progress_batch_max_events=max(1, _int_setting(source.value('COURSE_PROGRESS_BATCH_MAX_EVENTS'), 500)),
+        lesson_touch_flush_seconds=max(0, _int_setting(source.value('LESSON_TOUCH_FLUSH_SECONDS'), 5)),
+        lesson_touch_max_pending=max(1, _int_setting(source.value('LESSON_TOUCH_MAX_PENDING'), 10000)),
+    )
+
+
+def _load_platform_settings(source):
+    return PlatformSettings(
+        stats_cache_seconds=max(0, _int_setting(source.value('PLATFORM_STATS_CACHE_SECONDS'), 30)),
+        catalog_cache_max_age_seconds=max(0, _int_setting(source.value('CATALOG_CACHE_MAX_AGE_SECONDS'), 60)),
+        metrics_token=source.value('METRICS_TOKEN'),
+        counter_flush_seconds=max(0, _int_setting(source.value('PLATFORM_COUNTER_FLUSH_SECONDS'), 10)),
+    )
+
+
+def load_settings(config=None) -> Settings:
+    """Build an immutable settings snapshot from Flask config, falling back to the environment."""
+    source = _SettingsSource(config)
+    environment = (source.value('FLASK_ENV') or source.value('ENV')).lower()
+    testing = bool((config or {}).get('TESTING'))
+
+    return Settings(
+        environment=environment,
+        testing=testing,
+        auth=_load_auth_settings(source, environment, testing),
+        billing=_load_billing_settings(source, environment),
+        assessment=_load_assessment_settings(source),
+        training=_load_training_settings(source),
+        platform=_load_platform_settings(source),
+    )
+
+
+def reload_settings(app=None) -> Settings:
+    """Rebuild the snapshot for ``app`` (or the current app), e.g. after tests change env vars."""
+    target_app = app or current_app._get_current_object()
+    settings = load_settings(target_app.config)
+    target_app.extensions[SETTINGS_EXTENSION_KEY] = settings
+    return settings
+
+
+def get_settings() -> Settings:
+    settings = current_app.extensions.get(SETTINGS_EXTENSION_KEY)
+    if settings is None:
+        settings = reload_settings()
+    return settings
@@ -2,15 +2,18 @@ from datetime import datetime, timedelta, timezone
 
 import jwt
 import pytest
+import auth_identity
 import routes
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 
 from app import create_app
 from models import db
+from seeders.assessment_questions import seed_assessment_questions
 from seeders.certifications import seed_certification_types
 from seeders.course_content import seed_course_content
 from seeders.training import seed_training_modules
+from settings import reload_settings
 
 
 @pytest.fixture(autouse=True)
@@ -65,7 +68,8 @@ def app(tmp_path, monkeypatch, supabase_keys):
     })
 
     _, public_key = supabase_keys
-    monkeypatch.setattr(routes, 'PyJWKClient', lambda *args, **kwargs: _FakeJwksClient(public_key))
+    if hasattr(routes, 'PyJWKClient'):
+        monkeypatch.setattr(routes, 'PyJWKClient', lambda *args, **kwargs: _FakeJwksClient(public_key))
     for factory_name in (
         '_get_supabase_jwks_client',
         '_get_auth_jwks_client',
@@ -78,6 +82,9 @@ def app(tmp_path, monkeypatch, supabase_keys):
         cache = getattr(routes, cache_name, None)
         if isinstance(cache, dict):
             cache.clear()
+    routes.clear_verified_token_cache()
+    routes.clear_demo_user_cache()
+    auth_identity.clear_identity_user_cache()
 
     with test_app.app_context():
         db.drop_all()
@@ -85,6 +92,7 @@ def app(tmp_path, monkeypatch, supabase_keys):
         seed_training_modules(force=True, silent=True)
         seed_certification_types(force=True, silent=True)
         seed_course_content(force=True, silent=True)
+        seed_assessment_questions(force=True, silent=True)
         yield test_app
         db.session.remove()
         db.drop_all()
@@ -139,6 +147,13 @@ def create_supabase_token(app, supabase_keys):
     return _create
 
 
+@pytest.fixture()
+def metrics_headers(app):
+    app.config['METRICS_TOKEN'] = 'test-metrics-token'
+    reload_settings(app)
+    return {'X-Metrics-Token': 'test-metrics-token'}
+
+
 @pytest.fixture()
 def auth_headers(create_supabase_token):
     def _headers(user, *, extra_claims=None, email=None):
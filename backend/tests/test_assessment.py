@@ -1,8 +1,20 @@
 from collections import Counter
+import base64
 import json
+import threading
+import time
 
 from models import db, User, AssessmentResult
-from routes.assessment import SAMPLE_QUESTIONS, DOMAINS, _recommended_difficulty
+from settings import reload_settings
+from routes.assessment import (
+    SAMPLE_QUESTIONS,
+    DOMAINS,
+    _create_question_set_token,
+    _recommended_difficulty,
+    _resolve_question_set_token,
+    _sign_payload,
+    get_openrouter_circuit_stats,
+)
 from auth_identity import SUPABASE_PROVIDER
 
 
@@ -108,6 +120,7 @@ def test_assessment_questions_respects_level_with_curated_fallback(client, monke
     monkeypatch.delenv('OPENROUTER_API_KEY', raising=False)
     monkeypatch.delenv('OPENROUTER_MODEL', raising=False)
     monkeypatch.delenv('ASSESSMENT_QUESTION_SET_SECRET', raising=False)
+    reload_settings()
 
     response = client.get('/api/assessment/questions?level=advanced')
 
@@ -127,6 +140,7 @@ def test_assessment_questions_falls_back_when_openrouter_output_invalid(client,
     monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
     monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
     monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    reload_settings()
 
     def fake_completion(**kwargs):
         return {
@@ -156,6 +170,7 @@ def test_generated_question_set_token_grades_and_persists_level(client, app, aut
     monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
     monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
     monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    reload_settings()
 
     def fake_completion(**kwargs):
         return {
@@ -485,3 +500,178 @@ def test_assessment_level_influences_recommendation_difficulty():
 
     assert _recommended_difficulty(beginner_result) == 1
     assert _recommended_difficulty(advanced_result) == 2
+
+
+def _per_domain_completion(calls, malformed_once=(), always_fail=(), delay_seconds=0.0):
+    lock = threading.Lock()
+
+    def fake_completion(**kwargs):
+        prompt = kwargs['messages'][-1]['content']
+        domain = next(candidate for candidate in DOMAINS if f'the domain is "{candidate}"' in prompt)
+        with lock:
+            calls.append(domain)
+            attempt = calls.count(domain)
+        if delay_seconds:
+            time.sleep(delay_seconds)
+
+        questions = [
+            question for question in _generated_question_payload()['questions'] if question['domain'] == domain
+        ]
+        if domain in always_fail or (domain in malformed_once and attempt == 1):
+            questions[1] = {'domain': domain, 'question_text': 'Missing options?'}
+        return {'choices': [{'message': {'content': json.dumps({'questions': questions})}}]}
+
+    return fake_completion
+
+
+def _enable_per_domain_generation(monkeypatch):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    monkeypatch.setenv('OPENROUTER_GENERATION_MODE', 'per_domain')
+    reload_settings()
+
+
+def test_per_domain_generation_runs_concurrently_and_retries_only_failed_domains(client, monkeypatch):
+    _enable_per_domain_generation(monkeypatch)
+    calls = []
+    monkeypatch.setattr(
+        'routes.assessment._post_openrouter_chat_completion',
+        _per_domain_completion(calls, malformed_once=('Practical Usage',), delay_seconds=0.2),
+    )
+
+    started = time.monotonic()
+    response = client.get('/api/assessment/questions?level=advanced')
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['generation_source'] == 'openrouter'
+    assert data['question_set_token']
+    assert _domain_counts(data['questions']) == Counter({domain: 3 for domain in DOMAINS})
+    assert Counter(calls) == Counter({**{domain: 1 for domain in DOMAINS}, 'Practical Usage': 2})
+    assert elapsed < 0.2 * len(DOMAINS)
+
+
+def test_per_domain_generation_falls_back_when_a_domain_keeps_failing(client, monkeypatch):
+    _enable_per_domain_generation(monkeypatch)
+    calls = []
+    monkeypatch.setattr(
+        'routes.assessment._post_openrouter_chat_completion',
+        _per_domain_completion(calls, always_fail=('Strategic Understanding',)),
+    )
+
+    response = client.get('/api/assessment/questions?level=beginner')
+
+    assert response.status_code == 200
+    assert response.get_json()['generation_source'] == 'curated_fallback'
+    assert calls.count('Strategic Understanding') == 2
+    assert len(calls) == len(DOMAINS) + 1
+
+
+def test_failed_per_domain_set_counts_once_against_the_circuit(app, client, monkeypatch):
+    _enable_per_domain_generation(monkeypatch)
+
+    def failing_completion(**kwargs):
+        raise TimeoutError('upstream timed out')
+
+    monkeypatch.setattr('routes.assessment._post_openrouter_chat_completion', failing_completion)
+
+    response = client.get('/api/assessment/questions?level=beginner')
+
+    assert response.get_json()['generation_source'] == 'curated_fallback'
+    stats = get_openrouter_circuit_stats()
+    assert (stats['state'], stats['failures'], stats['consecutive_failures']) == ('closed', 1, 1)
+
+
+def test_hung_domain_call_is_bounded_by_the_latency_budget(app, client, monkeypatch):
+    _enable_per_domain_generation(monkeypatch)
+    monkeypatch.setenv('OPENROUTER_LATENCY_BUDGET_SECONDS', '0.3')
+    reload_settings()
+    calls = []
+    completion = _per_domain_completion(calls)
+
+    def hanging_completion(**kwargs):
+        if 'the domain is "Practical Usage"' in kwargs['messages'][-1]['content']:
+            time.sleep(1.5)
+        return completion(**kwargs)
+
+    monkeypatch.setattr('routes.assessment._post_openrouter_chat_completion', hanging_completion)
+
+    started = time.monotonic()
+    response = client.get('/api/assessment/questions?level=beginner')
+
+    assert time.monotonic() - started < 1.0
+    assert response.get_json()['generation_source'] == 'curated_fallback'
+    stats = get_openrouter_circuit_stats()
+    assert (stats['failures'], stats['latency_budget_exceeded']) == (1, 1)
+
+
+def _grading_questions_for_token():
+    questions = []
+    for index, question in enumerate(_generated_question_payload()['questions'], start=1):
+        questions.append({**question, 'id': f'token-question-{index}', 'correct_answer': 'ABCD'[index % 4]})
+    return questions
+
+
+def _token_payload(token):
+    encoded_payload = token.split('.', 1)[0]
+    return json.loads(base64.urlsafe_b64decode(encoded_payload + '=' * (-len(encoded_payload) % 4)))
+
+
+def test_question_set_token_v2_carries_encrypted_answer_key(app, monkeypatch):
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    reload_settings()
+    grading_questions = _grading_questions_for_token()
+
+    token = _create_question_set_token(grading_questions, 'advanced', 'test/model')
+    payload = _token_payload(token)
+
+    assert payload['v'] == 2
+    assert all('answer_hash' not in question for question in payload['questions'])
+    assert 'ABCD' not in payload['answer_key']
+
+    resolved = _resolve_question_set_token(token)
+    assert resolved['assessment_level'] == 'advanced'
+    assert [question['correct_answer'] for question in resolved['questions']] == [
+        question['correct_answer'] for question in grading_questions
+    ]
+
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'rotated-secret')
+    reload_settings()
+    assert _resolve_question_set_token(token) is None
+
+
+def test_question_set_token_v2_rejects_reordered_answer_key(app, monkeypatch):
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    reload_settings()
+    grading_questions = _grading_questions_for_token()
+    first = _token_payload(_create_question_set_token(grading_questions, 'beginner', 'test/model'))
+    second = _token_payload(_create_question_set_token(list(reversed(grading_questions)), 'beginner', 'test/model'))
+
+    forged = {**first, 'answer_key': second['answer_key']}
+    forged_token = _sign_payload(forged, 'test-question-set-secret')
+
+    assert _resolve_question_set_token(forged_token) is None
+
+
+def test_question_set_token_v1_is_still_accepted(client, monkeypatch):
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    reload_settings()
+    grading_questions = _grading_questions_for_token()
+    token = _create_question_set_token(grading_questions, 'intermediate', 'test/model', version=1)
+
+    assert _token_payload(token)['v'] == 1
+    answers = {question['id']: question['correct_answer'] for question in grading_questions}
+    response = client.post(
+        '/api/assessment/submit',
+        json={
+            'answers': answers,
+            'assessment_level': 'intermediate',
+            'question_set_token': token,
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total_score'] == len(grading_questions)
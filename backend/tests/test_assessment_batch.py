@@ -0,0 +1,129 @@
+import json
+
+from models import AssessmentDomainScore, AssessmentResult, PlatformCounter, User, db
+from platform_counters import read_platform_counters
+from routes.assessment import SAMPLE_QUESTIONS, _create_question_set_token
+from settings import reload_settings
+from tests.test_assessment import build_assessment_payload_from_question_ids
+
+
+def _create_user(email, organization, tier='free'):
+    user = User(
+        email=email,
+        password_hash='test-hash',
+        first_name='Test',
+        last_name='User',
+        organization=organization,
+        subscription_tier=tier,
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _curated_sheet(**learner):
+    selected_question_ids = [str(question['id']) for question in SAMPLE_QUESTIONS[:15]]
+    answers, option_map = build_assessment_payload_from_question_ids(selected_question_ids)
+    return {
+        **learner,
+        'answers': answers,
+        'option_map': option_map,
+        'selected_question_ids': selected_question_ids,
+        'assessment_level': 'beginner',
+        'time_taken_minutes': 20,
+    }
+
+
+def test_batch_submit_requires_enterprise_subscription(app, client, auth_headers):
+    user = _create_user('learner@acme.test', 'Acme')
+
+    response = client.post(
+        '/api/assessment/submit/batch',
+        json={'sheets': [_curated_sheet(email='learner@acme.test')]},
+        headers=auth_headers(user),
+    )
+
+    assert response.status_code == 403
+    assert AssessmentResult.query.count() == 0
+
+
+def test_batch_submit_grades_sheets_and_reports_errors_per_sheet(app, client, auth_headers, monkeypatch):
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    monkeypatch.setenv('ASSESSMENT_BATCH_CHUNK_SIZE', '1')
+    reload_settings()
+    admin = _create_user('admin@acme.test', 'Acme', tier='enterprise')
+    learner = _create_user('learner@acme.test', 'Acme')
+    outsider = _create_user('outsider@other.test', 'Other')
+
+    generated = [dict(question, id=f'gen-{index}') for index, question in enumerate(SAMPLE_QUESTIONS[:15])]
+    token = _create_question_set_token(generated, 'advanced', 'test/model')
+    token_answers = {question['id']: 'D' for question in generated}
+    sheets = [
+        _curated_sheet(email='LEARNER@acme.test', sheet_id='row-1'),
+        {
+            'user_id': learner.id,
+            'answers': token_answers,
+            'assessment_level': 'advanced',
+            'question_set_token': token,
+        },
+        _curated_sheet(user_id=outsider.id),
+        dict(_curated_sheet(email='learner@acme.test'), assessment_level='expert'),
+        {'user_id': admin.id, 'answers': token_answers, 'assessment_level': 'advanced', 'question_set_token': 'bad'},
+    ]
+
+    response = client.post('/api/assessment/submit/batch', json={'sheets': sheets}, headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data['submitted'], data['saved'], data['failed']) == (5, 2, 3)
+    first, second, outsider_result, bad_level, bad_token = data['results']
+    assert first['status'] == 'saved'
+    assert first['sheet_id'] == 'row-1'
+    assert first['total_score'] == 15
+    assert first['score_band'] == 'Advanced'
+    expected_token_score = sum(1 for question in generated if question['correct_answer'] == 'D')
+    assert second['total_score'] == expected_token_score
+    assert second['assessment_level'] == 'advanced'
+    assert outsider_result == {'index': 2, 'status': 'error', 'error': 'Learner not found'}
+    assert bad_level['error'] == 'Invalid assessment level'
+    assert bad_token['error'] == 'Question set token is invalid or expired'
+
+    records = {record.id: record for record in AssessmentResult.query.filter_by(user_id=learner.id)}
+    assert set(records) == {first['result_id'], second['result_id']}
+    saved = records[first['result_id']]
+    assert saved.domain_scores['AI Fundamentals'] == {'score': 3, 'total': 3}
+    assert saved.functional_score == 3
+    assert saved.time_taken_minutes == 20
+    assert json.loads(saved.recommendations)['generation_source'] == 'curated_fallback'
+    domain_rows = AssessmentDomainScore.query.filter_by(result_id=saved.id).all()
+    assert {row.domain: (row.score, row.total) for row in domain_rows} == {
+        domain: (entry['score'], entry['total']) for domain, entry in saved.domain_scores.items()
+    }
+    assert {row.completed_at for row in domain_rows} == {saved.completed_at}
+    db.session.expire_all()
+    assert db.session.get(User, learner.id).latest_assessment_result_id == second['result_id']
+
+
+def test_grade_answer_sheets_cli_reads_json_lines(app, tmp_path):
+    _create_user('learner@acme.test', 'Acme')
+    sheets_path = tmp_path / 'sheets.jsonl'
+    sheets_path.write_text(
+        '\n'.join(json.dumps(sheet) for sheet in (
+            _curated_sheet(email='learner@acme.test'),
+            _curated_sheet(email='missing@acme.test'),
+        ))
+    )
+    output_path = tmp_path / 'results.json'
+    baseline = read_platform_counters()['total_assessments']
+
+    result = app.test_cli_runner().invoke(
+        args=['grade-answer-sheets', str(sheets_path), '--organization', 'Acme', '--output', str(output_path)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert 'Graded 2 sheets: 1 saved, 1 failed.' in result.output
+    assert 'sheet 1: Learner not found' in result.output
+    assert json.loads(output_path.read_text())['saved'] == 1
+    assert AssessmentResult.query.count() == 1
+    # CLI processes run no flusher, so the stored counter must already include the new result.
+    assert db.session.get(PlatformCounter, 'total_assessments').value == baseline + 1
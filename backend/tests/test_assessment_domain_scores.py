@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from assessment_analytics import backfill_domain_scores, domain_score_summary
+from models import AssessmentDomainScore, AssessmentResult, User, db
+from routes.assessment import DOMAINS, SAMPLE_QUESTIONS
+from tests.test_assessment import build_assessment_payload_from_question_ids
+
+
+def _user(email, organization=None):
+    user = User(email=email, password_hash='test-hash', first_name='Test', last_name='User', organization=organization)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _legacy_result(user, completed_at, domain_scores=None, **legacy_columns):
+    result = AssessmentResult(
+        user_id=user.id,
+        total_score=0,
+        max_score=15,
+        percentage=0,
+        domain_scores=domain_scores,
+        completed_at=completed_at,
+        **legacy_columns,
+    )
+    db.session.add(result)
+    db.session.commit()
+    return result
+
+
+def _domain_rows(result_id):
+    return {
+        row.domain: (row.score, row.total)
+        for row in AssessmentDomainScore.query.filter_by(result_id=result_id)
+    }
+
+
+def test_submit_writes_domain_rows_with_the_result(app, client, auth_headers):
+    user = _user('domain-rows@example.com')
+    question_ids = [question['id'] for question in SAMPLE_QUESTIONS[:15]]
+    answers, option_map = build_assessment_payload_from_question_ids(question_ids)
+
+    response = client.post(
+        '/api/assessment/submit',
+        json={'answers': answers, 'option_map': option_map, 'selected_question_ids': question_ids},
+        headers=auth_headers(user),
+    )
+
+    assert response.status_code == 200
+    result = AssessmentResult.query.filter_by(user_id=user.id).one()
+    assert _domain_rows(result.id) == {
+        domain: (entry['score'], entry['total'])
+        for domain, entry in response.get_json()['domain_scores'].items()
+    }
+    assert {row.completed_at for row in AssessmentDomainScore.query.filter_by(user_id=user.id)} == {
+        result.completed_at,
+    }
+
+
+def test_backfill_copies_json_and_legacy_scores_in_resumable_batches(app):
+    user = _user('backfill@example.com')
+    with_json = _legacy_result(
+        user,
+        datetime(2026, 1, 5),
+        domain_scores={domain: {'score': 2, 'total': 3} for domain in DOMAINS},
+    )
+    legacy_only = _legacy_result(
+        user,
+        datetime(2026, 1, 6),
+        functional_score=4,
+        ethical_score=1,
+        rhetorical_score=2,
+        pedagogical_score=3,
+        recommendations='{"insights": [], "strategic_score": 5}',
+    )
+    already_copied = _legacy_result(user, datetime(2026, 1, 7), domain_scores={'AI Fundamentals': {'score': 1}})
+    db.session.add(AssessmentDomainScore(
+        result_id=already_copied.id,
+        user_id=user.id,
+        domain='AI Fundamentals',
+        score=1,
+        total=5,
+        completed_at=already_copied.completed_at,
+    ))
+    db.session.commit()
+
+    assert backfill_domain_scores(batch_size=1) == 2
+    assert backfill_domain_scores(batch_size=1) == 0
+
+    assert _domain_rows(with_json.id) == {domain: (2, 3) for domain in DOMAINS}
+    assert _domain_rows(legacy_only.id) == {
+        'AI Fundamentals': (4, 5),
+        'Practical Usage': (1, 5),
+        'Ethics & Critical Thinking': (2, 5),
+        'AI Impact & Applications': (3, 5),
+        'Strategic Understanding': (5, 5),
+    }
+    assert _domain_rows(already_copied.id) == {'AI Fundamentals': (1, 5)}
+
+
+def test_summary_groups_by_domain_within_organization_and_window(app):
+    acme_one = _user('one@acme.test', organization='Acme')
+    acme_two = _user('two@acme.test', organization='Acme')
+    other = _user('other@other.test', organization='Other')
+    ethics = 'Ethics & Critical Thinking'
+    for user, score, completed_at in (
+        (acme_one, 3, datetime(2026, 4, 2)),
+        (acme_two, 1, datetime(2026, 5, 20)),
+        (acme_two, 0, datetime(2026, 7, 1)),
+        (other, 0, datetime(2026, 4, 3)),
+    ):
+        _legacy_result(user, completed_at, domain_scores={ethics: {'score': score, 'total': 3}})
+    backfill_domain_scores()
+
+    summary = domain_score_summary(
+        organization='Acme',
+        domain=ethics,
+        since=datetime(2026, 4, 1),
+        until=datetime(2026, 7, 1),
+    )
+
+    assert summary == {ethics: {'results': 2, 'average_score': 2.0, 'percentage': 66.7}}
+    assert domain_score_summary(organization='Nobody') == {}
+
+
+def test_domain_window_query_uses_index(app):
+    query = (db.session.query(AssessmentDomainScore.domain, AssessmentDomainScore.score)
+             .filter(AssessmentDomainScore.domain == 'Practical Usage',
+                     AssessmentDomainScore.completed_at >= datetime(2026, 1, 1)))
+    sql = str(query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+
+    plan = ' '.join(row[-1] for row in db.session.execute(text('EXPLAIN QUERY PLAN ' + sql)).all())
+
+    assert 'ix_assessment_domain_score_domain_completed' in plan
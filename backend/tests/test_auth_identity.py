@@ -144,3 +144,57 @@ def test_profile_sync_preserves_locally_managed_fields(client, app, create_supab
         assert user.last_name == 'Profile'
         assert user.role == 'Sales'
         assert user.organization == 'Acme'
+
+
+def test_unchanged_profile_resolves_without_user_writes_or_identity_lookup(client, app, create_supabase_token):
+    from sqlalchemy import event
+
+    subject = '00000000-0000-4000-8000-000000000987'
+    first_token = create_supabase_token(
+        sub=subject,
+        email='read-only@example.com',
+        extra_claims={'given_name': 'Read', 'family_name': 'Only'},
+    )
+    assert client.get('/api/auth/profile', headers={'Authorization': f'Bearer {first_token}'}).status_code == 200
+
+    second_token = create_supabase_token(
+        sub=subject,
+        email='read-only@example.com',
+        extra_claims={
+            'given_name': 'Read',
+            'family_name': 'Only',
+            'session_id': '00000000-0000-4000-8000-000000000100',
+        },
+    )
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record_statement)
+    try:
+        response = client.get('/api/auth/profile', headers={'Authorization': f'Bearer {second_token}'})
+    finally:
+        event.remove(engine, 'before_cursor_execute', record_statement)
+
+    assert response.status_code == 200
+    assert not any(statement.startswith('update user') for statement in statements)
+    assert not any('user.auth_subject =' in statement for statement in statements)
+
+
+def test_changed_profile_claims_are_written_once(client, app, create_supabase_token):
+    subject = '00000000-0000-4000-8000-000000000988'
+    for given_name in ('Before', 'After'):
+        token = create_supabase_token(
+            sub=subject,
+            email='changing@example.com',
+            extra_claims={'given_name': given_name, 'family_name': 'Claims'},
+        )
+        response = client.get('/api/auth/profile', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200
+
+    with app.app_context():
+        user = User.query.filter_by(auth_subject=subject).first()
+        assert user.first_name == 'After'
@@ -5,6 +5,7 @@ import json
 import pytest
 
 from models import User, db
+from settings import reload_settings
 
 
 def test_profile_rejects_invalid_bearer_token(client):
@@ -20,6 +21,7 @@ def test_profile_rejects_invalid_bearer_token(client):
 def test_demo_bearer_token_is_rejected_in_production(client, app, monkeypatch):
     monkeypatch.setitem(app.config, 'TESTING', False)
     monkeypatch.setitem(app.config, 'FLASK_ENV', 'production')
+    reload_settings()
 
     response = client.get(
         '/api/auth/profile',
@@ -63,6 +65,7 @@ def test_demo_payload_token_is_rejected_in_production(client, app, monkeypatch):
     encoded = base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('utf-8').rstrip('=')
     monkeypatch.setitem(app.config, 'TESTING', False)
     monkeypatch.setitem(app.config, 'FLASK_ENV', 'production')
+    reload_settings()
 
     response = client.get(
         '/api/auth/profile',
@@ -135,3 +138,128 @@ def test_profile_uses_provider_scoped_supabase_identity(client, app, create_supa
 
     assert response.status_code == 200
     assert response.get_json()['user']['id'] == user_id
+
+
+def test_repeat_supabase_token_is_served_from_verified_token_cache(client, app, create_supabase_token, monkeypatch):
+    import routes
+
+    token = create_supabase_token(
+        sub='00000000-0000-4000-8000-000000000654',
+        email='cached-session@example.com',
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first_response = client.get('/api/auth/profile', headers=headers)
+    assert first_response.status_code == 200
+    user_id = first_response.get_json()['user']['id']
+
+    def fail_decode(_token):
+        raise AssertionError('cached tokens must not be re-verified')
+
+    monkeypatch.setattr(routes, '_decode_supabase_jwt', fail_decode)
+    monkeypatch.setattr(routes, 'resolve_user_from_claims', fail_decode)
+
+    second_response = client.get('/api/auth/profile', headers=headers)
+
+    assert second_response.status_code == 200
+    assert second_response.get_json()['user']['id'] == user_id
+    stats = routes.get_verified_token_cache_stats()
+    assert stats['hits'] >= 1
+    assert stats['entries'] == 1
+
+
+def test_verified_token_cache_expires_entries_at_token_exp():
+    from auth_token_cache import VerifiedTokenCache
+
+    now = [1000.0]
+    cache = VerifiedTokenCache(max_entries=2, clock=lambda: now[0])
+    cache.set('token-a', provider='supabase', subject='a', user_id='user-a', claims={'exp': 1010})
+    cache.set('token-b', provider='supabase', subject='b', user_id='user-b', claims={'exp': 1100})
+    cache.set('token-c', provider='supabase', subject='c', user_id='user-c', claims={'exp': 1100})
+
+    assert cache.get('token-a') is None
+    assert cache.get('token-b')['user_id'] == 'user-b'
+
+    now[0] = 1200.0
+    assert cache.get('token-c') is None
+    assert cache.stats() == {
+        'entries': 1,
+        'max_entries': 2,
+        'hits': 1,
+        'misses': 2,
+        'evictions': 1,
+        'expirations': 1,
+        'hit_ratio': 0.3333,
+    }
+
+
+def test_verified_token_cache_is_sized_from_app_settings(tmp_path):
+    import routes
+    from app import create_app
+
+    create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "sized.sqlite"}',
+        'AUTH_TOKEN_CACHE_MAX_ENTRIES': '1',
+    })
+    try:
+        assert routes.get_verified_token_cache_stats()['max_entries'] == 1
+    finally:
+        routes.configure_verified_token_cache(4096)
+
+
+def test_verified_token_cache_resize_evicts_least_recently_used():
+    from auth_token_cache import VerifiedTokenCache
+
+    cache = VerifiedTokenCache(max_entries=3, clock=lambda: 1000.0)
+    for name in ('a', 'b', 'c'):
+        cache.set(f'token-{name}', provider='supabase', subject=name, user_id=f'user-{name}', claims={'exp': 2000})
+    cache.get('token-a')
+
+    cache.resize(2)
+
+    assert cache.get('token-b') is None
+    assert cache.get('token-a')['user_id'] == 'user-a'
+    assert cache.stats()['evictions'] == 1
+
+
+def _demo_token(payload):
+    encoded = base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('utf-8').rstrip('=')
+    return f'demo.{encoded}'
+
+
+def test_repeat_demo_token_requests_do_not_write_user_rows(client, app):
+    from sqlalchemy import event
+
+    headers = {'Authorization': f'Bearer {_demo_token({"email": "load-test@example.com", "role": "learner"})}'}
+    assert client.get('/api/auth/profile', headers=headers).status_code == 200
+
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record_statement)
+    try:
+        for _ in range(3):
+            assert client.get('/api/auth/profile', headers=headers).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', record_statement)
+
+    assert not any(statement.startswith(('update user', 'insert into user')) for statement in statements)
+
+
+def test_changed_demo_payload_updates_stored_user(client, app):
+    for first_name in ('Before', 'After'):
+        token = _demo_token({
+            'email': 'changing-demo@example.com',
+            'user_metadata': {'first_name': first_name, 'last_name': 'Reviewer'},
+        })
+        response = client.get('/api/auth/profile', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200
+
+    assert response.get_json()['user']['first_name'] == 'After'
+    with app.app_context():
+        assert User.query.filter_by(email='changing-demo@example.com').one().first_name == 'After'
@@ -1,6 +1,7 @@
 import pytest
 
 from models import db, User
+from settings import reload_settings
 
 
 @pytest.fixture()
@@ -28,6 +29,7 @@ def authenticated_user(client, app, create_supabase_token):
 
 def test_billing_config_endpoint(client, monkeypatch):
     monkeypatch.setenv('STRIPE_PRICE_PREMIUM', '')
+    reload_settings()
     response = client.get('/api/billing/config')
     assert response.status_code == 200
     payload = response.get_json()
@@ -41,6 +43,7 @@ def test_checkout_requires_configuration(client, authenticated_user, monkeypatch
     monkeypatch.setenv('STRIPE_SECRET_KEY', '')
     monkeypatch.setenv('STRIPE_PRICE_PREMIUM', '')
     monkeypatch.setenv('DISABLE_STRIPE_AUTO_MOCK', '1')
+    reload_settings()
 
     response = client.post(
         '/api/billing/checkout-session',
@@ -68,6 +71,7 @@ def test_checkout_session_success(client, authenticated_user, monkeypatch):
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
     monkeypatch.setenv('STRIPE_PRICE_PREMIUM', 'price_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
@@ -102,6 +106,7 @@ def test_checkout_session_uses_authenticated_email(client, authenticated_user, m
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
     monkeypatch.setenv('STRIPE_PRICE_PREMIUM', 'price_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
@@ -137,6 +142,7 @@ def test_checkout_session_failure_returns_clean_error(client, authenticated_user
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
     monkeypatch.setenv('STRIPE_PRICE_PREMIUM', 'price_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
@@ -167,6 +173,7 @@ def test_checkout_session_complete_updates_subscription(client, authenticated_us
     email = authenticated_user['email']
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
@@ -240,6 +247,7 @@ def test_stripe_webhook_checkout_completion_updates_subscription(client, authent
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
     monkeypatch.setenv('STRIPE_WEBHOOK_SECRET', 'whsec_test_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
@@ -335,6 +343,7 @@ def test_subscription_endpoint_uses_stripe_fallback(client, authenticated_user,
         db.session.commit()
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
@@ -401,6 +410,7 @@ def test_customer_portal_success(client, authenticated_user, monkeypatch, app):
         db.session.commit()
 
     monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_mock')
+    reload_settings()
 
     import routes.billing as billing_routes
 
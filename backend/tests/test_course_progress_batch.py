@@ -0,0 +1,104 @@
+from models import Lesson, LessonProgress, UserProgress, db
+from module_catalog import get_module_catalog
+from progress_version import read_progress_version
+from routes.course_content import collapse_progress_events
+from tests.test_platform_counters import _statements
+from tests.test_training_routes import create_user
+
+
+def _module_lessons(module_id):
+    return Lesson.query.filter_by(module_id=module_id).order_by(Lesson.order_index).all()
+
+
+def _distinct_module_ids(count):
+    rows = db.session.query(Lesson.module_id).distinct().order_by(Lesson.module_id).limit(count).all()
+    return [module_id for (module_id,) in rows]
+
+
+def test_collapse_keeps_the_highest_time_and_status():
+    collapsed = collapse_progress_events([
+        {'lesson_id': 'a', 'time_spent_minutes': 4, 'status': 'in_progress'},
+        {'lesson_id': 'b', 'time_spent_minutes': 2},
+        {'lesson_id': 'a', 'time_spent_minutes': 9, 'status': 'completed'},
+        {'lesson_id': 'a', 'time_spent_minutes': 6, 'status': 'in_progress'},
+    ])
+
+    assert collapsed == {
+        'a': {'time_spent_minutes': 9, 'status': 'completed'},
+        'b': {'time_spent_minutes': 2, 'status': None},
+    }
+
+
+def test_batch_applies_events_for_many_lessons_in_one_transaction(app, client, auth_headers):
+    user = create_user(email='batch-progress@example.com')
+    first_module, second_module = _distinct_module_ids(2)
+    first_lessons = _module_lessons(first_module)
+    second_lesson = _module_lessons(second_module)[0]
+    headers = auth_headers(user)
+    earlier = [{'lesson_id': first_lessons[0].id, 'time_spent_minutes': 30, 'status': 'completed'}]
+    assert client.post('/api/course/progress/batch', headers=headers, json={'events': earlier}).status_code == 200
+
+    events = [
+        {'lesson_id': first_lessons[0].id, 'time_spent_minutes': 5, 'status': 'in_progress'},
+        {'lesson_id': first_lessons[1].id, 'time_spent_minutes': 3, 'status': 'in_progress'},
+        {'lesson_id': second_lesson.id, 'time_spent_minutes': 7},
+        {'lesson_id': first_lessons[1].id, 'time_spent_minutes': 8, 'status': 'completed'},
+        {'lesson_id': 'missing-lesson', 'time_spent_minutes': 1},
+    ]
+    response = client.post('/api/course/progress/batch', headers=headers, json={'events': events})
+
+    assert response.status_code == 200, response.get_json()
+    data = response.get_json()
+    assert data['unknown_lesson_ids'] == ['missing-lesson']
+    assert data['lessons'][first_lessons[0].id]['status'] == 'completed'
+    assert data['lessons'][first_lessons[0].id]['time_spent_minutes'] == 30
+    assert data['lessons'][first_lessons[1].id]['status'] == 'completed'
+    assert data['lessons'][second_lesson.id]['status'] == 'in_progress'
+
+    summaries = {summary['module_id']: summary for summary in data['modules']}
+    assert set(summaries) == {first_module, second_module}
+    assert summaries[first_module]['completed_lessons'] == 2
+    assert summaries[first_module]['time_spent_minutes'] == 38
+    assert summaries[second_module]['status'] == 'in_progress'
+
+    stored = UserProgress.query.filter_by(user_id=user.id, module_id=first_module).one()
+    assert stored.progress_percentage == int(2 / len(first_lessons) * 100)
+    assert read_progress_version(user.id).startswith('2:')
+
+
+def test_batch_statement_count_does_not_grow_with_events(app, client, auth_headers):
+    module_id = _distinct_module_ids(1)[0]
+    lesson_ids = [lesson.id for lesson in _module_lessons(module_id)]
+    get_module_catalog()
+    users, counts = [], []
+    for repeats in (1, 15):
+        user = create_user(email=f'events-{repeats}@example.com')
+        headers = auth_headers(user)
+        client.get('/api/training/progress', headers=headers)  # first sign-in links the identity
+        events = [
+            {'lesson_id': lesson_id, 'time_spent_minutes': minute, 'status': 'in_progress'}
+            for minute in range(repeats)
+            for lesson_id in lesson_ids
+        ]
+        with _statements() as statements:
+            response = client.post('/api/course/progress/batch', headers=headers, json={'events': events})
+        assert response.status_code == 200
+        counts.append(len(statements))
+        users.append(user)
+
+    assert counts[0] == counts[1]
+    assert LessonProgress.query.filter_by(user_id=users[-1].id).count() == len(lesson_ids)
+
+
+def test_batch_rejects_malformed_events(app, client, auth_headers):
+    headers = auth_headers(create_user(email='bad-batch@example.com'))
+
+    for body in (
+        {},
+        {'events': []},
+        {'events': [{'time_spent_minutes': 3}]},
+        {'events': [{'lesson_id': 'x', 'status': 'done'}]},
+        {'events': [{'lesson_id': 'x', 'time_spent_minutes': -1}]},
+    ):
+        response = client.post('/api/course/progress/batch', headers=headers, json=body)
+        assert response.status_code == 400, body
@@ -0,0 +1,172 @@
+import json
+
+from generated_question_bank import GeneratedQuestionBank, question_content_hash
+from models import GeneratedQuestion
+from routes.assessment import DOMAINS, QUESTIONS_PER_DOMAIN
+from settings import reload_settings
+from tests.test_assessment import _answers_for_generated_questions
+from tests.test_platform_counters import _statements
+
+
+def _batch_payload(batch):
+    questions = []
+    for domain in DOMAINS:
+        for index in range(1, QUESTIONS_PER_DOMAIN + 1):
+            number = batch * 10 + index
+            questions.append({
+                'domain': domain,
+                'question_text': f'{domain} generated question {number}?',
+                'option_a': f'Correct {domain} {number}',
+                'option_b': f'Distractor B {domain} {number}',
+                'option_c': f'Distractor C {domain} {number}',
+                'option_d': f'Distractor D {domain} {number}',
+                'correct_answer': 'A',
+                'explanation': f'{domain} explanation {number}',
+            })
+    return {'questions': questions}
+
+
+def _question(domain, text, options=('One', 'Two', 'Three', 'Four')):
+    return {
+        'domain': domain,
+        'question_text': text,
+        'option_a': options[0],
+        'option_b': options[1],
+        'option_c': options[2],
+        'option_d': options[3],
+        'correct_answer': 'B',
+        'explanation': '',
+    }
+
+
+def test_content_hash_ignores_case_punctuation_and_option_order():
+    first = _question('Prompt Engineering', 'What makes a prompt specific?')
+    second = _question('Prompt Engineering', 'what makes a PROMPT specific', ('Four', 'three', 'Two', 'One'))
+
+    assert question_content_hash(first) == question_content_hash(second)
+
+
+def test_bank_drops_exact_and_near_duplicates(app):
+    bank = GeneratedQuestionBank(domains=['Prompt Engineering'], similarity_threshold=0.8)
+    original = _question('Prompt Engineering', 'Which technique improves reliability of structured model outputs?')
+    reworded = _question(
+        'Prompt Engineering',
+        'Which technique improves the reliability of structured model outputs?',
+        ('Alpha', 'Beta', 'Gamma', 'Delta'),
+    )
+    distinct = _question('Prompt Engineering', 'When should you provide examples inside a prompt?')
+
+    assert bank.add([original, dict(original), reworded, distinct], assessment_level='beginner', model='m') == 2
+    assert bank.add([original], assessment_level='beginner', model='m') == 0
+
+    assert GeneratedQuestion.query.count() == 2
+    stats = bank.stats()
+    assert stats['questions'] == 2
+    assert stats['exact_duplicates'] == 2
+    assert stats['near_duplicates'] == 1
+
+
+def test_add_inserts_a_batch_without_reading_rows_back(app):
+    bank = GeneratedQuestionBank(domains=DOMAINS)
+    bank.draw('beginner', QUESTIONS_PER_DOMAIN, min_per_domain=3)
+
+    with _statements() as statements:
+        assert bank.add(_batch_payload(1)['questions'], assessment_level='beginner', model='m') == 15
+
+    assert not any(statement.startswith('select') for statement in statements)
+    drawn = bank.draw('beginner', QUESTIONS_PER_DOMAIN, min_per_domain=3)
+    banked_ids = {record.id for record in GeneratedQuestion.query}
+    assert {question['id'] for question in drawn} <= banked_ids
+    assert all(question['correct_answer'] == 'A' for question in drawn)
+
+
+def test_question_banked_by_another_worker_only_skips_that_row(app):
+    first = GeneratedQuestionBank(domains=['Prompt Engineering'])
+    second = GeneratedQuestionBank(domains=['Prompt Engineering'])
+    shared = _question('Prompt Engineering', 'Why give the model a role in the system prompt?')
+    second.draw('beginner', 1, min_per_domain=1)
+    first.add([shared], assessment_level='beginner', model='m')
+
+    fresh = _question('Prompt Engineering', 'How do delimiters help separate instructions from data?')
+    assert second.add([shared, fresh], assessment_level='beginner', model='m') == 1
+
+    assert GeneratedQuestion.query.count() == 2
+    assert second.stats()['exact_duplicates'] == 1
+    assert second.add([shared], assessment_level='beginner', model='m') == 0
+
+
+def test_refresh_reads_only_recently_created_rows(app):
+    now = [0.0]
+    bank = GeneratedQuestionBank(domains=['Prompt Engineering'], refresh_seconds=60, clock=lambda: now[0])
+    other_worker = GeneratedQuestionBank(domains=['Prompt Engineering'])
+    other_worker.add(
+        [_question('Prompt Engineering', 'What is few-shot prompting used for?')],
+        assessment_level='beginner',
+        model='m',
+    )
+    bank.draw('beginner', 1, min_per_domain=1)
+    assert bank.available('beginner') == {'Prompt Engineering': 1}
+
+    other_worker.add(
+        [_question('Prompt Engineering', 'Why ask a model to explain its reasoning step by step?')],
+        assessment_level='beginner',
+        model='m',
+    )
+    now[0] = 61
+    with _statements() as statements:
+        bank.draw('beginner', 1, min_per_domain=1)
+
+    assert bank.available('beginner') == {'Prompt Engineering': 2}
+    select = next(statement for statement in statements if 'from generated_question' in statement)
+    assert 'generated_question.created_at >=' in select
+
+
+def test_draw_requires_minimum_per_domain(app):
+    bank = GeneratedQuestionBank(domains=DOMAINS)
+    bank.add(_batch_payload(1)['questions'], assessment_level='beginner', model='m')
+
+    assert bank.draw('beginner', QUESTIONS_PER_DOMAIN, min_per_domain=6) is None
+    drawn = bank.draw('beginner', QUESTIONS_PER_DOMAIN, min_per_domain=3)
+    assert len(drawn) == QUESTIONS_PER_DOMAIN * len(DOMAINS)
+    assert bank.draw('advanced', QUESTIONS_PER_DOMAIN, min_per_domain=3) is None
+    assert bank.stats()['draw_misses'] == 2
+
+
+def test_questions_are_served_from_bank_once_it_is_deep_enough(app, client, monkeypatch, metrics_headers):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    monkeypatch.setenv('GENERATED_QUESTION_REUSE_RATIO', '1')
+    monkeypatch.setenv('GENERATED_QUESTION_MIN_PER_DOMAIN', '6')
+    reload_settings()
+    calls = []
+
+    def fake_completion(**kwargs):
+        calls.append(kwargs)
+        return {'choices': [{'message': {'content': json.dumps(_batch_payload(len(calls)))}}]}
+
+    monkeypatch.setattr('routes.assessment._post_openrouter_chat_completion', fake_completion)
+
+    for _ in range(2):
+        assert client.get('/api/assessment/questions?level=beginner').get_json()['generation_source'] == 'openrouter'
+    assert len(calls) == 2
+
+    question_set = client.get('/api/assessment/questions?level=beginner').get_json()
+
+    assert len(calls) == 2
+    assert question_set['generation_source'] == 'openrouter'
+    response = client.post(
+        '/api/assessment/submit',
+        json={
+            'answers': _answers_for_generated_questions(question_set['questions']),
+            'selected_question_ids': question_set['selected_question_ids'],
+            'assessment_level': 'beginner',
+            'question_set_token': question_set['question_set_token'],
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()['total_score'] == 15
+
+    metrics = client.get('/api/metrics', headers=metrics_headers).get_json()['generated_question_bank']
+    assert metrics['questions'] == 2 * QUESTIONS_PER_DOMAIN * len(DOMAINS)
+    assert metrics['draws'] == 1
@@ -0,0 +1,111 @@
+from models import Certification, TrainingModule, User, UserProgress, db
+from progress_version import read_progress_version
+from tests.test_certification import create_enterprise_user
+from tests.test_module_catalog import _catalog_statements
+from tests.test_platform_counters import _statements
+
+
+def _revalidate(client, path, response, headers=None):
+    return client.get(path, headers={**(headers or {}), 'If-None-Match': response.headers['ETag']})
+
+
+def test_anonymous_module_listing_is_public_and_revalidates(app, client):
+    first = client.get('/api/training/modules?role=Sales')
+
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'public, max-age=60'
+    assert first.headers['Surrogate-Key'] == 'training-modules'
+    assert 'Authorization' in first.headers['Vary']
+    assert not first.headers['ETag'].startswith('W/')
+
+    with _catalog_statements() as statements:
+        cached = client.get('/api/training/modules?role=Sales')
+        not_modified = _revalidate(client, '/api/training/modules?role=Sales', first)
+    assert statements == []
+    assert cached.data == first.data
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+    assert client.get('/api/training/modules?role=HR').headers['ETag'] != first.headers['ETag']
+
+    module = db.session.get(TrainingModule, 'module-ai-fundamentals-intro')
+    module.description = 'Updated description'
+    db.session.commit()
+
+    changed = _revalidate(client, '/api/training/modules?role=Sales', first)
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != first.headers['ETag']
+
+
+def test_signed_in_module_listing_tracks_the_progress_version(app, client, auth_headers):
+    user = User(email='etag@example.com', password_hash='x', first_name='E', last_name='T')
+    db.session.add(user)
+    db.session.commit()
+    headers = auth_headers(user)
+
+    first = client.get('/api/training/modules', headers=headers)
+    assert first.headers['ETag'].startswith('W/')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Surrogate-Key' not in first.headers
+    assert _revalidate(client, '/api/training/modules', first, headers).status_code == 304
+
+    assert read_progress_version(user.id) == '0:'
+    with _statements() as statements:
+        assert client.post('/api/training/enroll/module-ai-fundamentals-intro', headers=headers).status_code == 200
+    assert not any(statement.startswith('update "user"') for statement in statements)
+    version = read_progress_version(user.id)
+    assert version.startswith('1:')
+
+    changed = _revalidate(client, '/api/training/modules', first, headers)
+    assert changed.status_code == 200
+    assert changed.get_json()['resume_module']['module_id'] == 'module-ai-fundamentals-intro'
+
+    progress = UserProgress.query.filter_by(user_id=user.id).one()
+    progress.status = progress.status
+    db.session.commit()
+    assert read_progress_version(user.id) == version
+
+    progress.progress_percentage = 10
+    db.session.commit()
+    assert read_progress_version(user.id) != version
+
+
+def test_certification_catalog_variants(app, client, auth_headers):
+    anonymous = client.get('/api/certification/available')
+    assert anonymous.headers['Cache-Control'] == 'public, max-age=60'
+    assert _revalidate(client, '/api/certification/available', anonymous).status_code == 304
+
+    user = create_enterprise_user('etag-cert@example.com')
+    headers = auth_headers(user)
+    signed_in = client.get('/api/certification/available', headers=headers)
+    assert signed_in.headers['ETag'].startswith('W/')
+    assert _revalidate(client, '/api/certification/available', signed_in, headers).status_code == 304
+
+    user = db.session.get(User, user.id)
+    user.subscription_tier = 'free'
+    db.session.commit()
+    assert _revalidate(client, '/api/certification/available', signed_in, headers).status_code == 200
+
+
+def test_billing_config_and_verification_revalidate(app, client):
+    config = client.get('/api/billing/config')
+    assert config.headers['Surrogate-Key'] == 'billing-config'
+    assert _revalidate(client, '/api/billing/config', config).status_code == 304
+
+    user = create_enterprise_user('etag-verify@example.com')
+    db.session.add(Certification(
+        user_id=user.id,
+        certification_type='LitmusAI Professional',
+        verification_code='ETAG1234',
+    ))
+    db.session.commit()
+
+    verified = client.get('/api/certification/verify/ETAG1234')
+    assert verified.status_code == 200
+    assert verified.headers['Surrogate-Key'] == 'certification-verify certification-ETAG1234'
+    assert _revalidate(client, '/api/certification/verify/ETAG1234', verified).status_code == 304
+
+    Certification.query.filter_by(verification_code='ETAG1234').update({Certification.is_valid: False})
+    db.session.commit()
+    revoked = _revalidate(client, '/api/certification/verify/ETAG1234', verified)
+    assert revoked.status_code == 200
+    assert revoked.get_json()['certification']['is_valid'] is False
@@ -0,0 +1,130 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from jwt.algorithms import RSAAlgorithm
+from cryptography.hazmat.primitives import serialization
+
+from jwks_manager import JwksKeyManager
+
+
+class _JwksServer:
+    def __init__(self, jwks):
+        self.jwks = jwks
+        self.requests = 0
+        self.fail = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.fail:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(server.jwks).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}/auth/v1/.well-known/jwks.json'
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture()
+def jwks_server(supabase_keys):
+    _, public_pem = supabase_keys
+    public_key = serialization.load_pem_public_key(public_pem)
+    jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+    jwk.update({'kid': 'test-key', 'alg': 'RS256', 'use': 'sig'})
+    server = _JwksServer({'keys': [jwk]})
+    yield server
+    server.close()
+
+
+def _signed_token(supabase_keys, kid='test-key'):
+    private_pem, _ = supabase_keys
+    return jwt.encode({'sub': 'jwks-user'}, private_pem, algorithm='RS256', headers={'kid': kid})
+
+
+def test_manager_prefetches_and_serves_keys_without_further_fetches(jwks_server, supabase_keys, tmp_path):
+    manager = JwksKeyManager(jwks_server.url, cache_path=str(tmp_path / 'jwks.json'))
+    assert manager.refresh() is True
+
+    token = _signed_token(supabase_keys)
+    for _ in range(5):
+        signing_key = manager.get_signing_key_from_jwt(token)
+        assert jwt.decode(token, signing_key.key, algorithms=['RS256'])['sub'] == 'jwks-user'
+
+    manager.stop()
+    assert jwks_server.requests == 1
+    assert json.loads((tmp_path / 'jwks.json').read_text())['jwks'] == jwks_server.jwks
+
+
+def test_manager_keeps_last_known_keys_when_endpoint_fails(jwks_server, supabase_keys, tmp_path):
+    manager = JwksKeyManager(jwks_server.url, cache_path=str(tmp_path / 'jwks.json'))
+    assert manager.refresh() is True
+
+    jwks_server.fail = True
+    assert manager.refresh(force=True) is False
+    assert manager.fetch_failures == 1
+    assert manager.key_ids() == ['test-key']
+    assert manager.get_signing_key_from_jwt(_signed_token(supabase_keys)) is not None
+    manager.stop()
+
+
+def test_workers_share_the_on_disk_key_cache(jwks_server, supabase_keys, tmp_path):
+    cache_path = str(tmp_path / 'jwks.json')
+    first_worker = JwksKeyManager(jwks_server.url, cache_path=cache_path)
+    assert first_worker.refresh() is True
+
+    second_worker = JwksKeyManager(jwks_server.url, cache_path=cache_path)
+    assert second_worker.refresh() is True
+    assert second_worker.get_signing_key_from_jwt(_signed_token(supabase_keys)) is not None
+
+    first_worker.stop()
+    second_worker.stop()
+    assert jwks_server.requests == 1
+
+
+def test_background_thread_refreshes_before_lifespan_expires(jwks_server, tmp_path):
+    clock = [1000.0]
+    manager = JwksKeyManager(
+        jwks_server.url,
+        refresh_seconds=600,
+        cache_path=str(tmp_path / 'jwks.json'),
+        clock=lambda: clock[0],
+    )
+    assert manager.refresh() is True
+    assert manager._refresh_delay() == pytest.approx(480)
+
+    clock[0] += 500
+    assert manager._refresh_delay() == 1.0
+    assert manager.refresh() is True
+    assert jwks_server.requests == 2
+
+
+def test_unknown_key_id_is_rejected_after_one_rate_limited_refresh(jwks_server, supabase_keys, tmp_path):
+    manager = JwksKeyManager(jwks_server.url, cache_path=str(tmp_path / 'jwks.json'))
+    assert manager.refresh() is True
+
+    token = _signed_token(supabase_keys, kid='rotated-key')
+    for _ in range(3):
+        with pytest.raises(jwt.PyJWKClientError):
+            manager.get_signing_key_from_jwt(token)
+
+    manager.stop()
+    assert jwks_server.requests == 2
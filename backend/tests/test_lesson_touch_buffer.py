@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from lesson_touch_buffer import LessonTouchBuffer, get_lesson_touch_buffer
+from models import LessonProgress, UserProgress, db
+from tests.test_platform_counters import _statements
+from tests.test_progress_counters import _create_module
+from tests.test_training_routes import create_user
+
+
+@pytest.fixture()
+def touch_buffer(app):
+    buffer = get_lesson_touch_buffer()
+    buffer.flush_interval_seconds = 3600
+    buffer.start(app)
+    yield buffer
+    buffer.stop()
+
+
+def _progress_rows(user, module_id):
+    db.session.expire_all()
+    lessons = {row.lesson_id: row for row in LessonProgress.query.filter_by(user_id=user.id)}
+    return lessons, UserProgress.query.filter_by(user_id=user.id, module_id=module_id).one()
+
+
+def test_views_write_synchronously_while_the_buffer_is_stopped(app, client, auth_headers):
+    first, second = _create_module('module-touch-sync', 2)
+    user = create_user(email='touch-sync@example.com')
+    headers = auth_headers(user)
+
+    client.get(f'/api/course/lessons/{first}', headers=headers)
+    client.get(f'/api/course/lessons/{second}', headers=headers)
+    client.get(f'/api/course/lessons/{first}', headers=headers)
+
+    _, module_progress = _progress_rows(user, 'module-touch-sync')
+    assert module_progress.current_lesson_id == first
+    assert get_lesson_touch_buffer().stats()['recorded'] == 0
+
+
+def test_revisits_are_coalesced_and_flushed_in_bulk(app, client, auth_headers, metrics_headers, touch_buffer):
+    first, second = _create_module('module-touch-buffered', 2)
+    user = create_user(email='touch-buffered@example.com')
+    headers = auth_headers(user)
+    client.get(f'/api/course/lessons/{first}', headers=headers)
+    client.get(f'/api/course/lessons/{second}', headers=headers)
+    lessons, module_progress = _progress_rows(user, 'module-touch-buffered')
+    assert set(lessons) == {first, second}
+    assert module_progress.current_lesson_id == second
+    viewed_at = lessons[first].last_accessed
+
+    with _statements() as statements:
+        for lesson_id in (first, second, first):
+            assert client.get(f'/api/course/lessons/{lesson_id}', headers=headers).status_code == 200
+    assert not any(statement.startswith(('update', 'insert')) for statement in statements)
+    assert touch_buffer.pending_count() == 2
+
+    with _statements() as statements:
+        assert touch_buffer.flush() == 2
+    assert sum(statement.startswith('update lesson_progress') for statement in statements) == 1
+    assert sum(statement.startswith('update user_progress') for statement in statements) == 1
+
+    lessons, module_progress = _progress_rows(user, 'module-touch-buffered')
+    assert lessons[first].last_accessed > viewed_at
+    assert module_progress.current_lesson_id == first
+    assert module_progress.last_accessed == lessons[first].last_accessed
+
+    stats = client.get('/api/metrics', headers=metrics_headers).get_json()['lesson_touch_buffer']
+    assert stats['running'] is True
+    assert (stats['recorded'], stats['coalesced'], stats['touches_flushed']) == (3, 1, 2)
+    assert stats['flushes'] == 1
+    assert stats['last_flush_ms'] is not None
+
+
+def test_stale_touches_do_not_rewind_progress(app, client, auth_headers, touch_buffer):
+    first, second = _create_module('module-touch-stale', 2)
+    user = create_user(email='touch-stale@example.com')
+    headers = auth_headers(user)
+    client.get(f'/api/course/lessons/{first}', headers=headers)
+    client.get(f'/api/course/lessons/{second}', headers=headers)
+
+    touch_buffer.record(user.id, first, 'module-touch-stale', datetime.utcnow() - timedelta(days=1))
+    touch_buffer.flush()
+
+    _, module_progress = _progress_rows(user, 'module-touch-stale')
+    assert module_progress.current_lesson_id == second
+
+
+def test_failed_flush_requeues_touches_for_the_next_flush(app, client, auth_headers, touch_buffer, monkeypatch):
+    first, second = _create_module('module-touch-retry', 2)
+    user = create_user(email='touch-retry@example.com')
+    headers = auth_headers(user)
+    client.get(f'/api/course/lessons/{first}', headers=headers)
+    client.get(f'/api/course/lessons/{second}', headers=headers)
+    newer = datetime.utcnow() + timedelta(minutes=5)
+    touch_buffer.record(user.id, first, 'module-touch-retry', newer - timedelta(minutes=1))
+
+    def unavailable(*args, **kwargs):
+        raise OperationalError('UPDATE lesson_progress', {}, Exception('database is locked'))
+
+    with monkeypatch.context() as patched:
+        patched.setattr(db.session, 'execute', unavailable)
+        assert touch_buffer.flush() == 0
+    touch_buffer.record(user.id, first, 'module-touch-retry', newer)
+
+    stats = touch_buffer.stats()
+    assert (stats['pending'], stats['flush_failures'], stats['requeued'], stats['dropped']) == (1, 1, 1, 0)
+    with _statements() as statements:
+        assert touch_buffer.flush() == 1
+    assert not any(statement.startswith('update "user"') for statement in statements)
+
+    lessons, module_progress = _progress_rows(user, 'module-touch-retry')
+    assert lessons[first].last_accessed == newer
+    assert (module_progress.current_lesson_id, module_progress.last_accessed) == (first, newer)
+
+
+def test_full_buffer_drops_and_counts_new_touches(app):
+    buffer = LessonTouchBuffer(flush_interval_seconds=3600, max_pending=1).start(app)
+    try:
+        now = datetime.utcnow()
+        buffer.record('user-a', 'lesson-1', 'module-1', now)
+        buffer.record('user-a', 'lesson-1', 'module-1', now + timedelta(seconds=1))
+        buffer.record('user-b', 'lesson-1', 'module-1', now)
+
+        stats = buffer.stats()
+        assert (stats['pending'], stats['coalesced'], stats['dropped']) == (1, 1, 1)
+    finally:
+        buffer.stop()
+    assert buffer.stats()['touches_flushed'] == 1
@@ -0,0 +1,169 @@
+from contextlib import contextmanager
+
+from flask import current_app
+from sqlalchemy import event, text
+
+from models import CatalogVersion, Lesson, TrainingModule, User, db
+from module_catalog import (
+    MODULE_CATALOG_EXTENSION_KEY,
+    ModuleCatalog,
+    get_module_catalog,
+    read_module_catalog_version,
+)
+from seeders.training import seed_training_modules
+
+
+@contextmanager
+def _catalog_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        lowered = statement.lower()
+        if 'training_module' in lowered or 'from lesson' in lowered or 'catalog_version' in lowered:
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def test_module_listing_runs_no_catalog_queries_once_warm(app, client):
+    first = client.get('/api/training/modules')
+    assert first.status_code == 200
+
+    with _catalog_statements() as statements:
+        second = client.get('/api/training/modules?role=Sales')
+        detail = client.get('/api/training/modules/module-ai-fundamentals-intro')
+
+    assert second.status_code == 200
+    assert detail.status_code == 200
+    assert statements == []
+    assert {module['role_specific'] for module in second.get_json()['modules']} <= {'Sales', 'General'}
+    titles = [module['title'] for module in first.get_json()['modules']]
+    assert titles == sorted(titles)
+    intro = detail.get_json()['module']
+    assert intro['lesson_count'] > 0
+    assert intro['has_internal_lessons'] is True
+
+
+@contextmanager
+def _all_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def _cold_listing(client, headers=None):
+    get_module_catalog()
+    current_app.extensions[MODULE_CATALOG_EXTENSION_KEY] = ModuleCatalog(refresh_seconds=30)
+    with _all_statements() as statements:
+        response = client.get('/api/training/modules', headers=headers)
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+
+def test_cold_module_listing_runs_constant_queries(app, client, auth_headers):
+    user = User(email='listing@example.com', password_hash='x', first_name='L', last_name='Q')
+    db.session.add(user)
+    db.session.commit()
+    headers = auth_headers(user)
+    client.get('/api/training/modules', headers=headers)  # first sign-in links the identity
+
+    _, anonymous_baseline = _cold_listing(client)
+    _, authenticated_baseline = _cold_listing(client, headers)
+
+    for index in range(30):
+        module_id = f'module-listing-{index:02d}'
+        db.session.add(TrainingModule(
+            id=module_id,
+            title=f'Listing {index:02d}',
+            estimated_duration_minutes=15,
+            content_type='reading',
+            prerequisites='{"requirements": ["Basics"], "metadata": {"access_tier": "free"}}',
+        ))
+        db.session.add_all(
+            Lesson(module_id=module_id, title=f'Lesson {order}', order_index=order, content_type='text')
+            for order in range(index % 4)
+        )
+    db.session.commit()
+
+    payload, anonymous = _cold_listing(client)
+    _, authenticated = _cold_listing(client, headers)
+
+    assert anonymous == anonymous_baseline
+    assert authenticated == authenticated_baseline
+    listed = {module['id']: module for module in payload['modules']}
+    assert listed['module-listing-03']['lesson_count'] == 3
+    assert listed['module-listing-04']['lesson_count'] == 0
+    assert listed['module-listing-03']['prerequisites'] == ['Basics']
+
+
+def test_catalog_picks_up_version_bumps_from_other_workers(app):
+    now = [0.0]
+    catalog = ModuleCatalog(refresh_seconds=30, clock=lambda: now[0])
+    app.extensions[MODULE_CATALOG_EXTENSION_KEY] = catalog
+    before = get_module_catalog()
+    module_id = before.active_modules[0].id
+
+    # Simulate another worker: Core statements bypass this process's ORM session events.
+    with db.engine.begin() as connection:
+        connection.execute(
+            text('UPDATE training_module SET title = :title WHERE id = :id'),
+            {'title': 'Renamed elsewhere', 'id': module_id},
+        )
+        connection.execute(
+            CatalogVersion.__table__.update()
+            .where(CatalogVersion.name == 'training_modules')
+            .values(version=before.version + 1)
+        )
+
+    now[0] = 10.0
+    assert get_module_catalog() is before
+
+    now[0] = 31.0
+    after = get_module_catalog()
+    assert after is not before
+    assert after.get(module_id).title == 'Renamed elsewhere'
+    assert catalog.reload_count == 2
+
+
+def test_in_process_commits_and_seeders_invalidate_the_snapshot(app):
+    before = get_module_catalog()
+    version_before = read_module_catalog_version()
+
+    module = db.session.get(TrainingModule, before.active_modules[0].id)
+    module.is_active = False
+    db.session.commit()
+
+    after = get_module_catalog()
+    assert module.id not in {entry.id for entry in after.active_modules}
+    assert after.get(module.id).is_active is False
+
+    seed_training_modules(force=True, silent=True)
+
+    assert read_module_catalog_version() == version_before + 1
+    assert get_module_catalog().get(module.id).is_active is True
+
+
+def test_recommendations_read_modules_from_snapshot(app, client, auth_headers):
+    user = User(email='catalog@example.com', password_hash='x', first_name='C', last_name='T', role='Sales')
+    db.session.add(user)
+    db.session.commit()
+    headers = auth_headers(user)
+    assert client.get('/api/assessment/recommendations', headers=headers).status_code == 200
+
+    with _catalog_statements() as statements:
+        response = client.get('/api/assessment/recommendations', headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['recommendations']
+    assert statements == []
@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, CircuitOpenError
+from routes.assessment import OPENROUTER_CIRCUIT_EXTENSION_KEY
+from settings import reload_settings
+from tests.test_assessment import _generated_question_payload
+
+
+class _FakeOpenRouter:
+    def __init__(self):
+        self.requests = 0
+        self.status = 200
+        self.delay_seconds = 0.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server.requests += 1
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if server.delay_seconds:
+                    time.sleep(server.delay_seconds)
+                if server.status != 200:
+                    self.send_response(server.status)
+                    self.end_headers()
+                    return
+                body = json.dumps({
+                    'choices': [{'message': {'content': json.dumps(_generated_question_payload())}}],
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_address[1]}/api/v1'
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture()
+def fake_openrouter(app, monkeypatch):
+    server = _FakeOpenRouter()
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('OPENROUTER_BASE_URL', server.base_url)
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    monkeypatch.setenv('OPENROUTER_LATENCY_BUDGET_SECONDS', '0.3')
+    monkeypatch.setenv('OPENROUTER_CIRCUIT_FAILURE_THRESHOLD', '2')
+    reload_settings()
+    yield server
+    server.close()
+
+
+def _install_breaker(app, clock):
+    breaker = CircuitBreaker('openrouter', failure_threshold=2, recovery_seconds=30, clock=clock)
+    app.extensions[OPENROUTER_CIRCUIT_EXTENSION_KEY] = breaker
+    return breaker
+
+
+def _question_source(client, level='beginner'):
+    response = client.get(f'/api/assessment/questions?level={level}')
+    assert response.status_code == 200
+    return response.get_json()['generation_source']
+
+
+def test_breaker_transitions_through_half_open():
+    now = [0.0]
+    breaker = CircuitBreaker('upstream', failure_threshold=2, recovery_seconds=10, clock=lambda: now[0])
+
+    def fail():
+        raise TimeoutError('slow upstream')
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            breaker.call(fail)
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'unreachable')
+
+    now[0] = 10.0
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+    now[0] = 20.0
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == STATE_CLOSED
+    assert breaker.stats()['rejections'] == 2
+
+
+def test_slow_successes_count_against_latency_budget():
+    breaker = CircuitBreaker('upstream', failure_threshold=1)
+
+    assert breaker.call(lambda: time.sleep(0.02) or 'late', latency_budget_seconds=0.001) == 'late'
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.stats()['latency_budget_exceeded'] == 1
+
+
+def test_open_circuit_skips_openrouter_and_recovers(app, client, fake_openrouter, caplog):
+    now = [0.0]
+    breaker = _install_breaker(app, lambda: now[0])
+    fake_openrouter.status = 503
+
+    assert _question_source(client) == 'curated_fallback'
+    assert _question_source(client) == 'curated_fallback'
+    assert breaker.state == STATE_OPEN
+    assert fake_openrouter.requests == 2
+
+    started = time.monotonic()
+    assert _question_source(client) == 'curated_fallback'
+    assert time.monotonic() - started < 0.3
+    assert fake_openrouter.requests == 2
+
+    fake_openrouter.status = 200
+    now[0] = 30.0
+    assert _question_source(client) == 'openrouter'
+    assert breaker.state == STATE_CLOSED
+    assert fake_openrouter.requests == 3
+
+    transitions = [
+        (record.msg.get('from_state'), record.msg.get('to_state'))
+        for record in caplog.records
+        if isinstance(record.msg, dict) and record.msg.get('event') == 'circuit_state_changed'
+    ]
+    assert transitions == [
+        (STATE_CLOSED, STATE_OPEN),
+        (STATE_OPEN, STATE_HALF_OPEN),
+        (STATE_HALF_OPEN, STATE_CLOSED),
+    ]
+
+
+def test_latency_budget_bounds_request_time_and_opens_circuit(app, client, fake_openrouter, metrics_headers):
+    breaker = _install_breaker(app, time.monotonic)
+    fake_openrouter.delay_seconds = 1.0
+
+    for _ in range(2):
+        started = time.monotonic()
+        assert _question_source(client) == 'curated_fallback'
+        assert time.monotonic() - started < 0.9
+
+    assert breaker.state == STATE_OPEN
+    metrics = client.get('/api/metrics', headers=metrics_headers).get_json()['openrouter_circuit']
+    assert metrics['state'] == STATE_OPEN
+    assert metrics['failures'] == 2
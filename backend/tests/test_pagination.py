@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+from models import AssessmentResult, Certification, TrainingModule, User, UserProgress, db
+
+
+def _create_user(email='pager@example.com'):
+    user = User(email=email, password_hash='test-hash', first_name='Page', last_name='R', subscription_tier='free')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _collect(client, url, key, headers, limit):
+    items = []
+    cursor = None
+    pages = 0
+    while True:
+        query = f'{url}{"&" if "?" in url else "?"}limit={limit}'
+        if cursor:
+            query += f'&cursor={cursor}'
+        response = client.get(query, headers=headers)
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert len(payload[key]) <= limit
+        items.extend(payload[key])
+        pages += 1
+        cursor = payload['next_cursor']
+        if not cursor:
+            return items, pages
+
+
+def test_assessment_history_pages_by_completed_at_with_id_tiebreak(client, app, auth_headers):
+    user = _create_user()
+    base = datetime(2026, 1, 1)
+    for index in range(7):
+        db.session.add(AssessmentResult(
+            user_id=user.id,
+            total_score=index,
+            max_score=15,
+            percentage=index / 15 * 100,
+            domain_scores={'AI Fundamentals': {'score': 1, 'total': 3}},
+            recommendations='{"insights": []}',
+            # Pairs of rows share a timestamp so the id tiebreaker is exercised.
+            completed_at=base + timedelta(days=index // 2),
+        ))
+    db.session.commit()
+    headers = auth_headers(user)
+
+    history, pages = _collect(client, '/api/assessment/history', 'history', headers, limit=3)
+
+    assert pages == 3
+    expected = AssessmentResult.query.order_by(
+        AssessmentResult.completed_at.desc(),
+        AssessmentResult.id.desc(),
+    ).all()
+    assert [entry['id'] for entry in history] == [result.id for result in expected]
+    assert history[0]['domain_scores']['AI Fundamentals'] == {'score': 1, 'total': 3}
+
+    summary = client.get('/api/assessment/history?summary=1&limit=2', headers=headers).get_json()
+    assert [entry['id'] for entry in summary['history']] == [result.id for result in expected[:2]]
+    assert 'domain_scores' not in summary['history'][0]
+    assert 'recommendations' not in summary['history'][0]
+    assert summary['history'][0]['score_band'] == 'Beginner'
+
+
+def test_list_endpoints_reject_malformed_page_arguments(client, app, auth_headers):
+    headers = auth_headers(_create_user())
+
+    for url in (
+        '/api/assessment/history?cursor=not-a-cursor',
+        '/api/certification/earned?limit=abc',
+        '/api/training/progress?limit=0',
+    ):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 400, url
+
+
+def test_earned_certifications_page_through_null_issue_dates(client, app, auth_headers):
+    user = _create_user()
+    for index in range(5):
+        db.session.add(Certification(
+            user_id=user.id,
+            certification_type=f'Cert {index}',
+            verification_code=f'CODE-{index}',
+            issued_at=datetime(2026, 2, index + 1),
+        ))
+    db.session.commit()
+    Certification.query.filter_by(certification_type='Cert 0').update({Certification.issued_at: None})
+    db.session.commit()
+    headers = auth_headers(user)
+
+    certifications, _ = _collect(client, '/api/certification/earned', 'certifications', headers, limit=2)
+
+    assert [entry['certification_type'] for entry in certifications] == [
+        'Cert 4', 'Cert 3', 'Cert 2', 'Cert 1', 'Cert 0',
+    ]
+
+    summary = client.get('/api/certification/earned?summary=true', headers=headers).get_json()
+    assert len(summary['certifications']) == 5
+    assert 'skills_validated' not in summary['certifications'][0]
+
+
+def test_training_progress_summary_covers_every_page(client, app, auth_headers):
+    user = _create_user()
+    modules = TrainingModule.query.order_by(TrainingModule.id).limit(4).all()
+    now = datetime(2026, 3, 1)
+    for index, module in enumerate(modules):
+        db.session.add(UserProgress(
+            user_id=user.id,
+            module_id=module.id,
+            status='completed' if index % 2 else 'in_progress',
+            progress_percentage=100 if index % 2 else 50,
+            time_spent_minutes=10,
+            last_accessed=now - timedelta(hours=index),
+        ))
+    db.session.commit()
+    headers = auth_headers(user)
+
+    first_page = client.get('/api/training/progress?limit=1', headers=headers).get_json()
+    assert first_page['summary']['completed_modules'] == 2
+    assert first_page['summary']['total_learning_time'] == 40
+    assert first_page['summary']['resume_module']['module_id'] == modules[0].id
+
+    second_page = client.get(
+        f'/api/training/progress?limit=1&cursor={first_page["next_cursor"]}',
+        headers=headers,
+    ).get_json()
+    assert 'summary' not in second_page
+    assert second_page['progress'][0]['module_id'] == modules[1].id
+
+    progress, _ = _collect(client, '/api/training/progress?summary=1', 'progress', headers, limit=3)
+    assert [entry['module_id'] for entry in progress] == [module.id for module in modules]
+    assert 'time_spent_minutes' not in progress[0]
+
+
+def test_list_endpoints_return_every_row_without_a_limit(client, app, auth_headers):
+    user = _create_user()
+    base = datetime(2026, 4, 1)
+    for index in range(60):
+        db.session.add(Certification(
+            user_id=user.id,
+            certification_type=f'Cert {index}',
+            verification_code=f'ALL-{index}',
+            issued_at=base + timedelta(hours=index),
+        ))
+    db.session.commit()
+
+    payload = client.get('/api/certification/earned', headers=auth_headers(user)).get_json()
+
+    assert len(payload['certifications']) == 60
+    assert payload['next_cursor'] is None
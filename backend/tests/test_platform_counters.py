@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from models import AssessmentResult, Certification, PlatformCounter, User, db
+from platform_counters import get_platform_counter_buffer, read_platform_counters, reconcile_platform_counters
+from settings import reload_settings
+from tests.test_assessment_batch import _create_user, _curated_sheet
+
+
+@contextmanager
+def _statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def _add_learner_records(email):
+    user = User(email=email, password_hash='test-hash', first_name='Test', last_name='User')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(AssessmentResult(user_id=user.id, total_score=10, max_score=15, percentage=66.7))
+    db.session.add(Certification(user_id=user.id, certification_type='LitmusAI Professional',
+                                 verification_code=f'code-{email}'))
+    db.session.commit()
+    return user
+
+
+@pytest.fixture()
+def uncached_stats(monkeypatch):
+    monkeypatch.setenv('PLATFORM_STATS_CACHE_SECONDS', '0')
+    reload_settings()
+
+
+def test_stats_follow_writes_without_counting_tables(app, client, uncached_stats):
+    before = client.get('/api/stats').get_json()
+    _add_learner_records('counted@example.com')
+
+    with _statements() as statements:
+        after = client.get('/api/stats')
+
+    assert after.status_code == 200
+    data = after.get_json()
+    assert set(data) == {
+        'total_users',
+        'total_assessments',
+        'total_certifications',
+        'completion_rate',
+        'average_transformation_weeks',
+        'satisfaction_rating',
+    }
+    assert data['total_users'] == before['total_users'] + 1 == User.query.count()
+    assert data['total_assessments'] == before['total_assessments'] + 1 == AssessmentResult.query.count()
+    assert data['total_certifications'] == before['total_certifications'] + 1 == Certification.query.count()
+    assert not any('count(' in statement for statement in statements)
+
+
+@pytest.fixture()
+def counter_buffer(app):
+    buffer = get_platform_counter_buffer()
+    buffer.flush_interval_seconds = 3600
+    buffer.start(app)
+    yield buffer
+    buffer.stop()
+
+
+def test_writes_buffer_counts_instead_of_locking_the_counter_rows(app, uncached_stats, counter_buffer):
+    baseline = read_platform_counters()
+
+    with _statements() as statements:
+        _add_learner_records('buffered@example.com')
+    assert not any('platform_counter' in statement for statement in statements)
+    assert counter_buffer.pending() == {
+        'total_users': 1,
+        'total_assessments': 1,
+        'total_certifications': 1,
+    }
+
+    assert counter_buffer.flush() == {
+        'total_users': 1,
+        'total_assessments': 1,
+        'total_certifications': 1,
+    }
+    stored = dict(db.session.query(PlatformCounter.name, PlatformCounter.value).all())
+    assert stored['total_users'] == baseline['total_users'] + 1
+    assert read_platform_counters()['total_certifications'] == baseline['total_certifications'] + 1
+
+
+def test_cached_stats_skip_the_database(app, client):
+    first = client.get('/api/stats').get_json()
+    _add_learner_records('cached@example.com')
+
+    with _statements() as statements:
+        second = client.get('/api/stats').get_json()
+
+    assert second == first
+    assert statements == []
+
+
+def test_rolled_back_rows_and_bulk_inserts_keep_counters_exact(app, uncached_stats):
+    from routes.assessment import grade_answer_sheets
+
+    baseline = read_platform_counters()
+    db.session.add(User(email='rolled-back@example.com', password_hash='x', first_name='A', last_name='B'))
+    db.session.flush()
+    db.session.rollback()
+    assert read_platform_counters() == baseline
+
+    _create_user('bulk@acme.test', 'Acme')
+    summary = grade_answer_sheets([_curated_sheet(email='bulk@acme.test')] * 3, organization='Acme', chunk_size=2)
+
+    assert summary['saved'] == 3
+    assert read_platform_counters()['total_assessments'] == baseline['total_assessments'] + 3
+    assert reconcile_platform_counters() == {}
+
+
+def test_reconcile_command_corrects_drift(app, uncached_stats):
+    read_platform_counters()
+    PlatformCounter.query.filter_by(name='total_users').update({PlatformCounter.value: 999})
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['reconcile-platform-counters'])
+
+    assert result.exit_code == 0, result.output
+    assert f'total_users: 999 -> {User.query.count()}' in result.output
+    assert read_platform_counters()['total_users'] == User.query.count()
+    assert 'in sync' in app.test_cli_runner().invoke(args=['reconcile-platform-counters']).output
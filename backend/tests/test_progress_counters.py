@@ -0,0 +1,114 @@
+from models import Lesson, LessonProgress, TrainingModule, UserProgress, db
+from module_catalog import get_module_catalog
+from tests.test_platform_counters import _statements
+from tests.test_training_routes import create_user
+
+
+def _create_module(module_id, lesson_count, optional=()):
+    db.session.add(TrainingModule(
+        id=module_id,
+        title=module_id,
+        estimated_duration_minutes=30,
+        content_type='interactive',
+    ))
+    lessons = [
+        Lesson(
+            id=f'{module_id}-lesson-{index}',
+            module_id=module_id,
+            title=f'Lesson {index}',
+            order_index=index,
+            content_type='text',
+            is_required=index not in optional,
+        )
+        for index in range(lesson_count)
+    ]
+    db.session.add_all(lessons)
+    db.session.commit()
+    return [lesson.id for lesson in lessons]
+
+
+def _module_progress(user, module_id):
+    db.session.expire_all()
+    return UserProgress.query.filter_by(user_id=user.id, module_id=module_id).one()
+
+
+def test_completing_a_lesson_costs_the_same_queries_whatever_the_module_size(app, client, auth_headers):
+    small = _create_module('module-counters-small', 2)
+    large = _create_module('module-counters-large', 60)
+    get_module_catalog()
+
+    counts = []
+    for lesson_ids in (small, large):
+        user = create_user(email=f'counters-{len(lesson_ids)}@example.com')
+        headers = auth_headers(user)
+        client.get('/api/training/progress', headers=headers)  # first sign-in links the identity
+        client.put(f'/api/course/lessons/{lesson_ids[0]}/progress', headers=headers, json={'time_spent_minutes': 2})
+
+        with _statements() as statements:
+            response = client.post(
+                f'/api/course/lessons/{lesson_ids[0]}/complete',
+                headers=headers,
+                json={'time_spent_minutes': 5},
+            )
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+    assert not any('lesson_progress.module_id =' in statement for statement in statements)
+
+
+def test_counters_follow_heartbeats_completions_and_regressions(app, client, auth_headers):
+    lesson_ids = _create_module('module-counters-flow', 4, optional={3})
+    user = create_user(email='counters-flow@example.com')
+    headers = auth_headers(user)
+
+    client.put(f'/api/course/lessons/{lesson_ids[0]}/progress', headers=headers, json={'time_spent_minutes': 4})
+    client.put(f'/api/course/lessons/{lesson_ids[0]}/progress', headers=headers, json={'time_spent_minutes': 3})
+    client.post(f'/api/course/lessons/{lesson_ids[1]}/complete', headers=headers, json={'time_spent_minutes': 6})
+    client.post(f'/api/course/lessons/{lesson_ids[3]}/complete', headers=headers, json={'time_spent_minutes': 1})
+
+    progress = _module_progress(user, 'module-counters-flow')
+    assert progress.completed_required_lessons == 1
+    assert progress.lesson_time_spent_minutes == progress.time_spent_minutes == 11
+    assert progress.progress_percentage == 33
+    assert progress.status == 'in_progress'
+    assert progress.current_lesson_id == lesson_ids[0]
+
+    client.post(f'/api/course/lessons/{lesson_ids[0]}/complete', headers=headers, json={'time_spent_minutes': 4})
+    client.post(f'/api/course/lessons/{lesson_ids[2]}/complete', headers=headers, json={})
+    progress = _module_progress(user, 'module-counters-flow')
+    assert progress.status == 'completed'
+    assert progress.progress_percentage == 100
+    assert progress.completed_at is not None
+    assert progress.current_lesson_id == lesson_ids[3]
+
+    client.put(f'/api/course/lessons/{lesson_ids[2]}/progress', headers=headers, json={'status': 'in_progress'})
+    progress = _module_progress(user, 'module-counters-flow')
+    assert progress.completed_required_lessons == 2
+    assert progress.status == 'in_progress'
+    assert progress.completed_at is None
+    assert progress.current_lesson_id == lesson_ids[2]
+
+
+def test_rebuild_command_repairs_drifted_counters(app, client, auth_headers):
+    lesson_ids = _create_module('module-counters-repair', 3)
+    user = create_user(email='counters-repair@example.com')
+    headers = auth_headers(user)
+    client.post(f'/api/course/lessons/{lesson_ids[0]}/complete', headers=headers, json={'time_spent_minutes': 7})
+    db.session.add(LessonProgress(
+        user_id=user.id,
+        lesson_id=lesson_ids[1],
+        module_id='module-counters-repair',
+        status='completed',
+        time_spent_minutes=5,
+    ))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['rebuild-progress-counters', '--batch-size', '1'])
+
+    assert result.exit_code == 0, result.output
+    assert 'on 1 user progress rows' in result.output
+    progress = _module_progress(user, 'module-counters-repair')
+    assert (progress.completed_required_lessons, progress.lesson_time_spent_minutes) == (2, 12)
+    assert progress.progress_percentage == 66
+    assert 'on 0 user progress rows' in app.test_cli_runner().invoke(args=['rebuild-progress-counters']).output
@@ -0,0 +1,99 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from models import AssessmentResult, User, UserProgress, db
+from routes.assessment import get_latest_assessment_result
+from tests.test_assessment import build_assessment_payload_from_question_ids
+
+
+def _per_user_lookups(user_id='user-1'):
+    return {
+        'ix_assessment_result_user_completed': (AssessmentResult.query
+                                                .filter_by(user_id=user_id)
+                                                .order_by(AssessmentResult.completed_at.desc())
+                                                .limit(1)),
+        'ix_user_progress_user_status': UserProgress.query.filter_by(user_id=user_id, status='completed'),
+        'uq_user_progress_user_module': UserProgress.query.filter_by(user_id=user_id, module_id='module-1'),
+    }
+
+
+def _literal_sql(query, dialect):
+    return str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+
+def test_sqlite_plans_use_per_user_indexes(app):
+    for index_name, query in _per_user_lookups().items():
+        plan = db.session.execute(
+            text('EXPLAIN QUERY PLAN ' + _literal_sql(query, db.engine.dialect))
+        ).all()
+        details = ' '.join(row[-1] for row in plan)
+        assert index_name in details, (index_name, details)
+        assert 'USE TEMP B-TREE FOR ORDER BY' not in details
+
+
+def test_per_user_indexes_compile_for_postgres():
+    statements = [
+        str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for table in (AssessmentResult.__table__, UserProgress.__table__)
+        for index in table.indexes
+    ]
+
+    assert 'CREATE INDEX ix_assessment_result_user_completed ON assessment_result (user_id, completed_at)' in statements
+    assert 'CREATE UNIQUE INDEX uq_user_progress_user_module ON user_progress (user_id, module_id)' in statements
+    assert 'CREATE INDEX ix_user_progress_user_status ON user_progress (user_id, status)' in statements
+
+
+@pytest.mark.skipif(not os.getenv('TEST_POSTGRES_URL'), reason='TEST_POSTGRES_URL is not set')
+def test_postgres_plans_use_per_user_indexes(app):
+    engine = create_engine(os.environ['TEST_POSTGRES_URL'])
+    schema = f'plans_{uuid.uuid4().hex[:8]}'
+    try:
+        with engine.begin() as connection:
+            connection.execute(text(f'CREATE SCHEMA {schema}'))
+            connection.execute(text(f'SET search_path TO {schema}'))
+            db.metadata.create_all(connection)
+            connection.execute(text('ANALYZE'))
+            connection.execute(text('SET enable_seqscan TO off'))
+            for index_name, query in _per_user_lookups().items():
+                plan = '\n'.join(
+                    row[0] for row in connection.execute(text('EXPLAIN ' + _literal_sql(query, engine.dialect)))
+                )
+                assert index_name in plan, (index_name, plan)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA IF EXISTS {schema} CASCADE'))
+        engine.dispose()
+
+
+def test_submit_maintains_latest_assessment_pointer(app, client, auth_headers):
+    user = User(email='pointer@example.com', password_hash='x', first_name='P', last_name='T')
+    db.session.add(user)
+    db.session.commit()
+    headers = auth_headers(user)
+
+    result_ids = []
+    for _ in range(2):
+        question_set = client.get('/api/assessment/questions').get_json()
+        answers, option_map = build_assessment_payload_from_question_ids(question_set['selected_question_ids'])
+        response = client.post(
+            '/api/assessment/submit',
+            json={
+                'answers': answers,
+                'option_map': option_map,
+                'selected_question_ids': question_set['selected_question_ids'],
+                'assessment_level': 'beginner',
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+        db.session.expire_all()
+        result_ids.append(db.session.get(User, user.id).latest_assessment_result_id)
+
+    assert result_ids[0] != result_ids[1]
+    assert AssessmentResult.query.filter_by(user_id=user.id).count() == 2
+    assert get_latest_assessment_result(user.id).id == result_ids[1]
@@ -0,0 +1,159 @@
+import question_bank
+from models import Assessment, db
+from question_bank import QuestionBank, QuestionBankSnapshot, get_question_bank
+from routes.assessment import ASSESSMENT_LEVELS, DOMAINS, QUESTIONS_PER_DOMAIN, SAMPLE_QUESTIONS
+
+
+def _bank(**overrides):
+    options = {
+        'domains': DOMAINS,
+        'levels': ASSESSMENT_LEVELS,
+        'questions_per_domain': QUESTIONS_PER_DOMAIN,
+        'fallback_questions': SAMPLE_QUESTIONS,
+        'refresh_seconds': 3600,
+    }
+    options.update(overrides)
+    return QuestionBank(**options)
+
+
+def _add_question(question_id, domain='AI Fundamentals', **fields):
+    record = Assessment(
+        id=question_id,
+        title=f'{domain} question {question_id}',
+        domain=domain,
+        question_text=fields.pop('question_text', f'Question {question_id}?'),
+        option_a='A option',
+        option_b='B option',
+        option_c='C option',
+        option_d='D option',
+        correct_answer=fields.pop('correct_answer', 'a'),
+        **fields,
+    )
+    db.session.add(record)
+    db.session.commit()
+    return record
+
+
+def test_snapshot_indexes_seeded_questions_by_id_and_level(app):
+    snapshot = _bank().snapshot()
+
+    assert snapshot.source == 'database'
+    assert len(snapshot) == len(SAMPLE_QUESTIONS)
+    assert snapshot.get('7')['question_text'] == SAMPLE_QUESTIONS[6]['question_text']
+    assert [question['id'] for question in snapshot.questions_for_ids(['3', 'missing', '1'])] == ['3', '1']
+
+    beginner_ids = {question['id'] for question in snapshot.level_candidates['beginner']}
+    advanced_ids = {question['id'] for question in snapshot.level_candidates['advanced']}
+    assert {'1', '2', '3'} <= beginner_ids
+    assert {'1', '2'}.isdisjoint(advanced_ids)
+    for level in ASSESSMENT_LEVELS:
+        selected = snapshot.select(level)
+        assert len(selected) == len(DOMAINS) * QUESTIONS_PER_DOMAIN
+        assert {question['domain'] for question in selected} == set(DOMAINS)
+
+
+def test_bank_reloads_after_committed_question_changes(app):
+    bank = _bank()
+    first = bank.snapshot()
+    assert bank.snapshot() is first
+
+    _add_question('bank-new-1', correct_answer='c')
+    second = bank.snapshot()
+
+    assert second is not first
+    assert second.version != first.version
+    assert second.get('bank-new-1')['correct_answer'] == 'C'
+
+    Assessment.query.get('bank-new-1').is_active = False
+    db.session.commit()
+    third = bank.snapshot()
+
+    assert third.get('bank-new-1') is None
+    assert third.version == first.version
+
+
+def test_bank_detects_changes_from_other_processes_via_signature(app):
+    now = [0.0]
+    bank = _bank(refresh_seconds=30, clock=lambda: now[0])
+    first = bank.snapshot()
+
+    db.session.execute(
+        Assessment.__table__.insert().values(
+            id='external-1',
+            title='External question',
+            domain='Practical Usage',
+            question_text='Inserted by another worker?',
+            option_a='A',
+            option_b='B',
+            option_c='C',
+            option_d='D',
+            correct_answer='B',
+        )
+    )
+    db.session.commit()
+
+    assert bank.snapshot() is first
+
+    now[0] = 31.0
+    refreshed = bank.snapshot()
+    assert refreshed.get('external-1') is not None
+
+
+def test_bank_reloads_in_place_edits_made_by_other_processes(app, monkeypatch):
+    now = [0.0]
+    bank = _bank(refresh_seconds=30, clock=lambda: now[0])
+    assert bank.snapshot().get('1')['correct_answer'] == 'A'
+
+    # Another worker's commit never advances this process's in-memory generation.
+    monkeypatch.setattr(question_bank, 'bump_question_bank_generation', lambda: None)
+    Assessment.query.get('1').correct_answer = 'D'
+    db.session.commit()
+    assert bank.snapshot().get('1')['correct_answer'] == 'A'
+
+    now[0] = 31.0
+    assert bank.snapshot().get('1')['correct_answer'] == 'D'
+
+
+def test_bank_falls_back_to_builtin_questions_when_table_is_empty(app):
+    Assessment.query.delete()
+    db.session.commit()
+
+    snapshot = _bank().snapshot()
+
+    assert snapshot.source == 'builtin'
+    assert len(snapshot) == len(SAMPLE_QUESTIONS)
+
+
+def test_snapshot_ignores_unknown_domains_and_orders_by_difficulty():
+    questions = [
+        {'id': 'b', 'domain': 'AI Fundamentals', 'difficulty_level': 3, 'correct_answer': 'A'},
+        {'id': 'a', 'domain': 'AI Fundamentals', 'difficulty_level': 1, 'correct_answer': 'B'},
+        {'id': '10', 'domain': 'AI Fundamentals', 'difficulty_level': 1, 'correct_answer': 'C'},
+        {'id': '2', 'domain': 'AI Fundamentals', 'difficulty_level': 1, 'correct_answer': 'D'},
+        {'id': 'legacy', 'domain': 'Functional', 'correct_answer': 'A'},
+    ]
+
+    snapshot = QuestionBankSnapshot(
+        questions,
+        domains=DOMAINS,
+        levels=ASSESSMENT_LEVELS,
+        questions_per_domain=QUESTIONS_PER_DOMAIN,
+        source='test',
+    )
+
+    assert [question['id'] for question in snapshot.by_domain['AI Fundamentals']] == ['2', '10', 'a', 'b']
+    assert snapshot.get('legacy') is None
+    assert [question['id'] for question in snapshot.level_candidates['advanced']] == ['10', 'a', 'b']
+
+
+def test_questions_endpoint_serves_bank_questions(app, client):
+    for suffix in 'abcd':
+        _add_question(f'strategy-extra-{suffix}', domain='Strategic Understanding')
+
+    response = client.get('/api/assessment/questions?level=advanced')
+
+    assert response.status_code == 200
+    selected_ids = response.get_json()['selected_question_ids']
+    strategic_ids = [question_id for question_id in selected_ids if question_id.startswith('strategy-extra-')]
+    assert len(strategic_ids) == QUESTIONS_PER_DOMAIN
+    assert get_question_bank().snapshot().get('strategy-extra-a') is not None
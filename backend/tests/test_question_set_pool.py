@@ -0,0 +1,149 @@
+import json
+import time
+
+from question_set_pool import QuestionSetPool
+from routes.assessment import ASSESSMENT_LEVELS, start_question_set_pool
+from settings import reload_settings
+from tests.test_assessment import _generated_question_payload
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_pool_refills_each_level_and_pops_in_order():
+    generated = []
+
+    def generate(level):
+        generated.append(level)
+        return {'level': level, 'sequence': len(generated)}
+
+    pool = QuestionSetPool(levels=ASSESSMENT_LEVELS, generate=generate, target_depth=2)
+    while pool.refill_once():
+        pass
+
+    assert sorted(generated) == sorted(ASSESSMENT_LEVELS * 2)
+    assert all(pool.depth(level) == 2 for level in ASSESSMENT_LEVELS)
+
+    first = pool.pop('advanced')
+    second = pool.pop('advanced')
+    assert first['level'] == second['level'] == 'advanced'
+    assert first['sequence'] < second['sequence']
+    assert pool.pop('advanced') is None
+
+    stats = pool.stats()['levels']['advanced']
+    assert stats['depth'] == 0
+    assert stats['pops'] == 3
+    assert stats['empty_pops'] == 1
+    assert stats['empty_rate'] == round(1 / 3, 4)
+    assert stats['refills'] == 2
+    assert stats['avg_refill_ms'] is not None
+
+
+def test_pool_discards_sets_older_than_max_age_and_counts_failures():
+    now = [1000.0]
+    pool = QuestionSetPool(
+        levels=('beginner',),
+        generate=lambda level: None,
+        target_depth=1,
+        max_age_seconds=60,
+        clock=lambda: now[0],
+    )
+    pool.push('beginner', {'id': 'stale'})
+    now[0] += 61
+
+    assert pool.pop('beginner') is None
+    assert pool.refill_once() is False
+
+    stats = pool.stats()['levels']['beginner']
+    assert stats['expired'] == 1
+    assert stats['empty_pops'] == 1
+    assert stats['refill_failures'] == 1
+
+
+def test_questions_endpoint_serves_pooled_openrouter_sets(app, client, monkeypatch, metrics_headers):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    monkeypatch.setenv('QUESTION_SET_POOL_DEPTH', '1')
+    reload_settings()
+
+    completions = []
+
+    def fake_completion(**kwargs):
+        completions.append(kwargs)
+        return {'choices': [{'message': {'content': json.dumps(_generated_question_payload())}}]}
+
+    monkeypatch.setattr('routes.assessment._post_openrouter_chat_completion', fake_completion)
+
+    pool = start_question_set_pool()
+    try:
+        assert _wait_for(lambda: all(pool.depth(level) == 1 for level in ASSESSMENT_LEVELS))
+        generated_before_request = len(completions)
+
+        response = client.get('/api/assessment/questions?level=beginner')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['generation_source'] == 'openrouter'
+        assert data['question_set_token']
+        assert len(completions) == generated_before_request
+        assert _wait_for(lambda: pool.depth('beginner') == 1)
+
+        metrics = client.get('/api/metrics', headers=metrics_headers).get_json()['question_set_pool']
+        assert metrics['running'] is True
+        assert metrics['levels']['beginner']['pops'] == 1
+        assert metrics['levels']['beginner']['empty_pops'] == 0
+        assert metrics['levels']['beginner']['refills'] == 2
+    finally:
+        pool.stop()
+
+
+def test_questions_endpoint_falls_back_when_running_pool_is_empty(app, client, monkeypatch):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    reload_settings()
+
+    def failing_completion(**kwargs):
+        raise TimeoutError('upstream timed out')
+
+    monkeypatch.setattr('routes.assessment._post_openrouter_chat_completion', failing_completion)
+
+    pool = start_question_set_pool()
+    try:
+        response = client.get('/api/assessment/questions?level=intermediate')
+
+        assert response.status_code == 200
+        assert response.get_json()['generation_source'] == 'curated_fallback'
+        assert pool.stats()['levels']['intermediate']['empty_pops'] == 1
+    finally:
+        pool.stop()
+
+
+def test_background_services_start_with_the_first_request_not_the_app(app, client, monkeypatch):
+    started = []
+    monkeypatch.setattr('app._start_background_services', lambda flask_app: started.append(flask_app))
+    app.config['TESTING'] = False
+    assert started == []
+
+    client.get('/api/health')
+    client.get('/api/health')
+
+    assert started == [app]
+
+
+def test_metrics_require_the_configured_token(app, client):
+    assert client.get('/api/metrics').status_code == 404
+
+    app.config['METRICS_TOKEN'] = 'ops-only'
+    reload_settings(app)
+
+    assert client.get('/api/metrics').status_code == 401
+    assert client.get('/api/metrics', headers={'X-Metrics-Token': 'wrong'}).status_code == 401
+    assert client.get('/api/metrics', headers={'X-Metrics-Token': 'ops-only'}).status_code == 200
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime, timedelta
+
+from models import QuestionSet, db
+from question_set_store import DatabaseQuestionSetStore, MemoryQuestionSetStore, QuestionSetStoreUnavailable
+from routes.assessment import QUESTION_SET_STORE_EXTENSION_KEY, QUESTION_SET_TOKEN_TTL_SECONDS
+from settings import reload_settings
+from tests.test_assessment import _answers_for_generated_questions, _generated_question_payload
+
+
+def _configure_generation(monkeypatch, store_backend):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+    monkeypatch.setenv('QUESTION_SET_STORE', store_backend)
+    reload_settings()
+
+    def fake_completion(**kwargs):
+        return {'choices': [{'message': {'content': json.dumps(_generated_question_payload())}}]}
+
+    monkeypatch.setattr('routes.assessment._post_openrouter_chat_completion', fake_completion)
+
+
+def _submit(client, question_set):
+    return client.post(
+        '/api/assessment/submit',
+        json={
+            'answers': _answers_for_generated_questions(question_set['questions']),
+            'selected_question_ids': question_set['selected_question_ids'],
+            'assessment_level': question_set['assessment_level'],
+            'question_set_token': question_set['question_set_token'],
+        },
+    )
+
+
+def test_database_store_issues_compact_reference_tokens(app, client, monkeypatch):
+    _configure_generation(monkeypatch, 'database')
+
+    question_set = client.get('/api/assessment/questions?level=advanced').get_json()
+
+    assert question_set['generation_source'] == 'openrouter'
+    assert len(question_set['question_set_token']) < 300
+    assert QuestionSet.query.count() == 1
+
+    response = _submit(client, question_set)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total_score'] == 15
+    assert data['assessment_level'] == 'advanced'
+
+
+def test_reference_token_is_rejected_once_stored_set_expires(app, client, monkeypatch):
+    _configure_generation(monkeypatch, 'database')
+    question_set = client.get('/api/assessment/questions?level=beginner').get_json()
+
+    QuestionSet.query.update({QuestionSet.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+    response = _submit(client, question_set)
+
+    assert response.status_code == 400
+    assert app.extensions[QUESTION_SET_STORE_EXTENSION_KEY].purge_expired() == 1
+    assert QuestionSet.query.count() == 0
+
+
+def test_falls_back_to_self_contained_token_when_store_is_unavailable(app, client, monkeypatch):
+    _configure_generation(monkeypatch, 'database')
+
+    def unavailable(*args, **kwargs):
+        raise QuestionSetStoreUnavailable('database is read-only')
+
+    store = DatabaseQuestionSetStore(QUESTION_SET_TOKEN_TTL_SECONDS)
+    monkeypatch.setattr(store, 'put', unavailable)
+    app.extensions[QUESTION_SET_STORE_EXTENSION_KEY] = store
+
+    question_set = client.get('/api/assessment/questions?level=intermediate').get_json()
+
+    assert question_set['generation_source'] == 'openrouter'
+    assert len(question_set['question_set_token']) > 1000
+    assert _submit(client, question_set).status_code == 200
+
+
+def test_memory_store_evicts_entries_after_ttl():
+    now = [0.0]
+    store = MemoryQuestionSetStore(ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+
+    first = store.put('beginner', {'questions': ['first']})
+    now[0] = 30.0
+    second = store.put('beginner', {'questions': ['second']})
+    assert store.get(first) == {'questions': ['first']}
+
+    now[0] = 61.0
+    assert store.get(first) is None
+    assert store.get(second) == {'questions': ['second']}
+
+    third = store.put('advanced', {'questions': ['third']})
+    fourth = store.put('advanced', {'questions': ['fourth']})
+    assert store.get(second) is None
+    assert store.get(third) and store.get(fourth)
@@ -0,0 +1,179 @@
+import json
+import random
+
+import pytest
+
+from models import AssessmentResult, TrainingModule, User, UserProgress, db
+from module_catalog import get_module_catalog
+from routes.assessment import (
+    ASSESSMENT_LEVELS,
+    DOMAINS,
+    _build_course_recommendations,
+    _normalize_workplace_track,
+    _recommendation_context,
+    _score_context_module,
+    get_latest_assessment_result,
+)
+from training_metadata import build_module_metadata
+
+pytest.importorskip('numpy')
+
+from recommendation_batch import ModuleScoringMatrix, iter_recommendations_for_all_users  # noqa: E402
+
+
+ROLES = (None, 'Sales', 'hr', 'People Ops', 'Marketing', 'ops', 'Engineering', 'General')
+
+
+def _add_edge_case_modules():
+    db.session.add_all([
+        TrainingModule(
+            id='module-batch-no-targets',
+            title='Batch No Targets',
+            role_specific='Operations',
+            difficulty_level=None,
+            estimated_duration_minutes=20,
+            content_type='reading',
+            target_domains=None,
+        ),
+        TrainingModule(
+            id='module-batch-repeated-targets',
+            title='Batch Repeated Targets',
+            role_specific='HR',
+            difficulty_level=3,
+            estimated_duration_minutes=30,
+            content_type='video',
+            content_url='https://example.com/course',
+            target_domains=json.dumps(['Practical Usage', 'Practical Usage', 'Data Literacy']),
+        ),
+        TrainingModule(
+            id='module-batch-same-title',
+            title='Batch Repeated Targets',
+            role_specific='Growth',
+            difficulty_level=5,
+            estimated_duration_minutes=30,
+            content_type='video',
+            target_domains=json.dumps(['Strategic Understanding']),
+        ),
+    ])
+    db.session.commit()
+
+
+def _seed_learners(count, seed=7):
+    rng = random.Random(seed)
+    module_ids = [module.id for module in get_module_catalog().active_modules]
+    users = []
+    for index in range(count):
+        user = User(
+            email=f'batch-learner-{index}@example.com',
+            password_hash='test-hash',
+            first_name='Batch',
+            last_name=str(index),
+            role=rng.choice(ROLES),
+        )
+        db.session.add(user)
+        users.append(user)
+    db.session.flush()
+
+    for user in users:
+        for _ in range(rng.choice((0, 1, 1, 2))):
+            domain_scores = {
+                domain: {'score': rng.randint(0, 3), 'total': rng.choice((3, 3, 0))}
+                for domain in DOMAINS
+                if rng.random() < 0.85
+            }
+            result = AssessmentResult(
+                user_id=user.id,
+                total_score=sum(entry['score'] for entry in domain_scores.values()),
+                max_score=15,
+                percentage=rng.choice((rng.uniform(0, 100), 49.9, 50, 70, 75)),
+                assessment_level=rng.choice(ASSESSMENT_LEVELS + (None,)),
+                domain_scores=domain_scores,
+            )
+            db.session.add(result)
+            db.session.flush()
+            if rng.random() < 0.8:
+                user.latest_assessment_result_id = result.id
+        for module_id in rng.sample(module_ids, rng.randint(0, 4)):
+            db.session.add(UserProgress(
+                user_id=user.id,
+                module_id=module_id,
+                status=rng.choice(('completed', 'completed', 'in_progress')),
+            ))
+    db.session.commit()
+    return users
+
+
+def _request_path_payload(user_id):
+    user = db.session.get(User, user_id)
+    completed_module_ids = {
+        module_id
+        for (module_id,) in db.session.query(UserProgress.module_id).filter_by(user_id=user_id, status='completed')
+    }
+    return _build_course_recommendations(
+        user_id,
+        get_latest_assessment_result(user_id, user),
+        _normalize_workplace_track(user.role),
+        completed_module_ids,
+        get_module_catalog().active_modules,
+    )
+
+
+def test_batch_scores_match_request_path_for_every_user(app):
+    _add_edge_case_modules()
+    _seed_learners(80)
+
+    batched = dict(iter_recommendations_for_all_users(chunk_size=17))
+
+    assert len(batched) == User.query.count()
+    for user_id, payload in batched.items():
+        assert payload == _request_path_payload(user_id), user_id
+    assert all(len(payload['recommendations']) == 6 for payload in batched.values())
+
+
+def test_chunk_size_does_not_change_results(app):
+    _seed_learners(25, seed=11)
+
+    whole = dict(iter_recommendations_for_all_users(chunk_size=1000))
+    chunked = dict(iter_recommendations_for_all_users(chunk_size=3))
+
+    assert chunked == whole
+
+
+def test_score_matrix_is_bit_identical_to_scalar_scorer(app):
+    _add_edge_case_modules()
+    users = _seed_learners(30, seed=3)
+    modules = get_module_catalog().active_modules
+    matrix = ModuleScoringMatrix(modules)
+
+    contexts, completed = [], []
+    for user in users:
+        module_ids = {
+            progress.module_id
+            for progress in UserProgress.query.filter_by(user_id=user.id, status='completed')
+        }
+        contexts.append(_recommendation_context(
+            get_latest_assessment_result(user.id, user),
+            _normalize_workplace_track(user.role),
+            module_ids,
+        ))
+        completed.append(module_ids)
+
+    scores, _ = matrix.score(contexts, completed)
+
+    for row, context in enumerate(contexts):
+        for column, module in enumerate(modules):
+            expected = _score_context_module(module, build_module_metadata(module), context)['score']
+            expected -= 18 if module.id in completed[row] else 0
+            assert scores[row, column] == expected
+
+
+def test_refresh_recommendations_cli_writes_json_lines(app, tmp_path):
+    _seed_learners(5, seed=5)
+    output = tmp_path / 'recommendations.jsonl'
+
+    result = app.test_cli_runner().invoke(args=['refresh-recommendations', str(output), '--chunk-size', '2'])
+
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == User.query.count()
+    assert all(len(line['recommendations']) <= 6 and line['user_id'] for line in lines)
@@ -0,0 +1,103 @@
+from models import TrainingModule, db
+from recommendation_cache import RECOMMENDATION_CACHE_EXTENSION_KEY, RecommendationCache
+from seeders.assessment_questions import SAMPLE_QUESTIONS
+from tests.test_assessment import build_assessment_payload_from_question_ids, create_user
+
+
+def _count_serializations(monkeypatch):
+    import routes.assessment
+
+    calls = []
+    original = routes.assessment.serialize_course_recommendation
+
+    def counting(*args, **kwargs):
+        calls.append(args[0].id)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(routes.assessment, 'serialize_course_recommendation', counting)
+    return calls
+
+
+def _recommendations(client, headers):
+    response = client.get('/api/assessment/recommendations', headers=headers)
+    assert response.status_code == 200
+    return response
+
+
+def test_cache_hit_skips_scoring_and_serialization(app, client, auth_headers, monkeypatch):
+    user = create_user(email='cached-recommendations@example.com')
+    headers = auth_headers(user)
+    calls = _count_serializations(monkeypatch)
+
+    first = _recommendations(client, headers)
+    built = len(calls)
+    second = _recommendations(client, headers)
+
+    assert built > 0
+    assert len(calls) == built
+    assert second.get_data() == first.get_data()
+    assert second.get_json()['recommendations']
+    assert app.extensions[RECOMMENDATION_CACHE_EXTENSION_KEY].stats()['hits'] == 1
+
+
+def test_submit_completion_and_profile_update_invalidate(app, client, auth_headers, monkeypatch):
+    user = create_user(email='invalidated-recommendations@example.com')
+    headers = auth_headers(user)
+    calls = _count_serializations(monkeypatch)
+
+    def rebuilt_after(change):
+        _recommendations(client, headers)
+        before = len(calls)
+        invalidations = app.extensions[RECOMMENDATION_CACHE_EXTENSION_KEY].stats()['invalidations']
+        assert change().status_code == 200
+        assert app.extensions[RECOMMENDATION_CACHE_EXTENSION_KEY].stats()['invalidations'] == invalidations + 1
+        _recommendations(client, headers)
+        return len(calls) > before
+
+    question_ids = [question['id'] for question in SAMPLE_QUESTIONS[:15]]
+    answers, option_map = build_assessment_payload_from_question_ids(question_ids)
+    assert rebuilt_after(lambda: client.post(
+        '/api/assessment/submit',
+        json={'answers': answers, 'option_map': option_map, 'selected_question_ids': question_ids},
+        headers=headers,
+    ))
+    assert rebuilt_after(lambda: client.put(
+        '/api/training/progress/module-ai-fundamentals-intro',
+        json={'status': 'completed', 'progress_percentage': 100},
+        headers=headers,
+    ))
+    assert rebuilt_after(lambda: client.put('/api/auth/profile', json={'role': 'Sales'}, headers=headers))
+
+
+def test_catalog_change_misses_even_without_invalidation(app, client, auth_headers, monkeypatch):
+    user = create_user(email='catalog-recommendations@example.com')
+    headers = auth_headers(user)
+    calls = _count_serializations(monkeypatch)
+
+    _recommendations(client, headers)
+    built = len(calls)
+
+    module = db.session.get(TrainingModule, 'module-ai-fundamentals-intro')
+    module.title = 'AI Fundamentals, Revised'
+    db.session.commit()
+
+    _recommendations(client, headers)
+    assert len(calls) > built
+    assert 'module-ai-fundamentals-intro' in calls[built:]
+
+
+def test_entries_expire_and_are_evicted_least_recently_used():
+    now = [0.0]
+    cache = RecommendationCache(ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+
+    cache.put('a', ('k',), '{"a": 1}')
+    cache.put('b', ('k',), '{"b": 1}')
+    assert cache.get('a', ('k',)) == '{"a": 1}'
+    assert cache.get('a', ('other',)) is None
+
+    cache.put('c', ('k',), '{"c": 1}')
+    assert cache.get('b', ('k',)) is None
+    assert cache.get('c', ('k',)) == '{"c": 1}'
+
+    now[0] = 61.0
+    assert cache.get('a', ('k',)) is None
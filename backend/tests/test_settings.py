@@ -0,0 +1,45 @@
+import dataclasses
+
+import pytest
+
+from settings import get_settings, load_settings, reload_settings
+
+
+def test_settings_snapshot_is_frozen_and_normalized(monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', ' https://example-project.supabase.co/ ')
+    monkeypatch.delenv('SUPABASE_JWT_ISSUER', raising=False)
+    monkeypatch.delenv('SUPABASE_JWKS_URL', raising=False)
+    monkeypatch.setenv('OPENROUTER_BASE_URL', 'https://openrouter.example/api/v1/')
+
+    settings = load_settings({'TESTING': True})
+
+    assert settings.auth.jwt_issuer == 'https://example-project.supabase.co/auth/v1'
+    assert settings.auth.jwks_url == 'https://example-project.supabase.co/auth/v1/.well-known/jwks.json'
+    assert settings.assessment.openrouter_base_url == 'https://openrouter.example/api/v1'
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.auth.jwt_secret = 'changed'
+    with pytest.raises(TypeError):
+        settings.billing.stripe_price_ids['STRIPE_PRICE_PREMIUM'] = 'price_changed'
+
+
+def test_config_values_take_precedence_over_environment(monkeypatch):
+    monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_env')
+
+    settings = load_settings({'STRIPE_SECRET_KEY': 'sk_config', 'FLASK_ENV': 'production'})
+
+    assert settings.billing.stripe_secret_key == 'sk_config'
+    assert settings.billing.mock_mode is False
+    assert settings.auth.demo_auth_enabled is False
+
+
+def test_reload_settings_replaces_app_snapshot(app, monkeypatch):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-openrouter-key')
+    monkeypatch.setenv('OPENROUTER_MODEL', 'test/model')
+    monkeypatch.setenv('ASSESSMENT_QUESTION_SET_SECRET', 'test-question-set-secret')
+
+    before = get_settings()
+    reloaded = reload_settings()
+
+    assert get_settings() is reloaded
+    assert before is not reloaded
+    assert reloaded.assessment.openrouter_configured is True
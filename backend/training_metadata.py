@@ -64,6 +64,9 @@ def safe_external_url(value):
 
 
 def get_module_lesson_count(module):
+    lesson_count = getattr(module, 'lesson_count', None)
+    if lesson_count is not None:
+        return lesson_count
     try:
         return len(module.lessons or [])
     except Exception:
@@ -79,6 +82,17 @@ def build_module_detail_path(module):
     return f'/training/modules/{safe_module_id}'
 
 
+def get_module_prerequisite_payload(module):
+    # Catalog snapshot modules carry the parsed payload; ORM rows are parsed here.
+    payload = getattr(module, 'prerequisite_payload', None)
+    if payload is not None:
+        return payload
+    try:
+        return json.loads(module.prerequisites) if module.prerequisites else {}
+    except (TypeError, ValueError):
+        return {}
+
+
 def build_module_routing_metadata(module):
     lesson_count = get_module_lesson_count(module)
     has_internal_lessons = lesson_count > 0
@@ -87,11 +101,7 @@ def build_module_routing_metadata(module):
     learn_path = f'{detail_path}/learn' if has_internal_lessons else None
 
     metadata = {}
-    try:
-        prerequisite_payload = json.loads(module.prerequisites) if module.prerequisites else {}
-    except (TypeError, ValueError):
-        prerequisite_payload = {}
-
+    prerequisite_payload = get_module_prerequisite_payload(module)
     if isinstance(prerequisite_payload, dict) and isinstance(prerequisite_payload.get('metadata'), dict):
         metadata = prerequisite_payload['metadata']
 
@@ -123,12 +133,17 @@ def build_module_start_path(module):
 
 
 def build_module_metadata(module):
+    cached_metadata = getattr(module, 'module_metadata', None)
+    if cached_metadata is not None:
+        return cached_metadata
+
     lesson_count = get_module_lesson_count(module)
     has_internal_lessons = module_has_internal_lessons(module)
     routing = build_module_routing_metadata(module)
 
+    target_domains = getattr(module, 'target_domain_list', None)
     return {
-        'target_domains': parse_json_array(module.target_domains),
+        'target_domains': list(target_domains) if target_domains is not None else parse_json_array(module.target_domains),
         'lesson_count': lesson_count,
         'has_internal_lessons': has_internal_lessons,
         'routing': routing,
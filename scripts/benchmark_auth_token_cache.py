@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Measure per-request bearer-token authentication cost with and without the
+verified-token cache.
+
+Runs entirely in-process against a throwaway SQLite database and a locally
+generated RS256 key pair, so no Supabase project or network access is needed:
+
+    python scripts/benchmark_auth_token_cache.py --iterations 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('SKIP_SCHEMA_READINESS_CHECK', '1')
+
+import jwt  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+import routes  # noqa: E402
+from app import create_app  # noqa: E402
+from models import db  # noqa: E402
+
+ISSUER = 'https://bench-project.supabase.co/auth/v1'
+AUDIENCE = 'authenticated'
+
+
+class _StaticSigningKey:
+    def __init__(self, key):
+        self.key = key
+
+
+class _StaticJwksClient:
+    def __init__(self, key):
+        self._key = key
+
+    def get_signing_key_from_jwt(self, token):
+        return _StaticSigningKey(self._key)
+
+
+def _key_pair():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem, public_pem
+
+
+def _token(private_pem):
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {
+            'sub': '00000000-0000-4000-8000-00000000b001',
+            'iss': ISSUER,
+            'aud': AUDIENCE,
+            'email': 'bench@example.com',
+            'user_metadata': {'first_name': 'Bench', 'last_name': 'User'},
+            'iat': int(now.timestamp()),
+            'exp': int((now + timedelta(hours=1)).timestamp()),
+        },
+        private_pem,
+        algorithm='RS256',
+        headers={'kid': 'bench-key'},
+    )
+
+
+def _time_per_call(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    private_pem, public_pem = _key_pair()
+    routes._get_supabase_jwks_client = lambda jwks_url: _StaticJwksClient(public_pem)
+    token = _token(private_pem)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{Path(tmp_dir) / "bench.sqlite"}',
+            'SUPABASE_JWT_ISSUER': ISSUER,
+            'SUPABASE_JWKS_URL': f'{ISSUER}/.well-known/jwks.json',
+            'SUPABASE_JWT_AUDIENCE': AUDIENCE,
+        })
+
+        with app.test_request_context():
+            db.create_all()
+            authenticate = lambda: routes.get_authenticated_identity(token=token)  # noqa: E731
+            authenticate()
+
+            def uncached():
+                routes.clear_verified_token_cache()
+                authenticate()
+
+            uncached_ms = _time_per_call(uncached, args.iterations)
+            routes.clear_verified_token_cache()
+            authenticate()
+            cached_ms = _time_per_call(authenticate, args.iterations)
+            stats = routes.get_verified_token_cache_stats()
+            db.session.remove()
+            db.drop_all()
+
+    print(f'iterations:            {args.iterations}')
+    print(f'uncached auth (ms/op): {uncached_ms:.3f}')
+    print(f'cached auth (ms/op):   {cached_ms:.3f}')
+    print(f'speedup:               {uncached_ms / cached_ms:.1f}x')
+    print(f'cache stats:           {stats}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Measure bulk answer-sheet grading throughput against a throwaway SQLite database.
+
+Grades the same synthetic cohort twice: once committing every result on its
+own (what one ``POST /api/assessment/submit`` per learner costs) and once with
+the chunked bulk insert used by ``/api/assessment/submit/batch``:
+
+    python scripts/benchmark_bulk_grading.py --sheets 10000 --learners 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('SKIP_SCHEMA_READINESS_CHECK', '1')
+
+from app import create_app  # noqa: E402
+from models import AssessmentResult, User, db  # noqa: E402
+from routes.assessment import _select_random_questions, grade_answer_sheets  # noqa: E402
+from seeders.assessment_questions import seed_assessment_questions  # noqa: E402
+
+
+def _create_learners(count):
+    users = [
+        User(
+            email=f'learner-{index}@bench.test',
+            password_hash='bench',
+            first_name='Bench',
+            last_name=str(index),
+            organization='Bench',
+        )
+        for index in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.email for user in users]
+
+
+def _build_sheets(count, emails, question_sets):
+    rng = random.Random(7)
+    sheets = []
+    for index in range(count):
+        questions = question_sets[index % len(question_sets)]
+        sheets.append({
+            'sheet_id': index,
+            'email': emails[index % len(emails)],
+            'assessment_level': 'intermediate',
+            'selected_question_ids': [question['id'] for question in questions],
+            'answers': {question['id']: rng.choice('ABCD') for question in questions},
+            'time_taken_minutes': rng.randint(5, 30),
+        })
+    return sheets
+
+
+def _run(sheets, chunk_size):
+    AssessmentResult.query.delete()
+    db.session.commit()
+    started = time.perf_counter()
+    summary = grade_answer_sheets(sheets, organization='Bench', chunk_size=chunk_size)
+    elapsed = time.perf_counter() - started
+    assert summary['saved'] == len(sheets), summary['failed']
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=10000)
+    parser.add_argument('--learners', type=int, default=1000)
+    parser.add_argument('--question-sets', type=int, default=20)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{Path(tmp_dir) / "bench.sqlite"}',
+        })
+
+        with app.app_context():
+            db.create_all()
+            seed_assessment_questions(silent=True)
+            emails = _create_learners(args.learners)
+            question_sets = [_select_random_questions('intermediate') for _ in range(args.question_sets)]
+            sheets = _build_sheets(args.sheets, emails, question_sets)
+
+            per_sheet = _run(sheets, chunk_size=1)
+            batched = _run(sheets, chunk_size=args.chunk_size)
+
+    print(f'sheets: {args.sheets}, learners: {args.learners}, distinct question sets: {args.question_sets}')
+    print(f'{"mode":<22} {"seconds":>9} {"sheets/s":>10}')
+    for label, elapsed in (('commit per sheet', per_sheet), (f'chunks of {args.chunk_size}', batched)):
+        print(f'{label:<22} {elapsed:>9.2f} {args.sheets / elapsed:>10.0f}')
+    print(f'speedup: {per_sheet / batched:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
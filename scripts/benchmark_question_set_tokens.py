@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Compare question-set token creation and resolution cost for token formats
+v1 (per-answer HMACs) and v2 (encrypted answer key).
+
+Runs in-process with a throwaway SQLite app and a synthetic 15-question set:
+
+    python scripts/benchmark_question_set_tokens.py --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('SKIP_SCHEMA_READINESS_CHECK', '1')
+
+from app import create_app  # noqa: E402
+from routes.assessment import (  # noqa: E402
+    DOMAINS,
+    QUESTIONS_PER_DOMAIN,
+    _create_question_set_token,
+    _resolve_question_set_token,
+)
+
+
+def _grading_questions():
+    questions = []
+    for domain in DOMAINS:
+        for index in range(1, QUESTIONS_PER_DOMAIN + 1):
+            questions.append({
+                'id': f'bench-{len(questions) + 1}',
+                'domain': domain,
+                'question_text': f'{domain} benchmark question {index}?',
+                'option_a': f'{domain} option A {index}',
+                'option_b': f'{domain} option B {index}',
+                'option_c': f'{domain} option C {index}',
+                'option_d': f'{domain} option D {index}',
+                'correct_answer': 'D',
+            })
+    return questions
+
+
+def _time_per_call(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    questions = _grading_questions()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{Path(tmp_dir) / "bench.sqlite"}',
+            'ASSESSMENT_QUESTION_SET_SECRET': 'benchmark-question-set-secret',
+        })
+
+        with app.app_context():
+            results = {}
+            for version in (1, 2):
+                token = _create_question_set_token(questions, 'intermediate', 'bench/model', version=version)
+                assert _resolve_question_set_token(token) is not None
+                results[version] = {
+                    'create_us': _time_per_call(
+                        lambda: _create_question_set_token(questions, 'intermediate', 'bench/model', version=version),
+                        args.iterations,
+                    ),
+                    'resolve_us': _time_per_call(lambda: _resolve_question_set_token(token), args.iterations),
+                    'token_bytes': len(token),
+                }
+
+    print(f'iterations: {args.iterations}, questions per set: {len(questions)}')
+    print(f'{"version":<8} {"create (us/op)":>15} {"resolve (us/op)":>16} {"token bytes":>12}')
+    for version, result in results.items():
+        print(
+            f'v{version:<7} {result["create_us"]:>15.1f} {result["resolve_us"]:>16.1f} '
+            f'{result["token_bytes"]:>12}'
+        )
+    print(f'resolve speedup v2 vs v1: {results[1]["resolve_us"] / results[2]["resolve_us"]:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Measure the all-users recommendation refresh against a throwaway SQLite database.
+
+Scores the same synthetic cohort twice: once user by user through the
+per-request scorer behind ``GET /api/assessment/recommendations`` and once with
+the vectorized ``flask refresh-recommendations`` engine:
+
+    python scripts/benchmark_recommendation_refresh.py --users 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('SKIP_SCHEMA_READINESS_CHECK', '1')
+
+from app import create_app  # noqa: E402
+from models import AssessmentResult, User, UserProgress, db  # noqa: E402
+from module_catalog import get_module_catalog  # noqa: E402
+from recommendation_batch import iter_recommendations_for_all_users  # noqa: E402
+from routes.assessment import (  # noqa: E402
+    DOMAINS,
+    _build_course_recommendations,
+    _normalize_workplace_track,
+    _point_users_at_latest_assessments,
+)
+from seeders.training import seed_training_modules  # noqa: E402
+
+
+def _create_cohort(count):
+    rng = random.Random(7)
+    module_ids = [module.id for module in get_module_catalog().active_modules]
+    users = [
+        User(
+            email=f'learner-{index}@bench.test',
+            password_hash='bench',
+            first_name='Bench',
+            last_name=str(index),
+            role=rng.choice((None, 'Sales', 'HR', 'Marketing', 'Operations')),
+        )
+        for index in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+
+    latest = {}
+    for user in users:
+        result = AssessmentResult(
+            user_id=user.id,
+            total_score=0,
+            max_score=15,
+            percentage=rng.uniform(0, 100),
+            assessment_level=rng.choice(('beginner', 'intermediate', 'advanced')),
+            domain_scores={domain: {'score': rng.randint(0, 3), 'total': 3} for domain in DOMAINS},
+        )
+        db.session.add(result)
+        db.session.flush()
+        latest[user.id] = result.id
+        for module_id in rng.sample(module_ids, rng.randint(0, 3)):
+            db.session.add(UserProgress(user_id=user.id, module_id=module_id, status='completed'))
+    _point_users_at_latest_assessments(latest)
+    db.session.commit()
+
+
+def _per_user():
+    modules = get_module_catalog().active_modules
+    payloads = {}
+    for user in User.query.all():
+        result = db.session.get(AssessmentResult, user.latest_assessment_result_id)
+        completed = {
+            module_id
+            for (module_id,) in db.session.query(UserProgress.module_id).filter_by(
+                user_id=user.id,
+                status='completed',
+            )
+        }
+        payloads[user.id] = _build_course_recommendations(
+            user.id,
+            result,
+            _normalize_workplace_track(user.role),
+            completed,
+            modules,
+        )
+    return payloads
+
+
+def _timed(function):
+    started = time.perf_counter()
+    value = function()
+    return value, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{Path(tmp_dir) / "bench.sqlite"}',
+        })
+
+        with app.app_context():
+            db.create_all()
+            seed_training_modules(silent=True)
+            _create_cohort(args.users)
+            module_count = len(get_module_catalog().active_modules)
+
+            expected, per_user = _timed(_per_user)
+            batched, vectorized = _timed(
+                lambda: dict(iter_recommendations_for_all_users(chunk_size=args.chunk_size))
+            )
+            assert batched == expected, 'batch output differs from the per-request scorer'
+
+    print(f'users: {args.users}, active modules: {module_count}')
+    print(f'{"mode":<22} {"seconds":>9} {"users/s":>10}')
+    for label, elapsed in (('per user', per_user), (f'chunks of {args.chunk_size}', vectorized)):
+        print(f'{label:<22} {elapsed:>9.2f} {args.users / elapsed:>10.0f}')
+    print(f'speedup: {per_user / vectorized:.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())